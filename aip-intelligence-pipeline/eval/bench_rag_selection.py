@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from openaip_pipeline.services.rag.rag import (  # noqa: E402
+    _dedupe_exact_docs,
+    _doc_section_key,
+    _doc_similarity_score,
+    _select_diverse_docs,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the pairwise reference and the vectorized chunk selection (dedupe + MMR)."
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        nargs="+",
+        default=[60, 200, 1000],
+        help="Candidate pool sizes to measure.",
+    )
+    parser.add_argument("--max-docs", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions; the best run is reported.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def _reference_text_overlap(a: str, b: str) -> float:
+    tokens_a = set(re.findall(r"[a-z0-9]{2,}", (a or "").lower()))
+    tokens_b = set(re.findall(r"[a-z0-9]{2,}", (b or "").lower()))
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def _reference_select(docs: list[Any], *, max_docs: int) -> list[Any]:
+    """The pairwise implementation the vectorized selection replaced."""
+    suppressed: list[Any] = []
+    for doc in sorted(_dedupe_exact_docs(docs), key=_doc_similarity_score, reverse=True):
+        if any(_reference_text_overlap(doc.page_content, kept.page_content) >= 0.92 for kept in suppressed):
+            continue
+        suppressed.append(doc)
+    if len(suppressed) <= max_docs:
+        return suppressed
+    ranked = sorted(suppressed, key=_doc_similarity_score, reverse=True)
+    selected = [ranked[0]]
+    remaining = ranked[1:]
+    while remaining and len(selected) < min(max_docs, len(ranked)):
+        best_index = 0
+        best_score = float("-inf")
+        for index, candidate in enumerate(remaining):
+            max_overlap = max(
+                (_reference_text_overlap(candidate.page_content, existing.page_content) for existing in selected),
+                default=0.0,
+            )
+            penalty = 0.15 if any(_doc_section_key(existing) == _doc_section_key(candidate) for existing in selected) else 0.0
+            score = _doc_similarity_score(candidate) - (0.35 * max_overlap) - penalty
+            if score > best_score:
+                best_score = score
+                best_index = index
+        selected.append(remaining.pop(best_index))
+    return selected[:max_docs]
+
+
+def _synthetic_docs(rng: random.Random, count: int) -> list[Any]:
+    words = [
+        "drainage", "rehabilitation", "barangay", "road", "concreting", "health", "center", "flood",
+        "control", "supply", "daycare", "livelihood", "training", "seminar", "solar", "streetlight",
+        "canal", "desilting", "nutrition", "program", "equipment", "procurement", "senior", "citizens",
+    ]
+    docs: list[Any] = []
+    templates = [" ".join(rng.choice(words) for _ in range(rng.randint(30, 90))) for _ in range(max(4, count // 5))]
+    for index in range(count):
+        text = rng.choice(templates)
+        if rng.random() < 0.7:
+            text = f"{text} item {index} {rng.choice(words)} {rng.randint(1000, 9999)}"
+        docs.append(
+            SimpleNamespace(
+                page_content=text,
+                metadata={
+                    "chunk_id": f"chunk-{index}",
+                    "scope_type": "barangay",
+                    "scope_id": f"brgy-{index % 7}",
+                    "similarity": round(rng.uniform(0.3, 0.95), 4),
+                    "metadata": {"section": f"section-{rng.randint(0, 9)}"},
+                },
+            )
+        )
+    return docs
+
+
+def _best_of(repeat: int, fn: Callable[[], list[Any]]) -> tuple[float, list[Any]]:
+    best = float("inf")
+    result: list[Any] = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    rows: list[dict[str, Any]] = []
+    for count in args.candidates:
+        docs = _synthetic_docs(rng, count)
+        reference_seconds, reference = _best_of(
+            args.repeat,
+            lambda docs=docs: _reference_select(docs, max_docs=args.max_docs),
+        )
+        measured_seconds, measured = _best_of(
+            args.repeat,
+            lambda docs=docs: _select_diverse_docs(docs, max_docs=args.max_docs, min_docs=min(4, args.max_docs)),
+        )
+        rows.append(
+            {
+                "candidates": count,
+                "identical_selection": [doc.metadata["chunk_id"] for doc in measured]
+                == [doc.metadata["chunk_id"] for doc in reference],
+                "reference_ms": round(reference_seconds * 1000.0, 2),
+                "measured_ms": round(measured_seconds * 1000.0, 2),
+                "speedup": round(reference_seconds / measured_seconds, 1) if measured_seconds > 0 else None,
+            }
+        )
+    print(json.dumps(rows, indent=2))
+    return 0 if all(row["identical_selection"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from openaip_pipeline.services.chunking.context_window import (  # noqa: E402
+    chunk_items_by_token_budget,
+    chunk_json_list_by_token_budget,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the reference and measured token-budget chunkers on synthetic AIP projects."
+    )
+    parser.add_argument("--projects", type=int, default=5000, help="Number of synthetic projects.")
+    parser.add_argument(
+        "--budget-tokens",
+        type=int,
+        default=62000,
+        help="Input token budget per chunk (validation default is roughly half of 128k).",
+    )
+    parser.add_argument("--max-items", type=int, default=None, help="Optional per-chunk item cap.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions; the best run is reported.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def _synthetic_project(rng: random.Random, index: int) -> dict[str, Any]:
+    words = ["drainage", "rehabilitation", "barangay", "road", "health", "center", "flood", "control", "supply"]
+    description = " ".join(rng.choice(words) for _ in range(rng.randint(8, 60)))
+    total = round(rng.random() * 5_000_000, 2)
+    return {
+        "aip_ref_code": f"{rng.choice(['1000', '3000', '8000'])}-{index:05d}",
+        "program_project_description": description,
+        "implementing_agency": "City Engineering Office",
+        "start_date": "Jan 2026",
+        "completion_date": "Dec 2026",
+        "expected_output": description[:80],
+        "source_of_funds": "General Fund",
+        "personal_services": None,
+        "maintenance_and_other_operating_expenses": round(total * 0.4, 2),
+        "capital_outlay": round(total * 0.6, 2),
+        "total": total,
+        "errors": None,
+    }
+
+
+def _best_of(repeat: int, fn: Callable[[], list[list[int]]]) -> tuple[float, list[list[int]]]:
+    best = float("inf")
+    result: list[list[int]] = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    projects = [_synthetic_project(rng, index) for index in range(args.projects)]
+    static_payload: dict[str, Any] = {}
+
+    reference_seconds, reference_chunks = _best_of(
+        args.repeat,
+        lambda: chunk_items_by_token_budget(
+            items=list(range(len(projects))),
+            static_payload=static_payload,
+            add_item_fn=lambda payload, chunk: {**payload, "projects": [projects[index] for index in chunk]},
+            budget_tokens=args.budget_tokens,
+            max_items_per_chunk=args.max_items,
+        ),
+    )
+    measured_seconds, measured_chunks = _best_of(
+        args.repeat,
+        lambda: chunk_json_list_by_token_budget(
+            items=projects,
+            static_payload=static_payload,
+            list_key="projects",
+            budget_tokens=args.budget_tokens,
+            max_items_per_chunk=args.max_items,
+        ),
+    )
+
+    report = {
+        "projects": len(projects),
+        "budget_tokens": args.budget_tokens,
+        "chunks": len(measured_chunks),
+        "identical_boundaries": measured_chunks == reference_chunks,
+        "reference_seconds": round(reference_seconds, 4),
+        "measured_seconds": round(measured_seconds, 4),
+        "speedup": round(reference_seconds / measured_seconds, 1) if measured_seconds > 0 else None,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical_boundaries"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+
+from openaip_pipeline.adapters.supabase.transport import (
+    RETRYABLE_STATUS_CODES,
+    UNPROCESSED_STATUS_CODES,
+    _read_non_negative_int_env,
+    _read_positive_float_env,
+    _read_positive_int_env,
+    retry_backoff_seconds,
+)
+from openaip_pipeline.core.errors import ExternalServiceError
+
+
+class SupabaseRpcError(ExternalServiceError):
+    """Failed PostgREST RPC; `code` carries the PostgREST error code (e.g. `PGRST202`)."""
+
+    def __init__(self, message: str, *, status_code: int, code: str | None, payload: dict[str, Any] | None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.payload = payload
+
+
+class AsyncSupabaseRpcClient:
+    """Non-blocking PostgREST RPC caller for the API request path.
+
+    Requests wait for a pooled connection on the event loop instead of holding a worker
+    thread, so concurrency is bounded by `PIPELINE_SUPABASE_HTTP_MAX_CONNECTIONS` sockets
+    rather than by the threadpool. Timeouts and retry limits reuse the sync transport's
+    `PIPELINE_SUPABASE_HTTP_*` settings. Instances are bound to the event loop that first
+    uses them; close them with `aclose` on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        service_key: str,
+        max_connections: int | None = None,
+        timeout_seconds: float | None = None,
+        max_retries: int | None = None,
+        retry_backoff_seconds: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        pool_size = max_connections or _read_positive_int_env("PIPELINE_SUPABASE_HTTP_MAX_CONNECTIONS", 20)
+        self.base_url = url.rstrip("/")
+        self.timeout_seconds = timeout_seconds or _read_positive_float_env("PIPELINE_SUPABASE_HTTP_TIMEOUT_SECONDS", 120.0)
+        self.max_retries = (
+            _read_non_negative_int_env("PIPELINE_SUPABASE_HTTP_MAX_RETRIES", 3) if max_retries is None else max_retries
+        )
+        self.retry_backoff_seconds = retry_backoff_seconds or _read_positive_float_env(
+            "PIPELINE_SUPABASE_HTTP_RETRY_BACKOFF_SECONDS", 0.5
+        )
+        self._headers = {
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "Content-Type": "application/json",
+        }
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def rpc(self, function_name: str, params: dict[str, Any], *, idempotent: bool = True) -> Any:
+        """Call `function_name` and return its decoded JSON result.
+
+        Retrieval RPCs are read-only, so by default every retryable status is replayed;
+        pass `idempotent=False` to limit replays to statuses that were never processed.
+        """
+        url = f"{self.base_url}/rest/v1/rpc/{function_name}"
+        body = json.dumps(params).encode("utf-8")
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.post(url, content=body, headers=self._headers, timeout=self.timeout_seconds)
+            except httpx.TransportError:
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(retry_backoff_seconds(self.retry_backoff_seconds, attempt, None))
+                attempt += 1
+                continue
+            if response.status_code < 400:
+                return response.json() if response.content else None
+            retryable = idempotent or response.status_code in UNPROCESSED_STATUS_CODES
+            if response.status_code in RETRYABLE_STATUS_CODES and retryable and attempt < self.max_retries:
+                await asyncio.sleep(retry_backoff_seconds(self.retry_backoff_seconds, attempt, response))
+                attempt += 1
+                continue
+            raise _rpc_error(function_name, response)
+
+
+def _rpc_error(function_name: str, response: httpx.Response) -> SupabaseRpcError:
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        payload = None
+    code = str(payload.get("code")) if payload and payload.get("code") is not None else None
+    message = f"Supabase RPC {function_name} failed with HTTP {response.status_code}"
+    if payload and payload.get("message"):
+        message = f"{message}: {payload['message']}"
+    return SupabaseRpcError(message, status_code=response.status_code, code=code, payload=payload)
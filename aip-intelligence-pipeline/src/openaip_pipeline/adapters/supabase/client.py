@@ -4,10 +4,10 @@ import json
 import os
 import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
+from openaip_pipeline.adapters.supabase.transport import SupabaseHttpTransport, get_shared_transport
 from openaip_pipeline.core.settings import Settings
 
 
@@ -89,8 +89,9 @@ def _format_http_error_message(
 
 
 class SupabaseRestClient:
-    def __init__(self, config: SupabaseConfig):
+    def __init__(self, config: SupabaseConfig, *, transport: SupabaseHttpTransport | None = None):
         self.config = config
+        self.transport = transport or get_shared_transport()
         self.base_url = config.url.rstrip("/")
         self.service_key = config.service_key
         self.http_timeout_seconds = _read_positive_float_env("PIPELINE_SUPABASE_HTTP_TIMEOUT_SECONDS", 120.0)
@@ -128,22 +129,28 @@ class SupabaseRestClient:
         method: str,
         url: str,
         *,
-        payload: dict[str, Any] | None = None,
+        payload: dict[str, Any] | list[dict[str, Any]] | None = None,
         raw_bytes: bytes | None = None,
         headers: dict[str, str] | None = None,
+        idempotent: bool | None = None,
+        parse_json: bool = True,
     ) -> Any:
         body = raw_bytes
         if payload is not None:
             body = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url=url, data=body, headers=self._headers(headers), method=method)
+        request_headers = self._headers(headers)
+        if idempotent is None:
+            # Plain inserts are the only writes that are unsafe to replay after a 5xx.
+            idempotent = method != "POST" or "merge-duplicates" in request_headers.get("Prefer", "")
         try:
-            with urllib.request.urlopen(req, timeout=self.http_timeout_seconds) as response:
-                data = response.read()
-                if not data:
-                    return None
-                if (response.headers.get("Content-Type") or "").startswith("application/json"):
-                    return json.loads(data.decode("utf-8"))
-                return data
+            response = self.transport.request(
+                method,
+                url,
+                body=body,
+                headers=request_headers,
+                timeout=self.http_timeout_seconds,
+                idempotent=idempotent,
+            )
         except urllib.error.HTTPError as error:
             parsed_payload, raw_body = _extract_http_error_payload(error)
             if parsed_payload is not None:
@@ -156,6 +163,14 @@ class SupabaseRestClient:
                 raw_body=raw_body,
             )
             raise
+        data = response.content
+        if not parse_json:
+            return data
+        if not data:
+            return None
+        if (response.headers.get("Content-Type") or "").startswith("application/json"):
+            return json.loads(data.decode("utf-8"))
+        return data
 
     def select(
         self,
@@ -179,12 +194,13 @@ class SupabaseRestClient:
     def insert(
         self,
         table: str,
-        row: dict[str, Any],
+        row: dict[str, Any] | list[dict[str, Any]],
         *,
         select: str | None = None,
         on_conflict: str | None = None,
         upsert: bool = False,
     ) -> list[dict[str, Any]]:
+        # A list of rows is sent as one PostgREST bulk insert; every row must carry the same keys.
         query: dict[str, str] = {}
         if select:
             query["select"] = select
@@ -196,6 +212,36 @@ class SupabaseRestClient:
         data = self._request("POST", self._rest_url(table, query or None), payload=row, headers=headers)
         return data or []
 
+    def insert_encoded_rows(
+        self,
+        table: str,
+        encoded_rows: list[str],
+        *,
+        on_conflict: str | None = None,
+        upsert: bool = False,
+    ) -> None:
+        """Bulk insert rows that were already serialized to JSON objects, returning nothing.
+
+        Callers that size requests by encoded bytes reuse their encoding here instead of
+        paying for a second `json.dumps`, and `return=minimal` keeps large rows from being
+        echoed back in the response.
+        """
+        if not encoded_rows:
+            return
+        query: dict[str, str] = {}
+        if on_conflict:
+            query["on_conflict"] = on_conflict
+        prefer = "return=minimal"
+        if upsert:
+            prefer = f"resolution=merge-duplicates,{prefer}"
+        body = ("[" + ",".join(encoded_rows) + "]").encode("utf-8")
+        self._request(
+            "POST",
+            self._rest_url(table, query or None),
+            raw_bytes=body,
+            headers={"Prefer": prefer},
+        )
+
     def update(
         self,
         table: str,
@@ -215,10 +261,18 @@ class SupabaseRestClient:
         )
         return data or []
 
+    def rpc(self, function_name: str, params: dict[str, Any], *, idempotent: bool = False) -> Any:
+        return self._request(
+            "POST",
+            self._rest_url(f"rpc/{function_name}"),
+            payload=params,
+            idempotent=idempotent,
+        )
+
     def create_signed_url(self, bucket_id: str, object_name: str, expires_in: int = 600) -> str:
         object_path = urllib.parse.quote(object_name, safe="/")
         url = f"{self.base_url}/storage/v1/object/sign/{bucket_id}/{object_path}"
-        data = self._request("POST", url, payload={"expiresIn": expires_in})
+        data = self._request("POST", url, payload={"expiresIn": expires_in}, idempotent=True)
         if not isinstance(data, dict):
             raise RuntimeError("Signed URL response is invalid.")
         signed = data.get("signedURL") or data.get("signedUrl")
@@ -231,14 +285,10 @@ class SupabaseRestClient:
         return f"{self.base_url}/storage/v1/{signed}"
 
     def download_bytes(self, url: str) -> bytes:
-        req = urllib.request.Request(url=url, method="GET")
         total = 0
         chunks: list[bytes] = []
-        with urllib.request.urlopen(req, timeout=self.download_timeout_seconds) as response:
-            while True:
-                chunk = response.read(64 * 1024)
-                if not chunk:
-                    break
+        with self.transport.stream("GET", url, timeout=self.download_timeout_seconds) as response:
+            for chunk in response.iter_bytes(64 * 1024):
                 total += len(chunk)
                 if total > self.source_pdf_max_bytes:
                     raise SupabaseGuardrailError(
@@ -262,6 +312,11 @@ class SupabaseRestClient:
                 "Content-Type": content_type,
                 "x-upsert": "true",
             },
+            idempotent=True,
         )
         return object_name
 
+    def download_object(self, *, bucket_id: str, object_name: str) -> bytes:
+        object_path = urllib.parse.quote(object_name, safe="/")
+        url = f"{self.base_url}/storage/v1/object/{bucket_id}/{object_path}"
+        return self._request("GET", url, parse_json=False)
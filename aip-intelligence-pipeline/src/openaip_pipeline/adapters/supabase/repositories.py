@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
 from datetime import date, datetime
 from typing import Any
 from urllib.error import HTTPError
 
 from openaip_pipeline.adapters.supabase.client import SupabaseRestClient
 from openaip_pipeline.adapters.supabase.dto import ExtractionRunDTO, UploadedFileDTO
-from openaip_pipeline.core.clock import now_utc_iso
+from openaip_pipeline.adapters.supabase.storage import is_storage_pointer, load_json_payload, persist_json_payload
+from openaip_pipeline.core.clock import now_utc_iso, utc_iso_after
+from openaip_pipeline.core.errors import RunLeaseLostError
 from openaip_pipeline.services.line_items.embedding_text import build_line_item_embedding_text
 
 
@@ -27,6 +33,85 @@ STAGE_START_MESSAGES: dict[str, str] = {
     "categorize": "Starting categorization...",
 }
 SECTOR_PREFIXES: tuple[str, ...] = ("1000", "3000", "8000", "9000")
+DEFAULT_UPSERT_BATCH_SIZE = 200
+PROJECT_RETURN_COLUMNS = "id,project_key,aip_ref_code,is_human_edited"
+LINE_ITEM_RETURN_COLUMNS = "id,aip_ref_code,page_no,row_no,table_no"
+DEFAULT_EMBEDDING_UPSERT_MAX_BYTES = 1024 * 1024
+MAX_VECTOR_LITERAL_PRECISION = 17
+# The categorize artifact is read straight from artifact_json by the embed edge function
+# and, like summarize, by the website, so published stages always stay inline.
+INLINE_ONLY_ARTIFACT_TYPES: frozenset[str] = frozenset({"summarize", "categorize"})
+DEFAULT_LINEAGE_CACHE_SIZE = 256
+
+
+def _read_positive_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def _chunked(rows: list[Any], size: int) -> list[list[Any]]:
+    return [rows[index : index + size] for index in range(0, len(rows), size)]
+
+
+def _chunked_by_bytes(encoded_rows: list[str], max_bytes: int) -> list[list[str]]:
+    # Each chunk holds at least one row, so a single oversized row is still sent on its own.
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 2
+    for encoded in encoded_rows:
+        row_bytes = len(encoded.encode("utf-8")) + 1
+        if current and current_bytes + row_bytes > max_bytes:
+            chunks.append(current)
+            current = []
+            current_bytes = 2
+        current.append(encoded)
+        current_bytes += row_bytes
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _encode_vector_literal(values: list[float], precision: int) -> str:
+    """Encode a vector as a pgvector text literal with `precision` significant digits."""
+    spec = f".{precision}g"
+    return "[" + ",".join(format(float(value), spec) for value in values) + "]"
+
+
+class _LineageCache:
+    """Thread-safe LRU of `(run_id, artifact_type) -> (source_run_id, artifact_id)`.
+
+    Retry lineage and the artifacts of finished runs never change, so a resolved entry
+    stays valid; only the artifact row itself is re-read, by primary key.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> tuple[str, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple[str, str], entry: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
 
 
 def _clamp_pct(value: float) -> int:
@@ -202,6 +287,49 @@ def _first_source_ref(project: dict[str, Any]) -> dict[str, Any] | None:
     return None
 
 
+def _line_item_key(
+    aip_ref_code: str | None,
+    page_no: int | None,
+    row_no: int | None,
+    table_no: int | None,
+) -> tuple[Any, ...] | None:
+    if aip_ref_code:
+        return ("ref", aip_ref_code.lower())
+    if page_no is not None and row_no is not None and table_no is not None:
+        return ("provenance", page_no, row_no, table_no)
+    return None
+
+
+def _line_item_row_key(row: dict[str, Any]) -> tuple[Any, ...] | None:
+    return _line_item_key(
+        _normalize_text_or_none(row.get("aip_ref_code")),
+        _to_int_or_none(row.get("page_no")),
+        _to_int_or_none(row.get("row_no")),
+        _to_int_or_none(row.get("table_no")),
+    )
+
+
+def _line_item_with_embedding_text(
+    payload: dict[str, Any],
+    *,
+    row_id: str | None,
+    barangay_id: str | None,
+) -> dict[str, Any]:
+    return {
+        **payload,
+        "id": row_id,
+        "barangay_name": None,
+        "embedding_text": build_line_item_embedding_text(
+            {
+                **payload,
+                "id": row_id,
+                "barangay_id": barangay_id,
+                "barangay_name": None,
+            }
+        ),
+    }
+
+
 def _normalize_resume_stage(value: Any) -> str:
     text = _normalize_text_or_none(value)
     if not text:
@@ -214,9 +342,53 @@ def _normalize_resume_stage(value: Any) -> str:
     return "extract"
 
 
+def _requeue_patch(message: str) -> dict[str, Any]:
+    return {
+        "status": "queued",
+        "lease_owner": None,
+        "lease_heartbeat_at": None,
+        "lease_expires_at": None,
+        "progress_message": message,
+        "progress_updated_at": now_utc_iso(),
+    }
+
+
 class PipelineRepository:
-    def __init__(self, client: SupabaseRestClient):
+    def __init__(
+        self,
+        client: SupabaseRestClient,
+        *,
+        upsert_batch_size: int | None = None,
+        artifact_bucket_id: str | None = None,
+        artifact_inline_max_bytes: int | None = None,
+        artifact_compression: str = "gzip",
+    ):
         self.client = client
+        # Offload is opt-in: without a bucket and threshold every artifact is written inline.
+        self.artifact_bucket_id = artifact_bucket_id
+        self.artifact_inline_max_bytes = artifact_inline_max_bytes
+        self.artifact_compression = artifact_compression
+        # A batch size of 1 keeps the one-request-per-row path.
+        if isinstance(upsert_batch_size, int) and upsert_batch_size > 0:
+            self.upsert_batch_size = upsert_batch_size
+        else:
+            self.upsert_batch_size = _read_positive_int_env(
+                "PIPELINE_SUPABASE_UPSERT_BATCH_SIZE", DEFAULT_UPSERT_BATCH_SIZE
+            )
+        self.embedding_upsert_max_bytes = _read_positive_int_env(
+            "PIPELINE_SUPABASE_EMBEDDING_UPSERT_MAX_BYTES", DEFAULT_EMBEDDING_UPSERT_MAX_BYTES
+        )
+        # 0 keeps full-precision JSON float arrays; a positive value switches to pgvector
+        # text literals rounded to that many significant digits.
+        self.embedding_vector_precision = min(
+            _read_positive_int_env("PIPELINE_EMBEDDING_VECTOR_PRECISION", 0),
+            MAX_VECTOR_LITERAL_PRECISION,
+        )
+        self._claim_rpc_missing = False
+        self._lineage_rpc_missing = False
+        self._lineage_cache = _LineageCache(
+            _read_positive_int_env("PIPELINE_LINEAGE_CACHE_SIZE", DEFAULT_LINEAGE_CACHE_SIZE)
+        )
 
     def assert_progress_tracking_ready(self) -> None:
         try:
@@ -232,7 +404,26 @@ class PipelineRepository:
                 "Apply website/docs/sql/2026-02-19_extraction_run_progress.sql."
             ) from error
 
-    def claim_next_queued_run(self) -> ExtractionRunDTO | None:
+    def assert_run_leases_ready(self) -> None:
+        try:
+            self.client.select(
+                "extraction_runs",
+                select="id,lease_owner,lease_heartbeat_at,lease_expires_at",
+                order="created_at.desc",
+                limit=1,
+            )
+        except Exception as error:
+            raise RuntimeError(
+                "Run lease columns are unavailable in extraction_runs. "
+                "Apply supabase/migrations/20261017_extraction_run_leases.sql."
+            ) from error
+
+    def claim_next_queued_run(
+        self,
+        *,
+        lease_owner: str | None = None,
+        lease_seconds: float | None = None,
+    ) -> ExtractionRunDTO | None:
         rows = self.client.select(
             "extraction_runs",
             select=(
@@ -247,20 +438,29 @@ class PipelineRepository:
             return None
         candidate = rows[0]
         initial_stage = _normalize_resume_stage(candidate.get("resume_from_stage"))
+        patch: dict[str, Any] = {
+            "status": "running",
+            "stage": initial_stage,
+            "started_at": now_utc_iso(),
+            "finished_at": None,
+            "error_code": None,
+            "error_message": None,
+            "overall_progress_pct": 0,
+            "stage_progress_pct": 0,
+            "progress_message": STAGE_START_MESSAGES[initial_stage],
+            "progress_updated_at": now_utc_iso(),
+        }
+        if lease_owner and lease_seconds:
+            patch.update(
+                {
+                    "lease_owner": lease_owner,
+                    "lease_heartbeat_at": now_utc_iso(),
+                    "lease_expires_at": utc_iso_after(lease_seconds),
+                }
+            )
         claimed = self.client.update(
             "extraction_runs",
-            {
-                "status": "running",
-                "stage": initial_stage,
-                "started_at": now_utc_iso(),
-                "finished_at": None,
-                "error_code": None,
-                "error_message": None,
-                "overall_progress_pct": 0,
-                "stage_progress_pct": 0,
-                "progress_message": STAGE_START_MESSAGES[initial_stage],
-                "progress_updated_at": now_utc_iso(),
-            },
+            patch,
             filters={"id": f"eq.{candidate['id']}", "status": "eq.queued"},
             select=(
                 "id,aip_id,uploaded_file_id,retry_of_run_id,resume_from_stage,"
@@ -271,6 +471,112 @@ class PipelineRepository:
             return None
         return ExtractionRunDTO.from_row(claimed[0])
 
+    def claim_queued_runs(
+        self,
+        limit: int,
+        *,
+        lease_owner: str | None = None,
+        lease_seconds: float | None = None,
+        order: str = "oldest",
+        prefer_retries: bool = False,
+    ) -> list[ExtractionRunDTO]:
+        """Atomically claim up to `limit` queued runs through the claim_extraction_runs RPC.
+
+        The RPC locks candidates with `FOR UPDATE SKIP LOCKED`, so concurrent workers
+        never contend for the same row. Falls back to one-at-a-time claims when the RPC
+        has not been deployed yet.
+        """
+        if limit <= 0:
+            return []
+        if not self._claim_rpc_missing:
+            try:
+                rows = self.client.rpc(
+                    "claim_extraction_runs",
+                    {
+                        "p_limit": limit,
+                        "p_lease_owner": lease_owner,
+                        "p_lease_seconds": int(lease_seconds) if lease_owner and lease_seconds else None,
+                        "p_order": "newest" if order == "newest" else "oldest",
+                        "p_prefer_retries": prefer_retries,
+                    },
+                )
+            except HTTPError as error:
+                if error.code != 404:
+                    raise
+                self._claim_rpc_missing = True
+                print(
+                    "[WORKER][CLAIM] claim_extraction_runs RPC unavailable; "
+                    "apply supabase/migrations/20261017_rpc_claim_extraction_runs.sql",
+                    flush=True,
+                )
+            else:
+                runs = [ExtractionRunDTO.from_row(row) for row in rows or []]
+                runs.sort(key=lambda run: run.created_at or "", reverse=order == "newest")
+                return runs
+        claimed: list[ExtractionRunDTO] = []
+        for _ in range(limit):
+            run = self.claim_next_queued_run(lease_owner=lease_owner, lease_seconds=lease_seconds)
+            if run is None:
+                break
+            claimed.append(run)
+        return claimed
+
+    def renew_run_leases(self, *, run_ids: list[str], lease_owner: str, lease_seconds: float) -> set[str]:
+        """Extend the leases this worker still holds; returns the run ids that were renewed."""
+        if not run_ids:
+            return set()
+        renewed = self.client.update(
+            "extraction_runs",
+            {
+                "lease_heartbeat_at": now_utc_iso(),
+                "lease_expires_at": utc_iso_after(lease_seconds),
+            },
+            filters={
+                "id": f"in.({','.join(run_ids)})",
+                "status": "eq.running",
+                "lease_owner": f"eq.{lease_owner}",
+            },
+            select="id",
+        )
+        return {str(row["id"]) for row in renewed if row.get("id")}
+
+    def assert_run_lease_held(self, *, run_id: str, lease_owner: str) -> None:
+        rows = self.client.select(
+            "extraction_runs",
+            select="id",
+            filters={"id": f"eq.{run_id}", "status": "eq.running", "lease_owner": f"eq.{lease_owner}"},
+            limit=1,
+        )
+        if not rows:
+            raise RunLeaseLostError(f"Run {run_id} is no longer leased by {lease_owner}.")
+
+    def release_run_lease(self, *, run_id: str, lease_owner: str) -> None:
+        self.client.update(
+            "extraction_runs",
+            {"lease_owner": None, "lease_expires_at": None},
+            filters={"id": f"eq.{run_id}", "lease_owner": f"eq.{lease_owner}"},
+        )
+
+    def requeue_expired_runs(self) -> list[str]:
+        """Return running runs whose lease expired (crashed or stalled slot) to the queue."""
+        requeued = self.client.update(
+            "extraction_runs",
+            _requeue_patch("Worker lease expired; run re-queued."),
+            filters={"status": "eq.running", "lease_expires_at": f"lt.{now_utc_iso()}"},
+            select="id",
+        )
+        return [str(row["id"]) for row in requeued if row.get("id")]
+
+    def requeue_run(self, *, run_id: str, lease_owner: str) -> bool:
+        """Hand a still-running run this owner holds back to the queue; False if it no longer holds it."""
+        requeued = self.client.update(
+            "extraction_runs",
+            _requeue_patch("Worker slot crashed; run re-queued."),
+            filters={"id": f"eq.{run_id}", "status": "eq.running", "lease_owner": f"eq.{lease_owner}"},
+            select="id",
+        )
+        return bool(requeued)
+
     def enqueue_run(
         self,
         *,
@@ -368,6 +674,7 @@ class PipelineRepository:
         stage: str,
         stage_progress_pct: int,
         progress_message: str | None = None,
+        lease_owner: str | None = None,
     ) -> None:
         patch: dict[str, Any] = {
             "stage": stage,
@@ -378,19 +685,20 @@ class PipelineRepository:
         }
         if progress_message is not None:
             patch["progress_message"] = progress_message
-        self.client.update("extraction_runs", patch, filters={"id": f"eq.{run_id}"})
+        self._update_run(run_id, patch, lease_owner=lease_owner)
 
-    def set_run_stage(self, *, run_id: str, stage: str) -> None:
+    def set_run_stage(self, *, run_id: str, stage: str, lease_owner: str | None = None) -> None:
         self.set_run_progress(
             run_id=run_id,
             stage=stage,
             stage_progress_pct=0,
             progress_message=STAGE_START_MESSAGES.get(stage, f"Starting {stage}..."),
+            lease_owner=lease_owner,
         )
 
-    def set_run_failed(self, *, run_id: str, stage: str, error_message: str) -> None:
-        self.client.update(
-            "extraction_runs",
+    def set_run_failed(self, *, run_id: str, stage: str, error_message: str, lease_owner: str | None = None) -> None:
+        self._update_run(
+            run_id,
             {
                 "status": "failed",
                 "stage": stage,
@@ -399,12 +707,12 @@ class PipelineRepository:
                 "progress_message": error_message,
                 "progress_updated_at": now_utc_iso(),
             },
-            filters={"id": f"eq.{run_id}"},
+            lease_owner=lease_owner,
         )
 
-    def set_run_succeeded(self, *, run_id: str) -> None:
-        self.client.update(
-            "extraction_runs",
+    def set_run_succeeded(self, *, run_id: str, lease_owner: str | None = None) -> None:
+        self._update_run(
+            run_id,
             {
                 "status": "succeeded",
                 "stage": "categorize",
@@ -416,8 +724,22 @@ class PipelineRepository:
                 "progress_message": None,
                 "progress_updated_at": now_utc_iso(),
             },
-            filters={"id": f"eq.{run_id}"},
+            lease_owner=lease_owner,
+        )
+
+    def _update_run(self, run_id: str, patch: dict[str, Any], *, lease_owner: str | None) -> None:
+        """Patch one run; with `lease_owner`, only while that worker still holds the run's lease."""
+        if lease_owner is None:
+            self.client.update("extraction_runs", patch, filters={"id": f"eq.{run_id}"})
+            return
+        updated = self.client.update(
+            "extraction_runs",
+            patch,
+            filters={"id": f"eq.{run_id}", "lease_owner": f"eq.{lease_owner}"},
+            select="id",
         )
+        if not updated:
+            raise RunLeaseLostError(f"Run {run_id} is no longer leased by {lease_owner}.")
 
     def insert_artifact(
         self,
@@ -428,6 +750,21 @@ class PipelineRepository:
         artifact_json: dict[str, Any] | None,
         artifact_text: str | None = None,
     ) -> str:
+        if (
+            artifact_json is not None
+            and self.artifact_bucket_id
+            and self.artifact_inline_max_bytes
+            and artifact_type not in INLINE_ONLY_ARTIFACT_TYPES
+        ):
+            inline_payload, pointer = persist_json_payload(
+                client=self.client,
+                bucket_id=self.artifact_bucket_id,
+                object_prefix=f"runs/{run_id}/{artifact_type}",
+                payload=artifact_json,
+                inline_max_bytes=self.artifact_inline_max_bytes,
+                compression=self.artifact_compression,
+            )
+            artifact_json = inline_payload if pointer is None else pointer
         rows = self.client.insert(
             "extraction_artifacts",
             {
@@ -456,11 +793,87 @@ class PipelineRepository:
         )
         if not rows:
             return None
-        payload = rows[0].get("artifact_json")
+        return self._resolve_artifact_json(rows[0].get("artifact_json"))
+
+    def _resolve_artifact_json(self, payload: Any) -> dict[str, Any] | None:
         if not isinstance(payload, dict):
             return None
+        if is_storage_pointer(payload):
+            return load_json_payload(client=self.client, pointer=payload, default_bucket_id=self.artifact_bucket_id)
         return payload
 
+    def _get_artifact_by_id(self, artifact_id: str) -> dict[str, Any] | None:
+        rows = self.client.select(
+            "extraction_artifacts",
+            select="artifact_json",
+            filters={"id": f"eq.{artifact_id}"},
+            limit=1,
+        )
+        if not rows:
+            return None
+        return self._resolve_artifact_json(rows[0].get("artifact_json"))
+
+    def find_lineage_artifact(self, *, run_id: str, artifact_type: str) -> tuple[dict[str, Any] | None, str | None]:
+        """Return the nearest `artifact_type` artifact along the run's retry lineage and its run id.
+
+        Resolved lineages are kept in a worker-local LRU, so a run that is claimed again
+        re-reads its artifact by id instead of walking the lineage. Databases without the
+        `find_lineage_artifact` RPC fall back to walking `retry_of_run_id` one hop at a time.
+        """
+        cache_key = (run_id, artifact_type)
+        cached = self._lineage_cache.get(cache_key)
+        if cached is not None:
+            source_run_id, artifact_id = cached
+            payload = self._get_artifact_by_id(artifact_id)
+            if payload is not None:
+                return payload, source_run_id
+            self._lineage_cache.discard(cache_key)
+        if not self._lineage_rpc_missing:
+            try:
+                rows = self.client.rpc(
+                    "find_lineage_artifact",
+                    {"p_run_id": run_id, "p_artifact_type": artifact_type},
+                    idempotent=True,
+                )
+            except HTTPError as error:
+                if error.code != 404:
+                    raise
+                self._lineage_rpc_missing = True
+                print(
+                    "[WORKER][RESUME] find_lineage_artifact RPC unavailable; "
+                    "apply supabase/migrations/20261017_rpc_find_lineage_artifact.sql",
+                    flush=True,
+                )
+            else:
+                if not rows:
+                    return None, None
+                row = rows[0]
+                source_run_id = _normalize_text_or_none(row.get("source_run_id"))
+                artifact_id = _normalize_text_or_none(row.get("artifact_id"))
+                payload = self._resolve_artifact_json(row.get("artifact_json"))
+                if payload is None or source_run_id is None:
+                    return None, None
+                if artifact_id is not None:
+                    self._lineage_cache.put(cache_key, (source_run_id, artifact_id))
+                return payload, source_run_id
+        return self._walk_lineage_for_artifact(run_id=run_id, artifact_type=artifact_type)
+
+    def _walk_lineage_for_artifact(
+        self,
+        *,
+        run_id: str,
+        artifact_type: str,
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        visited: set[str] = set()
+        cursor: str | None = run_id
+        while cursor and cursor not in visited:
+            visited.add(cursor)
+            artifact = self.get_stage_artifact(run_id=cursor, artifact_type=artifact_type)
+            if artifact is not None:
+                return artifact, cursor
+            cursor = self.get_parent_run_id(run_id=cursor)
+        return None, None
+
     def get_parent_run_id(self, *, run_id: str) -> str | None:
         rows = self.client.select(
             "extraction_runs",
@@ -519,6 +932,153 @@ class PipelineRepository:
                 upsert=True,
             )
 
+    def _build_project_payload(
+        self,
+        raw: dict[str, Any],
+        *,
+        extraction_artifact_id: str,
+        project_key: str,
+        ref_code: str | None,
+    ) -> dict[str, Any]:
+        amounts = raw.get("amounts") if isinstance(raw.get("amounts"), dict) else {}
+        climate = raw.get("climate") if isinstance(raw.get("climate"), dict) else {}
+        classification = raw.get("classification") if isinstance(raw.get("classification"), dict) else {}
+        return {
+            "extraction_artifact_id": extraction_artifact_id,
+            "project_key": project_key,
+            "aip_ref_code": ref_code,
+            "program_project_description": str(raw.get("program_project_description") or "Unspecified project"),
+            "implementing_agency": raw.get("implementing_agency"),
+            "start_date": raw.get("start_date"),
+            "completion_date": raw.get("completion_date"),
+            "expected_output": raw.get("expected_output"),
+            "source_of_funds": raw.get("source_of_funds"),
+            "personal_services": _to_float_or_none(amounts.get("personal_services", raw.get("personal_services"))),
+            "maintenance_and_other_operating_expenses": _to_float_or_none(
+                amounts.get(
+                    "maintenance_and_other_operating_expenses",
+                    raw.get("maintenance_and_other_operating_expenses"),
+                )
+            ),
+            "financial_expenses": _to_float_or_none(amounts.get("financial_expenses", raw.get("financial_expenses"))),
+            "capital_outlay": _to_float_or_none(amounts.get("capital_outlay", raw.get("capital_outlay"))),
+            "total": _to_float_or_none(amounts.get("total", raw.get("total"))),
+            "climate_change_adaptation": climate.get(
+                "climate_change_adaptation", raw.get("climate_change_adaptation")
+            ),
+            "climate_change_mitigation": climate.get(
+                "climate_change_mitigation", raw.get("climate_change_mitigation")
+            ),
+            "cc_topology_code": climate.get("cc_topology_code", raw.get("cc_topology_code")),
+            "prm_ncr_lgu_rm_objective_results_indicator": climate.get(
+                "prm_ncr_lgu_rm_objective_results_indicator",
+                raw.get("prm_ncr_lgu_rm_objective_results_indicator"),
+            ),
+            "errors": _normalize_errors(raw.get("errors")),
+            "category": _map_category(classification.get("category", raw.get("category"))),
+        }
+
+    def _upsert_project_row(
+        self,
+        *,
+        aip_id: str,
+        payload: dict[str, Any],
+        existing_by_key: dict[str, dict[str, Any]],
+    ) -> None:
+        project_key = payload["project_key"]
+        ref_code = payload["aip_ref_code"]
+        project_key_token = _project_key_token(project_key) or ""
+        existing = existing_by_key.get(project_key_token)
+        if existing and bool(existing.get("is_human_edited")):
+            return
+        if existing:
+            self.client.update("projects", payload, filters={"id": f"eq.{existing['id']}"})
+            return
+        create_payload = dict(payload)
+        create_payload["aip_id"] = aip_id
+        try:
+            inserted = self.client.insert(
+                "projects",
+                create_payload,
+                select=PROJECT_RETURN_COLUMNS,
+            )
+            if inserted:
+                inserted_key_token = _project_key_token(inserted[0].get("project_key"))
+                if inserted_key_token:
+                    existing_by_key[inserted_key_token] = inserted[0]
+        except HTTPError as error:
+            if error.code != 409:
+                raise RuntimeError(
+                    (
+                        "Failed to insert project row. "
+                        f"aip_id={aip_id} project_key={project_key} "
+                        f"aip_ref_code={ref_code} error={error}"
+                    )
+                ) from error
+            conflict_rows = self.client.select(
+                "projects",
+                select=PROJECT_RETURN_COLUMNS,
+                filters={"aip_id": f"eq.{aip_id}", "project_key": f"eq.{project_key}"},
+                limit=1,
+            )
+            if not conflict_rows and ref_code:
+                conflict_rows = self.client.select(
+                    "projects",
+                    select=PROJECT_RETURN_COLUMNS,
+                    filters={"aip_id": f"eq.{aip_id}", "aip_ref_code": f"eq.{ref_code}"},
+                    limit=1,
+                )
+            if not conflict_rows:
+                raise RuntimeError(
+                    (
+                        "Project insert returned HTTP 409 but lookup found no conflicting row. "
+                        f"aip_id={aip_id} project_key={project_key} "
+                        f"aip_ref_code={ref_code} error={error}"
+                    )
+                ) from error
+            conflict_row = conflict_rows[0]
+            conflict_key_token = _project_key_token(conflict_row.get("project_key")) or project_key_token
+            existing_by_key[conflict_key_token] = conflict_row
+            if bool(conflict_row.get("is_human_edited")):
+                return
+            self.client.update("projects", payload, filters={"id": f"eq.{conflict_row['id']}"})
+
+    def _bulk_upsert_project_chunk(
+        self,
+        *,
+        aip_id: str,
+        chunk: list[dict[str, Any]],
+        on_conflict: str,
+        existing_by_key: dict[str, dict[str, Any]],
+    ) -> None:
+        rows = [{**payload, "aip_id": aip_id} for payload in chunk]
+        try:
+            upserted = self.client.insert(
+                "projects",
+                rows,
+                select=PROJECT_RETURN_COLUMNS,
+                on_conflict=on_conflict,
+                upsert=True,
+            )
+        except HTTPError as error:
+            if error.code != 409:
+                raise RuntimeError(
+                    (
+                        "Failed to bulk upsert project rows. "
+                        f"aip_id={aip_id} rows={len(rows)} "
+                        f"first_project_key={rows[0]['project_key']} error={error}"
+                    )
+                ) from error
+            # Another unique key collided (or a concurrent writer won the race); the
+            # per-row path resolves each conflict and still honors human edits.
+            for payload in chunk:
+                self._upsert_project_row(aip_id=aip_id, payload=payload, existing_by_key=existing_by_key)
+            return
+        for row in upserted or []:
+            key_token = _project_key_token(row.get("project_key"))
+            if key_token:
+                existing_by_key[key_token] = row
+
     def upsert_projects(
         self,
         *,
@@ -530,7 +1090,7 @@ class PipelineRepository:
             return
         existing_rows = self.client.select(
             "projects",
-            select="id,project_key,aip_ref_code,is_human_edited",
+            select=PROJECT_RETURN_COLUMNS,
             filters={"aip_id": f"eq.{aip_id}"},
         )
         existing_by_key: dict[str, dict[str, Any]] = {}
@@ -539,6 +1099,11 @@ class PipelineRepository:
             if not key_token:
                 continue
             existing_by_key[key_token] = row
+
+        # Later duplicates of the same project key win, matching the per-row path where
+        # the second occurrence updates the row created by the first.
+        payload_by_key: dict[str, dict[str, Any]] = {}
+        ordered_payloads: list[dict[str, Any]] = []
         for raw in projects:
             if not isinstance(raw, dict):
                 continue
@@ -550,96 +1115,37 @@ class PipelineRepository:
             existing = existing_by_key.get(project_key_token)
             if existing and bool(existing.get("is_human_edited")):
                 continue
-            amounts = raw.get("amounts") if isinstance(raw.get("amounts"), dict) else {}
-            climate = raw.get("climate") if isinstance(raw.get("climate"), dict) else {}
-            classification = raw.get("classification") if isinstance(raw.get("classification"), dict) else {}
-            payload = {
-                "extraction_artifact_id": extraction_artifact_id,
-                "project_key": project_key,
-                "aip_ref_code": ref_code,
-                "program_project_description": str(raw.get("program_project_description") or "Unspecified project"),
-                "implementing_agency": raw.get("implementing_agency"),
-                "start_date": raw.get("start_date"),
-                "completion_date": raw.get("completion_date"),
-                "expected_output": raw.get("expected_output"),
-                "source_of_funds": raw.get("source_of_funds"),
-                "personal_services": _to_float_or_none(
-                    amounts.get("personal_services", raw.get("personal_services"))
-                ),
-                "maintenance_and_other_operating_expenses": _to_float_or_none(
-                    amounts.get(
-                        "maintenance_and_other_operating_expenses",
-                        raw.get("maintenance_and_other_operating_expenses"),
-                    )
-                ),
-                "financial_expenses": _to_float_or_none(amounts.get("financial_expenses", raw.get("financial_expenses"))),
-                "capital_outlay": _to_float_or_none(amounts.get("capital_outlay", raw.get("capital_outlay"))),
-                "total": _to_float_or_none(amounts.get("total", raw.get("total"))),
-                "climate_change_adaptation": climate.get(
-                    "climate_change_adaptation", raw.get("climate_change_adaptation")
-                ),
-                "climate_change_mitigation": climate.get(
-                    "climate_change_mitigation", raw.get("climate_change_mitigation")
-                ),
-                "cc_topology_code": climate.get("cc_topology_code", raw.get("cc_topology_code")),
-                "prm_ncr_lgu_rm_objective_results_indicator": climate.get(
-                    "prm_ncr_lgu_rm_objective_results_indicator",
-                    raw.get("prm_ncr_lgu_rm_objective_results_indicator"),
-                ),
-                "errors": _normalize_errors(raw.get("errors")),
-                "category": _map_category(classification.get("category", raw.get("category"))),
-            }
-            if existing:
-                self.client.update("projects", payload, filters={"id": f"eq.{existing['id']}"})
-                continue
-            create_payload = dict(payload)
-            create_payload["aip_id"] = aip_id
-            try:
-                inserted = self.client.insert(
-                    "projects",
-                    create_payload,
-                    select="id,project_key,aip_ref_code,is_human_edited",
-                )
-                if inserted:
-                    inserted_key_token = _project_key_token(inserted[0].get("project_key"))
-                    if inserted_key_token:
-                        existing_by_key[inserted_key_token] = inserted[0]
-            except HTTPError as error:
-                if error.code != 409:
-                    raise RuntimeError(
-                        (
-                            "Failed to insert project row. "
-                            f"aip_id={aip_id} project_key={project_key} "
-                            f"aip_ref_code={ref_code} error={error}"
-                        )
-                    ) from error
-                conflict_rows = self.client.select(
-                    "projects",
-                    select="id,project_key,aip_ref_code,is_human_edited",
-                    filters={"aip_id": f"eq.{aip_id}", "project_key": f"eq.{project_key}"},
-                    limit=1,
-                )
-                if not conflict_rows and ref_code:
-                    conflict_rows = self.client.select(
-                        "projects",
-                        select="id,project_key,aip_ref_code,is_human_edited",
-                        filters={"aip_id": f"eq.{aip_id}", "aip_ref_code": f"eq.{ref_code}"},
-                        limit=1,
-                    )
-                if not conflict_rows:
-                    raise RuntimeError(
-                        (
-                            "Project insert returned HTTP 409 but lookup found no conflicting row. "
-                            f"aip_id={aip_id} project_key={project_key} "
-                            f"aip_ref_code={ref_code} error={error}"
-                        )
-                    ) from error
-                conflict_row = conflict_rows[0]
-                conflict_key_token = _project_key_token(conflict_row.get("project_key")) or project_key_token
-                existing_by_key[conflict_key_token] = conflict_row
-                if bool(conflict_row.get("is_human_edited")):
-                    continue
-                self.client.update("projects", payload, filters={"id": f"eq.{conflict_row['id']}"})
+            payload = self._build_project_payload(
+                raw,
+                extraction_artifact_id=extraction_artifact_id,
+                project_key=project_key,
+                ref_code=ref_code,
+            )
+            ordered_payloads.append(payload)
+            payload_by_key[project_key_token] = payload
+
+        if self.upsert_batch_size <= 1:
+            for payload in ordered_payloads:
+                self._upsert_project_row(aip_id=aip_id, payload=payload, existing_by_key=existing_by_key)
+            return
+
+        updates: list[dict[str, Any]] = []
+        creates: list[dict[str, Any]] = []
+        for key_token, payload in payload_by_key.items():
+            existing = existing_by_key.get(key_token)
+            existing_id = _normalize_text_or_none(existing.get("id")) if existing else None
+            if existing_id:
+                updates.append({**payload, "id": existing_id})
+            else:
+                creates.append(payload)
+        for chunk in _chunked(updates, self.upsert_batch_size):
+            self._bulk_upsert_project_chunk(
+                aip_id=aip_id, chunk=chunk, on_conflict="id", existing_by_key=existing_by_key
+            )
+        for chunk in _chunked(creates, self.upsert_batch_size):
+            self._bulk_upsert_project_chunk(
+                aip_id=aip_id, chunk=chunk, on_conflict="aip_id,project_key", existing_by_key=existing_by_key
+            )
 
     def upsert_aip_line_items(self, *, aip_id: str, projects: Any) -> list[dict[str, Any]]:
         if not isinstance(projects, list) or not projects:
@@ -653,27 +1159,19 @@ class PipelineRepository:
         barangay_id = _normalize_text_or_none(aip_context.get("barangay_id"))
         existing_rows = self.client.select(
             "aip_line_items",
-            select="id,aip_ref_code,page_no,row_no,table_no",
+            select=LINE_ITEM_RETURN_COLUMNS,
             filters={"aip_id": f"eq.{aip_id}"},
         )
 
-        existing_by_ref: dict[str, dict[str, Any]] = {}
-        existing_by_provenance: dict[tuple[int, int, int], dict[str, Any]] = {}
+        existing_by_key: dict[tuple[Any, ...], dict[str, Any]] = {}
         for existing in existing_rows:
-            existing_id = _normalize_text_or_none(existing.get("id"))
-            if not existing_id:
-                continue
-            ref_code = _normalize_text_or_none(existing.get("aip_ref_code"))
-            if ref_code:
-                existing_by_ref[ref_code.lower()] = existing
+            if not _normalize_text_or_none(existing.get("id")):
                 continue
-            page_no = _to_int_or_none(existing.get("page_no"))
-            row_no = _to_int_or_none(existing.get("row_no"))
-            table_no = _to_int_or_none(existing.get("table_no"))
-            if page_no is not None and row_no is not None and table_no is not None:
-                existing_by_provenance[(page_no, row_no, table_no)] = existing
+            existing_key = _line_item_row_key(existing)
+            if existing_key is not None:
+                existing_by_key[existing_key] = existing
 
-        upserted_items: list[dict[str, Any]] = []
+        keyed_payloads: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
         for raw_project in projects:
             if not isinstance(raw_project, dict):
                 continue
@@ -686,7 +1184,8 @@ class PipelineRepository:
             table_no = _to_int_or_none(source_ref.get("table_index"))
 
             aip_ref_code = _normalize_text_or_none(raw_project.get("aip_ref_code"))
-            if not aip_ref_code and (page_no is None or row_no is None or table_no is None):
+            item_key = _line_item_key(aip_ref_code, page_no, row_no, table_no)
+            if item_key is None:
                 # Skip rows without a stable idempotent key.
                 continue
             sector_code = _derive_sector_code(aip_ref_code)
@@ -719,13 +1218,77 @@ class PipelineRepository:
                 "row_no": row_no,
                 "table_no": table_no,
             }
+            keyed_payloads.append((item_key, payload))
+
+        if self.upsert_batch_size <= 1:
+            return self._upsert_line_item_rows(
+                keyed_payloads=keyed_payloads,
+                existing_by_key=existing_by_key,
+                barangay_id=barangay_id,
+            )
 
-            existing: dict[str, Any] | None = None
-            if aip_ref_code:
-                existing = existing_by_ref.get(aip_ref_code.lower())
-            elif page_no is not None and row_no is not None and table_no is not None:
-                existing = existing_by_provenance.get((page_no, row_no, table_no))
+        # Duplicate keys collapse to their last occurrence: PostgreSQL rejects an upsert
+        # that touches the same row twice, and the final row state is the same.
+        payload_by_key: dict[tuple[Any, ...], dict[str, Any]] = {}
+        for item_key, payload in keyed_payloads:
+            payload_by_key[item_key] = payload
+
+        updates: list[dict[str, Any]] = []
+        creates: list[dict[str, Any]] = []
+        for item_key, payload in payload_by_key.items():
+            existing = existing_by_key.get(item_key)
+            if existing is None:
+                creates.append(payload)
+                continue
+            existing_id = _normalize_text_or_none(existing.get("id"))
+            updates.append({**payload, "id": existing_id})
+
+        row_id_by_key: dict[tuple[Any, ...], str] = {}
+        # Existing rows upsert on the primary key; the natural keys are partial unique
+        # indexes, which PostgREST cannot target with on_conflict.
+        for chunk in _chunked(updates, self.upsert_batch_size):
+            returned = self.client.insert(
+                "aip_line_items",
+                chunk,
+                select=LINE_ITEM_RETURN_COLUMNS,
+                on_conflict="id",
+                upsert=True,
+            )
+            for row in chunk:
+                row_key = _line_item_row_key(row)
+                if row_key is not None:
+                    row_id_by_key[row_key] = row["id"]
+            for row in returned or []:
+                row_key = _line_item_row_key(row)
+                row_id = _normalize_text_or_none(row.get("id"))
+                if row_key is not None and row_id:
+                    row_id_by_key[row_key] = row_id
+        for chunk in _chunked(creates, self.upsert_batch_size):
+            returned = self.client.insert("aip_line_items", chunk, select=LINE_ITEM_RETURN_COLUMNS)
+            for row in returned or []:
+                row_key = _line_item_row_key(row)
+                row_id = _normalize_text_or_none(row.get("id"))
+                if row_key is not None and row_id:
+                    row_id_by_key[row_key] = row_id
+
+        upserted_items: list[dict[str, Any]] = []
+        for item_key, payload in payload_by_key.items():
+            row_id = row_id_by_key.get(item_key)
+            if not row_id:
+                continue
+            upserted_items.append(_line_item_with_embedding_text(payload, row_id=row_id, barangay_id=barangay_id))
+        return upserted_items
 
+    def _upsert_line_item_rows(
+        self,
+        *,
+        keyed_payloads: list[tuple[tuple[Any, ...], dict[str, Any]]],
+        existing_by_key: dict[tuple[Any, ...], dict[str, Any]],
+        barangay_id: str | None,
+    ) -> list[dict[str, Any]]:
+        upserted_items: list[dict[str, Any]] = []
+        for item_key, payload in keyed_payloads:
+            existing = existing_by_key.get(item_key)
             if existing:
                 existing_id = _normalize_text_or_none(existing.get("id"))
                 if not existing_id:
@@ -737,20 +1300,7 @@ class PipelineRepository:
                     select="id",
                 )
                 row_id = _normalize_text_or_none(updated[0].get("id")) if updated else existing_id
-                payload_with_id = {
-                    **payload,
-                    "id": row_id,
-                    "barangay_name": None,
-                    "embedding_text": build_line_item_embedding_text(
-                        {
-                            **payload,
-                            "id": row_id,
-                            "barangay_id": barangay_id,
-                            "barangay_name": None,
-                        }
-                    ),
-                }
-                upserted_items.append(payload_with_id)
+                upserted_items.append(_line_item_with_embedding_text(payload, row_id=row_id, barangay_id=barangay_id))
                 continue
 
             inserted = self.client.insert("aip_line_items", payload, select="id")
@@ -759,34 +1309,8 @@ class PipelineRepository:
             row_id = _normalize_text_or_none(inserted[0].get("id"))
             if not row_id:
                 continue
-
-            created_row = {
-                "id": row_id,
-                "aip_ref_code": aip_ref_code,
-                "page_no": page_no,
-                "row_no": row_no,
-                "table_no": table_no,
-            }
-            if aip_ref_code:
-                existing_by_ref[aip_ref_code.lower()] = created_row
-            elif page_no is not None and row_no is not None and table_no is not None:
-                existing_by_provenance[(page_no, row_no, table_no)] = created_row
-
-            payload_with_id = {
-                **payload,
-                "id": row_id,
-                "barangay_name": None,
-                "embedding_text": build_line_item_embedding_text(
-                    {
-                        **payload,
-                        "id": row_id,
-                        "barangay_id": barangay_id,
-                        "barangay_name": None,
-                    }
-                ),
-            }
-            upserted_items.append(payload_with_id)
-
+            existing_by_key[item_key] = {"id": row_id}
+            upserted_items.append(_line_item_with_embedding_text(payload, row_id=row_id, barangay_id=barangay_id))
         return upserted_items
 
     def upsert_aip_line_item_embeddings(
@@ -798,6 +1322,7 @@ class PipelineRepository:
         if not line_items:
             return
 
+        payloads: list[dict[str, Any]] = []
         for item in line_items:
             line_item_id = _normalize_text_or_none(item.get("line_item_id"))
             embedding = item.get("embedding")
@@ -805,14 +1330,38 @@ class PipelineRepository:
                 continue
             if not all(isinstance(value, (int, float)) for value in embedding):
                 continue
-            payload = {
-                "line_item_id": line_item_id,
-                "embedding": embedding,
-                "model": model,
-            }
-            self.client.insert(
+            payloads.append(
+                {
+                    "line_item_id": line_item_id,
+                    "embedding": embedding,
+                    "model": model,
+                }
+            )
+
+        if self.upsert_batch_size <= 1:
+            for payload in payloads:
+                self.client.insert(
+                    "aip_line_item_embeddings",
+                    payload,
+                    on_conflict="line_item_id",
+                    upsert=True,
+                )
+            return
+
+        # Rows are serialized once; the same strings size the chunks and form the request body.
+        # Later rows for the same line item win, since one upsert cannot touch a row twice.
+        encoded_by_id: dict[str, str] = {}
+        for payload in payloads:
+            if self.embedding_vector_precision > 0:
+                payload = {
+                    **payload,
+                    "embedding": _encode_vector_literal(payload["embedding"], self.embedding_vector_precision),
+                }
+            encoded_by_id[payload["line_item_id"]] = json.dumps(payload, separators=(",", ":"))
+        for chunk in _chunked_by_bytes(list(encoded_by_id.values()), self.embedding_upsert_max_bytes):
+            self.client.insert_encoded_rows(
                 "aip_line_item_embeddings",
-                payload,
+                chunk,
                 on_conflict="line_item_id",
                 upsert=True,
             )
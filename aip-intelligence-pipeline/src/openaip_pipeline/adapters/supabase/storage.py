@@ -1,11 +1,67 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import uuid
 from typing import Any
 
 from openaip_pipeline.adapters.supabase.client import SupabaseRestClient
 
 
+ARTIFACT_COMPRESSIONS: tuple[str, ...] = ("gzip", "zstd", "none")
+_COMPRESSION_SUFFIXES = {"gzip": ".json.gz", "zstd": ".json.zst", "none": ".json"}
+_COMPRESSION_CONTENT_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd", "none": "application/json"}
+GZIP_COMPRESS_LEVEL = 6
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_artifact_compression(value: str | None) -> str:
+    """Normalize a compression name; zstd degrades to gzip when `zstandard` is missing."""
+    lowered = (value or "").strip().lower()
+    if lowered not in ARTIFACT_COMPRESSIONS:
+        return "gzip"
+    if lowered == "zstd" and _zstandard() is None:
+        return "gzip"
+    return lowered
+
+
+def _compress(content: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(content, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor().compress(content)
+    return content
+
+
+def _decompress(content: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(content)
+    if compression == "zstd":
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("Artifact is zstd-compressed but the `zstandard` package is not installed.")
+        return zstandard.ZstdDecompressor().decompress(content)
+    if compression == "none":
+        return content
+    raise RuntimeError(f"Unsupported artifact storage encoding: {compression}")
+
+
+def is_storage_pointer(value: Any) -> bool:
+    """True for an `artifact_json` value that references an offloaded storage object."""
+    if not isinstance(value, dict):
+        return False
+    storage_path = value.get("storage_path")
+    return isinstance(storage_path, str) and bool(storage_path.strip()) and "projects" not in value
+
+
 def persist_json_payload(
     *,
     client: SupabaseRestClient,
@@ -13,16 +69,64 @@ def persist_json_payload(
     object_prefix: str,
     payload: dict[str, Any],
     inline_max_bytes: int,
-) -> tuple[dict[str, Any] | None, str | None]:
+    compression: str = "gzip",
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Return `(payload, None)` when it fits inline, else upload it and return `(None, pointer)`.
+
+    The pointer keeps the `storage_bucket`/`storage_path` keys the artifact delete trigger
+    already understands, plus the encoding and a SHA-256 of the uncompressed JSON so
+    readers can verify what they download.
+    """
     encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
     if len(encoded) <= inline_max_bytes:
         return payload, None
-    object_name = f"{object_prefix}.json"
+    encoding = resolve_artifact_compression(compression)
+    content = _compress(encoded, encoding)
+    # A unique suffix per write: re-running a stage never overwrites an object an older row points at.
+    object_name = f"{object_prefix}_{uuid.uuid4().hex[:12]}{_COMPRESSION_SUFFIXES[encoding]}"
     storage_path = client.upload_bytes(
         bucket_id=bucket_id,
         object_name=object_name,
-        content=encoded,
-        content_type="application/json",
+        content=content,
+        content_type=_COMPRESSION_CONTENT_TYPES[encoding],
     )
-    return None, storage_path
+    pointer = {
+        "storage_bucket": bucket_id,
+        "storage_path": storage_path,
+        "storage_encoding": encoding,
+        "content_sha256": hashlib.sha256(encoded).hexdigest(),
+        "content_bytes": len(encoded),
+        "stored_bytes": len(content),
+    }
+    return None, pointer
+
+
+def load_json_payload(
+    *,
+    client: SupabaseRestClient,
+    pointer: dict[str, Any],
+    default_bucket_id: str | None = None,
+) -> dict[str, Any]:
+    """Download, decompress, and verify an artifact written by `persist_json_payload`.
 
+    Older pointers carry only `storage_path`; they are read as plain JSON from
+    `default_bucket_id` without a hash check.
+    """
+    bucket_id = str(pointer.get("storage_bucket") or default_bucket_id or "").strip()
+    storage_path = str(pointer.get("storage_path") or "").strip()
+    if not bucket_id or not storage_path:
+        raise RuntimeError("Artifact storage pointer is missing its bucket or path.")
+    content = client.download_object(bucket_id=bucket_id, object_name=storage_path)
+    encoded = _decompress(content, str(pointer.get("storage_encoding") or "none"))
+    expected_hash = pointer.get("content_sha256")
+    if isinstance(expected_hash, str) and expected_hash:
+        actual_hash = hashlib.sha256(encoded).hexdigest()
+        if actual_hash != expected_hash:
+            raise RuntimeError(
+                f"Artifact content hash mismatch for {bucket_id}/{storage_path}: "
+                f"expected {expected_hash}, got {actual_hash}."
+            )
+    payload = json.loads(encoded.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise RuntimeError(f"Offloaded artifact {bucket_id}/{storage_path} is not a JSON object.")
+    return payload
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import random
+import threading
+import time
+import urllib.error
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Statuses where the gateway rejected the request before it reached PostgREST, so even
+# non-idempotent writes are safe to replay.
+UNPROCESSED_STATUS_CODES = frozenset({429, 503})
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+_shared_lock = threading.Lock()
+_shared_transport: "SupabaseHttpTransport | None" = None
+
+
+def _read_positive_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = float(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def _read_positive_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def _read_non_negative_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def _read_bool_env(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _to_http_error(response: httpx.Response, body: bytes) -> urllib.error.HTTPError:
+    # Callers (and the error enrichment in SupabaseRestClient) are written against
+    # urllib's HTTPError, so failed responses keep that shape, body included.
+    return urllib.error.HTTPError(
+        url=str(response.request.url),
+        code=response.status_code,
+        msg=response.reason_phrase or "HTTP error",
+        hdrs=response.headers,  # type: ignore[arg-type]
+        fp=io.BytesIO(body),
+    )
+
+
+def retry_backoff_seconds(base_seconds: float, attempt: int, response: httpx.Response | None) -> float:
+    """Honor a capped `Retry-After`, else jittered exponential backoff from `base_seconds`."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass
+    base = base_seconds * (2**attempt)
+    return base + random.uniform(0.0, base / 2)
+
+
+def worst_case_request_seconds() -> float:
+    """Longest one REST call can block: every attempt timing out, plus the retry waits between them."""
+    timeout = _read_positive_float_env("PIPELINE_SUPABASE_HTTP_TIMEOUT_SECONDS", 120.0)
+    max_retries = _read_non_negative_int_env("PIPELINE_SUPABASE_HTTP_MAX_RETRIES", 3)
+    backoff = _read_positive_float_env("PIPELINE_SUPABASE_HTTP_RETRY_BACKOFF_SECONDS", 0.5)
+    waits = sum(max(MAX_RETRY_AFTER_SECONDS, backoff * (2**attempt) * 1.5) for attempt in range(max_retries))
+    return timeout * (max_retries + 1) + waits
+
+
+class SupabaseHttpTransport:
+    """Pooled keep-alive HTTP transport shared by every Supabase REST and storage call.
+
+    Connections are reused across requests (optionally over HTTP/2), gzip responses are
+    decoded transparently, large JSON request bodies can be gzip-compressed, and 429/5xx
+    responses are retried with jittered exponential backoff. Non-idempotent requests are
+    only replayed for statuses that guarantee the request was never processed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry_seconds: float | None = None,
+        http2: bool | None = None,
+        gzip_min_bytes: int | None = None,
+        max_retries: int | None = None,
+        retry_backoff_seconds: float | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        pool_size = max_connections or _read_positive_int_env("PIPELINE_SUPABASE_HTTP_MAX_CONNECTIONS", 20)
+        keepalive = max_keepalive_connections or min(pool_size, 10)
+        expiry = keepalive_expiry_seconds or _read_positive_float_env(
+            "PIPELINE_SUPABASE_HTTP_KEEPALIVE_SECONDS", 30.0
+        )
+        use_http2 = _read_bool_env("PIPELINE_SUPABASE_HTTP2", False) if http2 is None else http2
+        if use_http2 and not _http2_available():
+            print("[SUPABASE][HTTP] http2_unavailable fallback=http1.1 install=httpx[http2]", flush=True)
+            use_http2 = False
+        self.http2 = use_http2
+        self.gzip_min_bytes = (
+            _read_non_negative_int_env("PIPELINE_SUPABASE_GZIP_MIN_BYTES", 0) if gzip_min_bytes is None else gzip_min_bytes
+        )
+        self.max_retries = (
+            _read_non_negative_int_env("PIPELINE_SUPABASE_HTTP_MAX_RETRIES", 3) if max_retries is None else max_retries
+        )
+        self.retry_backoff_seconds = retry_backoff_seconds or _read_positive_float_env(
+            "PIPELINE_SUPABASE_HTTP_RETRY_BACKOFF_SECONDS", 0.5
+        )
+        self._client = httpx.Client(
+            http2=use_http2,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=keepalive,
+                keepalive_expiry=expiry,
+            ),
+            transport=transport,
+        )
+
+        # Security proof:
+        # - PIPELINE_SUPABASE_HTTP_MAX_CONNECTIONS bounds pooled sockets per process (default 20)
+        # - PIPELINE_SUPABASE_HTTP_MAX_RETRIES bounds replays per request (default 3)
+        # - Retry-After waits are capped at 30s; non-idempotent writes replay only on 429/503
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _backoff_seconds(self, attempt: int, response: httpx.Response | None) -> float:
+        return retry_backoff_seconds(self.retry_backoff_seconds, attempt, response)
+
+    def _encode_body(self, body: bytes | None, headers: dict[str, str]) -> bytes | None:
+        if body is None or self.gzip_min_bytes <= 0 or len(body) < self.gzip_min_bytes:
+            return body
+        if not headers.get("Content-Type", "").startswith("application/json"):
+            return body
+        headers["Content-Encoding"] = "gzip"
+        return gzip.compress(body, compresslevel=5)
+
+    def _should_retry(self, status_code: int, attempt: int, idempotent: bool) -> bool:
+        if attempt >= self.max_retries or status_code not in RETRYABLE_STATUS_CODES:
+            return False
+        return idempotent or status_code in UNPROCESSED_STATUS_CODES
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float,
+        idempotent: bool,
+    ) -> httpx.Response:
+        """Send a request and return the successful response; raise `HTTPError` otherwise."""
+        request_headers = dict(headers or {})
+        content = self._encode_body(body, request_headers)
+        attempt = 0
+        while True:
+            try:
+                response = self._client.request(
+                    method,
+                    url,
+                    content=content,
+                    headers=request_headers,
+                    timeout=timeout,
+                )
+            except httpx.TransportError:
+                # Connection-level failures are only replayed when the request is idempotent.
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_seconds(attempt, None))
+                attempt += 1
+                continue
+            if response.status_code < 400:
+                return response
+            if self._should_retry(response.status_code, attempt, idempotent):
+                print(
+                    f"[SUPABASE][HTTP] retry status={response.status_code} attempt={attempt + 1} method={method}",
+                    flush=True,
+                )
+                time.sleep(self._backoff_seconds(attempt, response))
+                attempt += 1
+                continue
+            raise _to_http_error(response, response.content)
+
+    @contextmanager
+    def stream(self, method: str, url: str, *, timeout: float) -> Iterator[httpx.Response]:
+        """Stream a response body; failed statuses raise `HTTPError` before yielding."""
+        attempt = 0
+        while True:
+            with self._client.stream(method, url, timeout=timeout) as response:
+                if response.status_code < 400:
+                    yield response
+                    return
+                body = response.read()
+                if not self._should_retry(response.status_code, attempt, idempotent=method == "GET"):
+                    raise _to_http_error(response, body)
+            time.sleep(self._backoff_seconds(attempt, response))
+            attempt += 1
+
+
+def get_shared_transport() -> SupabaseHttpTransport:
+    # One pool per process: API routes build a client per request, and the worker builds
+    # one per loop, so the pool has to outlive individual SupabaseRestClient instances.
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = SupabaseHttpTransport()
+        return _shared_transport
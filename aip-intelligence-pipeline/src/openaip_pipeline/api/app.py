@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
 
-from openaip_pipeline.api.routes.chat import router as chat_router
+from openaip_pipeline.api.routes.chat import load_rag_engine, router as chat_router
 from openaip_pipeline.api.routes.health import router as health_router
 from openaip_pipeline.api.routes.intent import router as intent_router
 from openaip_pipeline.api.routes.runs import router as runs_router
+from openaip_pipeline.core.errors import ConfigurationError
 from openaip_pipeline.core.logging import configure_logging
 
+logger = logging.getLogger(__name__)
+
 
 def _load_env() -> None:
     # Prefer project-local developer config while still allowing .env defaults.
@@ -19,8 +25,23 @@ def _load_env() -> None:
     load_dotenv()
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # One RAG engine per process: clients, prompts and flags are shared by every chat request.
+    try:
+        app.state.rag_engine = load_rag_engine()
+    except ConfigurationError as error:
+        logger.warning("RAG engine not initialized at startup: %s", error)
+        app.state.rag_engine = None
+    yield
+    engine = getattr(app.state, "rag_engine", None)
+    app.state.rag_engine = None
+    if engine is not None:
+        await engine.aclose()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="OpenAIP Pipeline Service", version="1.0.0")
+    app = FastAPI(title="OpenAIP Pipeline Service", version="1.0.0", lifespan=_lifespan)
     app.include_router(health_router)
     app.include_router(runs_router)
     app.include_router(chat_router)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import inspect
@@ -8,18 +9,22 @@ import logging
 import os
 import threading
 import time
-from typing import Any, Literal
+from typing import Any, AsyncIterator, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from openaip_pipeline.core.settings import Settings
 from openaip_pipeline.services.intent.chat_shortcuts import maybe_handle_conversational_intent
+from openaip_pipeline.services.intent.executor import route_intent
 from openaip_pipeline.services.intent.router import IntentRouter
-from openaip_pipeline.services.openai_utils import build_openai_client
-from openaip_pipeline.services.rag.rag import answer_with_rag
+from openaip_pipeline.services.rag.engine import RagEngine
+from openaip_pipeline.services.rag.rag import aanswer_with_rag
+from openaip_pipeline.services.rag.streaming import format_sse_event
 
 _CHAT_AUTH_LOCK = threading.Lock()
+_RAG_ENGINE_LOCK = threading.Lock()
 _CHAT_NONCE_CACHE: dict[tuple[str, str, str, str], float] = {}
 _CHAT_EXPECTED_AUDIENCE = "website-backend"
 _CHAT_MAX_CLOCK_SKEW_SECONDS = 60
@@ -191,48 +196,65 @@ class QueryEmbeddingResponse(BaseModel):
     dimensions: int
 
 
+def load_rag_engine() -> RagEngine:
+    # Supabase is only required once retrieval runs, so /embed-query keeps working without it.
+    settings = Settings.load(require_supabase=False, require_openai=True)
+    return RagEngine.from_settings(settings)
+
+
+def _rag_engine(request: Request) -> RagEngine:
+    engine = getattr(request.app.state, "rag_engine", None)
+    if engine is not None:
+        return engine
+    # Startup could not build the engine (e.g. env loaded later); build it once on first use.
+    with _RAG_ENGINE_LOCK:
+        engine = getattr(request.app.state, "rag_engine", None)
+        if engine is None:
+            engine = load_rag_engine()
+            request.app.state.rag_engine = engine
+    return engine
+
+
 def _intent_router_enabled() -> bool:
     value = os.getenv("INTENT_ROUTER_ENABLED", "false").strip().lower()
     return value in {"1", "true", "yes", "on"}
 
 
-@router.post("/answer", response_model=ChatAnswerResponse)
-def chat_answer(
-    req: ChatAnswerRequest,
-) -> ChatAnswerResponse:
-    if _intent_router_enabled():
-        intent_result = _INTENT_ROUTER.route(req.question)
-        logger.info(
-            "Intent router: intent=%s confidence=%.3f method=%s",
-            intent_result.intent.value,
-            intent_result.confidence,
-            intent_result.method,
-        )
-        shortcut = maybe_handle_conversational_intent(req.question, intent_result)
-        if shortcut is not None:
-            return ChatAnswerResponse(
-                question=req.question,
-                answer=shortcut["message"],
-                refused=False,
-                citations=[],
-                retrieval_meta={
-                    "reason": "conversational_shortcut",
-                    "intent": intent_result.intent.value,
-                    "confidence": intent_result.confidence,
-                    "method": intent_result.method,
-                    "feature_flag": "INTENT_ROUTER_ENABLED",
-                },
-                context_count=0,
-            )
-
-    settings = Settings.load(require_supabase=True, require_openai=True)
-    model_name = (req.model_name or settings.pipeline_model).strip() or settings.pipeline_model
-
-    result = answer_with_rag(
-        supabase_url=settings.supabase_url,
-        supabase_service_key=settings.supabase_service_key,
-        openai_api_key=settings.openai_api_key,
-        embeddings_model=settings.embedding_model,
+async def _conversational_shortcut(req: ChatAnswerRequest) -> ChatAnswerResponse | None:
+    if not _intent_router_enabled():
+        return None
+    intent_result = await route_intent(_INTENT_ROUTER, req.question)
+    logger.info(
+        "Intent router: intent=%s confidence=%.3f method=%s",
+        intent_result.intent.value,
+        intent_result.confidence,
+        intent_result.method,
+    )
+    shortcut = maybe_handle_conversational_intent(req.question, intent_result)
+    if shortcut is None:
+        return None
+    return ChatAnswerResponse(
+        question=req.question,
+        answer=shortcut["message"],
+        refused=False,
+        citations=[],
+        retrieval_meta={
+            "reason": "conversational_shortcut",
+            "intent": intent_result.intent.value,
+            "confidence": intent_result.confidence,
+            "method": intent_result.method,
+            "feature_flag": "INTENT_ROUTER_ENABLED",
+        },
+        context_count=0,
+    )
+
+
+async def _answer(req: ChatAnswerRequest, engine: RagEngine, **callbacks: Any) -> ChatAnswerResponse:
+    model_name = (req.model_name or engine.default_chat_model).strip() or engine.default_chat_model
+
+    result = await aanswer_with_rag(
+        engine=engine,
+        embeddings_model=engine.embeddings_model,
         chat_model=model_name,
         question=req.question,
         retrieval_scope=req.retrieval_scope.model_dump(),
@@ -240,6 +262,7 @@ def chat_answer(
         retrieval_filters=req.retrieval_filters.model_dump(exclude_none=True),
         top_k=req.top_k,
         min_similarity=req.min_similarity,
+        **callbacks,
     )
 
     return ChatAnswerResponse(
@@ -252,28 +275,84 @@ def chat_answer(
     )
 
 
+@router.post("/answer", response_model=ChatAnswerResponse)
+async def chat_answer(
+    req: ChatAnswerRequest,
+    request: Request,
+) -> ChatAnswerResponse:
+    shortcut = await _conversational_shortcut(req)
+    if shortcut is not None:
+        return shortcut
+    return await _answer(req, _rag_engine(request))
+
+
+@router.post("/answer/stream")
+async def chat_answer_stream(
+    req: ChatAnswerRequest,
+    request: Request,
+) -> StreamingResponse:
+    """Server-sent events variant of `/answer`.
+
+    Frames, in order: `retrieval` (selection metadata and candidate citations, sent once
+    the evidence gate allows generation), `token` (answer text deltas), then `final` (the
+    validated `ChatAnswerResponse`, whose answer and citations supersede anything streamed)
+    or `error`. Gated, refused and cached answers arrive as a lone `final` frame.
+    """
+    shortcut = await _conversational_shortcut(req)
+    frames: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def emit(event: str, payload: dict[str, Any]) -> None:
+        frames.put_nowait(format_sse_event(event, payload))
+
+    async def run() -> None:
+        try:
+            if shortcut is not None:
+                response = shortcut
+            else:
+                response = await _answer(
+                    req,
+                    _rag_engine(request),
+                    on_selection=lambda payload: emit("retrieval", payload),
+                    on_token=lambda delta: emit("token", {"delta": delta}),
+                )
+            emit("final", response.model_dump())
+        except Exception:
+            logger.exception("Streaming chat answer failed.")
+            emit("error", {"detail": "Chat answer failed."})
+        finally:
+            frames.put_nowait(None)
+
+    async def stream() -> AsyncIterator[str]:
+        task = asyncio.create_task(run())
+        try:
+            while (frame := await frames.get()) is not None:
+                yield frame
+        finally:
+            # A client disconnect cancels the in-flight retrieval/generation.
+            task.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/embed-query", response_model=QueryEmbeddingResponse)
-def embed_query(
+async def embed_query(
     req: QueryEmbeddingRequest,
+    request: Request,
 ) -> QueryEmbeddingResponse:
-    settings = Settings.load(require_supabase=False, require_openai=True)
-    model_name = (req.model_name or settings.embedding_model).strip() or settings.embedding_model
-
-    client = build_openai_client(settings.openai_api_key)
-    response = client.embeddings.create(model=model_name, input=req.text)
-    data = list(getattr(response, "data", []) or [])
-    if not data:
-        raise HTTPException(status_code=500, detail="Embedding response is empty.")
+    engine = _rag_engine(request)
+    model_name = (req.model_name or engine.embeddings_model).strip() or engine.embeddings_model
 
-    embedding = getattr(data[0], "embedding", None)
-    if not isinstance(embedding, list) or not embedding:
-        raise HTTPException(status_code=500, detail="Embedding vector missing in response.")
-    if not all(isinstance(value, (int, float)) for value in embedding):
-        raise HTTPException(status_code=500, detail="Embedding vector contains invalid values.")
+    try:
+        embedding = await engine.aembed_query(req.text, model=model_name)
+    except RuntimeError as error:
+        raise HTTPException(status_code=500, detail=str(error)) from error
 
-    normalized = [float(value) for value in embedding]
     return QueryEmbeddingResponse(
-        embedding=normalized,
+        embedding=embedding,
         model=model_name,
-        dimensions=len(normalized),
+        dimensions=len(embedding),
     )
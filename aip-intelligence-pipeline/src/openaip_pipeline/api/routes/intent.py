@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from openaip_pipeline.services.intent import IntentRouter
+from openaip_pipeline.services.intent import IntentRouter, route_intent
 
 MAX_INTENT_TEXT_LENGTH = 2000
 
@@ -17,11 +17,11 @@ class IntentClassifyRequest(BaseModel):
 
 
 @router.post("/classify")
-def classify_intent(payload: IntentClassifyRequest) -> dict[str, str | float | None]:
+async def classify_intent(payload: IntentClassifyRequest) -> dict[str, str | float | None]:
     text = payload.text
     # Truncate oversized payloads instead of rejecting them to keep the endpoint easy to consume.
     if len(text) > MAX_INTENT_TEXT_LENGTH:
         text = text[:MAX_INTENT_TEXT_LENGTH]
 
-    result = _INTENT_ROUTER.route(text)
+    result = await route_intent(_INTENT_ROUTER, text)
     return result.to_dict()
@@ -9,3 +9,7 @@ class ConfigurationError(PipelineError):
 class ExternalServiceError(PipelineError):
     pass
 
+
+
+class RunLeaseLostError(PipelineError):
+    """The worker no longer holds the lease on an extraction run; another worker may own it."""
@@ -50,6 +50,9 @@ class Settings:
     artifact_inline_max_bytes: int
     enable_rag: bool
     dev_routes: bool
+    worker_concurrency: int = 1
+    worker_lease_seconds: float = 120.0
+    artifact_compression: str = "gzip"
 
     @classmethod
     def load(cls, *, require_supabase: bool = True, require_openai: bool = True) -> "Settings":
@@ -74,5 +77,8 @@ class Settings:
             artifact_inline_max_bytes=max(1024, _optional_int("PIPELINE_ARTIFACT_INLINE_MAX_BYTES", 32768)),
             enable_rag=_optional_bool("PIPELINE_ENABLE_RAG", False),
             dev_routes=_optional_bool("PIPELINE_DEV_ROUTES", False),
+            worker_concurrency=max(1, _optional_int("PIPELINE_WORKER_CONCURRENCY", 1)),
+            worker_lease_seconds=float(max(15, _optional_int("PIPELINE_WORKER_LEASE_SECONDS", 120))),
+            artifact_compression=_optional("PIPELINE_ARTIFACT_COMPRESSION", "gzip").lower(),
         )
 
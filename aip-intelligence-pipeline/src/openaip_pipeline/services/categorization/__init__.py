@@ -1,7 +1,14 @@
 from openaip_pipeline.services.categorization.categorize import (
+    attach_summary_to_categorized_obj,
+    categorize_from_summarized,
     categorize_from_summarized_json_str,
     write_categorized_json_file,
 )
 
-__all__ = ["categorize_from_summarized_json_str", "write_categorized_json_file"]
+__all__ = [
+    "attach_summary_to_categorized_obj",
+    "categorize_from_summarized",
+    "categorize_from_summarized_json_str",
+    "write_categorized_json_file",
+]
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
 from collections import deque
 from typing import Any, Callable, Literal
@@ -17,15 +18,20 @@ from openaip_pipeline.core.artifact_contract import (
 )
 from openaip_pipeline.core.clock import now_utc_iso
 from openaip_pipeline.core.resources import read_text
+from openaip_pipeline.services.chunking.chunk_queue import ChunkQueueExecutor
 from openaip_pipeline.services.chunking.context_window import (
-    chunk_items_by_token_budget,
+    chunk_measured_items_by_token_budget,
     estimate_tokens_from_text,
     is_context_limit_error,
+    json_size_bytes,
+    json_string_body_bytes,
     sum_usage,
 )
 from openaip_pipeline.services.openai_utils import build_openai_client, safe_usage_dict
 
 
+DEFAULT_CATEGORIZE_CONCURRENCY = 4
+
 Category = Literal["Infrastructure", "Healthcare", "Other", "infrastructure", "health", "other"]
 
 
@@ -54,21 +60,31 @@ class CategorizationResponse(BaseModel):
         return value
 
 
+class CategorizationCancelledError(RuntimeError):
+    pass
+
+
 class CategorizationResult:
     def __init__(
         self,
         categorized_obj: dict[str, Any],
-        categorized_json_str: str,
+        categorized_json_str: str | None,
         usage: dict[str, Any],
         elapsed_seconds: float,
         model: str,
     ):
         self.categorized_obj = categorized_obj
-        self.categorized_json_str = categorized_json_str
+        self._categorized_json_str = categorized_json_str
         self.usage = usage
         self.elapsed_seconds = elapsed_seconds
         self.model = model
 
+    @property
+    def categorized_json_str(self) -> str:
+        if self._categorized_json_str is None:
+            self._categorized_json_str = json.dumps(self.categorized_obj, ensure_ascii=False, indent=2)
+        return self._categorized_json_str
+
 
 def _read_positive_int_env(name: str, default: int) -> int:
     raw = os.getenv(name)
@@ -81,6 +97,12 @@ def _read_positive_int_env(name: str, default: int) -> int:
     return parsed if parsed > 0 else default
 
 
+def resolve_categorize_concurrency(value: int | None) -> int:
+    if isinstance(value, int) and value > 0:
+        return value
+    return _read_positive_int_env("PIPELINE_CATEGORIZE_CONCURRENCY", DEFAULT_CATEGORIZE_CONCURRENCY)
+
+
 def _truncate_text(value: Any, char_limit: int) -> str | None:
     if value is None:
         return None
@@ -105,21 +127,36 @@ def _build_classification_text(project: ProjectForCategorization) -> str:
     return "\n".join(parts).strip() or "No details provided."
 
 
+USER_TEXT_PREFIX = "Items:\n\n"
+USER_TEXT_ITEM_SEPARATOR = "\n\n---\n\n"
+
+
+def _item_header(index: int) -> str:
+    return f"ITEM {index}\n"
+
+
 def _build_user_text(item_texts: list[str]) -> str:
-    numbered = [f"ITEM {idx}\n{text}" for idx, text in enumerate(item_texts)]
-    return "Items:\n\n" + "\n\n---\n\n".join(numbered)
+    numbered = [f"{_item_header(idx)}{text}" for idx, text in enumerate(item_texts)]
+    return USER_TEXT_PREFIX + USER_TEXT_ITEM_SEPARATOR.join(numbered)
 
 
-def _build_chunk_estimate_payload(
-    static_payload: dict[str, Any],
-    chunk_indices: list[int],
+def _chunk_item_texts_by_token_budget(
+    *,
     item_texts: list[str],
-) -> dict[str, Any]:
-    chunk_texts = [item_texts[index] for index in chunk_indices]
-    return {
-        **static_payload,
-        "user_text": _build_user_text(chunk_texts),
-    }
+    static_payload: dict[str, Any],
+    budget_tokens: int,
+    max_items_per_chunk: int | None,
+) -> list[list[int]]:
+    # Sizes of `{**static_payload, "user_text": _build_user_text(chunk)}` assembled from parts
+    # measured once: JSON string escaping is per character, so the pieces add up exactly.
+    return chunk_measured_items_by_token_budget(
+        item_bytes=[json_string_body_bytes(text) for text in item_texts],
+        base_bytes=json_size_bytes({**static_payload, "user_text": USER_TEXT_PREFIX}),
+        separator_bytes=json_string_body_bytes(USER_TEXT_ITEM_SEPARATOR),
+        slot_bytes=lambda position: json_string_body_bytes(_item_header(position)),
+        budget_tokens=budget_tokens,
+        max_items_per_chunk=max_items_per_chunk,
+    )
 
 
 def categorize_batch(
@@ -157,6 +194,8 @@ def categorize_all_projects(
     batch_size: int | None,
     on_progress: Callable[[int, int, int, int], None] | None,
     client: OpenAI,
+    categorize_concurrency: int | None = None,
+    cancel_event: threading.Event | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     if batch_size is not None and batch_size <= 0:
         raise ValueError("batch_size must be >= 1 when provided.")
@@ -164,6 +203,8 @@ def categorize_all_projects(
     total = len(projects_raw)
     if total == 0:
         return projects_raw, {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    # Classified rows replace their slots in a new list; the caller's rows are never mutated.
+    projects_raw = list(projects_raw)
 
     categorize_context_window_tokens = _read_positive_int_env(
         "PIPELINE_CATEGORIZE_CONTEXT_WINDOW_TOKENS", 128000
@@ -196,7 +237,7 @@ def categorize_all_projects(
     item_texts = [_build_classification_text(project) for project in minimal]
     static_payload = {"stage": "categorization"}
     system_prompt = read_text("prompts/categorization/system.txt")
-    prompt_tokens = estimate_tokens_from_text(system_prompt + "\nItems:\n\n")
+    prompt_tokens = estimate_tokens_from_text(system_prompt + "\n" + USER_TEXT_PREFIX)
     input_budget_tokens = max(
         1024,
         categorize_context_window_tokens
@@ -204,82 +245,98 @@ def categorize_all_projects(
         - prompt_tokens,
     )
 
-    initial_chunks = chunk_items_by_token_budget(
-        items=list(range(total)),
+    initial_chunks = _chunk_item_texts_by_token_budget(
+        item_texts=item_texts,
         static_payload=static_payload,
-        add_item_fn=lambda payload, chunk: _build_chunk_estimate_payload(
-            payload, chunk, item_texts
-        ),
         budget_tokens=input_budget_tokens,
         max_items_per_chunk=batch_size,
     )
     chunk_queue: deque[list[int]] = deque(initial_chunks)
     total_chunks_planned = len(initial_chunks)
+    started_chunks = 0
     completed_chunks = 0
     done_projects = 0
-    chunk_usages: list[dict[str, Any]] = []
-
-    while chunk_queue:
-        chunk_indices = chunk_queue.popleft()
-        chunk_size = len(chunk_indices)
-        if chunk_size == 0:
-            continue
-
-        try:
-            parsed, usage = categorize_batch(
-                batch=[minimal[index] for index in chunk_indices],
-                model=model,
-                client=client,
-                batch_no=completed_chunks + 1,
-                total_batches=total_chunks_planned,
-            )
-        except Exception as error:
-            if not is_context_limit_error(error):
-                raise
-            if chunk_size <= 1:
-                index = chunk_indices[0]
-                ref_code = str(projects_raw[index].get("aip_ref_code") or "").strip()
+    # Keyed by (first index, -size) so usage order does not depend on completion order.
+    chunk_usage_records: list[tuple[tuple[int, int], dict[str, Any]]] = []
+    batch_numbers: dict[tuple[int, int], tuple[int, int]] = {}
+
+    def on_dispatch(chunk_indices: list[int]) -> None:
+        nonlocal started_chunks
+        started_chunks += 1
+        batch_numbers[(chunk_indices[0], -len(chunk_indices))] = (started_chunks, total_chunks_planned)
+
+    def request_chunk(chunk_indices: list[int]) -> tuple[CategorizationResponse, dict[str, Any]]:
+        if cancel_event is not None and cancel_event.is_set():
+            # Checked before every batch request; the failure unwinds the queue without new calls.
+            raise CategorizationCancelledError("Categorization cancelled before all batches were sent.")
+        batch_no, total_batches = batch_numbers[(chunk_indices[0], -len(chunk_indices))]
+        return categorize_batch(
+            batch=[minimal[index] for index in chunk_indices],
+            model=model,
+            client=client,
+            batch_no=batch_no,
+            total_batches=total_batches,
+        )
+
+    executor: ChunkQueueExecutor[tuple[CategorizationResponse, dict[str, Any]]] = ChunkQueueExecutor(
+        request_chunk,
+        max_workers=resolve_categorize_concurrency(categorize_concurrency),
+        thread_name_prefix="categorize-chunk",
+    )
+    with executor:
+        for chunk_indices, future in executor.run(chunk_queue, on_dispatch=on_dispatch):
+            chunk_size = len(chunk_indices)
+            try:
+                parsed, usage = future.result()
+            except Exception as error:
+                if not is_context_limit_error(error):
+                    raise
+                if chunk_size <= 1:
+                    index = chunk_indices[0]
+                    ref_code = str(projects_raw[index].get("aip_ref_code") or "").strip()
+                    raise RuntimeError(
+                        (
+                            "Categorization chunk exceeds model context window for a single project. "
+                            f"index={index} aip_ref_code={ref_code or 'unknown'}"
+                        )
+                    ) from error
+                midpoint = chunk_size // 2
+                left_chunk = chunk_indices[:midpoint]
+                right_chunk = chunk_indices[midpoint:]
+                chunk_queue.appendleft(right_chunk)
+                chunk_queue.appendleft(left_chunk)
+                total_chunks_planned += 1
+                continue
+
+            idx_to_cat = {item.index: normalize_category(item.category) for item in parsed.items}
+            out_of_range_indices = [index for index in idx_to_cat if index < 0 or index >= chunk_size]
+            if out_of_range_indices:
                 raise RuntimeError(
                     (
-                        "Categorization chunk exceeds model context window for a single project. "
-                        f"index={index} aip_ref_code={ref_code or 'unknown'}"
+                        "Invalid categorization response indices for chunk: "
+                        f"indices={out_of_range_indices} chunk_size={chunk_size}"
                     )
-                ) from error
-            midpoint = chunk_size // 2
-            left_chunk = chunk_indices[:midpoint]
-            right_chunk = chunk_indices[midpoint:]
-            chunk_queue.appendleft(right_chunk)
-            chunk_queue.appendleft(left_chunk)
-            total_chunks_planned += 1
-            continue
-
-        idx_to_cat = {item.index: normalize_category(item.category) for item in parsed.items}
-        out_of_range_indices = [index for index in idx_to_cat if index < 0 or index >= chunk_size]
-        if out_of_range_indices:
-            raise RuntimeError(
-                (
-                    "Invalid categorization response indices for chunk: "
-                    f"indices={out_of_range_indices} chunk_size={chunk_size}"
                 )
-            )
-        for local_idx, global_idx in enumerate(chunk_indices):
-            row = projects_raw[global_idx]
-            classification = row.get("classification") if isinstance(row.get("classification"), dict) else {}
-            classification["category"] = idx_to_cat.get(local_idx, "other")
-            classification["sector_code"] = infer_sector_code(row.get("aip_ref_code"))
-            row["classification"] = classification
-
-        chunk_usages.append(usage)
-        done_projects += chunk_size
-        completed_chunks += 1
-        if on_progress:
-            on_progress(
-                min(done_projects, total),
-                total,
-                completed_chunks,
-                total_chunks_planned,
-            )
+            for local_idx, global_idx in enumerate(chunk_indices):
+                row = projects_raw[global_idx]
+                classification = dict(row["classification"]) if isinstance(row.get("classification"), dict) else {}
+                classification["category"] = idx_to_cat.get(local_idx, "other")
+                classification["sector_code"] = infer_sector_code(row.get("aip_ref_code"))
+                projects_raw[global_idx] = {**row, "classification": classification}
+
+            chunk_usage_records.append(((chunk_indices[0], -chunk_size), usage))
+            done_projects += chunk_size
+            completed_chunks += 1
+            if on_progress:
+                on_progress(
+                    min(done_projects, total),
+                    total,
+                    completed_chunks,
+                    total_chunks_planned,
+                )
 
+    chunk_usage_records.sort(key=lambda record: record[0])
+    chunk_usages = [usage for _, usage in chunk_usage_records]
     return projects_raw, sum_usage(chunk_usages)
 
 
@@ -299,11 +356,39 @@ def categorize_from_summarized_json_str(
     heartbeat_seconds: float = 10.0,
     on_progress: Callable[[int, int, int, int], None] | None = None,
     client: OpenAI | None = None,
+    categorize_concurrency: int | None = None,
 ) -> CategorizationResult:
     try:
         doc = json.loads(summarized_json_str)
     except json.JSONDecodeError as error:
         raise ValueError(f"Input is not valid JSON string: {error}") from error
+    return categorize_from_summarized(
+        doc,
+        model=model,
+        batch_size=batch_size,
+        heartbeat_seconds=heartbeat_seconds,
+        on_progress=on_progress,
+        client=client,
+        categorize_concurrency=categorize_concurrency,
+    )
+
+
+def categorize_from_summarized(
+    doc: dict[str, Any],
+    model: str = "gpt-5.2",
+    batch_size: int | None = 25,
+    heartbeat_seconds: float = 10.0,
+    on_progress: Callable[[int, int, int, int], None] | None = None,
+    client: OpenAI | None = None,
+    categorize_concurrency: int | None = None,
+    cancel_event: threading.Event | None = None,
+) -> CategorizationResult:
+    """Categorize a summarize (or scale) artifact held in memory; `doc` is never mutated.
+
+    Setting `cancel_event` stops further batch requests and raises `CategorizationCancelledError`.
+    """
+    if not isinstance(doc, dict):
+        raise ValueError("Invalid input: top-level JSON must be an object.")
     projects = doc.get("projects", [])
     if not isinstance(projects, list):
         raise ValueError("Invalid input: top-level 'projects' must be a list.")
@@ -325,13 +410,16 @@ def categorize_from_summarized_json_str(
         batch_size=batch_size,
         on_progress=on_progress,
         client=resolved_client,
+        categorize_concurrency=categorize_concurrency,
+        cancel_event=cancel_event,
     )
     elapsed = round(time.perf_counter() - started, 4)
+    source_document = doc.get("document")
     categorized = make_stage_root(
         stage="categorize",
         aip_id=str(doc.get("aip_id") or "unknown-aip"),
         uploaded_file_id=str(doc.get("uploaded_file_id")) if doc.get("uploaded_file_id") else None,
-        document=doc.get("document") if isinstance(doc.get("document"), dict) else _fallback_document(),
+        document=source_document if isinstance(source_document, dict) else _fallback_document(),
         projects=updated_projects,
         totals=doc.get("totals") if isinstance(doc.get("totals"), list) else [],
         summary=doc.get("summary") if isinstance(doc.get("summary"), dict) else None,
@@ -342,13 +430,26 @@ def categorize_from_summarized_json_str(
     )
     return CategorizationResult(
         categorized_obj=categorized,
-        categorized_json_str=json.dumps(categorized, ensure_ascii=False, indent=2),
+        categorized_json_str=None,
         usage=usage,
         elapsed_seconds=elapsed,
         model=model,
     )
 
 
+def attach_summary_to_categorized_obj(
+    categorized_obj: dict[str, Any],
+    summarized_payload: dict[str, Any],
+) -> dict[str, Any]:
+    """Carry the summarize block into a categorize artifact built from the pre-summary payload.
+
+    Summarization passes projects, totals and warnings through unchanged, so when
+    categorization ran alongside it only the `summary` block differs.
+    """
+    summary = summarized_payload.get("summary")
+    return {**categorized_obj, "summary": summary if isinstance(summary, dict) else None}
+
+
 def write_categorized_json_file(categorized_json_str: str, out_path: str) -> str:
     os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as file_handle:
@@ -1,15 +1,25 @@
+from openaip_pipeline.services.chunking.chunk_queue import ChunkQueueExecutor
 from openaip_pipeline.services.chunking.context_window import (
     chunk_items_by_token_budget,
+    chunk_json_list_by_token_budget,
+    chunk_measured_items_by_token_budget,
     estimate_tokens_from_json,
     estimate_tokens_from_text,
     is_context_limit_error,
+    json_size_bytes,
+    json_string_body_bytes,
     sum_usage,
 )
 
 __all__ = [
+    "ChunkQueueExecutor",
     "chunk_items_by_token_budget",
+    "chunk_json_list_by_token_budget",
+    "chunk_measured_items_by_token_budget",
     "estimate_tokens_from_json",
     "estimate_tokens_from_text",
     "is_context_limit_error",
+    "json_size_bytes",
+    "json_string_body_bytes",
     "sum_usage",
 ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Generic, Iterator, TypeVar
+
+
+T = TypeVar("T")
+
+
+class ChunkQueueExecutor(Generic[T]):
+    """Keep up to `max_workers` model-call chunks in flight and hand results back in order of completion.
+
+    `run(chunk_queue)` pops chunks from the front of the queue, submits `run_chunk` for each,
+    and yields `(chunk_indices, future)` on the calling thread as each request finishes.
+    Callers inspect `future.result()` and may push split halves back onto the front of the
+    same queue; they are dispatched before any remaining planned chunk. Leaving the
+    `with` block (including on error) cancels chunks that have not started yet.
+    """
+
+    def __init__(
+        self,
+        run_chunk: Callable[[list[int]], T],
+        *,
+        max_workers: int,
+        thread_name_prefix: str = "chunk",
+    ) -> None:
+        self.run_chunk = run_chunk
+        self.max_workers = max(1, max_workers)
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> ChunkQueueExecutor[T]:
+        if self.max_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, chunk_indices: list[int]) -> Future[T]:
+        if self._executor is not None:
+            return self._executor.submit(self.run_chunk, chunk_indices)
+        future: Future[T] = Future()
+        try:
+            future.set_result(self.run_chunk(chunk_indices))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def run(
+        self,
+        chunk_queue: deque[list[int]],
+        *,
+        on_dispatch: Callable[[list[int]], None] | None = None,
+    ) -> Iterator[tuple[list[int], Future[T]]]:
+        in_flight: dict[Future[T], list[int]] = {}
+        while chunk_queue or in_flight:
+            while chunk_queue and len(in_flight) < self.max_workers:
+                chunk_indices = chunk_queue.popleft()
+                if not chunk_indices:
+                    continue
+                if on_dispatch:
+                    on_dispatch(chunk_indices)
+                in_flight[self._submit(chunk_indices)] = chunk_indices
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            # Deterministic hand-back when several chunks finish in the same wakeup.
+            for future in sorted(done, key=lambda item: in_flight[item][0]):
+                yield in_flight.pop(future), future
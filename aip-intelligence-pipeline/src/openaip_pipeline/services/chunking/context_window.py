@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Sequence, TypeVar
 
 
 T = TypeVar("T")
@@ -19,6 +19,97 @@ def estimate_tokens_from_json(payload: Any) -> int:
     )
 
 
+def json_size_bytes(value: Any) -> int:
+    """UTF-8 size of `value` in the compact encoding `estimate_tokens_from_json` measures."""
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def json_string_body_bytes(text: str) -> int:
+    """UTF-8 size of `text` once escaped inside a JSON string, excluding the quotes."""
+    return json_size_bytes(text) - 2
+
+
+def _tokens_from_bytes(size_bytes: int) -> int:
+    if size_bytes <= 0:
+        return 0
+    return max(1, (size_bytes + 3) // 4)
+
+
+def chunk_measured_items_by_token_budget(
+    *,
+    item_bytes: Sequence[int],
+    base_bytes: int,
+    budget_tokens: int,
+    separator_bytes: int = 0,
+    slot_bytes: Callable[[int], int] | None = None,
+    max_items_per_chunk: int | None = None,
+) -> list[list[int]]:
+    """Group item indices into chunks from pre-measured serialized sizes.
+
+    A chunk of items `i..j` is assumed to serialize to `base_bytes` plus each item's size,
+    `slot_bytes(position)` for per-position framing, and `separator_bytes` between items.
+    Running totals make this linear in the number of items. When those sizes describe the
+    payload exactly, the boundaries match `chunk_items_by_token_budget`.
+    """
+    if budget_tokens <= 0:
+        raise ValueError("budget_tokens must be >= 1")
+    if max_items_per_chunk is not None and max_items_per_chunk <= 0:
+        raise ValueError("max_items_per_chunk must be >= 1 when provided")
+
+    def first_item_bytes(size: int) -> int:
+        return base_bytes + size + (slot_bytes(0) if slot_bytes else 0)
+
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_bytes = base_bytes
+    for index, size in enumerate(item_bytes):
+        position = len(current)
+        if max_items_per_chunk is not None and position + 1 > max_items_per_chunk:
+            if current:
+                chunks.append(current)
+            current = [index]
+            current_bytes = first_item_bytes(size)
+            continue
+
+        candidate_bytes = current_bytes + size + (slot_bytes(position) if slot_bytes else 0)
+        if position:
+            candidate_bytes += separator_bytes
+        if not current or _tokens_from_bytes(candidate_bytes) <= budget_tokens:
+            current.append(index)
+            current_bytes = candidate_bytes
+            continue
+
+        chunks.append(current)
+        current = [index]
+        current_bytes = first_item_bytes(size)
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_json_list_by_token_budget(
+    *,
+    items: Sequence[Any],
+    static_payload: dict[str, Any],
+    list_key: str,
+    budget_tokens: int,
+    max_items_per_chunk: int | None = None,
+) -> list[list[int]]:
+    """Chunk indices of `items` for payloads shaped `{**static_payload, list_key: [...]}`.
+
+    Each item is serialized once; boundaries equal `chunk_items_by_token_budget` with an
+    `add_item_fn` that builds that payload.
+    """
+    return chunk_measured_items_by_token_budget(
+        item_bytes=[json_size_bytes(item) for item in items],
+        base_bytes=json_size_bytes({**static_payload, list_key: []}),
+        separator_bytes=1,
+        budget_tokens=budget_tokens,
+        max_items_per_chunk=max_items_per_chunk,
+    )
+
+
 def chunk_items_by_token_budget(
     *,
     items: list[T],
@@ -27,6 +118,11 @@ def chunk_items_by_token_budget(
     budget_tokens: int,
     max_items_per_chunk: int | None = None,
 ) -> list[list[T]]:
+    """Reference chunker for arbitrary payload builders.
+
+    Re-serializes the whole candidate payload per item (quadratic in chunk size); stages
+    whose payload is a list or a joined string use the measured variants above instead.
+    """
     if budget_tokens <= 0:
         raise ValueError("budget_tokens must be >= 1")
     if max_items_per_chunk is not None and max_items_per_chunk <= 0:
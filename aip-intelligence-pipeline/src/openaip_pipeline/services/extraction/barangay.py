@@ -2,13 +2,12 @@ from __future__ import annotations
 
 import json
 import os
-import tempfile
 import time
 from typing import Any, Callable
 
 from openai import APITimeoutError, OpenAI
 from pydantic import BaseModel, Field
-from pypdf import PdfReader, PdfWriter
+from pypdf import PdfReader
 
 from openaip_pipeline.core.artifact_contract import (
     build_project_key,
@@ -26,7 +25,10 @@ from openaip_pipeline.core.artifact_contract import (
 )
 from openaip_pipeline.core.resources import read_text
 from openaip_pipeline.services.extraction.document_metadata import extract_document_metadata
-from openaip_pipeline.services.extraction.totals_extractor import extract_totals_from_pdf
+from openaip_pipeline.services.extraction.page_cache import build_extraction_page_cache
+from openaip_pipeline.services.extraction.page_scheduler import resolve_extract_concurrency, run_pages_in_order
+from openaip_pipeline.services.extraction.pdf_document import PdfDocument, PdfSource, pdf_stream, read_pdf_source
+from openaip_pipeline.services.extraction.totals_extractor import extract_totals_from_pages
 from openaip_pipeline.services.openai_utils import build_openai_client, safe_usage_dict
 
 
@@ -139,20 +141,30 @@ def _resolve_extract_page_timeout_seconds(
 # - PIPELINE_PARSE_TIMEOUT_SECONDS (default 20) rejects slow parse with PARSE_TIMEOUT.
 # - PIPELINE_EXTRACT_PAGE_TIMEOUT_SECONDS (default 300) bounds each page extraction step with EXTRACT_TIMEOUT.
 # - PIPELINE_EXTRACT_TIMEOUT_SECONDS is a legacy fallback for per-page timeout when new config is unset.
+# - PIPELINE_EXTRACT_CACHE_DIR (unset = disabled) reuses parsed pages keyed by page bytes, model, prompt and schema.
+# - PIPELINE_EXTRACT_CONCURRENCY (default 4) and PIPELINE_EXTRACT_MAX_INFLIGHT (default 8) bound parallel page requests.
 
 
-def extract_single_page_pdf(original_pdf_path: str, page_index: int) -> str:
-    reader = PdfReader(original_pdf_path)
-    if len(reader.pages) == 0:
+def _open_pdf_document(pdf_source: PdfSource, parse_timeout_seconds: float | None) -> PdfDocument:
+    parse_started = time.perf_counter()
+    source = read_pdf_source(pdf_source)
+    pdf_document = PdfDocument(PdfReader(pdf_stream(source)), source=source)
+    page_count = pdf_document.page_count
+    parse_elapsed = time.perf_counter() - parse_started
+    parse_timeout = _resolve_parse_timeout_seconds(parse_timeout_seconds)
+    if parse_elapsed > parse_timeout:
+        raise ExtractionGuardrailError(
+            "PARSE_TIMEOUT",
+            f"PDF parsing exceeded timeout ({parse_timeout:.2f}s).",
+        )
+    if page_count == 0:
         raise ValueError("PDF has no pages")
-    if page_index < 0 or page_index >= len(reader.pages):
-        raise IndexError(f"page_index out of range: {page_index}")
-    writer = PdfWriter()
-    writer.add_page(reader.pages[page_index])
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    with open(temp_file.name, "wb") as file_handle:
-        writer.write(file_handle)
-    return temp_file.name
+    return pdf_document
+
+
+def extract_single_page_pdf(original_pdf: PdfSource | PdfDocument, page_index: int) -> bytes:
+    pdf_document = original_pdf if isinstance(original_pdf, PdfDocument) else PdfDocument.open(original_pdf)
+    return pdf_document.single_page_pdf_bytes(page_index)
 
 
 def _normalize_barangay_row(*, row: dict[str, Any], page: int, row_index: int) -> tuple[dict[str, Any], int]:
@@ -235,20 +247,20 @@ def _dedupe_projects(projects: list[dict[str, Any]]) -> list[dict[str, Any]]:
 def extract_brgy_aip_from_pdf_page(
     *,
     client: OpenAI,
-    pdf_path: str,
+    pdf_source: PdfSource,
     page_index: int,
     total_pages: int,
     model: str,
     system_prompt: str,
     user_prompt: str,
     page_timeout_seconds: float,
+    pdf_document: PdfDocument | None = None,
 ) -> tuple[BrgyAIPExtraction, dict[str, Any]]:
     page_number = page_index + 1
     page_started = time.perf_counter()
-    page_pdf: str | None = None
     response: Any | None = None
     try:
-        page_pdf = extract_single_page_pdf(pdf_path, page_index)
+        page_pdf = extract_single_page_pdf(pdf_document or pdf_source, page_index)
         remaining_after_split = page_timeout_seconds - (time.perf_counter() - page_started)
         if remaining_after_split <= 0:
             raise ExtractionGuardrailError(
@@ -257,8 +269,10 @@ def extract_brgy_aip_from_pdf_page(
             )
 
         upload_client = client.with_options(timeout=max(remaining_after_split, 0.001))
-        with open(page_pdf, "rb") as file_handle:
-            uploaded = upload_client.files.create(file=file_handle, purpose="user_data")
+        uploaded = upload_client.files.create(
+            file=(f"page-{page_number}.pdf", page_pdf, "application/pdf"),
+            purpose="user_data",
+        )
 
         remaining_after_upload = page_timeout_seconds - (time.perf_counter() - page_started)
         if remaining_after_upload <= 0:
@@ -293,12 +307,6 @@ def extract_brgy_aip_from_pdf_page(
             "EXTRACT_TIMEOUT",
             f"Extraction timed out on page {page_number}/{total_pages} after {page_timeout_seconds:.2f}s.",
         ) from error
-    finally:
-        if page_pdf:
-            try:
-                os.remove(page_pdf)
-            except OSError:
-                pass
 
     if response is None:
         raise RuntimeError("Extraction response was empty.")
@@ -309,27 +317,19 @@ def extract_brgy_aip_from_pdf_page(
 def extract_brgy_aip_from_pdf_all_pages(
     *,
     client: OpenAI,
-    pdf_path: str,
+    pdf_source: PdfSource,
     model: str,
     on_progress: Callable[[int, int], None] | None,
     max_pages: int | None = None,
     parse_timeout_seconds: float | None = None,
     extract_timeout_seconds: float | None = None,
     extract_page_timeout_seconds: float | None = None,
+    extract_concurrency: int | None = None,
+    pdf_document: PdfDocument | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, Any], int]:
-    parse_started = time.perf_counter()
-    reader = PdfReader(pdf_path)
-    parse_elapsed = time.perf_counter() - parse_started
-    parse_timeout = _resolve_parse_timeout_seconds(parse_timeout_seconds)
-    if parse_elapsed > parse_timeout:
-        raise ExtractionGuardrailError(
-            "PARSE_TIMEOUT",
-            f"PDF parsing exceeded timeout ({parse_timeout:.2f}s).",
-        )
-
-    total_pages = len(reader.pages)
-    if total_pages == 0:
-        raise ValueError("PDF has no pages")
+    if pdf_document is None:
+        pdf_document = _open_pdf_document(pdf_source, parse_timeout_seconds)
+    total_pages = pdf_document.page_count
 
     resolved_max_pages = _resolve_max_pages(max_pages)
     if total_pages > resolved_max_pages:
@@ -348,17 +348,40 @@ def extract_brgy_aip_from_pdf_all_pages(
     usage_total: dict[str, Any] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
     system_prompt = read_text("prompts/extraction/barangay_system.txt")
     user_prompt = read_text("prompts/extraction/barangay_user.txt")
-    for index in range(total_pages):
-        page_data, page_usage = extract_brgy_aip_from_pdf_page(
-            client=client,
-            pdf_path=pdf_path,
-            page_index=index,
-            total_pages=total_pages,
-            model=model,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            page_timeout_seconds=extract_page_timeout,
-        )
+
+    page_cache = build_extraction_page_cache(
+        scope="barangay",
+        model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        text_format=BrgyAIPExtraction,
+    )
+
+    def extract_page(index: int) -> tuple[BrgyAIPExtraction, dict[str, Any]]:
+        def call_model() -> tuple[BrgyAIPExtraction, dict[str, Any]]:
+            return extract_brgy_aip_from_pdf_page(
+                client=client,
+                pdf_source=pdf_source,
+                page_index=index,
+                total_pages=total_pages,
+                model=model,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                page_timeout_seconds=extract_page_timeout,
+                pdf_document=pdf_document,
+            )
+
+        if page_cache is None:
+            return call_model()
+        return page_cache.fetch_or_extract(pdf_document.single_page_pdf_bytes(index), call_model)
+
+    page_results = run_pages_in_order(
+        total_pages=total_pages,
+        max_workers=resolve_extract_concurrency(extract_concurrency),
+        extract_page=extract_page,
+        on_progress=on_progress,
+    )
+    for index, (page_data, page_usage) in enumerate(page_results):
         for row_index, row in enumerate(page_data.projects):
             row_payload = row.model_dump(mode="python")
             normalized_row, normalized_changes = _normalize_barangay_row(
@@ -372,14 +395,15 @@ def extract_brgy_aip_from_pdf_all_pages(
                 usage_total[key] += value
             else:
                 usage_total[key] = None
-        if on_progress:
-            on_progress(index + 1, total_pages)
     deduped = _dedupe_projects(projects)
-    return deduped, {**usage_total, "project_key_normalized_changes_count": project_key_normalized_changes_count}, total_pages
+    usage_summary = {**usage_total, "project_key_normalized_changes_count": project_key_normalized_changes_count}
+    if page_cache is not None:
+        usage_summary.update(page_cache.stats())
+    return deduped, usage_summary, total_pages
 
 
 def run_extraction(
-    pdf_path: str,
+    pdf_source: PdfSource,
     model: str = "gpt-5.2",
     job_id: str | None = None,
     aip_id: str | None = None,
@@ -390,33 +414,50 @@ def run_extraction(
     parse_timeout_seconds: float | None = None,
     extract_timeout_seconds: float | None = None,
     extract_page_timeout_seconds: float | None = None,
+    extract_concurrency: int | None = None,
+    source_name: str | None = None,
 ) -> ExtractionResult:
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    if isinstance(pdf_source, str) and not os.path.exists(pdf_source):
+        raise FileNotFoundError(f"PDF not found: {pdf_source}")
     resolved_client = client or build_openai_client()
     start_ts = time.perf_counter()
-    projects, usage, page_count = extract_brgy_aip_from_pdf_all_pages(
-        client=resolved_client,
-        pdf_path=pdf_path,
-        model=model,
-        on_progress=on_progress,
-        max_pages=max_pages,
-        parse_timeout_seconds=parse_timeout_seconds,
-        extract_timeout_seconds=extract_timeout_seconds,
-        extract_page_timeout_seconds=extract_page_timeout_seconds,
-    )
-    document, doc_warnings = extract_document_metadata(pdf_path, scope="barangay", page_count_hint=page_count)
-    fiscal_year = int(document.get("fiscal_year") or 0)
-    barangay_name = None
-    if isinstance(document.get("lgu"), dict):
-        name_value = (document.get("lgu") or {}).get("name")
-        if isinstance(name_value, str):
-            barangay_name = name_value
-    totals = (
-        extract_totals_from_pdf(pdf_path=pdf_path, fiscal_year=fiscal_year, barangay_name=barangay_name)
-        if fiscal_year > 0
-        else []
-    )
+    pdf_document = _open_pdf_document(pdf_source, parse_timeout_seconds)
+    try:
+        projects, usage, page_count = extract_brgy_aip_from_pdf_all_pages(
+            client=resolved_client,
+            pdf_source=pdf_document.source,
+            model=model,
+            on_progress=on_progress,
+            max_pages=max_pages,
+            parse_timeout_seconds=parse_timeout_seconds,
+            extract_timeout_seconds=extract_timeout_seconds,
+            extract_page_timeout_seconds=extract_page_timeout_seconds,
+            extract_concurrency=extract_concurrency,
+            pdf_document=pdf_document,
+        )
+        document, doc_warnings = extract_document_metadata(
+            pdf_document.source,
+            scope="barangay",
+            page_count_hint=page_count,
+            pdf_document=pdf_document,
+        )
+        fiscal_year = int(document.get("fiscal_year") or 0)
+        barangay_name = None
+        if isinstance(document.get("lgu"), dict):
+            name_value = (document.get("lgu") or {}).get("name")
+            if isinstance(name_value, str):
+                barangay_name = name_value
+        totals = (
+            extract_totals_from_pages(
+                pages_text=pdf_document.pages_text(),
+                fiscal_year=fiscal_year,
+                barangay_name=barangay_name,
+            )
+            if fiscal_year > 0
+            else []
+        )
+    finally:
+        pdf_document.close()
     warnings = list(doc_warnings)
     if not totals:
         print("[EXTRACTION][BARANGAY] totals_not_found: total_investment_program", flush=True)
@@ -454,7 +495,7 @@ def run_extraction(
     return ExtractionResult(
         job_id=job_id,
         model=model,
-        source_pdf=pdf_path,
+        source_pdf=source_name or pdf_document.source_name,
         extracted={"projects": projects, "totals": totals},
         usage=usage,
         payload=payload,
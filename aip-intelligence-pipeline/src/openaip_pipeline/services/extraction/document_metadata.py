@@ -5,10 +5,9 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Literal
 
-from pypdf import PdfReader
-
 from openaip_pipeline.core.artifact_contract import make_source_ref, normalize_identifier, normalize_whitespace
 from openaip_pipeline.core.clock import now_utc_iso
+from openaip_pipeline.services.extraction.pdf_document import PdfDocument, PdfSource
 from openaip_pipeline.services.extraction.signatory_parser import (
     parse_signatories_on_page,
     parse_signatory_lines,
@@ -583,7 +582,11 @@ def _infer_fiscal_year(pages: list[str]) -> tuple[int, list[dict[str, Any]]]:
     return selected_year, warnings
 
 
-def _extract_signatories(pdf_path: str, pages: list[str]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+def _extract_signatories(
+    pdf_path: str,
+    pages: list[str],
+    pdf_document: PdfDocument | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     if not pages or not pdf_path:
         return [], []
     all_entries: list[dict[str, Any]] = []
@@ -594,6 +597,7 @@ def _extract_signatories(pdf_path: str, pages: list[str]) -> tuple[list[dict[str
             pdf_path=pdf_path,
             page_number=page_number,
             fallback_page_text=fallback_text,
+            pdf_document=pdf_document,
         )
         all_entries.extend(entries)
         warnings.extend(page_warnings)
@@ -616,23 +620,24 @@ def _extract_signatories(pdf_path: str, pages: list[str]) -> tuple[list[dict[str
 
 
 def extract_document_metadata(
-    pdf_path: str,
+    pdf_source: PdfSource,
     *,
     scope: Scope,
     page_count_hint: int | None = None,
+    pdf_document: PdfDocument | None = None,
 ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
-    reader = PdfReader(pdf_path)
-    page_count = page_count_hint if isinstance(page_count_hint, int) and page_count_hint > 0 else len(reader.pages)
-    pages: list[str] = []
-    pages_structured: list[dict[str, Any]] = []
-    for page in reader.pages:
-        try:
-            text = page.extract_text() or ""
-        except Exception:
-            text = ""
-        lines = _to_lines(text)
-        pages.append(text)
-        pages_structured.append({"lines": lines})
+    if pdf_document is None:
+        with PdfDocument.open(pdf_source) as opened:
+            return extract_document_metadata(
+                opened.source,
+                scope=scope,
+                page_count_hint=page_count_hint,
+                pdf_document=opened,
+            )
+
+    page_count = page_count_hint if isinstance(page_count_hint, int) and page_count_hint > 0 else pdf_document.page_count
+    pages = pdf_document.pages_text()
+    pages_structured: list[dict[str, Any]] = [{"lines": _to_lines(text)} for text in pages]
 
     fiscal_year, year_warnings = _infer_fiscal_year(pages)
     lgu, source_info, lgu_warnings = resolve_lgu_metadata(pages, pages_structured)
@@ -647,7 +652,7 @@ def extract_document_metadata(
                 "source_refs": [],
             }
         )
-    signatories, signatory_warnings = _extract_signatories(pdf_path, pages)
+    signatories, signatory_warnings = _extract_signatories(pdf_document.source_name, pages, pdf_document)
     if source_info.get("document_type") == "unknown":
         source_info["document_type"] = "BAIP" if scope == "barangay" else "AIP"
     document = {
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Generic, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from openaip_pipeline.core.artifact_contract import SCHEMA_VERSION
+from openaip_pipeline.core.clock import now_utc_iso
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+CACHE_FORMAT_VERSION = 1
+ZERO_USAGE: dict[str, int] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+
+
+def _sha256_hex(value: bytes | str) -> str:
+    raw = value.encode("utf-8") if isinstance(value, str) else value
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ExtractionPageCache(Generic[ModelT]):
+    """Content-addressed on-disk cache of parsed single-page extraction responses.
+
+    Entries are keyed by the single-page PDF bytes, model name, prompt text and
+    output schema, so any change to one of them is a miss rather than a stale hit.
+    Parsed rows are stored before page-number normalization, which keeps an entry
+    valid when the same page moves to a different position in a re-uploaded AIP.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        scope: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        text_format: type[ModelT],
+    ) -> None:
+        self.root = root
+        self.scope = scope
+        self.model = model
+        self.text_format = text_format
+        self.prompt_hash = _sha256_hex(f"{system_prompt}\x00{user_prompt}")
+        schema_json = json.dumps(text_format.model_json_schema(), sort_keys=True)
+        self.schema_hash = _sha256_hex(f"{SCHEMA_VERSION}\x00{schema_json}")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key_for(self, page_bytes: bytes) -> str:
+        parts = [
+            f"v{CACHE_FORMAT_VERSION}",
+            self.scope,
+            _sha256_hex(page_bytes),
+            self.model,
+            self.prompt_hash,
+            self.schema_hash,
+        ]
+        return _sha256_hex("\x00".join(parts))
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / self.scope / key[:2] / f"{key}.json"
+
+    def get(self, page_bytes: bytes) -> tuple[ModelT, dict[str, Any]] | None:
+        path = self._entry_path(self.key_for(page_bytes))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            parsed = self.text_format.model_validate(entry["page_data"])
+        except (OSError, ValueError, KeyError, TypeError, ValidationError):
+            return None
+        usage = entry.get("usage") if isinstance(entry.get("usage"), dict) else {}
+        return parsed, usage
+
+    def put(self, page_bytes: bytes, parsed: ModelT, usage: dict[str, Any]) -> None:
+        path = self._entry_path(self.key_for(page_bytes))
+        entry = {
+            "model": self.model,
+            "scope": self.scope,
+            "schema_version": SCHEMA_VERSION,
+            "created_at": now_utc_iso(),
+            "page_data": parsed.model_dump(mode="json"),
+            "usage": usage,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as error:
+            print(f"[EXTRACTION][CACHE] write_failed key={path.stem[:12]} error={error}", flush=True)
+
+    def fetch_or_extract(
+        self,
+        page_bytes: bytes,
+        extract: Callable[[], tuple[ModelT, dict[str, Any]]],
+    ) -> tuple[ModelT, dict[str, Any]]:
+        cached = self.get(page_bytes)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            # A cached page costs no tokens in this run.
+            return cached[0], dict(ZERO_USAGE)
+        with self._lock:
+            self.misses += 1
+        parsed, usage = extract()
+        self.put(page_bytes, parsed, usage)
+        return parsed, usage
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"extraction_cache_hits": self.hits, "extraction_cache_misses": self.misses}
+
+
+def build_extraction_page_cache(
+    *,
+    scope: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    text_format: type[ModelT],
+) -> ExtractionPageCache[ModelT] | None:
+    cache_dir = os.getenv("PIPELINE_EXTRACT_CACHE_DIR", "").strip()
+    if not cache_dir:
+        return None
+    return ExtractionPageCache(
+        Path(cache_dir),
+        scope=scope,
+        model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        text_format=text_format,
+    )
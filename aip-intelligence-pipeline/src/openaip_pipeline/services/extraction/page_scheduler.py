@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_EXTRACT_CONCURRENCY = 4
+DEFAULT_EXTRACT_MAX_INFLIGHT = 8
+
+_inflight_lock = threading.Lock()
+_inflight_semaphore: threading.BoundedSemaphore | None = None
+
+
+def _read_positive_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def resolve_extract_concurrency(value: int | None) -> int:
+    if isinstance(value, int) and value > 0:
+        return value
+    return _read_positive_int_env("PIPELINE_EXTRACT_CONCURRENCY", DEFAULT_EXTRACT_CONCURRENCY)
+
+
+def _get_inflight_semaphore() -> threading.BoundedSemaphore:
+    # Process-wide cap shared by every extraction in flight (city and barangay, all runs).
+    global _inflight_semaphore
+    with _inflight_lock:
+        if _inflight_semaphore is None:
+            limit = _read_positive_int_env("PIPELINE_EXTRACT_MAX_INFLIGHT", DEFAULT_EXTRACT_MAX_INFLIGHT)
+            _inflight_semaphore = threading.BoundedSemaphore(limit)
+        return _inflight_semaphore
+
+
+def _run_page_with_inflight_slot(extract_page: Callable[[int], T], page_index: int) -> T:
+    # The slot is acquired before the page callable starts, so queueing never eats into
+    # the per-page timeout budget measured inside the callable.
+    with _get_inflight_semaphore():
+        return extract_page(page_index)
+
+
+def run_pages_in_order(
+    *,
+    total_pages: int,
+    max_workers: int,
+    extract_page: Callable[[int], T],
+    on_progress: Callable[[int, int], None] | None = None,
+) -> list[T]:
+    """Run `extract_page` for every page index and return results in page order.
+
+    `on_progress(done_pages, total_pages)` is invoked from the calling thread as pages
+    complete, so completion counts stay monotonic even when pages finish out of order.
+    The first page failure cancels pages that have not started and is re-raised.
+    """
+    if total_pages <= 0:
+        return []
+
+    worker_count = max(1, min(max_workers, total_pages))
+    if worker_count == 1:
+        sequential: list[T] = []
+        for index in range(total_pages):
+            sequential.append(_run_page_with_inflight_slot(extract_page, index))
+            if on_progress:
+                on_progress(index + 1, total_pages)
+        return sequential
+
+    results: dict[int, T] = {}
+    executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="extract-page")
+    try:
+        future_to_index: dict[Future[T], int] = {
+            executor.submit(_run_page_with_inflight_slot, extract_page, index): index for index in range(total_pages)
+        }
+        pending: set[Future[T]] = set(future_to_index)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda item: future_to_index[item]):
+                results[future_to_index[future]] = future.result()
+                if on_progress:
+                    on_progress(len(results), total_pages)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return [results[index] for index in range(total_pages)]
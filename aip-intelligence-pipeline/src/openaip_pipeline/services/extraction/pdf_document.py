@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import io
+import threading
+from typing import Any, BinaryIO
+
+from pypdf import PdfReader, PdfWriter
+
+from openaip_pipeline.core.artifact_contract import normalize_whitespace
+
+
+DEFAULT_PAGE_SIZE = (612.0, 792.0)
+IN_MEMORY_SOURCE_NAME = "<memory>"
+
+PdfSource = str | bytes | bytearray | memoryview | BinaryIO
+
+
+def read_pdf_source(source: PdfSource) -> str | bytes:
+    """Normalize a path, byte string or binary buffer into a path or immutable bytes."""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    try:
+        source.seek(0)
+    except (AttributeError, OSError):
+        pass
+    return source.read()
+
+
+def pdf_stream(source: str | bytes) -> str | io.BytesIO:
+    # Each reader gets its own buffer so pypdf and pdfplumber never share a stream position.
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+class PdfDocument:
+    """Parse-once handle over a source PDF, shared by every extraction step of a run.
+
+    Page text, page sizes, positioned words and single-page PDF blobs are computed on
+    first use and cached. Access to the underlying readers is serialized so the handle
+    can be shared by concurrent page workers.
+    """
+
+    def __init__(self, reader: PdfReader, *, source: str | bytes) -> None:
+        self.reader = reader
+        self.source = source
+        self._lock = threading.RLock()
+        self._page_count: int | None = None
+        self._page_text: dict[int, str] = {}
+        self._page_sizes: dict[int, tuple[float, float]] = {}
+        self._positioned_words: dict[int, tuple[list[dict[str, Any]], float, float, bool]] = {}
+        self._single_page_pdfs: dict[int, bytes] = {}
+        self._plumber_pdf: Any | None = None
+        self._plumber_unavailable = False
+
+    @classmethod
+    def open(cls, source: PdfSource) -> "PdfDocument":
+        normalized = read_pdf_source(source)
+        return cls(PdfReader(pdf_stream(normalized)), source=normalized)
+
+    @property
+    def source_name(self) -> str:
+        return self.source if isinstance(self.source, str) else IN_MEMORY_SOURCE_NAME
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._plumber_pdf is not None:
+                try:
+                    self._plumber_pdf.close()
+                except Exception:
+                    pass
+                self._plumber_pdf = None
+
+    @property
+    def page_count(self) -> int:
+        with self._lock:
+            if self._page_count is None:
+                self._page_count = len(self.reader.pages)
+            return self._page_count
+
+    def _check_page_index(self, page_index: int) -> None:
+        if self.page_count == 0:
+            raise ValueError("PDF has no pages")
+        if page_index < 0 or page_index >= self.page_count:
+            raise IndexError(f"page_index out of range: {page_index}")
+
+    def page_text(self, page_index: int) -> str:
+        with self._lock:
+            cached = self._page_text.get(page_index)
+            if cached is not None:
+                return cached
+            try:
+                text = self.reader.pages[page_index].extract_text() or ""
+            except Exception:
+                text = ""
+            self._page_text[page_index] = text
+            return text
+
+    def pages_text(self) -> list[str]:
+        return [self.page_text(index) for index in range(self.page_count)]
+
+    def page_size(self, page_number_1_indexed: int) -> tuple[float, float]:
+        with self._lock:
+            cached = self._page_sizes.get(page_number_1_indexed)
+            if cached is not None:
+                return cached
+            try:
+                page = self.reader.pages[page_number_1_indexed - 1]
+                size = (float(page.mediabox.width), float(page.mediabox.height))
+            except Exception:
+                size = DEFAULT_PAGE_SIZE
+            self._page_sizes[page_number_1_indexed] = size
+            return size
+
+    def single_page_pdf_bytes(self, page_index: int) -> bytes:
+        with self._lock:
+            cached = self._single_page_pdfs.get(page_index)
+            if cached is not None:
+                return cached
+            self._check_page_index(page_index)
+            writer = PdfWriter()
+            writer.add_page(self.reader.pages[page_index])
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            blob = buffer.getvalue()
+            self._single_page_pdfs[page_index] = blob
+            return blob
+
+    def _plumber(self) -> Any | None:
+        if self._plumber_pdf is not None or self._plumber_unavailable:
+            return self._plumber_pdf
+        try:
+            import pdfplumber  # type: ignore
+
+            self._plumber_pdf = pdfplumber.open(pdf_stream(self.source))
+        except Exception:
+            self._plumber_unavailable = True
+        return self._plumber_pdf
+
+    def positioned_words(self, page_number_1_indexed: int) -> tuple[list[dict[str, Any]], float, float, bool]:
+        with self._lock:
+            cached = self._positioned_words.get(page_number_1_indexed)
+            if cached is not None:
+                return cached
+            result = self._extract_positioned_words(page_number_1_indexed)
+            self._positioned_words[page_number_1_indexed] = result
+            return result
+
+    def _extract_positioned_words(self, page_number_1_indexed: int) -> tuple[list[dict[str, Any]], float, float, bool]:
+        pdf = self._plumber()
+        if pdf is None:
+            width, height = self.page_size(page_number_1_indexed)
+            return [], width, height, False
+
+        try:
+            page = pdf.pages[page_number_1_indexed - 1]
+            page_width = float(page.width or 0.0)
+            page_height = float(page.height or 0.0)
+            raw_words = page.extract_words(
+                use_text_flow=True,
+                keep_blank_chars=False,
+                x_tolerance=1,
+                y_tolerance=2,
+            )
+            words: list[dict[str, Any]] = []
+            for word in raw_words:
+                text = normalize_whitespace(word.get("text"))
+                if not text:
+                    continue
+                words.append(
+                    {
+                        "text": text,
+                        "x0": float(word.get("x0") or 0.0),
+                        "x1": float(word.get("x1") or 0.0),
+                        "y0": float(word.get("top") or 0.0),
+                        "y1": float(word.get("bottom") or 0.0),
+                        "page": page_number_1_indexed,
+                    }
+                )
+            has_text_layer = len(words) > 0
+            if page_width <= 0 or page_height <= 0:
+                page_width, page_height = self.page_size(page_number_1_indexed)
+            return words, page_width, page_height, has_text_layer
+        except Exception:
+            width, height = self.page_size(page_number_1_indexed)
+            return [], width, height, False
@@ -5,9 +5,8 @@ from dataclasses import dataclass
 from statistics import median
 from typing import Any
 
-from pypdf import PdfReader
-
 from openaip_pipeline.core.artifact_contract import make_source_ref, normalize_identifier, normalize_whitespace
+from openaip_pipeline.services.extraction.pdf_document import DEFAULT_PAGE_SIZE, PdfDocument
 
 ROLE_LABELS: dict[str, str] = {
     "preparedby": "prepared_by",
@@ -197,57 +196,19 @@ def infer_office_text(position_text: str | None) -> str | None:
     return None
 
 
-def _safe_page_size(pdf_path: str, page_number_1_indexed: int) -> tuple[float, float]:
-    try:
-        reader = PdfReader(pdf_path)
-        page = reader.pages[page_number_1_indexed - 1]
-        return float(page.mediabox.width), float(page.mediabox.height)
-    except Exception:
-        return 612.0, 792.0
-
-
-def extract_positioned_words(pdf_path: str, page_number_1_indexed: int) -> tuple[list[dict[str, Any]], float, float, bool]:
-    try:
-        import pdfplumber  # type: ignore
-    except Exception:
-        width, height = _safe_page_size(pdf_path, page_number_1_indexed)
-        return [], width, height, False
-
+def extract_positioned_words(
+    pdf_path: str,
+    page_number_1_indexed: int,
+    pdf_document: PdfDocument | None = None,
+) -> tuple[list[dict[str, Any]], float, float, bool]:
+    if pdf_document is not None:
+        return pdf_document.positioned_words(page_number_1_indexed)
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            page = pdf.pages[page_number_1_indexed - 1]
-            page_width = float(page.width or 0.0)
-            page_height = float(page.height or 0.0)
-            raw_words = page.extract_words(
-                use_text_flow=True,
-                keep_blank_chars=False,
-                x_tolerance=1,
-                y_tolerance=2,
-            )
-            words: list[dict[str, Any]] = []
-            for word in raw_words:
-                text = normalize_whitespace(word.get("text"))
-                if not text:
-                    continue
-                words.append(
-                    {
-                        "text": text,
-                        "x0": float(word.get("x0") or 0.0),
-                        "x1": float(word.get("x1") or 0.0),
-                        "y0": float(word.get("top") or 0.0),
-                        "y1": float(word.get("bottom") or 0.0),
-                        "page": page_number_1_indexed,
-                    }
-                )
-            has_text_layer = len(words) > 0
-            if page_width <= 0 or page_height <= 0:
-                fallback_width, fallback_height = _safe_page_size(pdf_path, page_number_1_indexed)
-                page_width = fallback_width
-                page_height = fallback_height
-            return words, page_width, page_height, has_text_layer
+        opened = PdfDocument.open(pdf_path)
     except Exception:
-        width, height = _safe_page_size(pdf_path, page_number_1_indexed)
-        return [], width, height, False
+        return [], *DEFAULT_PAGE_SIZE, False
+    with opened:
+        return opened.positioned_words(page_number_1_indexed)
 
 
 def _line_from_words(words: list[PositionedWord]) -> PositionedLine:
@@ -698,10 +659,16 @@ def parse_signatory_lines(lines: list[str], page: int) -> tuple[list[dict[str, A
     return signatories, warnings
 
 
-def parse_signatories_on_page(pdf_path: str, page_number: int, fallback_page_text: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+def parse_signatories_on_page(
+    pdf_path: str,
+    page_number: int,
+    fallback_page_text: str,
+    pdf_document: PdfDocument | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     words, page_width, page_height, has_text_layer = extract_positioned_words(
         pdf_path=pdf_path,
         page_number_1_indexed=page_number,
+        pdf_document=pdf_document,
     )
     signatories: list[dict[str, Any]] = []
     warnings: list[dict[str, Any]] = []
@@ -5,9 +5,8 @@ from decimal import Decimal, InvalidOperation
 import re
 from typing import Any
 
-from pypdf import PdfReader
-
 from openaip_pipeline.core.artifact_contract import normalize_whitespace
+from openaip_pipeline.services.extraction.pdf_document import PdfDocument
 
 
 _AMOUNT_PATTERN = re.compile(
@@ -173,14 +172,8 @@ def extract_totals_from_pdf(
     fiscal_year: int,
     barangay_name: str | None,
 ) -> list[dict[str, Any]]:
-    reader = PdfReader(pdf_path)
-    pages_text: list[str] = []
-    for page in reader.pages:
-        try:
-            page_text = page.extract_text() or ""
-        except Exception:
-            page_text = ""
-        pages_text.append(page_text)
+    with PdfDocument.open(pdf_path) as document:
+        pages_text = document.pages_text()
 
     return extract_totals_from_pages(
         pages_text=pages_text,
@@ -1,3 +1,4 @@
+from .executor import get_intent_executor, route_intent
 from .prototypes import INTENT_PROTOTYPES, validate_prototypes
 from .router import IntentRouter
 from .rules import (
@@ -18,9 +19,11 @@ __all__ = [
     "IntentRouter",
     "IntentType",
     "SemanticIntentClassifier",
+    "get_intent_executor",
     "match_line_item_ref",
     "match_scope_needs_clarification",
     "match_total_aggregation",
     "normalize_text",
+    "route_intent",
     "validate_prototypes",
 ]
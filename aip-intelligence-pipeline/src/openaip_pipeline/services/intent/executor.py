@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+
+from .types import IntentResult
+
+_executor_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+class _Router(Protocol):
+    def route(self, text: str) -> IntentResult: ...
+
+
+def _read_positive_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def get_intent_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for intent scoring, sized by `INTENT_EXECUTOR_WORKERS` (default 2).
+
+    Semantic scoring is CPU-bound, so a small dedicated pool keeps it from occupying the
+    event loop or the request threadpool; excess requests queue here instead.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_read_positive_int_env("INTENT_EXECUTOR_WORKERS", 2),
+                thread_name_prefix="intent-scoring",
+            )
+        return _executor
+
+
+async def route_intent(router: _Router, text: str) -> IntentResult:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_intent_executor(), router.route, text)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import Any
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
 from openaip_pipeline.core.errors import ConfigurationError
 
@@ -43,6 +45,60 @@ def build_openai_client(api_key: str | None = None) -> OpenAI:
     )
 
 
+_shared_clients_lock = threading.Lock()
+_shared_clients: dict[str, OpenAI] = {}
+
+
+def get_shared_openai_client(api_key: str | None = None) -> OpenAI:
+    """Process-wide OpenAI client so concurrent runs share one keep-alive connection pool.
+
+    The pool is sized by PIPELINE_OPENAI_MAX_CONNECTIONS; the SDK client is thread-safe.
+    """
+    resolved = (api_key or os.getenv("OPENAI_API_KEY", "")).strip()
+    if not resolved:
+        raise ConfigurationError("OPENAI_API_KEY not found.")
+    with _shared_clients_lock:
+        client = _shared_clients.get(resolved)
+        if client is None:
+            max_connections = max(1, _read_non_negative_int_env("PIPELINE_OPENAI_MAX_CONNECTIONS", 32))
+            client = OpenAI(
+                api_key=resolved,
+                timeout=_read_positive_float_env("PIPELINE_OPENAI_TIMEOUT_SECONDS", 600.0),
+                max_retries=_read_non_negative_int_env("PIPELINE_OPENAI_MAX_RETRIES", 3),
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    )
+                ),
+            )
+            _shared_clients[resolved] = client
+        return client
+
+
+def build_async_openai_client(api_key: str | None = None) -> AsyncOpenAI:
+    """Async client with the shared client's pool, timeout and retry settings.
+
+    Not cached process-wide: its connection pool belongs to the event loop that uses it,
+    so the owner (e.g. `RagEngine`) keeps one per app and closes it on shutdown.
+    """
+    resolved = (api_key or os.getenv("OPENAI_API_KEY", "")).strip()
+    if not resolved:
+        raise ConfigurationError("OPENAI_API_KEY not found.")
+    max_connections = max(1, _read_non_negative_int_env("PIPELINE_OPENAI_MAX_CONNECTIONS", 32))
+    return AsyncOpenAI(
+        api_key=resolved,
+        timeout=_read_positive_float_env("PIPELINE_OPENAI_TIMEOUT_SECONDS", 600.0),
+        max_retries=_read_non_negative_int_env("PIPELINE_OPENAI_MAX_RETRIES", 3),
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            )
+        ),
+    )
+
+
 def safe_usage_dict(response: Any) -> dict[str, int | None]:
     usage = getattr(response, "usage", None)
     if not usage:
@@ -1,4 +1,4 @@
-from openaip_pipeline.services.rag.rag import answer_with_rag
-
-__all__ = ["answer_with_rag"]
+from openaip_pipeline.services.rag.engine import RagEngine
+from openaip_pipeline.services.rag.rag import RagFlags, answer_with_rag
 
+__all__ = ["RagEngine", "RagFlags", "answer_with_rag"]
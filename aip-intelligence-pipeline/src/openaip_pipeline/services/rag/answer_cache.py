@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+from openaip_pipeline.services.rag.embedding_cache import normalize_query_text
+from openaip_pipeline.services.rag.retriever import YEAR_PATTERN
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _read_non_negative_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def _read_unit_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = float(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return min(1.0, max(0.0, parsed))
+
+
+def answer_context_key(
+    *,
+    retrieval_scope: dict[str, Any] | None,
+    retrieval_filters: dict[str, Any] | None,
+    retrieval_mode: str,
+    chat_model: str,
+    top_k: int,
+    min_similarity: float,
+) -> str:
+    """Everything besides the question that changes an answer, as a stable hash."""
+    payload = {
+        "scope": retrieval_scope or {"mode": "global", "targets": []},
+        "filters": retrieval_filters or {},
+        "mode": retrieval_mode,
+        "model": chat_model,
+        "top_k": top_k,
+        "min_similarity": min_similarity,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def question_anchors(question: str) -> frozenset[str]:
+    """Years and other figures in a question; a semantic hit must carry exactly the same set.
+
+    Questions such as "2024 road budget" and "2025 road budget" embed far above any useful
+    threshold, so similarity alone cannot keep one from being served the other's answer.
+    """
+    text = normalize_query_text(question)
+    years = {f"year:{year}" for year in YEAR_PATTERN.findall(text)}
+    numbers = {
+        f"number:{number.replace(',', '')}"
+        for number in _NUMBER_PATTERN.findall(text)
+        if not YEAR_PATTERN.fullmatch(number)
+    }
+    return frozenset(years | numbers)
+
+
+@dataclass
+class _AnswerEntry:
+    corpus_version: str
+    context_key: str
+    created_at: float
+    result: dict[str, Any]
+    embedding: np.ndarray | None
+    anchors: frozenset[str]
+
+
+class _SemanticBucket:
+    """Unit embeddings of the entries sharing one context key, anchor set and dimension.
+
+    Rows live in a preallocated float32 matrix that grows by doubling; removal moves the
+    last row into the freed slot, so a lookup is one matrix-vector product over `size` rows.
+    """
+
+    def __init__(self, dimensions: int) -> None:
+        self.matrix = np.empty((8, dimensions), dtype=np.float32)
+        self.keys: list[str] = []
+        self.rows: dict[str, int] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, embedding: np.ndarray) -> None:
+        if self.size == self.matrix.shape[0]:
+            grown = np.empty((self.matrix.shape[0] * 2, self.matrix.shape[1]), dtype=np.float32)
+            grown[: self.size] = self.matrix[: self.size]
+            self.matrix = grown
+        self.rows[key] = self.size
+        self.matrix[self.size] = embedding
+        self.keys.append(key)
+
+    def remove(self, key: str) -> None:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last_key = self.keys.pop()
+        if last_key != key:
+            self.matrix[row] = self.matrix[self.size]
+            self.keys[row] = last_key
+            self.rows[last_key] = row
+
+    def ranked(self, query: np.ndarray, threshold: float) -> list[tuple[str, float]]:
+        """Keys scoring at least `threshold` against `query`, best first."""
+        similarities = self.matrix[: self.size] @ query
+        passing = np.flatnonzero(similarities >= threshold)
+        order = passing[np.argsort(-similarities[passing], kind="stable")]
+        return [(self.keys[row], float(similarities[row])) for row in order]
+
+
+@dataclass(frozen=True)
+class AnswerCacheHit:
+    result: dict[str, Any]
+    match: str
+    similarity: float
+    age_seconds: float
+
+
+class AnswerCache:
+    """Bounded LRU/TTL cache of final `answer_with_rag` results.
+
+    Entries are keyed by normalized question plus `answer_context_key` and stamped with
+    the corpus version they were computed against; a lookup under a different version
+    misses and evicts. With `semantic_threshold` set, a miss falls back to the most
+    similar cached question (cosine on query embeddings) in the same context that names
+    the same years and figures (`question_anchors`). Embeddings are indexed per context
+    key and anchor set (`_SemanticBucket`), so the fallback never scans the whole cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 0,
+        ttl_seconds: int = 3600,
+        semantic_threshold: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.semantic_threshold = float(semantic_threshold)
+        self._clock = clock
+        self._entries: OrderedDict[str, _AnswerEntry] = OrderedDict()
+        self._buckets: dict[tuple[str, frozenset[str], int], _SemanticBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AnswerCache":
+        return cls(
+            max_entries=_read_non_negative_int_env("RAG_ANSWER_CACHE_SIZE", 0),
+            ttl_seconds=_read_non_negative_int_env("RAG_ANSWER_CACHE_TTL_SECONDS", 3600),
+            semantic_threshold=_read_unit_float_env("RAG_ANSWER_CACHE_SEMANTIC_THRESHOLD", 0.0),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.enabled and self.semantic_threshold > 0.0
+
+    @staticmethod
+    def _key(question: str, context_key: str) -> str:
+        return hashlib.sha256(f"{context_key}\n{normalize_query_text(question)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _unit(embedding: list[float] | None) -> np.ndarray | None:
+        if not embedding:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry.embedding is None:
+            return
+        bucket_key = (entry.context_key, entry.anchors, entry.embedding.shape[0])
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            return
+        bucket.remove(key)
+        if bucket.size == 0:
+            del self._buckets[bucket_key]
+
+    def _live_locked(self, key: str, entry: _AnswerEntry, *, corpus_version: str, now: float) -> bool:
+        expired = self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+        if expired or entry.corpus_version != corpus_version:
+            self._drop_locked(key)
+            return False
+        return True
+
+    def get(
+        self,
+        *,
+        question: str,
+        context_key: str,
+        corpus_version: str,
+        embedding: list[float] | None = None,
+    ) -> AnswerCacheHit | None:
+        if not self.enabled:
+            return None
+        key = self._key(question, context_key)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._live_locked(key, entry, corpus_version=corpus_version, now=now):
+                self._entries.move_to_end(key)
+                return AnswerCacheHit(copy.deepcopy(entry.result), "exact", 1.0, now - entry.created_at)
+
+            query = self._unit(embedding) if self.semantic_enabled else None
+            if query is None:
+                return None
+            bucket = self._buckets.get((context_key, question_anchors(question), query.shape[0]))
+            if bucket is None:
+                return None
+            for candidate_key, similarity in bucket.ranked(query, self.semantic_threshold):
+                candidate = self._entries[candidate_key]
+                if self._live_locked(candidate_key, candidate, corpus_version=corpus_version, now=now):
+                    self._entries.move_to_end(candidate_key)
+                    return AnswerCacheHit(
+                        copy.deepcopy(candidate.result), "semantic", similarity, now - candidate.created_at
+                    )
+            return None
+
+    def put(
+        self,
+        *,
+        question: str,
+        context_key: str,
+        corpus_version: str,
+        result: dict[str, Any],
+        embedding: list[float] | None = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = self._key(question, context_key)
+        entry = _AnswerEntry(
+            corpus_version=corpus_version,
+            context_key=context_key,
+            created_at=self._clock(),
+            result=copy.deepcopy(result),
+            embedding=self._unit(embedding) if self.semantic_enabled else None,
+            anchors=question_anchors(question),
+        )
+        with self._lock:
+            self._drop_locked(key)
+            self._entries[key] = entry
+            if entry.embedding is not None:
+                bucket_key = (context_key, entry.anchors, entry.embedding.shape[0])
+                bucket = self._buckets.get(bucket_key)
+                if bucket is None:
+                    bucket = self._buckets[bucket_key] = _SemanticBucket(entry.embedding.shape[0])
+                bucket.add(key, entry.embedding)
+            while len(self._entries) > self.max_entries:
+                self._drop_locked(next(iter(self._entries)))
+
+
+_shared_cache_lock = threading.Lock()
+_shared_cache: AnswerCache | None = None
+
+
+def get_shared_answer_cache() -> AnswerCache:
+    """Process-wide cache configured from `RAG_ANSWER_CACHE_*`, shared by every engine."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = AnswerCache.from_env()
+        return _shared_cache
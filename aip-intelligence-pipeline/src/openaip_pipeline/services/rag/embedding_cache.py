@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+
+def _read_non_negative_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = int(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def normalize_query_text(text: str) -> str:
+    """Case- and whitespace-insensitive form used as the cache key for a query."""
+    return " ".join((text or "").split()).casefold()
+
+
+def query_cache_key(text: str, model: str) -> str:
+    return hashlib.sha256(f"{model.strip()}\n{normalize_query_text(text)}".encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU/TTL cache of query embeddings keyed by normalized text and model.
+
+    With `disk_path` set, entries are also kept in a SQLite file so a restarted process
+    starts warm. Disk rows past the TTL or beyond `disk_max_entries` are pruned on open;
+    any disk error disables the disk tier instead of failing the request. SQLite work runs
+    under its own lock, so memory-tier lookups never wait on disk I/O; async callers pass
+    `memory_only=True` on the event loop and reach the disk tier from a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: int = 604800,
+        disk_path: str | Path | None = None,
+        disk_max_entries: int = 20000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.disk_max_entries = max(0, int(disk_max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._disk: sqlite3.Connection | None = None
+        if disk_path and self.max_entries > 0:
+            self._open_disk(Path(disk_path))
+
+    @classmethod
+    def from_env(cls) -> "QueryEmbeddingCache":
+        return cls(
+            max_entries=_read_non_negative_int_env("RAG_EMBEDDING_CACHE_SIZE", 1024),
+            ttl_seconds=_read_non_negative_int_env("RAG_EMBEDDING_CACHE_TTL_SECONDS", 604800),
+            disk_path=os.getenv("RAG_EMBEDDING_CACHE_PATH", "").strip() or None,
+            disk_max_entries=_read_non_negative_int_env("RAG_EMBEDDING_CACHE_DISK_MAX_ENTRIES", 20000),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self._disk is not None
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _open_disk(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(path), check_same_thread=False)
+            connection.execute(
+                "create table if not exists query_embeddings "
+                "(cache_key text primary key, created_at real not null, vector blob not null)"
+            )
+            if self.ttl_seconds > 0:
+                connection.execute(
+                    "delete from query_embeddings where created_at < ?",
+                    (self._clock() - self.ttl_seconds,),
+                )
+            connection.execute(
+                "delete from query_embeddings where cache_key not in "
+                "(select cache_key from query_embeddings order by created_at desc limit ?)",
+                (self.disk_max_entries,),
+            )
+            connection.commit()
+        except sqlite3.Error as error:
+            print(f"[RAG] embedding cache disk tier disabled ({path}): {error}", flush=True)
+            return
+        self._disk = connection
+
+    def _disk_failed(self, error: sqlite3.Error) -> None:
+        print(f"[RAG] embedding cache disk tier disabled: {error}", flush=True)
+        try:
+            if self._disk is not None:
+                self._disk.close()
+        except sqlite3.Error:
+            pass
+        self._disk = None
+
+    def _remember_locked(self, key: str, created_at: float, vector: list[float]) -> None:
+        self._entries[key] = (created_at, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str, now: float) -> tuple[float, list[float]] | None:
+        with self._disk_lock:
+            if self._disk is None:
+                return None
+            try:
+                row = self._disk.execute(
+                    "select created_at, vector from query_embeddings where cache_key = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as error:
+                self._disk_failed(error)
+                return None
+        if row is None or self._expired(float(row[0]), now):
+            return None
+        # Vectors are stored as float32, which is lossless for API embeddings.
+        return float(row[0]), array("f", row[1]).tolist()
+
+    def _write_disk(self, key: str, created_at: float, vector: list[float]) -> None:
+        with self._disk_lock:
+            if self._disk is None:
+                return
+            try:
+                self._disk.execute(
+                    "insert or replace into query_embeddings (cache_key, created_at, vector) values (?, ?, ?)",
+                    (key, created_at, array("f", vector).tobytes()),
+                )
+                self._disk.commit()
+            except sqlite3.Error as error:
+                self._disk_failed(error)
+
+    def get(self, text: str, model: str, *, memory_only: bool = False) -> list[float] | None:
+        """Return the cached vector, or None.
+
+        With `memory_only`, a memory miss returns None without touching SQLite and, while
+        the disk tier is enabled, is not counted as a miss: the caller is expected to
+        follow up with a full `get` off the event loop.
+        """
+        if not self.enabled:
+            return None
+        key = query_cache_key(text, model)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0], now):
+                self._entries.pop(key, None)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return list(entry[1])
+            if memory_only and self._disk is not None:
+                return None
+        entry = None if memory_only else self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._remember_locked(key, *entry)
+            self._hits += 1
+            return list(entry[1])
+
+    def put(self, text: str, model: str, vector: list[float], *, memory_only: bool = False) -> None:
+        """Store `vector`; with `memory_only`, leave the disk write to a later `persist`."""
+        if not self.enabled:
+            return
+        key = query_cache_key(text, model)
+        now = self._clock()
+        stored = [float(value) for value in vector]
+        with self._lock:
+            self._remember_locked(key, now, stored)
+        if not memory_only:
+            self._write_disk(key, now, stored)
+
+    def persist(self, text: str, model: str, vector: list[float]) -> None:
+        """Write one entry to the disk tier only (no-op without one)."""
+        if not self.enabled:
+            return
+        self._write_disk(query_cache_key(text, model), self._clock(), [float(value) for value in vector])
+
+    def stats(self) -> dict[str, int | float | bool | None]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "disk_enabled": self._disk is not None,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+            }
+
+
+_shared_cache_lock = threading.Lock()
+_shared_cache: QueryEmbeddingCache | None = None
+
+
+def get_shared_query_embedding_cache() -> QueryEmbeddingCache:
+    """Process-wide cache configured from `RAG_EMBEDDING_CACHE_*`, shared by every engine."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = QueryEmbeddingCache.from_env()
+        return _shared_cache
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any
+
+from pydantic import SecretStr
+
+from openaip_pipeline.core.errors import ConfigurationError
+from openaip_pipeline.core.resources import read_text
+from openaip_pipeline.core.settings import Settings
+from openaip_pipeline.services.openai_utils import build_async_openai_client, get_shared_openai_client
+from openaip_pipeline.services.rag.answer_cache import AnswerCache, get_shared_answer_cache
+from openaip_pipeline.services.rag.embedding_cache import QueryEmbeddingCache, get_shared_query_embedding_cache
+from openaip_pipeline.services.rag.rag import RagFlags, aanswer_with_rag, answer_with_rag
+
+
+def _read_non_negative_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        parsed = float(raw.strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed >= 0 else default
+
+
+class QueryEmbedder:
+    """Per-request embedding callable that tallies cache hits for `retrieval_meta`.
+
+    `prefetch` queues texts (e.g. multi-query variants); the first call that needs any of
+    them resolves the whole queue with a single embeddings request.
+    """
+
+    def __init__(self, engine: "RagEngine", model: str | None = None) -> None:
+        self._engine = engine
+        self._model = model
+        self._lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+        self._pending: list[str] = []
+        self._prefetched: dict[str, list[float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _tally(self, cached: bool) -> None:
+        with self._lock:
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def prefetch(self, texts: list[str]) -> None:
+        with self._batch_lock:
+            for text in texts:
+                if text not in self._prefetched and text not in self._pending:
+                    self._pending.append(text)
+
+    def __call__(self, text: str) -> list[float]:
+        with self._batch_lock:
+            if text in self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                for item, (vector, cached) in zip(batch, self._engine.lookup_embeddings(batch, model=self._model)):
+                    self._prefetched[item] = vector
+                    self._tally(cached)
+            prefetched = self._prefetched.get(text)
+        if prefetched is not None:
+            return list(prefetched)
+        vector, cached = self._engine.lookup_embedding(text, model=self._model)
+        self._tally(cached)
+        return vector
+
+    async def aembed_many(self, texts: list[str]) -> list[list[float]]:
+        """Resolve `texts` without blocking the event loop; all misses share one request."""
+        with self._batch_lock:
+            missing = [text for text in dict.fromkeys(texts) if text not in self._prefetched]
+            self._pending = [text for text in self._pending if text not in missing]
+        if missing:
+            results = await self._engine.alookup_embeddings(missing, model=self._model)
+            with self._batch_lock:
+                for item, (vector, cached) in zip(missing, results):
+                    self._prefetched[item] = vector
+                    self._tally(cached)
+        with self._batch_lock:
+            return [list(self._prefetched[text]) for text in texts]
+
+    def cache_meta(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "process_hit_rate": self._engine.embedding_cache.stats()["hit_rate"],
+        }
+
+
+class RagEngine:
+    """Long-lived owner of everything `answer_with_rag` needs besides the question.
+
+    The Supabase client, chat models and the OpenAI embeddings client are built on first
+    use and then reused, so requests skip client construction and connection setup.
+    Prompts and the RAG flag/calibration snapshot are read once at construction; restart
+    the process to pick up flag changes. The `a*` methods are the event-loop request path;
+    their async clients belong to the app's loop and are released by `aclose`.
+    """
+
+    def __init__(
+        self,
+        *,
+        supabase_url: str,
+        supabase_service_key: str,
+        openai_api_key: str,
+        embeddings_model: str,
+        chat_model: str,
+        flags: RagFlags | None = None,
+        supabase: Any | None = None,
+        supabase_rpc: Any | None = None,
+        embedding_cache: QueryEmbeddingCache | None = None,
+        answer_cache: AnswerCache | None = None,
+        corpus_version_ttl_seconds: float | None = None,
+    ) -> None:
+        self.supabase_url = supabase_url
+        self.supabase_service_key = supabase_service_key
+        self.openai_api_key = openai_api_key
+        self.embeddings_model = embeddings_model
+        self.default_chat_model = chat_model
+        self.flags = flags or RagFlags.from_env()
+        self.system_prompt = read_text("prompts/rag/system.txt").strip()
+        self.embedding_cache = embedding_cache or get_shared_query_embedding_cache()
+        self.answer_cache = answer_cache or get_shared_answer_cache()
+        self.corpus_version_ttl_seconds = (
+            corpus_version_ttl_seconds
+            if corpus_version_ttl_seconds is not None
+            else _read_non_negative_float_env("RAG_ANSWER_CACHE_VERSION_TTL_SECONDS", 30.0)
+        )
+        self._corpus_version: str | None = None
+        self._corpus_version_expires_at = 0.0
+        self._corpus_version_rpc_missing = False
+        self._supabase = supabase
+        self._supabase_rpc = supabase_rpc
+        self._async_openai_client: Any | None = None
+        self._chat_llms: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RagEngine":
+        return cls(
+            supabase_url=settings.supabase_url,
+            supabase_service_key=settings.supabase_service_key,
+            openai_api_key=settings.openai_api_key,
+            embeddings_model=settings.embedding_model,
+            chat_model=settings.pipeline_model,
+        )
+
+    @property
+    def supabase(self) -> Any:
+        with self._lock:
+            if self._supabase is None:
+                if not self.supabase_url or not self.supabase_service_key:
+                    raise ConfigurationError("SUPABASE_URL and SUPABASE_SERVICE_KEY are required for RAG retrieval.")
+                from supabase.client import create_client
+
+                self._supabase = create_client(self.supabase_url, self.supabase_service_key)
+            return self._supabase
+
+    @property
+    def supabase_rpc(self) -> Any:
+        with self._lock:
+            if self._supabase_rpc is None:
+                if not self.supabase_url or not self.supabase_service_key:
+                    raise ConfigurationError("SUPABASE_URL and SUPABASE_SERVICE_KEY are required for RAG retrieval.")
+                from openaip_pipeline.adapters.supabase.async_rpc import AsyncSupabaseRpcClient
+
+                self._supabase_rpc = AsyncSupabaseRpcClient(url=self.supabase_url, service_key=self.supabase_service_key)
+            return self._supabase_rpc
+
+    @property
+    def openai_client(self) -> Any:
+        return get_shared_openai_client(self.openai_api_key)
+
+    def _async_openai_client_locked(self) -> Any:
+        if self._async_openai_client is None:
+            self._async_openai_client = build_async_openai_client(self.openai_api_key)
+        return self._async_openai_client
+
+    @property
+    def async_openai_client(self) -> Any:
+        with self._lock:
+            return self._async_openai_client_locked()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            closers = [client for client in (self._supabase_rpc, self._async_openai_client) if client is not None]
+            self._supabase_rpc = None
+            self._async_openai_client = None
+            # Cached chat models send async calls through the client closed below.
+            self._chat_llms.clear()
+        for client in closers:
+            close = getattr(client, "aclose", None) or getattr(client, "close", None)
+            if close is not None:
+                await close()
+
+    def _fresh_corpus_version(self) -> tuple[bool, str | None]:
+        with self._lock:
+            if self._corpus_version is not None and time.monotonic() < self._corpus_version_expires_at:
+                return True, self._corpus_version
+            return self._corpus_version_rpc_missing, None
+
+    def _corpus_version_failed(self, error: Exception) -> None:
+        if getattr(error, "code", None) == "PGRST202":
+            self._corpus_version_rpc_missing = True
+            print(
+                "[RAG] answer cache disabled: get_rag_corpus_version RPC not found. Apply "
+                "supabase/migrations/20261017_rpc_get_rag_corpus_version.sql to enable it.",
+                flush=True,
+            )
+        else:
+            print(f"[RAG] corpus version lookup failed; skipping answer cache: {error}", flush=True)
+
+    def _store_corpus_version(self, data: Any) -> str | None:
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if isinstance(data, dict):
+            data = next(iter(data.values()), None)
+        version = str(data).strip() if data is not None else ""
+        if not version:
+            return None
+        with self._lock:
+            self._corpus_version = version
+            self._corpus_version_expires_at = time.monotonic() + self.corpus_version_ttl_seconds
+        return version
+
+    def corpus_version(self) -> str | None:
+        """Fingerprint of the published corpus, re-read at most every `corpus_version_ttl_seconds`.
+
+        Returns None when it cannot be read; callers must then skip the answer cache.
+        """
+        settled, version = self._fresh_corpus_version()
+        if settled:
+            return version
+        try:
+            data = self.supabase.rpc("get_rag_corpus_version", {}).execute().data
+        except Exception as error:
+            self._corpus_version_failed(error)
+            return None
+        return self._store_corpus_version(data)
+
+    async def acorpus_version(self) -> str | None:
+        settled, version = self._fresh_corpus_version()
+        if settled:
+            return version
+        try:
+            data = await self.supabase_rpc.rpc("get_rag_corpus_version", {})
+        except Exception as error:
+            self._corpus_version_failed(error)
+            return None
+        return self._store_corpus_version(data)
+
+    def chat_llm(self, model: str | None = None) -> Any:
+        resolved = (model or self.default_chat_model).strip() or self.default_chat_model
+        with self._lock:
+            llm = self._chat_llms.get(resolved)
+            if llm is None:
+                from langchain_openai import ChatOpenAI
+
+                # Async calls go through the engine's client, which `aclose` owns; langchain's
+                # default async client is a process-wide cached pool that must not be closed.
+                async_client = self._async_openai_client_locked()
+                llm = ChatOpenAI(
+                    model=resolved,
+                    temperature=0,
+                    api_key=SecretStr(self.openai_api_key),
+                    async_client=async_client.chat.completions,
+                    root_async_client=async_client,
+                )
+                self._chat_llms[resolved] = llm
+            return llm
+
+    def _request_embeddings(self, texts: list[str], model: str) -> list[list[float]]:
+        return _response_vectors(self.openai_client.embeddings.create(model=model, input=texts), len(texts))
+
+    async def _arequest_embeddings(self, texts: list[str], model: str) -> list[list[float]]:
+        response = await self.async_openai_client.embeddings.create(model=model, input=texts)
+        return _response_vectors(response, len(texts))
+
+    def _cached_embeddings(
+        self, texts: list[str], model: str, *, memory_only: bool = False
+    ) -> tuple[list[tuple[list[float], bool] | None], list[int]]:
+        results: list[tuple[list[float], bool] | None] = []
+        missing: list[int] = []
+        for index, text in enumerate(texts):
+            cached = self.embedding_cache.get(text, model, memory_only=memory_only)
+            results.append((cached, True) if cached is not None else None)
+            if cached is None:
+                missing.append(index)
+        return results, missing
+
+    def _fill_embeddings(
+        self,
+        texts: list[str],
+        model: str,
+        results: list[tuple[list[float], bool] | None],
+        missing: list[int],
+        vectors: list[list[float]],
+        *,
+        memory_only: bool = False,
+    ) -> list[tuple[list[float], bool]]:
+        for index, vector in zip(missing, vectors):
+            self.embedding_cache.put(texts[index], model, vector, memory_only=memory_only)
+            results[index] = (vector, False)
+        return [result for result in results if result is not None]
+
+    def lookup_embeddings(self, texts: list[str], *, model: str | None = None) -> list[tuple[list[float], bool]]:
+        """Return `(vector, served_from_cache)` per text, embedding all misses in one request."""
+        resolved = (model or self.embeddings_model).strip() or self.embeddings_model
+        results, missing = self._cached_embeddings(texts, resolved)
+        vectors = self._request_embeddings([texts[index] for index in missing], resolved) if missing else []
+        return self._fill_embeddings(texts, resolved, results, missing, vectors)
+
+    def _persist_embeddings(self, texts: list[str], model: str, vectors: list[list[float]]) -> None:
+        for text, vector in zip(texts, vectors):
+            self.embedding_cache.persist(text, model, vector)
+
+    async def alookup_embeddings(self, texts: list[str], *, model: str | None = None) -> list[tuple[list[float], bool]]:
+        """Async `lookup_embeddings`; only the memory tier is consulted on the event loop.
+
+        The SQLite tier (if enabled) is read and written via `asyncio.to_thread`.
+        """
+        resolved = (model or self.embeddings_model).strip() or self.embeddings_model
+        cache = self.embedding_cache
+        results, missing = self._cached_embeddings(texts, resolved, memory_only=True)
+        if missing and cache.disk_enabled:
+            from_disk, still_missing = await asyncio.to_thread(
+                self._cached_embeddings, [texts[index] for index in missing], resolved
+            )
+            for index, result in zip(missing, from_disk):
+                results[index] = result
+            missing = [missing[position] for position in still_missing]
+        vectors = await self._arequest_embeddings([texts[index] for index in missing], resolved) if missing else []
+        filled = self._fill_embeddings(texts, resolved, results, missing, vectors, memory_only=True)
+        if vectors and cache.disk_enabled:
+            await asyncio.to_thread(self._persist_embeddings, [texts[index] for index in missing], resolved, vectors)
+        return filled
+
+    def lookup_embedding(self, text: str, *, model: str | None = None) -> tuple[list[float], bool]:
+        return self.lookup_embeddings([text], model=model)[0]
+
+    def embed_query(self, text: str, *, model: str | None = None) -> list[float]:
+        return self.lookup_embedding(text, model=model)[0]
+
+    async def aembed_query(self, text: str, *, model: str | None = None) -> list[float]:
+        return (await self.alookup_embeddings([text], model=model))[0][0]
+
+    def query_embedder(self, model: str | None = None) -> QueryEmbedder:
+        return QueryEmbedder(self, model)
+
+    def answer(self, *, question: str, chat_model: str | None = None, **kwargs: Any) -> dict[str, Any]:
+        return answer_with_rag(
+            supabase_url=self.supabase_url,
+            supabase_service_key=self.supabase_service_key,
+            openai_api_key=self.openai_api_key,
+            embeddings_model=self.embeddings_model,
+            chat_model=(chat_model or self.default_chat_model).strip() or self.default_chat_model,
+            question=question,
+            engine=self,
+            **kwargs,
+        )
+
+    async def aanswer(self, *, question: str, chat_model: str | None = None, **kwargs: Any) -> dict[str, Any]:
+        return await aanswer_with_rag(
+            engine=self,
+            question=question,
+            chat_model=(chat_model or self.default_chat_model).strip() or self.default_chat_model,
+            **kwargs,
+        )
+
+
+def _response_vectors(response: Any, expected: int) -> list[list[float]]:
+    data = list(getattr(response, "data", []) or [])
+    if not data:
+        raise RuntimeError("Embedding response is empty.")
+    if len(data) != expected:
+        raise RuntimeError(f"Embedding response has {len(data)} vectors for {expected} inputs.")
+    data.sort(key=lambda item: getattr(item, "index", 0) or 0)
+    vectors: list[list[float]] = []
+    for item in data:
+        embedding = getattr(item, "embedding", None)
+        if not isinstance(embedding, list) or not embedding:
+            raise RuntimeError("Embedding vector missing in response.")
+        if not all(isinstance(value, (int, float)) for value in embedding):
+            raise RuntimeError("Embedding vector contains invalid values.")
+        vectors.append([float(value) for value in embedding])
+    return vectors
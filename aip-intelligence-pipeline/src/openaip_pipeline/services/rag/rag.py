@@ -1,25 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import hashlib
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Generator
 
-from openaip_pipeline.core.resources import read_text
+from openaip_pipeline.services.rag.answer_cache import answer_context_key
 from openaip_pipeline.services.rag.multi_query import (
     build_multi_query_variants,
     multi_query_reason_code,
     merge_multi_query_candidates,
     should_retry_multi_query,
 )
+from openaip_pipeline.services.rag.selection import CandidateFeatures, tokenize
+from openaip_pipeline.services.rag.streaming import astream_llm_content, stream_llm_content
 from openaip_pipeline.services.rag.retriever import (
+    AsyncRpc,
+    aretrieve_dense_docs,
+    aretrieve_keyword_docs,
     fuse_docs_rrf,
     retrieve_dense_docs,
     retrieve_keyword_docs,
 )
 
+if TYPE_CHECKING:
+    from openaip_pipeline.services.rag.engine import QueryEmbedder, RagEngine
+
 SOURCE_TAG_PATTERN = re.compile(r"\[(S\d+)\]")
 YEAR_PATTERN = re.compile(r"\b(20\d{2})\b")
 MAX_SNIPPET_LENGTH = 360
@@ -168,6 +179,10 @@ def _legacy_dual_read_enabled() -> bool:
     return _bool_env("RAG_LEGACY_DUAL_READ_ENABLED", True)
 
 
+def _speculative_dense_fallback_enabled() -> bool:
+    return _bool_env("RAG_SPECULATIVE_DENSE_FALLBACK_ENABLED", False)
+
+
 def _normalize_retrieval_mode(mode: str | None) -> str:
     normalized = (mode or "qa").strip().lower()
     if normalized == "overview":
@@ -182,29 +197,77 @@ def _effective_top_k(*, top_k: int, retrieval_mode: str) -> int:
     return max(3, min(top_k, 5))
 
 
-def _active_rag_flags() -> dict[str, bool]:
-    return {
-        "RAG_HYBRID_RETRIEVAL_ENABLED": _hybrid_retrieval_enabled(),
-        "RAG_KEYWORD_RETRIEVAL_ENABLED": _keyword_retrieval_enabled(),
-        "RAG_RRF_FUSION_ENABLED": _rrf_fusion_enabled(),
-        "RAG_EVIDENCE_GATE_ENABLED": _evidence_gate_enabled(),
-        "RAG_BORDERLINE_PARTIAL_ENABLED": _borderline_partial_enabled(),
-        "RAG_SELECTIVE_MULTI_QUERY_ENABLED": _selective_multi_query_enabled(),
-        "RAG_DIVERSITY_SELECTION_ENABLED": _diversity_selection_enabled(),
-        "RAG_LEGACY_DUAL_READ_ENABLED": _legacy_dual_read_enabled(),
-    }
+@dataclass(frozen=True)
+class RagFlags:
+    """Parsed RAG feature flags and calibration knobs.
+
+    `from_env` reads the same variables as the `_..._enabled()` helpers; a long-lived
+    `RagEngine` parses them once instead of on every request.
+    """
+
+    hybrid_retrieval: bool
+    keyword_retrieval: bool
+    rrf_fusion: bool
+    evidence_gate: bool
+    borderline_partial: bool
+    selective_multi_query: bool
+    diversity_selection: bool
+    legacy_dual_read: bool
+    speculative_dense_fallback: bool
+    partial_mode: bool
+    hybrid_dense_k: int
+    hybrid_keyword_k: int
+    rrf_k: int
+    gate_min_final_docs: int
+    gate_require_year_match: bool
+    borderline_explicit_match_min: float
+    selective_multi_query_max_variants: int
+
+    @classmethod
+    def from_env(cls) -> "RagFlags":
+        return cls(
+            hybrid_retrieval=_hybrid_retrieval_enabled(),
+            keyword_retrieval=_keyword_retrieval_enabled(),
+            rrf_fusion=_rrf_fusion_enabled(),
+            evidence_gate=_evidence_gate_enabled(),
+            borderline_partial=_borderline_partial_enabled(),
+            selective_multi_query=_selective_multi_query_enabled(),
+            diversity_selection=_diversity_selection_enabled(),
+            legacy_dual_read=_legacy_dual_read_enabled(),
+            speculative_dense_fallback=_speculative_dense_fallback_enabled(),
+            partial_mode=_partial_mode_enabled(),
+            hybrid_dense_k=_hybrid_dense_k(),
+            hybrid_keyword_k=_hybrid_keyword_k(),
+            rrf_k=_rrf_k(),
+            gate_min_final_docs=_gate_min_final_docs(),
+            gate_require_year_match=_gate_require_year_match(),
+            borderline_explicit_match_min=_borderline_explicit_match_min(),
+            selective_multi_query_max_variants=_selective_multi_query_max_variants(),
+        )
 
+    def active_flags(self) -> dict[str, bool]:
+        return {
+            "RAG_HYBRID_RETRIEVAL_ENABLED": self.hybrid_retrieval,
+            "RAG_KEYWORD_RETRIEVAL_ENABLED": self.keyword_retrieval,
+            "RAG_RRF_FUSION_ENABLED": self.rrf_fusion,
+            "RAG_EVIDENCE_GATE_ENABLED": self.evidence_gate,
+            "RAG_BORDERLINE_PARTIAL_ENABLED": self.borderline_partial,
+            "RAG_SELECTIVE_MULTI_QUERY_ENABLED": self.selective_multi_query,
+            "RAG_DIVERSITY_SELECTION_ENABLED": self.diversity_selection,
+            "RAG_LEGACY_DUAL_READ_ENABLED": self.legacy_dual_read,
+            "RAG_SPECULATIVE_DENSE_FALLBACK_ENABLED": self.speculative_dense_fallback,
+        }
 
-def _rag_calibration_snapshot() -> dict[str, int | float | bool]:
-    return {
-        "RAG_HYBRID_DENSE_K": _hybrid_dense_k(),
-        "RAG_HYBRID_KEYWORD_K": _hybrid_keyword_k(),
-        "RAG_RRF_K": _rrf_k(),
-        "RAG_GATE_MIN_FINAL_DOCS": _gate_min_final_docs(),
-        "RAG_GATE_REQUIRE_YEAR_MATCH": _gate_require_year_match(),
-        "RAG_BORDERLINE_EXPLICIT_MATCH_MIN": _borderline_explicit_match_min(),
-        "RAG_SELECTIVE_MULTI_QUERY_MAX_VARIANTS": _selective_multi_query_max_variants(),
-    }
+    def calibration(self) -> dict[str, int | float | bool]:
+        return {
+            "RAG_HYBRID_DENSE_K": self.hybrid_dense_k,
+            "RAG_HYBRID_KEYWORD_K": self.hybrid_keyword_k,
+            "RAG_RRF_K": self.rrf_k,
+            "RAG_GATE_MIN_FINAL_DOCS": self.gate_min_final_docs,
+            "RAG_GATE_REQUIRE_YEAR_MATCH": self.gate_require_year_match,
+            "RAG_BORDERLINE_EXPLICIT_MATCH_MIN": self.borderline_explicit_match_min,
+            "RAG_SELECTIVE_MULTI_QUERY_MAX_VARIANTS": self.selective_multi_query_max_variants,
+        }
 
 
 def _evidence_gate_reason_code(reason: str) -> str:
@@ -305,53 +368,151 @@ def run_hybrid_retrieval(
     retrieval_filters: dict[str, Any] | None,
     top_k: int,
     min_similarity: float,
+    flags: RagFlags | None = None,
+    embed_query: Callable[[str], list[float]] | None = None,
 ) -> dict[str, Any]:
+    resolved_flags = flags or RagFlags.from_env()
     resolved_mode = _normalize_retrieval_mode(retrieval_mode)
     effective_top_k = _effective_top_k(top_k=top_k, retrieval_mode=resolved_mode)
-    hybrid_enabled = _hybrid_retrieval_enabled()
-    keyword_enabled = _keyword_retrieval_enabled()
+    dense_k, keyword_k = _channel_sizes(resolved_flags, effective_top_k)
 
-    dense_k = _hybrid_dense_k() if hybrid_enabled else max(1, min(effective_top_k, 12))
-    keyword_k = _hybrid_keyword_k() if hybrid_enabled else 0
-    max_candidates = max(1, min(dense_k + max(0, keyword_k), 60))
+    def dense_channel() -> list[Any]:
+        return retrieve_dense_docs(
+            supabase=supabase,
+            embeddings_model=embeddings_model,
+            question=question,
+            k=dense_k,
+            min_similarity=0.0,
+            retrieval_scope=retrieval_scope,
+            retrieval_mode=resolved_mode,
+            retrieval_filters=retrieval_filters,
+            allow_legacy_fallback=resolved_flags.legacy_dual_read,
+            embed_query=embed_query,
+            speculative_fallbacks=resolved_flags.speculative_dense_fallback,
+        )
+
+    keyword_docs: list[Any] = []
+    if resolved_flags.hybrid_retrieval and resolved_flags.keyword_retrieval:
+        # The keyword channel needs no embedding, so it runs while the dense channel embeds and matches.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-keyword") as executor:
+            keyword_future = executor.submit(
+                retrieve_keyword_docs,
+                supabase=supabase,
+                question=question,
+                k=keyword_k,
+                retrieval_scope=retrieval_scope,
+                min_rank=0.0,
+                retrieval_filters=retrieval_filters,
+            )
+            dense_docs = dense_channel()
+            keyword_docs = keyword_future.result()
+    else:
+        dense_docs = dense_channel()
 
-    dense_docs = retrieve_dense_docs(
-        supabase=supabase,
-        embeddings_model=embeddings_model,
+    return _hybrid_bundle(
+        flags=resolved_flags,
+        dense_docs=dense_docs,
+        keyword_docs=keyword_docs,
+        retrieval_mode=resolved_mode,
+        effective_top_k=effective_top_k,
+        retrieval_filters=retrieval_filters,
+        min_similarity=min_similarity,
+    )
+
+
+async def arun_hybrid_retrieval(
+    *,
+    rpc: AsyncRpc,
+    question: str,
+    query_vector: list[float],
+    retrieval_scope: dict[str, Any] | None,
+    retrieval_mode: str,
+    retrieval_filters: dict[str, Any] | None,
+    top_k: int,
+    min_similarity: float,
+    flags: RagFlags | None = None,
+) -> dict[str, Any]:
+    """`run_hybrid_retrieval` over async RPCs; both channels are awaited concurrently."""
+    resolved_flags = flags or RagFlags.from_env()
+    resolved_mode = _normalize_retrieval_mode(retrieval_mode)
+    effective_top_k = _effective_top_k(top_k=top_k, retrieval_mode=resolved_mode)
+    dense_k, keyword_k = _channel_sizes(resolved_flags, effective_top_k)
+
+    dense_channel = aretrieve_dense_docs(
+        rpc=rpc,
         question=question,
+        query_vector=query_vector,
         k=dense_k,
         min_similarity=0.0,
         retrieval_scope=retrieval_scope,
         retrieval_mode=resolved_mode,
         retrieval_filters=retrieval_filters,
-        allow_legacy_fallback=_legacy_dual_read_enabled(),
+        allow_legacy_fallback=resolved_flags.legacy_dual_read,
+        speculative_fallbacks=resolved_flags.speculative_dense_fallback,
     )
     keyword_docs: list[Any] = []
-    fused_docs: list[Any] = dense_docs[:max_candidates]
-
-    if hybrid_enabled and keyword_enabled:
-        keyword_docs = retrieve_keyword_docs(
-            supabase=supabase,
-            question=question,
-            k=keyword_k,
-            retrieval_scope=retrieval_scope,
-            min_rank=0.0,
-            retrieval_filters=retrieval_filters,
+    if resolved_flags.hybrid_retrieval and resolved_flags.keyword_retrieval:
+        dense_docs, keyword_docs = await asyncio.gather(
+            dense_channel,
+            aretrieve_keyword_docs(
+                rpc=rpc,
+                question=question,
+                k=keyword_k,
+                retrieval_scope=retrieval_scope,
+                min_rank=0.0,
+                retrieval_filters=retrieval_filters,
+            ),
         )
-        if keyword_docs:
-            if _rrf_fusion_enabled():
-                fused_docs = fuse_docs_rrf(
-                    dense_docs=dense_docs,
-                    keyword_docs=keyword_docs,
-                    rrf_k=_rrf_k(),
-                    max_candidates=max_candidates,
-                )
-            else:
-                fused_docs = _merge_ranked_docs(
-                    dense_docs=dense_docs,
-                    keyword_docs=keyword_docs,
-                    max_candidates=max_candidates,
-                )
+    else:
+        dense_docs = await dense_channel
+
+    return _hybrid_bundle(
+        flags=resolved_flags,
+        dense_docs=dense_docs,
+        keyword_docs=keyword_docs,
+        retrieval_mode=resolved_mode,
+        effective_top_k=effective_top_k,
+        retrieval_filters=retrieval_filters,
+        min_similarity=min_similarity,
+    )
+
+
+def _channel_sizes(flags: RagFlags, effective_top_k: int) -> tuple[int, int]:
+    if not flags.hybrid_retrieval:
+        return max(1, min(effective_top_k, 12)), 0
+    return flags.hybrid_dense_k, flags.hybrid_keyword_k
+
+
+def _hybrid_bundle(
+    *,
+    flags: RagFlags,
+    dense_docs: list[Any],
+    keyword_docs: list[Any],
+    retrieval_mode: str,
+    effective_top_k: int,
+    retrieval_filters: dict[str, Any] | None,
+    min_similarity: float,
+) -> dict[str, Any]:
+    hybrid_enabled = flags.hybrid_retrieval
+    keyword_enabled = flags.keyword_retrieval
+    dense_k, keyword_k = _channel_sizes(flags, effective_top_k)
+    max_candidates = max(1, min(dense_k + max(0, keyword_k), 60))
+
+    fused_docs: list[Any] = dense_docs[:max_candidates]
+    if keyword_docs:
+        if flags.rrf_fusion:
+            fused_docs = fuse_docs_rrf(
+                dense_docs=dense_docs,
+                keyword_docs=keyword_docs,
+                rrf_k=flags.rrf_k,
+                max_candidates=max_candidates,
+            )
+        else:
+            fused_docs = _merge_ranked_docs(
+                dense_docs=dense_docs,
+                keyword_docs=keyword_docs,
+                max_candidates=max_candidates,
+            )
 
     # Keep the old dense-threshold behavior when hybrid retrieval is disabled.
     strong_docs = (
@@ -367,12 +528,12 @@ def run_hybrid_retrieval(
     return {
         "hybrid_enabled": hybrid_enabled,
         "keyword_enabled": keyword_enabled and hybrid_enabled,
-        "rrf_enabled": _rrf_fusion_enabled() and hybrid_enabled and keyword_enabled,
+        "rrf_enabled": flags.rrf_fusion and hybrid_enabled and keyword_enabled,
         "dense_docs": dense_docs,
         "keyword_docs": keyword_docs,
         "fused_docs": fused_docs,
         "strong_docs": strong_docs,
-        "retrieval_mode": resolved_mode,
+        "retrieval_mode": retrieval_mode,
         "effective_top_k": effective_top_k,
         "retrieval_filters": retrieval_filters or {},
     }
@@ -393,7 +554,7 @@ def _doc_section_key(doc: Any) -> str:
 
 
 def _token_set(text: str) -> set[str]:
-    return set(re.findall(r"[a-z0-9]{2,}", (text or "").lower()))
+    return tokenize(text)
 
 
 def _text_overlap(a: str, b: str) -> float:
@@ -422,15 +583,18 @@ def _dedupe_exact_docs(docs: list[Any]) -> list[Any]:
     return selected
 
 
+def _candidate_features(ranked: list[Any]) -> CandidateFeatures:
+    return CandidateFeatures(
+        texts=[str(getattr(doc, "page_content", "") or "") for doc in ranked],
+        scores=[_doc_similarity_score(doc) for doc in ranked],
+        section_keys=[_doc_section_key(doc) for doc in ranked],
+    )
+
+
 def _suppress_near_duplicates(docs: list[Any], *, max_overlap: float = 0.92) -> list[Any]:
-    selected: list[Any] = []
     ranked = sorted(docs, key=_doc_similarity_score, reverse=True)
-    for doc in ranked:
-        content = str(getattr(doc, "page_content", "") or "")
-        if any(_text_overlap(content, str(getattr(existing, "page_content", "") or "")) >= max_overlap for existing in selected):
-            continue
-        selected.append(doc)
-    return selected
+    kept = _candidate_features(ranked).suppress_near_duplicates(max_overlap=max_overlap)
+    return [ranked[index] for index in kept]
 
 
 def _select_diverse_docs(
@@ -442,45 +606,15 @@ def _select_diverse_docs(
     if not docs:
         return []
 
-    candidate_docs = _suppress_near_duplicates(_dedupe_exact_docs(docs))
-    if len(candidate_docs) <= max_docs:
-        return candidate_docs
-
-    ranked = sorted(candidate_docs, key=_doc_similarity_score, reverse=True)
-    selected: list[Any] = [ranked[0]]
-    remaining = ranked[1:]
-    target_count = min(max_docs, len(ranked))
-
-    while remaining and len(selected) < target_count:
-        best_index = 0
-        best_score = float("-inf")
-        for index, candidate in enumerate(remaining):
-            relevance = _doc_similarity_score(candidate)
-            max_content_overlap = max(
-                (
-                    _text_overlap(
-                        str(getattr(candidate, "page_content", "") or ""),
-                        str(getattr(existing, "page_content", "") or ""),
-                    )
-                    for existing in selected
-                ),
-                default=0.0,
-            )
-            section_penalty = 0.0
-            candidate_section = _doc_section_key(candidate)
-            if any(_doc_section_key(existing) == candidate_section for existing in selected):
-                section_penalty = 0.15
-
-            mmr_score = relevance - (0.35 * max_content_overlap) - section_penalty
-            if mmr_score > best_score:
-                best_score = mmr_score
-                best_index = index
-
-        selected.append(remaining.pop(best_index))
-        if len(selected) >= min_docs and len(selected) >= max_docs:
-            break
+    # Each candidate is tokenized once; dedupe and MMR both read the same overlap matrix.
+    ranked = _dedupe_exact_docs(docs)
+    features = _candidate_features(ranked)
+    kept = features.suppress_near_duplicates(max_overlap=0.92)
+    if len(kept) <= max_docs:
+        return [ranked[index] for index in kept]
 
-    return selected[:max_docs]
+    picked = features.subset(kept).mmr(max_docs=max_docs, overlap_weight=0.35, section_penalty=0.15)
+    return [ranked[kept[index]] for index in picked]
 
 
 def _build_citation(index: int, doc: Any, *, insufficient: bool = False) -> dict[str, Any]:
@@ -745,6 +879,7 @@ def evaluate_evidence_gate(
     *,
     question: str,
     selected_docs: list[Any],
+    flags: RagFlags | None = None,
 ) -> dict[str, Any]:
     if not selected_docs:
         return {
@@ -788,7 +923,8 @@ def evaluate_evidence_gate(
         default=0.0,
     )
 
-    min_final_docs = _gate_min_final_docs()
+    min_final_docs = flags.gate_min_final_docs if flags is not None else _gate_min_final_docs()
+    require_year_match = flags.gate_require_year_match if flags is not None else _gate_require_year_match()
     if final_count < min_final_docs:
         return {
             "decision": "clarify",
@@ -802,7 +938,7 @@ def evaluate_evidence_gate(
             },
         }
 
-    if requested_years and _gate_require_year_match() and year_match_count == 0:
+    if requested_years and require_year_match and year_match_count == 0:
         return {
             "decision": "refuse",
             "reason": "explicit_year_not_found",
@@ -846,6 +982,7 @@ def evaluate_borderline_semantic_evidence(
     *,
     question: str,
     selected_docs: list[Any],
+    flags: RagFlags | None = None,
 ) -> dict[str, Any]:
     # Hard guard: zero selected docs always resolve to refusal path, never borderline partial.
     if not selected_docs:
@@ -864,7 +1001,9 @@ def evaluate_borderline_semantic_evidence(
         default=0.0,
     )
     top_similarity = max((_doc_similarity_score(doc) for doc in selected_docs), default=0.0)
-    explicit_match_min = _borderline_explicit_match_min()
+    explicit_match_min = (
+        flags.borderline_explicit_match_min if flags is not None else _borderline_explicit_match_min()
+    )
 
     is_related = top_overlap >= 0.02 and top_similarity >= 0.2
     has_explicit_match = top_overlap >= explicit_match_min
@@ -891,6 +1030,138 @@ def evaluate_borderline_semantic_evidence(
     }
 
 
+def _answer_cacheable(result: dict[str, Any]) -> bool:
+    # Cache generated answers and outcomes decided before generation; LLM validation or
+    # verifier failures may be transient and are retried on the next ask.
+    meta = result.get("retrieval_meta") or {}
+    if meta.get("response_mode_source") == "pipeline_generated":
+        return True
+    return "generation_ms" not in (meta.get("stage_latency_ms") or {})
+
+
+@dataclass(frozen=True)
+class _CorpusVersionStep:
+    pass
+
+
+@dataclass(frozen=True)
+class _EmbeddingStep:
+    text: str
+
+
+@dataclass(frozen=True)
+class _RetrievalStep:
+    questions: list[str]
+    retrieval_scope: dict[str, Any]
+    retrieval_mode: str
+    retrieval_filters: dict[str, Any] | None
+    top_k: int
+    min_similarity: float
+
+
+@dataclass(frozen=True)
+class _LLMStep:
+    model: str
+    messages: list[dict[str, str]]
+    on_token: Callable[[str], None] | None = None
+
+
+# The answer flow is written once as a generator that yields its I/O (`_*Step`) and
+# receives the results; `_drive` performs them with blocking clients and `_adrive` with
+# async ones, so the sync and async entry points share every gate and validation rule.
+_AnswerSteps = Generator[Any, Any, dict[str, Any]]
+
+
+def _drive(steps: _AnswerSteps, *, engine: RagEngine, embeddings_model: str, query_embedder: QueryEmbedder) -> dict[str, Any]:
+    value: Any = None
+    while True:
+        try:
+            step = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        if isinstance(step, _CorpusVersionStep):
+            value = engine.corpus_version()
+        elif isinstance(step, _EmbeddingStep):
+            value = engine.embed_query(step.text, model=embeddings_model)
+        elif isinstance(step, _RetrievalStep):
+            def retrieve(
+                question: str, retrieval: _RetrievalStep = step, supabase: Any = engine.supabase
+            ) -> dict[str, Any]:
+                return run_hybrid_retrieval(
+                    supabase=supabase,
+                    embeddings_model=embeddings_model,
+                    question=question,
+                    retrieval_scope=retrieval.retrieval_scope,
+                    retrieval_mode=retrieval.retrieval_mode,
+                    retrieval_filters=retrieval.retrieval_filters,
+                    top_k=retrieval.top_k,
+                    min_similarity=retrieval.min_similarity,
+                    flags=engine.flags,
+                    embed_query=query_embedder,
+                )
+
+            if len(step.questions) == 1:
+                value = [retrieve(step.questions[0])]
+            else:
+                # All variants are embedded in one request, then retrieved concurrently.
+                query_embedder.prefetch(step.questions)
+                with ThreadPoolExecutor(max_workers=len(step.questions), thread_name_prefix="rag-variant") as executor:
+                    value = list(executor.map(retrieve, step.questions))
+        elif isinstance(step, _LLMStep):
+            llm = engine.chat_llm(step.model)
+            if step.on_token is not None:
+                value = stream_llm_content(llm, step.messages, step.on_token)
+            else:
+                value = str(getattr(llm.invoke(step.messages), "content", ""))
+        else:
+            raise TypeError(f"Unknown answer step: {step!r}")
+
+
+async def _adrive(
+    steps: _AnswerSteps, *, engine: RagEngine, embeddings_model: str, query_embedder: QueryEmbedder
+) -> dict[str, Any]:
+    value: Any = None
+    while True:
+        try:
+            step = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        if isinstance(step, _CorpusVersionStep):
+            value = await engine.acorpus_version()
+        elif isinstance(step, _EmbeddingStep):
+            value = await engine.aembed_query(step.text, model=embeddings_model)
+        elif isinstance(step, _RetrievalStep):
+            rpc = engine.supabase_rpc.rpc
+            # Every question (multi-query variants included) is embedded in one request.
+            vectors = await query_embedder.aembed_many(step.questions)
+            value = list(
+                await asyncio.gather(
+                    *(
+                        arun_hybrid_retrieval(
+                            rpc=rpc,
+                            question=question,
+                            query_vector=vector,
+                            retrieval_scope=step.retrieval_scope,
+                            retrieval_mode=step.retrieval_mode,
+                            retrieval_filters=step.retrieval_filters,
+                            top_k=step.top_k,
+                            min_similarity=step.min_similarity,
+                            flags=engine.flags,
+                        )
+                        for question, vector in zip(step.questions, vectors)
+                    )
+                )
+            )
+        elif isinstance(step, _LLMStep):
+            llm = engine.chat_llm(step.model)
+            if step.on_token is not None:
+                value = await astream_llm_content(llm, step.messages, step.on_token)
+            else:
+                value = str(getattr(await llm.ainvoke(step.messages), "content", ""))
+        else:
+            raise TypeError(f"Unknown answer step: {step!r}")
+
+
 def answer_with_rag(
     *,
     supabase_url: str,
@@ -905,23 +1176,217 @@ def answer_with_rag(
     top_k: int = 4,
     min_similarity: float = 0.3,
     metadata_filter: dict[str, Any] | None = None,
+    engine: RagEngine | None = None,
+    on_selection: Callable[[dict[str, Any]], None] | None = None,
+    on_token: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Answer `question` from retrieved AIP evidence.
+
+    Streaming callers pass `on_selection`, called once with the retrieval metadata and
+    candidate citations when the evidence gate lets generation proceed, and `on_token`,
+    called with answer text deltas while the model generates. The returned result is the
+    same validated answer either way; cache hits and gated outcomes call neither.
+    """
+    started_at = time.perf_counter()
+    if engine is None:
+        from openaip_pipeline.services.rag.engine import RagEngine
+
+        # One-off callers (worker traces, scripts) get a throwaway engine; the API reuses one.
+        engine = RagEngine(
+            supabase_url=supabase_url,
+            supabase_service_key=supabase_service_key,
+            openai_api_key=openai_api_key,
+            embeddings_model=embeddings_model,
+            chat_model=chat_model,
+        )
+    query_embedder = engine.query_embedder(embeddings_model)
+    steps = _answer_steps(
+        engine=engine,
+        chat_model=chat_model,
+        question=question,
+        retrieval_scope=retrieval_scope,
+        retrieval_mode=retrieval_mode,
+        retrieval_filters=retrieval_filters,
+        top_k=top_k,
+        min_similarity=min_similarity,
+        metadata_filter=metadata_filter,
+        query_embedder=query_embedder,
+        started_at=started_at,
+        on_selection=on_selection,
+        on_token=on_token,
+    )
+    return _drive(steps, engine=engine, embeddings_model=embeddings_model, query_embedder=query_embedder)
+
+
+async def aanswer_with_rag(
+    *,
+    engine: RagEngine,
+    question: str,
+    chat_model: str | None = None,
+    embeddings_model: str | None = None,
+    retrieval_scope: dict[str, Any] | None = None,
+    retrieval_mode: str = "qa",
+    retrieval_filters: dict[str, Any] | None = None,
+    top_k: int = 4,
+    min_similarity: float = 0.3,
+    metadata_filter: dict[str, Any] | None = None,
+    on_selection: Callable[[dict[str, Any]], None] | None = None,
+    on_token: Callable[[str], None] | None = None,
 ) -> dict[str, Any]:
-    from langchain_openai import ChatOpenAI
-    from supabase.client import create_client
+    """Event-loop variant of `answer_with_rag`: same result, no blocking I/O.
 
+    Retrieval RPCs, embeddings and generation all go through async clients, so a request
+    holds no thread while it waits on Supabase or OpenAI.
+    """
     started_at = time.perf_counter()
+    resolved_embeddings_model = embeddings_model or engine.embeddings_model
+    query_embedder = engine.query_embedder(resolved_embeddings_model)
+    steps = _answer_steps(
+        engine=engine,
+        chat_model=chat_model or engine.default_chat_model,
+        question=question,
+        retrieval_scope=retrieval_scope,
+        retrieval_mode=retrieval_mode,
+        retrieval_filters=retrieval_filters,
+        top_k=top_k,
+        min_similarity=min_similarity,
+        metadata_filter=metadata_filter,
+        query_embedder=query_embedder,
+        started_at=started_at,
+        on_selection=on_selection,
+        on_token=on_token,
+    )
+    return await _adrive(
+        steps,
+        engine=engine,
+        embeddings_model=resolved_embeddings_model,
+        query_embedder=query_embedder,
+    )
+
+
+def _answer_steps(
+    *,
+    engine: RagEngine,
+    chat_model: str,
+    question: str,
+    retrieval_scope: dict[str, Any] | None,
+    retrieval_mode: str,
+    retrieval_filters: dict[str, Any] | None,
+    top_k: int,
+    min_similarity: float,
+    metadata_filter: dict[str, Any] | None,
+    query_embedder: QueryEmbedder,
+    started_at: float,
+    on_selection: Callable[[dict[str, Any]], None] | None,
+    on_token: Callable[[str], None] | None,
+) -> _AnswerSteps:
+    pipeline_kwargs: dict[str, Any] = {
+        "chat_model": chat_model,
+        "question": question,
+        "retrieval_scope": retrieval_scope,
+        "retrieval_mode": retrieval_mode,
+        "retrieval_filters": retrieval_filters,
+        "top_k": top_k,
+        "min_similarity": min_similarity,
+        "metadata_filter": metadata_filter,
+        "flags": engine.flags,
+        "system_prompt": engine.system_prompt,
+        "query_embedder": query_embedder,
+        "started_at": started_at,
+        "on_selection": on_selection,
+        "on_token": on_token,
+    }
+    answer_cache = engine.answer_cache
+    if not answer_cache.enabled:
+        return (yield from _answer_pipeline_steps(**pipeline_kwargs))
+
+    context_key = answer_context_key(
+        retrieval_scope=retrieval_scope,
+        retrieval_filters=retrieval_filters,
+        retrieval_mode=_normalize_retrieval_mode(retrieval_mode),
+        chat_model=chat_model,
+        top_k=top_k,
+        min_similarity=min_similarity,
+    )
+    corpus_version = yield _CorpusVersionStep()
+    question_embedding: list[float] | None = None
+    hit = None
+    if corpus_version is not None:
+        if answer_cache.semantic_enabled:
+            # Served from the query-embedding cache; retrieval reuses it on a miss.
+            question_embedding = yield _EmbeddingStep(question)
+        hit = answer_cache.get(
+            question=question,
+            context_key=context_key,
+            corpus_version=corpus_version,
+            embedding=question_embedding,
+        )
+    lookup_ms = round((time.perf_counter() - started_at) * 1000.0, 3)
+
+    if hit is not None:
+        result = hit.result
+        result["question"] = question
+        meta = dict(result.get("retrieval_meta") or {})
+        meta["answer_cache"] = {
+            "hit": True,
+            "match": hit.match,
+            "similarity": round(hit.similarity, 4),
+            "age_seconds": round(hit.age_seconds, 3),
+        }
+        meta["stage_latency_ms"] = {
+            "answer_cache_hit": True,
+            "answer_cache_lookup_ms": lookup_ms,
+            "total_ms": round((time.perf_counter() - started_at) * 1000.0, 3),
+        }
+        result["retrieval_meta"] = meta
+        return result
+
+    result = yield from _answer_pipeline_steps(**pipeline_kwargs)
+    if corpus_version is not None and _answer_cacheable(result):
+        answer_cache.put(
+            question=question,
+            context_key=context_key,
+            corpus_version=corpus_version,
+            result=result,
+            embedding=question_embedding,
+        )
+    meta = dict(result.get("retrieval_meta") or {})
+    meta["answer_cache"] = {"hit": False, "corpus_version_available": corpus_version is not None}
+    meta["stage_latency_ms"] = {
+        **dict(meta.get("stage_latency_ms") or {}),
+        "answer_cache_hit": False,
+        "answer_cache_lookup_ms": lookup_ms,
+    }
+    result["retrieval_meta"] = meta
+    return result
+
+
+def _answer_pipeline_steps(
+    *,
+    chat_model: str,
+    question: str,
+    retrieval_scope: dict[str, Any] | None,
+    retrieval_mode: str,
+    retrieval_filters: dict[str, Any] | None,
+    top_k: int,
+    min_similarity: float,
+    metadata_filter: dict[str, Any] | None,
+    flags: RagFlags,
+    system_prompt: str,
+    query_embedder: QueryEmbedder,
+    started_at: float,
+    on_selection: Callable[[dict[str, Any]], None] | None,
+    on_token: Callable[[str], None] | None,
+) -> _AnswerSteps:
     stage_latency_ms: dict[str, float] = {}
-    active_rag_flags = _active_rag_flags()
-    rag_calibration = _rag_calibration_snapshot()
+    active_rag_flags = flags.active_flags()
+    rag_calibration = flags.calibration()
     resolved_scope = retrieval_scope or {"mode": "global", "targets": []}
     resolved_mode = _normalize_retrieval_mode(retrieval_mode)
     effective_top_k = _effective_top_k(top_k=top_k, retrieval_mode=resolved_mode)
-    supabase = create_client(supabase_url, supabase_service_key)
     retrieval_started_at = time.perf_counter()
-    retrieval_bundle = run_hybrid_retrieval(
-        supabase=supabase,
-        embeddings_model=embeddings_model,
-        question=question,
+    (retrieval_bundle,) = yield _RetrievalStep(
+        questions=[question],
         retrieval_scope=resolved_scope,
         retrieval_mode=resolved_mode,
         retrieval_filters=retrieval_filters,
@@ -937,7 +1402,7 @@ def answer_with_rag(
     effective_top_k = int(retrieval_bundle.get("effective_top_k") or effective_top_k)
     resolved_mode = _normalize_retrieval_mode(str(retrieval_bundle.get("retrieval_mode") or resolved_mode))
     applied_filters = dict(retrieval_bundle.get("retrieval_filters") or retrieval_filters or {})
-    diversity_enabled = _diversity_selection_enabled()
+    diversity_enabled = flags.diversity_selection
 
     dense_candidate_count = len(dense_docs)
     keyword_candidate_count = len(keyword_docs)
@@ -981,6 +1446,7 @@ def answer_with_rag(
         if selected_count > 0 and selected_docs:
             dense_final_count, keyword_final_count = _count_channel_contribution(selected_docs)
         merged_extra_meta = dict(retrieval_context_meta)
+        merged_extra_meta["embedding_cache"] = query_embedder.cache_meta()
         if isinstance(extra_meta, dict):
             merged_extra_meta.update(extra_meta)
         return _attach_selection_meta(
@@ -1028,7 +1494,7 @@ def answer_with_rag(
         )
 
     if not effective_strong_docs:
-        if docs and _partial_mode_enabled():
+        if docs and flags.partial_mode:
             response_mode_source = "pipeline_partial"
             borderline_detected = False
             borderline_reason_code = "partial_mode_initial_fallback"
@@ -1075,14 +1541,14 @@ def answer_with_rag(
     )
     stage_latency_ms["selection_ms"] = round((time.perf_counter() - selection_started_at) * 1000.0, 3)
 
-    if _evidence_gate_enabled():
+    if flags.evidence_gate:
         gate_started_at = time.perf_counter()
-        gate = evaluate_evidence_gate(question=question, selected_docs=selected_docs)
+        gate = evaluate_evidence_gate(question=question, selected_docs=selected_docs, flags=flags)
         gate_decision = str(gate.get("decision") or "clarify")
         gate_reason = str(gate.get("reason") or "gate_blocked")
         gate_reason_code = _evidence_gate_reason_code(gate_reason)
         gate_metrics = dict(gate.get("metrics") or {})
-        if gate_decision != "allow" and _selective_multi_query_enabled():
+        if gate_decision != "allow" and flags.selective_multi_query:
             should_retry, retry_reason = should_retry_multi_query(
                 gate_decision=gate_decision,
                 gate_reason=gate_reason,
@@ -1090,26 +1556,24 @@ def answer_with_rag(
             if should_retry:
                 variants = build_multi_query_variants(
                     question=question,
-                    max_variants=_selective_multi_query_max_variants(),
+                    max_variants=flags.selective_multi_query_max_variants,
                 )
                 if variants:
                     multi_query_triggered = True
                     multi_query_variant_count = len(variants)
                     multi_query_reason = retry_reason or "retryable_low_confidence"
                     multi_query_reason_code_value = multi_query_reason_code(multi_query_reason)
+                    variant_bundles = yield _RetrievalStep(
+                        questions=variants,
+                        retrieval_scope=resolved_scope,
+                        retrieval_mode=resolved_mode,
+                        retrieval_filters=applied_filters,
+                        top_k=effective_top_k,
+                        min_similarity=min_similarity,
+                    )
 
                     variant_docs: list[Any] = []
-                    for variant in variants:
-                        variant_bundle = run_hybrid_retrieval(
-                            supabase=supabase,
-                            embeddings_model=embeddings_model,
-                            question=variant,
-                            retrieval_scope=resolved_scope,
-                            retrieval_mode=resolved_mode,
-                            retrieval_filters=applied_filters,
-                            top_k=effective_top_k,
-                            min_similarity=min_similarity,
-                        )
+                    for variant_bundle in variant_bundles:
                         variant_strong_docs = list(variant_bundle.get("strong_docs") or [])
                         if variant_strong_docs:
                             variant_docs.extend(variant_strong_docs)
@@ -1131,7 +1595,7 @@ def answer_with_rag(
                             if diversity_enabled
                             else effective_strong_docs[: min(selection_max_docs, len(effective_strong_docs))]
                         )
-                        gate = evaluate_evidence_gate(question=question, selected_docs=selected_docs)
+                        gate = evaluate_evidence_gate(question=question, selected_docs=selected_docs, flags=flags)
                         gate_decision = str(gate.get("decision") or "clarify")
                         gate_reason = str(gate.get("reason") or "gate_blocked")
                         gate_reason_code = _evidence_gate_reason_code(gate_reason)
@@ -1178,8 +1642,17 @@ def answer_with_rag(
                 extra_meta=gate_metrics,
             )
 
-    llm = ChatOpenAI(model=chat_model, temperature=0, api_key=openai_api_key)
-    system_prompt = read_text("prompts/rag/system.txt").strip()
+    if on_selection is not None:
+        on_selection(
+            attach(
+                {
+                    "question": question,
+                    "citations": [_build_citation(index, doc) for index, doc in enumerate(selected_docs, start=1)],
+                },
+                selected_count=len(selected_docs),
+                extra_meta=gate_metrics,
+            )
+        )
 
     generation_instruction = (
         "Return strict JSON with keys: answer, used_source_ids.\n"
@@ -1194,15 +1667,14 @@ def answer_with_rag(
         f"Context:\n{_format_context(selected_docs)}\n\n"
         f"{generation_instruction}"
     )
+    generation_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": generation_user_prompt},
+    ]
     generation_started_at = time.perf_counter()
-    generation_response = llm.invoke(
-        [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": generation_user_prompt},
-        ]
-    )
+    generation_content = yield _LLMStep(chat_model, generation_messages, on_token)
     stage_latency_ms["generation_ms"] = round((time.perf_counter() - generation_started_at) * 1000.0, 3)
-    parsed_generation = _extract_json(str(getattr(generation_response, "content", "")) or "")
+    parsed_generation = _extract_json(generation_content or "")
     if not parsed_generation:
         return attach(
             _build_refusal(
@@ -1289,25 +1761,27 @@ def answer_with_rag(
         f"Context:\n{_format_context(selected_docs)}"
     )
     verifier_started_at = time.perf_counter()
-    verifier_response = llm.invoke(
+    verifier_content = yield _LLMStep(
+        chat_model,
         [
             {"role": "system", "content": verifier_prompt},
             {"role": "user", "content": verifier_user_prompt},
-        ]
+        ],
     )
     stage_latency_ms["verification_ms"] = round((time.perf_counter() - verifier_started_at) * 1000.0, 3)
-    parsed_verifier = _extract_json(str(getattr(verifier_response, "content", "")) or "")
+    parsed_verifier = _extract_json(verifier_content or "")
     verifier_passed = bool(parsed_verifier and parsed_verifier.get("supported") is True)
     if not verifier_passed:
         borderline_eval = evaluate_borderline_semantic_evidence(
             question=question,
             selected_docs=selected_docs,
+            flags=flags,
         )
         borderline_detected = bool(borderline_eval.get("is_borderline") is True)
         borderline_reason_code = str(borderline_eval.get("reason_code") or "not_borderline")
         borderline_metrics = dict(borderline_eval.get("metrics") or {})
 
-        if _borderline_partial_enabled() and borderline_detected:
+        if flags.borderline_partial and borderline_detected:
             response_mode_source = "pipeline_partial"
             return attach(
                 _build_partial_evidence(
@@ -1328,7 +1802,7 @@ def answer_with_rag(
                 response_mode_source_override="pipeline_partial",
             )
 
-        if _partial_mode_enabled():
+        if flags.partial_mode:
             response_mode_source = "pipeline_partial"
             return attach(
                 _build_partial_evidence(
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import re
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
 
 YEAR_PATTERN = re.compile(r"\b(20\d{2})\b")
 MULTI_YEAR_CUE_PATTERN = re.compile(
@@ -64,9 +66,7 @@ def _token_set(text: str) -> set[str]:
     return set(TOKEN_PATTERN.findall(_normalize_text(text)))
 
 
-def _overlap_score(question: str, content: str) -> float:
-    q_tokens = _token_set(question)
-    c_tokens = _token_set(content)
+def _token_overlap(q_tokens: set[str], c_tokens: set[str]) -> float:
     if not q_tokens or not c_tokens:
         return 0.0
     union = q_tokens | c_tokens
@@ -286,11 +286,13 @@ def _rerank_rows(
         _normalize_tag_list(filters.get("sector_tags"))
     )
 
+    # Tokenize the question once rather than once per row.
+    question_tokens = _token_set(question)
     scored_rows: list[dict[str, Any]] = []
     for row in rows:
         content = str(row.get("content") or "")
         semantic = float(row.get("similarity") or 0.0)
-        lexical_overlap = _overlap_score(question, content)
+        lexical_overlap = _token_overlap(question_tokens, _token_set(content))
         row_tags = _row_tag_set(row)
         tag_overlap = (
             float(len(preferred_tags & row_tags)) / float(max(1, len(preferred_tags)))
@@ -346,22 +348,21 @@ def _to_document(*, row: dict[str, Any], channel: str) -> Any:
     )
 
 
-def retrieve_dense_docs(
+AsyncRpc = Callable[[str, dict[str, Any]], Awaitable[Any]]
+
+
+def _dense_rpc_plan(
     *,
-    supabase: Any,
-    embeddings_model: str,
+    query_vector: list[float],
     question: str,
-    k: int = 8,
-    min_similarity: float = 0.0,
-    retrieval_scope: dict[str, Any] | None = None,
-    retrieval_mode: str = "qa",
-    retrieval_filters: dict[str, Any] | None = None,
-    allow_legacy_fallback: bool = True,
-) -> list[Any]:
-    from langchain_openai import OpenAIEmbeddings
-
-    embeddings = OpenAIEmbeddings(model=embeddings_model)
-    query_vector = embeddings.embed_query(question)
+    k: int,
+    min_similarity: float,
+    retrieval_scope: dict[str, Any] | None,
+    retrieval_mode: str,
+    retrieval_filters: dict[str, Any] | None,
+    allow_legacy_fallback: bool,
+) -> tuple[dict[str, Any], tuple[str, dict[str, Any]], list[tuple[str, dict[str, Any]]]]:
+    """Normalized filters, the primary match RPC, and the fallback RPCs used when it is sparse."""
     scope_mode, targets, own_barangay_id = _scope_params(retrieval_scope)
     normalized_filters = _normalize_retrieval_filters(
         retrieval_filters,
@@ -369,39 +370,32 @@ def retrieve_dense_docs(
         retrieval_scope=retrieval_scope,
     )
     include_summary_chunks = retrieval_mode == "overview"
+    v2_params = {
+        "query_embedding": query_vector,
+        "match_count": k,
+        "min_similarity": min_similarity,
+        "scope_mode": scope_mode,
+        "own_barangay_id": own_barangay_id,
+        "scope_targets": targets,
+        "filter_fiscal_year": normalized_filters.get("fiscal_year"),
+        "filter_scope_type": normalized_filters.get("scope_type"),
+        "filter_scope_name": normalized_filters.get("scope_name"),
+        "filter_document_type": normalized_filters.get("document_type"),
+        "filter_publication_status": normalized_filters.get("publication_status"),
+        "filter_office_name": normalized_filters.get("office_name"),
+        "filter_theme_tags": normalized_filters.get("theme_tags"),
+        "filter_sector_tags": normalized_filters.get("sector_tags"),
+        "include_summary_chunks": include_summary_chunks,
+    }
 
-    rows: list[dict[str, Any]] = []
-    try:
-        params = {
-            "query_embedding": query_vector,
-            "match_count": k,
-            "min_similarity": min_similarity,
-            "scope_mode": scope_mode,
-            "own_barangay_id": own_barangay_id,
-            "scope_targets": targets,
-            "filter_fiscal_year": normalized_filters.get("fiscal_year"),
-            "filter_scope_type": normalized_filters.get("scope_type"),
-            "filter_scope_name": normalized_filters.get("scope_name"),
-            "filter_document_type": normalized_filters.get("document_type"),
-            "filter_publication_status": normalized_filters.get("publication_status"),
-            "filter_office_name": normalized_filters.get("office_name"),
-            "filter_theme_tags": normalized_filters.get("theme_tags"),
-            "filter_sector_tags": normalized_filters.get("sector_tags"),
-            "include_summary_chunks": include_summary_chunks,
-        }
-        v2_result = supabase.rpc("match_published_aip_project_chunks_v2", params).execute()
-        rows = list(v2_result.data or [])
-    except Exception:
-        rows = []
-
-    rows = [row for row in rows if _row_matches_filters(row, normalized_filters)]
-    rows = _rerank_rows(rows, question=question, filters=normalized_filters, limit=k)
-
-    # QA mode falls back to summaries only when evidence is sparse.
-    if retrieval_mode == "qa" and len(rows) < min(2, max(1, k)):
-        try:
-            summary_result = supabase.rpc(
-                "match_published_aip_project_chunks_v2",
+    # QA mode falls back to summaries only when evidence is sparse; legacy is the rollout dual-read.
+    fallbacks: list[tuple[str, dict[str, Any]]] = []
+    if retrieval_mode == "qa":
+        fallbacks.append(("match_published_aip_project_chunks_v2", {**v2_params, "include_summary_chunks": True}))
+    if allow_legacy_fallback:
+        fallbacks.append(
+            (
+                "match_published_aip_chunks",
                 {
                     "query_embedding": query_vector,
                     "match_count": k,
@@ -409,42 +403,70 @@ def retrieve_dense_docs(
                     "scope_mode": scope_mode,
                     "own_barangay_id": own_barangay_id,
                     "scope_targets": targets,
-                    "filter_fiscal_year": normalized_filters.get("fiscal_year"),
-                    "filter_scope_type": normalized_filters.get("scope_type"),
-                    "filter_scope_name": normalized_filters.get("scope_name"),
-                    "filter_document_type": normalized_filters.get("document_type"),
-                    "filter_publication_status": normalized_filters.get("publication_status"),
-                    "filter_office_name": normalized_filters.get("office_name"),
-                    "filter_theme_tags": normalized_filters.get("theme_tags"),
-                    "filter_sector_tags": normalized_filters.get("sector_tags"),
-                    "include_summary_chunks": True,
                 },
-            ).execute()
-            summary_rows = [row for row in list(summary_result.data or []) if _row_matches_filters(row, normalized_filters)]
-            summary_rows = _rerank_rows(summary_rows, question=question, filters=normalized_filters, limit=k)
-            rows = _merge_rows(rows, summary_rows, limit=k)
-        except Exception:
-            pass
+            )
+        )
+    return normalized_filters, ("match_published_aip_project_chunks_v2", v2_params), fallbacks
+
 
-    # Dual-read fallback during rollout.
-    if allow_legacy_fallback and len(rows) < min(2, max(1, k)):
+def _matched_rows(data: Any, *, question: str, filters: dict[str, Any], k: int) -> list[dict[str, Any]]:
+    rows = [row for row in list(data or []) if _row_matches_filters(row, filters)]
+    return _rerank_rows(rows, question=question, filters=filters, limit=k)
+
+
+def retrieve_dense_docs(
+    *,
+    supabase: Any,
+    embeddings_model: str,
+    question: str,
+    k: int = 8,
+    min_similarity: float = 0.0,
+    retrieval_scope: dict[str, Any] | None = None,
+    retrieval_mode: str = "qa",
+    retrieval_filters: dict[str, Any] | None = None,
+    allow_legacy_fallback: bool = True,
+    embed_query: Callable[[str], list[float]] | None = None,
+    speculative_fallbacks: bool = False,
+) -> list[Any]:
+    if embed_query is None:
+        from langchain_openai import OpenAIEmbeddings
+
+        embed_query = OpenAIEmbeddings(model=embeddings_model).embed_query
+    normalized_filters, primary, fallbacks = _dense_rpc_plan(
+        query_vector=embed_query(question),
+        question=question,
+        k=k,
+        min_similarity=min_similarity,
+        retrieval_scope=retrieval_scope,
+        retrieval_mode=retrieval_mode,
+        retrieval_filters=retrieval_filters,
+        allow_legacy_fallback=allow_legacy_fallback,
+    )
+
+    def match_rows(call: tuple[str, dict[str, Any]]) -> list[dict[str, Any]]:
+        function_name, params = call
         try:
-            legacy_result = supabase.rpc(
-                "match_published_aip_chunks",
-                {
-                    "query_embedding": query_vector,
-                    "match_count": k,
-                    "min_similarity": min_similarity,
-                    "scope_mode": scope_mode,
-                    "own_barangay_id": own_barangay_id,
-                    "scope_targets": targets,
-                },
-            ).execute()
-            legacy_rows = [row for row in list(legacy_result.data or []) if _row_matches_filters(row, normalized_filters)]
-            legacy_rows = _rerank_rows(legacy_rows, question=question, filters=normalized_filters, limit=k)
-            rows = _merge_rows(rows, legacy_rows, limit=k)
+            result = supabase.rpc(function_name, params).execute()
+            return _matched_rows(result.data, question=question, filters=normalized_filters, k=k)
         except Exception:
-            pass
+            return []
+
+    sparse_threshold = min(2, max(1, k))
+    if speculative_fallbacks and fallbacks:
+        # Issue the fallbacks alongside the primary RPC; their rows are only merged when the
+        # sequential path would have called them, so results match and only latency changes.
+        with ThreadPoolExecutor(max_workers=len(fallbacks), thread_name_prefix="rag-dense-fallback") as executor:
+            futures = [executor.submit(match_rows, call) for call in fallbacks]
+            rows = match_rows(primary)
+            for future in futures:
+                fallback_rows = future.result()
+                if len(rows) < sparse_threshold:
+                    rows = _merge_rows(rows, fallback_rows, limit=k)
+    else:
+        rows = match_rows(primary)
+        for call in fallbacks:
+            if len(rows) < sparse_threshold:
+                rows = _merge_rows(rows, match_rows(call), limit=k)
 
     docs: list[Any] = []
     for row in rows[:k]:
@@ -452,40 +474,130 @@ def retrieve_dense_docs(
     return docs
 
 
-def retrieve_keyword_docs(
+async def aretrieve_dense_docs(
     *,
-    supabase: Any,
+    rpc: AsyncRpc,
     question: str,
+    query_vector: list[float],
     k: int = 8,
+    min_similarity: float = 0.0,
     retrieval_scope: dict[str, Any] | None = None,
-    min_rank: float = 0.0,
+    retrieval_mode: str = "qa",
     retrieval_filters: dict[str, Any] | None = None,
+    allow_legacy_fallback: bool = True,
+    speculative_fallbacks: bool = False,
 ) -> list[Any]:
+    """`retrieve_dense_docs` over an async RPC callable; the caller supplies the query vector."""
+    normalized_filters, primary, fallbacks = _dense_rpc_plan(
+        query_vector=query_vector,
+        question=question,
+        k=k,
+        min_similarity=min_similarity,
+        retrieval_scope=retrieval_scope,
+        retrieval_mode=retrieval_mode,
+        retrieval_filters=retrieval_filters,
+        allow_legacy_fallback=allow_legacy_fallback,
+    )
+
+    async def match_rows(call: tuple[str, dict[str, Any]]) -> list[dict[str, Any]]:
+        function_name, params = call
+        try:
+            data = await rpc(function_name, params)
+            return _matched_rows(data, question=question, filters=normalized_filters, k=k)
+        except Exception:
+            return []
+
+    sparse_threshold = min(2, max(1, k))
+    if speculative_fallbacks and fallbacks:
+        pending = [asyncio.ensure_future(match_rows(call)) for call in fallbacks]
+        rows = await match_rows(primary)
+        for task in pending:
+            fallback_rows = await task
+            if len(rows) < sparse_threshold:
+                rows = _merge_rows(rows, fallback_rows, limit=k)
+    else:
+        rows = await match_rows(primary)
+        for call in fallbacks:
+            if len(rows) < sparse_threshold:
+                rows = _merge_rows(rows, await match_rows(call), limit=k)
+
+    return [_to_document(row=row, channel="dense") for row in rows[:k]]
+
+
+def _keyword_rpc_plan(
+    *,
+    question: str,
+    k: int,
+    retrieval_scope: dict[str, Any] | None,
+    min_rank: float,
+    retrieval_filters: dict[str, Any] | None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
     scope_mode, targets, own_barangay_id = _scope_params(retrieval_scope)
     normalized_filters = _normalize_retrieval_filters(
         retrieval_filters,
         question=question,
         retrieval_scope=retrieval_scope,
     )
-    result = supabase.rpc(
-        "match_published_aip_chunks_keyword",
-        {
-            "query_text": question,
-            "match_count": k,
-            "min_rank": min_rank,
-            "scope_mode": scope_mode,
-            "own_barangay_id": own_barangay_id,
-            "scope_targets": targets,
-        },
-    ).execute()
-    rows = [row for row in list(result.data or []) if _row_matches_filters(row, normalized_filters)]
-    rows = _rerank_rows(rows, question=question, filters=normalized_filters, limit=k)
+    params = {
+        "query_text": question,
+        "match_count": k,
+        "min_rank": min_rank,
+        "scope_mode": scope_mode,
+        "own_barangay_id": own_barangay_id,
+        "scope_targets": targets,
+    }
+    return normalized_filters, params
+
+
+def retrieve_keyword_docs(
+    *,
+    supabase: Any,
+    question: str,
+    k: int = 8,
+    retrieval_scope: dict[str, Any] | None = None,
+    min_rank: float = 0.0,
+    retrieval_filters: dict[str, Any] | None = None,
+) -> list[Any]:
+    normalized_filters, params = _keyword_rpc_plan(
+        question=question,
+        k=k,
+        retrieval_scope=retrieval_scope,
+        min_rank=min_rank,
+        retrieval_filters=retrieval_filters,
+    )
+    result = supabase.rpc("match_published_aip_chunks_keyword", params).execute()
+    rows = _matched_rows(result.data, question=question, filters=normalized_filters, k=k)
     docs: list[Any] = []
     for row in rows[:k]:
         docs.append(_to_document(row=row, channel="keyword"))
     return docs
 
 
+async def aretrieve_keyword_docs(
+    *,
+    rpc: AsyncRpc,
+    question: str,
+    k: int = 8,
+    retrieval_scope: dict[str, Any] | None = None,
+    min_rank: float = 0.0,
+    retrieval_filters: dict[str, Any] | None = None,
+) -> list[Any]:
+    normalized_filters, params = _keyword_rpc_plan(
+        question=question,
+        k=k,
+        retrieval_scope=retrieval_scope,
+        min_rank=min_rank,
+        retrieval_filters=retrieval_filters,
+    )
+    rows = _matched_rows(
+        await rpc("match_published_aip_chunks_keyword", params),
+        question=question,
+        filters=normalized_filters,
+        k=k,
+    )
+    return [_to_document(row=row, channel="keyword") for row in rows[:k]]
+
+
 def fuse_docs_rrf(
     *,
     dense_docs: list[Any],
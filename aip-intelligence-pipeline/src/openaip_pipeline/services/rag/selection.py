@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+
+def tokenize(text: str) -> set[str]:
+    return set(TOKEN_PATTERN.findall((text or "").lower()))
+
+
+class CandidateFeatures:
+    """Retrieved chunks tokenized once, with pairwise overlap and section equality as matrices.
+
+    Tokens are mapped to ids from a vocabulary built over this candidate set, so the
+    Jaccard overlap matrix is exact (no hashing collisions) and matches the pairwise
+    set computation it replaces. Rows are in the caller's (ranked) order.
+    """
+
+    def __init__(self, *, texts: list[str], scores: list[float], section_keys: list[str]) -> None:
+        if not (len(texts) == len(scores) == len(section_keys)):
+            raise ValueError("texts, scores and section_keys must have the same length.")
+        self.scores = np.asarray(scores, dtype=np.float64)
+        section_ids: dict[str, int] = {}
+        self.section_ids = np.asarray(
+            [section_ids.setdefault(key, len(section_ids)) for key in section_keys],
+            dtype=np.int64,
+        )
+        vocabulary: dict[str, int] = {}
+        rows: list[np.ndarray] = []
+        for text in texts:
+            rows.append(
+                np.fromiter(
+                    (vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text)),
+                    dtype=np.int64,
+                )
+            )
+        self._overlap = self._jaccard(rows, len(vocabulary))
+
+    @staticmethod
+    def _jaccard(rows: list[np.ndarray], vocabulary_size: int) -> np.ndarray:
+        count = len(rows)
+        if count == 0 or vocabulary_size == 0:
+            return np.zeros((count, count), dtype=np.float64)
+        incidence = np.zeros((count, vocabulary_size), dtype=np.float32)
+        for index, token_ids in enumerate(rows):
+            incidence[index, token_ids] = 1.0
+        # float32 products are exact integer counts for any realistic chunk length.
+        intersection = (incidence @ incidence.T).astype(np.float64)
+        sizes = np.asarray([row.size for row in rows], dtype=np.float64)
+        union = sizes[:, None] + sizes[None, :] - intersection
+        overlap = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        empty = sizes == 0
+        overlap[empty, :] = 0.0
+        overlap[:, empty] = 0.0
+        return overlap
+
+    def __len__(self) -> int:
+        return int(self.scores.size)
+
+    @property
+    def overlap(self) -> np.ndarray:
+        return self._overlap
+
+    def subset(self, indices: list[int]) -> "CandidateFeatures":
+        picked = np.asarray(indices, dtype=np.int64)
+        clone = object.__new__(CandidateFeatures)
+        clone.scores = self.scores[picked]
+        clone.section_ids = self.section_ids[picked]
+        clone._overlap = self._overlap[np.ix_(picked, picked)]
+        return clone
+
+    def suppress_near_duplicates(self, *, max_overlap: float) -> list[int]:
+        """Greedy in row order: drop rows overlapping an already kept row by `max_overlap` or more."""
+        blocked = np.zeros(len(self), dtype=bool)
+        kept: list[int] = []
+        too_close = self._overlap >= max_overlap
+        for index in range(len(self)):
+            if blocked[index]:
+                continue
+            kept.append(index)
+            blocked |= too_close[index]
+        return kept
+
+    def mmr(
+        self,
+        *,
+        max_docs: int,
+        overlap_weight: float = 0.35,
+        section_penalty: float = 0.15,
+    ) -> list[int]:
+        """Incremental MMR seeded with row 0; ties go to the earliest row, as in a linear scan."""
+        count = len(self)
+        if count == 0:
+            return []
+        target = min(max_docs, count)
+        selected = [0]
+        available = np.ones(count, dtype=bool)
+        available[0] = False
+        max_overlap = self._overlap[0].copy()
+        same_section = self.section_ids == self.section_ids[0]
+        while len(selected) < target:
+            mmr_scores = self.scores - (overlap_weight * max_overlap) - (section_penalty * same_section)
+            mmr_scores[~available] = -np.inf
+            best = int(np.argmax(mmr_scores))
+            selected.append(best)
+            available[best] = False
+            np.maximum(max_overlap, self._overlap[best], out=max_overlap)
+            same_section |= self.section_ids == self.section_ids[best]
+        return selected
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable
+
+_ANSWER_KEY_PATTERN = re.compile(r'"answer"\s*:\s*"')
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class AnswerFieldDecoder:
+    """Incrementally decodes the `answer` string out of streamed generation JSON.
+
+    The generation prompt asks for `{"answer": ..., "used_source_ids": [...]}`; `feed`
+    takes raw model deltas and returns only the newly decoded answer text, so callers can
+    forward answer tokens without waiting for the closing brace. Escape sequences split
+    across deltas are held back until complete, and an escaped UTF-16 surrogate pair is
+    held until both halves arrive so it decodes to one character.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._position: int | None = None
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, delta: str) -> str:
+        if self._done or not delta:
+            return ""
+        self._buffer += delta
+        if self._position is None:
+            match = _ANSWER_KEY_PATTERN.search(self._buffer)
+            if match is None:
+                return ""
+            self._position = match.end()
+
+        out: list[str] = []
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if char == '"':
+                self._done = True
+                position += 1
+                break
+            if char != "\\":
+                out.append(char)
+                position += 1
+                continue
+            if position + 1 >= len(buffer):
+                break
+            escape = buffer[position + 1]
+            if escape == "u":
+                decoded = _decode_unicode_escape(buffer, position)
+                if decoded is None:
+                    break
+                text, position = decoded
+                out.append(text)
+                continue
+            out.append(_SIMPLE_ESCAPES.get(escape, escape))
+            position += 2
+        self._position = position
+        return "".join(out)
+
+
+def _decode_unicode_escape(buffer: str, position: int) -> tuple[str, int] | None:
+    """Decode the `\\uXXXX` escape at `position`; None until enough input has arrived.
+
+    A high surrogate is combined with a following escaped low surrogate. Unpaired
+    surrogates become U+FFFD, since they cannot be encoded into the SSE frame.
+    """
+    if position + 6 > len(buffer):
+        return None
+    try:
+        code = int(buffer[position + 2 : position + 6], 16)
+    except ValueError:
+        return "", position + 6
+    if 0xDC00 <= code <= 0xDFFF:
+        return "\ufffd", position + 6
+    if not 0xD800 <= code <= 0xDBFF:
+        return chr(code), position + 6
+    if position + 12 > len(buffer):
+        if buffer[position + 6 : position + 8] in ("\\u", "\\", ""):
+            return None
+        return "\ufffd", position + 6
+    if buffer[position + 6 : position + 8] == "\\u":
+        try:
+            low = int(buffer[position + 8 : position + 12], 16)
+        except ValueError:
+            low = 0
+        if 0xDC00 <= low <= 0xDFFF:
+            return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)), position + 12
+    return "\ufffd", position + 6
+
+
+def stream_llm_content(llm: Any, messages: list[dict[str, str]], on_token: Callable[[str], None]) -> str:
+    """Run `llm.stream`, forwarding decoded answer deltas; returns the full raw content."""
+    decoder = AnswerFieldDecoder()
+    parts: list[str] = []
+    for chunk in llm.stream(messages):
+        content = getattr(chunk, "content", chunk)
+        if not isinstance(content, str) or not content:
+            continue
+        parts.append(content)
+        delta = decoder.feed(content)
+        if delta:
+            on_token(delta)
+    return "".join(parts)
+
+
+async def astream_llm_content(llm: Any, messages: list[dict[str, str]], on_token: Callable[[str], None]) -> str:
+    """`stream_llm_content` over `llm.astream`."""
+    decoder = AnswerFieldDecoder()
+    parts: list[str] = []
+    async for chunk in llm.astream(messages):
+        content = getattr(chunk, "content", chunk)
+        if not isinstance(content, str) or not content:
+            continue
+        parts.append(content)
+        delta = decoder.feed(content)
+        if delta:
+            on_token(delta)
+    return "".join(parts)
+
+
+def format_sse_event(event: str, payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {data}\n\n"
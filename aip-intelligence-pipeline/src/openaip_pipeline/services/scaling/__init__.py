@@ -1,6 +1,7 @@
 from openaip_pipeline.services.scaling.scale_amounts import (
     ScaleAmountsResult,
+    scale_validated_amounts,
     scale_validated_amounts_json_str,
 )
 
-__all__ = ["ScaleAmountsResult", "scale_validated_amounts_json_str"]
+__all__ = ["ScaleAmountsResult", "scale_validated_amounts", "scale_validated_amounts_json_str"]
@@ -22,12 +22,18 @@ _CLIMATE_KEYS: tuple[str, ...] = (
 
 
 class ScaleAmountsResult:
-    def __init__(self, *, scaled_obj: dict[str, Any], scaled_json_str: str, scope: str, scaled: bool):
+    def __init__(self, *, scaled_obj: dict[str, Any], scaled_json_str: str | None = None, scope: str, scaled: bool):
         self.scaled_obj = scaled_obj
-        self.scaled_json_str = scaled_json_str
+        self._scaled_json_str = scaled_json_str
         self.scope = scope
         self.scaled = scaled
 
+    @property
+    def scaled_json_str(self) -> str:
+        if self._scaled_json_str is None:
+            self._scaled_json_str = json.dumps(self.scaled_obj, ensure_ascii=False, indent=2)
+        return self._scaled_json_str
+
 
 def _fallback_document() -> dict[str, Any]:
     year = int(now_utc_iso()[:4])
@@ -93,11 +99,12 @@ def _scale_to_numeric_text(value: Any) -> str | Any:
 
 
 def _build_scale_stage_root(payload: dict[str, Any], *, projects: list[dict[str, Any]], totals: list[dict[str, Any]]) -> dict[str, Any]:
+    source_document = payload.get("document")
     return make_stage_root(
         stage="scale_amounts",
         aip_id=str(payload.get("aip_id") or "unknown-aip"),
         uploaded_file_id=str(payload.get("uploaded_file_id")) if payload.get("uploaded_file_id") else None,
-        document=payload.get("document") if isinstance(payload.get("document"), dict) else _fallback_document(),
+        document=source_document if isinstance(source_document, dict) else _fallback_document(),
         projects=projects,
         totals=totals,
         summary=payload.get("summary") if isinstance(payload.get("summary"), dict) else None,
@@ -108,9 +115,31 @@ def _build_scale_stage_root(payload: dict[str, Any], *, projects: list[dict[str,
     )
 
 
-def _clone_json_dict(value: dict[str, Any]) -> dict[str, Any]:
-    # JSON roundtrip ensures we do not mutate caller-owned nested structures.
-    return json.loads(json.dumps(value, ensure_ascii=False))
+def _scale_project(project: dict[str, Any]) -> dict[str, Any]:
+    # Copy-on-write: only the containers that change are copied; the input stays untouched.
+    scaled = dict(project)
+    amounts = project.get("amounts")
+    if isinstance(amounts, dict):
+        scaled_amounts = dict(amounts)
+        for key in _PROJECT_AMOUNT_KEYS:
+            scaled_amount = _scale_to_float(amounts.get(key))
+            if scaled_amount is not None:
+                scaled_amounts[key] = scaled_amount
+        scaled["amounts"] = scaled_amounts
+    climate = project.get("climate")
+    if isinstance(climate, dict):
+        scaled_climate = dict(climate)
+        for key in _CLIMATE_KEYS:
+            scaled_climate[key] = _scale_to_numeric_text(climate.get(key))
+        scaled["climate"] = scaled_climate
+    return scaled
+
+
+def _scale_total(total: dict[str, Any]) -> dict[str, Any]:
+    scaled_total = _scale_to_float(total.get("value"))
+    if scaled_total is None:
+        return total
+    return {**total, "value": scaled_total}
 
 
 def scale_validated_amounts_json_str(validated_json_str: str, *, scope: str) -> ScaleAmountsResult:
@@ -118,53 +147,36 @@ def scale_validated_amounts_json_str(validated_json_str: str, *, scope: str) ->
         parsed = json.loads(validated_json_str)
     except json.JSONDecodeError as error:
         raise ValueError(f"Input is not valid JSON string: {error}") from error
-    if not isinstance(parsed, dict):
+    return scale_validated_amounts(parsed, scope=scope)
+
+
+def scale_validated_amounts(validated_obj: dict[str, Any], *, scope: str) -> ScaleAmountsResult:
+    """Scale a validate artifact held in memory; `validated_obj` is never mutated."""
+    if not isinstance(validated_obj, dict):
         raise ValueError("Top-level JSON must be an object/dict.")
-    projects = parsed.get("projects")
+    projects = validated_obj.get("projects")
     if not isinstance(projects, list):
         raise ValueError('Top-level key "projects" must be a list.')
-
-    copied = _clone_json_dict(parsed)
-    copied_projects = copied.get("projects")
-    if not isinstance(copied_projects, list):
-        copied_projects = []
-    copied_totals = copied.get("totals")
-    if not isinstance(copied_totals, list):
-        copied_totals = []
+    totals = validated_obj.get("totals")
+    if not isinstance(totals, list):
+        totals = []
 
     lowered_scope = (scope or "").strip().lower()
     should_scale = lowered_scope == "city"
 
+    dict_projects = [project for project in projects if isinstance(project, dict)]
+    dict_totals = [total for total in totals if isinstance(total, dict)]
     if should_scale:
-        for project in copied_projects:
-            if not isinstance(project, dict):
-                continue
-            amounts = project.get("amounts")
-            if isinstance(amounts, dict):
-                for key in _PROJECT_AMOUNT_KEYS:
-                    scaled_amount = _scale_to_float(amounts.get(key))
-                    if scaled_amount is not None:
-                        amounts[key] = scaled_amount
-            climate = project.get("climate")
-            if isinstance(climate, dict):
-                for key in _CLIMATE_KEYS:
-                    climate[key] = _scale_to_numeric_text(climate.get(key))
-
-        for total in copied_totals:
-            if not isinstance(total, dict):
-                continue
-            scaled_total = _scale_to_float(total.get("value"))
-            if scaled_total is not None:
-                total["value"] = scaled_total
+        dict_projects = [_scale_project(project) for project in dict_projects]
+        dict_totals = [_scale_total(total) for total in dict_totals]
 
     scaled_obj = _build_scale_stage_root(
-        copied,
-        projects=[project for project in copied_projects if isinstance(project, dict)],
-        totals=[total for total in copied_totals if isinstance(total, dict)],
+        validated_obj,
+        projects=dict_projects,
+        totals=dict_totals,
     )
     return ScaleAmountsResult(
         scaled_obj=scaled_obj,
-        scaled_json_str=json.dumps(scaled_obj, ensure_ascii=False, indent=2),
         scope=lowered_scope or "unknown",
         scaled=should_scale,
     )
@@ -1,7 +1,7 @@
 from openaip_pipeline.services.summarization.summarize import (
     attach_summary_to_validated_json_str,
+    summarize_aip_overall,
     summarize_aip_overall_json_str,
 )
 
-__all__ = ["attach_summary_to_validated_json_str", "summarize_aip_overall_json_str"]
-
+__all__ = ["attach_summary_to_validated_json_str", "summarize_aip_overall", "summarize_aip_overall_json_str"]
@@ -3,7 +3,8 @@ from __future__ import annotations
 import json
 import os
 import time
-from typing import Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, TypeVar
 
 from openai import OpenAI
 
@@ -15,26 +16,40 @@ from openaip_pipeline.core.artifact_contract import (
 )
 from openaip_pipeline.core.clock import now_utc_iso
 from openaip_pipeline.core.resources import read_text
+from openaip_pipeline.services.chunking.context_window import chunk_json_list_by_token_budget
 from openaip_pipeline.services.openai_utils import build_openai_client, safe_usage_dict
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_SUMMARIZE_CONCURRENCY = 4
+DEFAULT_SUMMARIZE_REDUCE_FANOUT = 8
+
+
 class SummarizationResult:
     def __init__(
         self,
         summary_text: str,
         summary_obj: dict[str, Any],
-        summary_json_str: str,
+        summary_json_str: str | None,
         usage: dict[str, Any],
         elapsed_seconds: float,
         model: str,
     ):
         self.summary_text = summary_text
         self.summary_obj = summary_obj
-        self.summary_json_str = summary_json_str
+        self._summary_json_str = summary_json_str
         self.usage = usage
         self.elapsed_seconds = elapsed_seconds
         self.model = model
 
+    @property
+    def summary_json_str(self) -> str:
+        if self._summary_json_str is None:
+            self._summary_json_str = json.dumps(self.summary_obj, ensure_ascii=False, indent=2)
+        return self._summary_json_str
+
 
 def _read_positive_int_env(name: str, default: int) -> int:
     raw = os.getenv(name)
@@ -47,6 +62,50 @@ def _read_positive_int_env(name: str, default: int) -> int:
     return parsed if parsed > 0 else default
 
 
+def resolve_summarize_concurrency(value: int | None) -> int:
+    if isinstance(value, int) and value > 0:
+        return value
+    return _read_positive_int_env("PIPELINE_SUMMARIZE_CONCURRENCY", DEFAULT_SUMMARIZE_CONCURRENCY)
+
+
+def _run_in_order(
+    items: list[T],
+    fn: Callable[[T], R],
+    *,
+    max_workers: int,
+    on_done: Callable[[int, int], None] | None = None,
+) -> list[R]:
+    """Apply `fn` to every item with bounded concurrency and return results in item order.
+
+    `on_done(done, total)` runs on the calling thread as items complete. The first failure
+    cancels items that have not started and is re-raised.
+    """
+    total = len(items)
+    worker_count = max(1, min(max_workers, total))
+    if worker_count == 1:
+        sequential: list[R] = []
+        for item in items:
+            sequential.append(fn(item))
+            if on_done:
+                on_done(len(sequential), total)
+        return sequential
+
+    results: dict[int, R] = {}
+    executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="summarize")
+    try:
+        future_to_index: dict[Future[R], int] = {executor.submit(fn, item): index for index, item in enumerate(items)}
+        pending: set[Future[R]] = set(future_to_index)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda item: future_to_index[item]):
+                results[future_to_index[future]] = future.result()
+                if on_done:
+                    on_done(len(results), total)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return [results[index] for index in range(total)]
+
+
 def _truncate_text(value: Any, char_limit: int) -> str | None:
     if value is None:
         return None
@@ -109,33 +168,19 @@ def _estimate_tokens_from_text(text: str) -> int:
     return max(1, (len(text.encode("utf-8")) + 3) // 4)
 
 
-def _estimate_payload_tokens(payload_obj: dict[str, Any]) -> int:
-    return _estimate_tokens_from_text(json.dumps(payload_obj, ensure_ascii=False, separators=(",", ":")))
-
-
 def _chunk_projects_by_token_budget(
     *,
     projects: list[dict[str, Any]],
     static_payload: dict[str, Any],
     budget_tokens: int,
 ) -> list[list[dict[str, Any]]]:
-    if not projects:
-        return []
-
-    chunks: list[list[dict[str, Any]]] = []
-    current: list[dict[str, Any]] = []
-    for project in projects:
-        candidate = [*current, project]
-        candidate_tokens = _estimate_payload_tokens({**static_payload, "projects": candidate})
-        if not current or candidate_tokens <= budget_tokens:
-            current = candidate
-            continue
-        chunks.append(current)
-        current = [project]
-
-    if current:
-        chunks.append(current)
-    return chunks
+    index_chunks = chunk_json_list_by_token_budget(
+        items=projects,
+        static_payload=static_payload,
+        list_key="projects",
+        budget_tokens=budget_tokens,
+    )
+    return [[projects[index] for index in chunk] for chunk in index_chunks]
 
 
 def _extract_summary_text(output_text: str) -> str:
@@ -297,6 +342,48 @@ def _reduce_summaries_with_backoff(
         )
 
 
+def _tree_reduce_summaries(
+    *,
+    chunk_summaries: list[str],
+    reduce_prompt: str,
+    model: str,
+    client: OpenAI,
+    usages: list[dict[str, Any]],
+    fanout: int,
+    max_workers: int,
+    beat: Callable[[str], None],
+) -> tuple[str, int]:
+    """Reduce summaries in k-ary rounds; the groups within a round are reduced concurrently.
+
+    Returns the final text and the number of rounds. Each group still falls back to
+    `_reduce_summaries_with_backoff` splitting when it overflows the context window.
+    """
+    fanout = max(2, fanout)
+    level = list(chunk_summaries)
+    rounds = 0
+    while len(level) > 1:
+        rounds += 1
+        groups = [level[start : start + fanout] for start in range(0, len(level), fanout)]
+        beat(f"Reducing chunk summaries round={rounds} groups={len(groups)}")
+
+        def reduce_group(group: list[str]) -> tuple[str, list[dict[str, Any]]]:
+            group_usages: list[dict[str, Any]] = []
+            text = _reduce_summaries_with_backoff(
+                chunk_summaries=group,
+                reduce_prompt=reduce_prompt,
+                model=model,
+                client=client,
+                usages=group_usages,
+            )
+            return text, group_usages
+
+        reduced = _run_in_order(groups, reduce_group, max_workers=max_workers)
+        for _, group_usages in reduced:
+            usages.extend(group_usages)
+        level = [text for text, _ in reduced]
+    return (level[0] if level else "No summary generated."), rounds
+
+
 def _fallback_document() -> dict[str, Any]:
     year = int(now_utc_iso()[:4])
     return {
@@ -311,11 +398,34 @@ def summarize_aip_overall_json_str(
     model: str = "gpt-5.2",
     heartbeat_seconds: float = 5.0,
     client: OpenAI | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    summarize_concurrency: int | None = None,
 ) -> SummarizationResult:
     try:
         validated_obj = json.loads(validated_json_str)
     except json.JSONDecodeError as error:
         raise ValueError(f"Input is not valid JSON string: {error}") from error
+    return summarize_aip_overall(
+        validated_obj,
+        model=model,
+        heartbeat_seconds=heartbeat_seconds,
+        client=client,
+        on_progress=on_progress,
+        summarize_concurrency=summarize_concurrency,
+    )
+
+
+def summarize_aip_overall(
+    validated_obj: dict[str, Any],
+    model: str = "gpt-5.2",
+    heartbeat_seconds: float = 5.0,
+    client: OpenAI | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    summarize_concurrency: int | None = None,
+) -> SummarizationResult:
+    """Summarize a scaled artifact held in memory; `validated_obj` is only read."""
+    if not isinstance(validated_obj, dict):
+        raise ValueError("Input JSON must be an object.")
     projects = validated_obj.get("projects")
     if not isinstance(projects, list):
         raise ValueError("Input JSON must contain top-level 'projects' array.")
@@ -324,6 +434,7 @@ def summarize_aip_overall_json_str(
     last_beat = start_ts
 
     def beat(msg: str) -> None:
+        # Only called from the orchestrating thread; map/reduce workers never touch it.
         nonlocal last_beat
         now = time.perf_counter()
         if now - last_beat >= heartbeat_seconds:
@@ -339,6 +450,11 @@ def summarize_aip_overall_json_str(
     summarize_project_field_char_limit = _read_positive_int_env(
         "PIPELINE_SUMMARIZE_PROJECT_FIELD_CHAR_LIMIT", 500
     )
+    summarize_reduce_fanout = max(
+        2,
+        _read_positive_int_env("PIPELINE_SUMMARIZE_REDUCE_FANOUT", DEFAULT_SUMMARIZE_REDUCE_FANOUT),
+    )
+    max_workers = resolve_summarize_concurrency(summarize_concurrency)
 
     compact_projects = [
         _compact_project_for_summary(project, summarize_project_field_char_limit)
@@ -386,38 +502,59 @@ def summarize_aip_overall_json_str(
         flush=True,
     )
 
-    usages: list[dict[str, Any]] = []
-    chunk_summaries: list[str] = []
-    for chunk_index, chunk in enumerate(project_chunks, start=1):
-        beat(f"Summarizing chunk {chunk_index}/{len(project_chunks)}")
+    def map_chunk(chunk: list[dict[str, Any]]) -> tuple[list[str], list[dict[str, Any]]]:
+        chunk_usages: list[dict[str, Any]] = []
         summaries = _summarize_map_chunk_with_backoff(
             projects_chunk=chunk,
             static_payload=static_payload,
             system_prompt=system_prompt,
             model=model,
             client=resolved_client,
-            usages=usages,
+            usages=chunk_usages,
         )
+        return summaries, chunk_usages
+
+    def map_done(done_chunks: int, total_chunks: int) -> None:
+        beat(f"Summarized chunk {done_chunks}/{total_chunks}")
+        if on_progress:
+            on_progress(done_chunks, total_chunks)
+
+    if on_progress:
+        on_progress(0, len(project_chunks))
+    # Usages are collected per chunk and merged in chunk order, so accounting does not
+    # depend on which map call finished first.
+    usages: list[dict[str, Any]] = []
+    chunk_summaries: list[str] = []
+    for summaries, chunk_usages in _run_in_order(
+        project_chunks,
+        map_chunk,
+        max_workers=max_workers,
+        on_done=map_done,
+    ):
         chunk_summaries.extend(summaries)
+        usages.extend(chunk_usages)
+    map_calls = len(usages)
 
     if len(chunk_summaries) <= 1:
         final_summary_text = chunk_summaries[0] if chunk_summaries else "No summary generated."
+        reduce_rounds = 0
     else:
-        beat("Reducing chunk summaries")
-        final_summary_text = _reduce_summaries_with_backoff(
+        final_summary_text, reduce_rounds = _tree_reduce_summaries(
             chunk_summaries=chunk_summaries,
             reduce_prompt=reduce_prompt,
             model=model,
             client=resolved_client,
             usages=usages,
+            fanout=summarize_reduce_fanout,
+            max_workers=max_workers,
+            beat=beat,
         )
-    reduce_rounds = max(0, len(usages) - len(chunk_summaries))
 
     print(
         (
             "[SUMMARY] map-reduce complete "
             f"map_outputs={len(chunk_summaries)} reduce_rounds={reduce_rounds} "
-            f"calls={len(usages)}"
+            f"calls={len(usages)} map_calls={map_calls} concurrency={max_workers}"
         ),
         flush=True,
     )
@@ -430,11 +567,12 @@ def summarize_aip_overall_json_str(
         "source_refs": summary_refs,
         "evidence_project_keys": evidence_keys or None,
     }
+    source_document = validated_obj.get("document")
     summary_artifact = make_stage_root(
         stage="summarize",
         aip_id=str(validated_obj.get("aip_id") or "unknown-aip"),
         uploaded_file_id=str(validated_obj.get("uploaded_file_id")) if validated_obj.get("uploaded_file_id") else None,
-        document=validated_obj.get("document") if isinstance(validated_obj.get("document"), dict) else _fallback_document(),
+        document=source_document if isinstance(source_document, dict) else _fallback_document(),
         projects=projects,
         totals=validated_obj.get("totals") if isinstance(validated_obj.get("totals"), list) else [],
         summary=summary_block,
@@ -446,7 +584,7 @@ def summarize_aip_overall_json_str(
     return SummarizationResult(
         summary_text=summary_block["text"],
         summary_obj=summary_artifact,
-        summary_json_str=json.dumps(summary_artifact, ensure_ascii=False, indent=2),
+        summary_json_str=None,
         usage=_sum_usage(usages),
         elapsed_seconds=elapsed,
         model=model,
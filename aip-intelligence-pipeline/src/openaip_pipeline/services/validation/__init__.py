@@ -1,5 +1,11 @@
+from openaip_pipeline.services.validation.barangay import validate_projects as validate_barangay_projects
 from openaip_pipeline.services.validation.barangay import validate_projects_json_str as validate_barangay_projects_json_str
+from openaip_pipeline.services.validation.city import validate_projects as validate_city_projects
 from openaip_pipeline.services.validation.city import validate_projects_json_str as validate_city_projects_json_str
 
-__all__ = ["validate_barangay_projects_json_str", "validate_city_projects_json_str"]
-
+__all__ = [
+    "validate_barangay_projects",
+    "validate_barangay_projects_json_str",
+    "validate_city_projects",
+    "validate_city_projects_json_str",
+]
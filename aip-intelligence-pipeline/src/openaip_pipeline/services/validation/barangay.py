@@ -11,8 +11,9 @@ from openai import OpenAI
 from openaip_pipeline.core.artifact_contract import SCHEMA_VERSION, make_stage_root, normalize_source_refs
 from openaip_pipeline.core.clock import now_utc_iso
 from openaip_pipeline.core.resources import read_text
+from openaip_pipeline.services.chunking.chunk_queue import ChunkQueueExecutor
 from openaip_pipeline.services.chunking.context_window import (
-    chunk_items_by_token_budget,
+    chunk_json_list_by_token_budget,
     estimate_tokens_from_json,
     estimate_tokens_from_text,
     is_context_limit_error,
@@ -21,6 +22,9 @@ from openaip_pipeline.services.chunking.context_window import (
 from openaip_pipeline.services.openai_utils import build_openai_client, safe_usage_dict
 
 
+DEFAULT_VALIDATE_CONCURRENCY = 4
+
+
 def _read_positive_int_env(name: str, default: int) -> int:
     raw = os.getenv(name)
     if raw is None:
@@ -32,6 +36,12 @@ def _read_positive_int_env(name: str, default: int) -> int:
     return parsed if parsed > 0 else default
 
 
+def resolve_validate_concurrency(value: int | None) -> int:
+    if isinstance(value, int) and value > 0:
+        return value
+    return _read_positive_int_env("PIPELINE_VALIDATE_CONCURRENCY", DEFAULT_VALIDATE_CONCURRENCY)
+
+
 def _truncate_text(value: Any, char_limit: int) -> str | None:
     if value is None:
         return None
@@ -45,7 +55,7 @@ class ValidationResult:
     def __init__(
         self,
         validated_obj: dict[str, Any],
-        validated_json_str: str,
+        validated_json_str: str | None,
         usage: dict[str, Any],
         elapsed_seconds: float,
         model: str,
@@ -53,13 +63,20 @@ class ValidationResult:
         chunk_elapsed_seconds: list[float] | None = None,
     ):
         self.validated_obj = validated_obj
-        self.validated_json_str = validated_json_str
+        self._validated_json_str = validated_json_str
         self.usage = usage
         self.elapsed_seconds = elapsed_seconds
         self.model = model
         self.chunk_usages = chunk_usages or []
         self.chunk_elapsed_seconds = chunk_elapsed_seconds or []
 
+    @property
+    def validated_json_str(self) -> str:
+        # Serialized on first access; in-process stage handoff only needs `validated_obj`.
+        if self._validated_json_str is None:
+            self._validated_json_str = json.dumps(self.validated_obj, ensure_ascii=False, indent=2)
+        return self._validated_json_str
+
 
 def _fallback_document() -> dict[str, Any]:
     year = int(now_utc_iso()[:4])
@@ -175,12 +192,31 @@ def validate_projects_json_str(
     batch_size: int | None = 25,
     on_progress: Callable[[int, int, int, int, str], None] | None = None,
     client: OpenAI | None = None,
+    validate_concurrency: int | None = None,
 ) -> ValidationResult:
     try:
         extraction_obj = json.loads(extraction_json_str)
     except json.JSONDecodeError as error:
         raise ValueError(f"Input is not valid JSON string: {error}") from error
+    return validate_projects(
+        extraction_obj,
+        model=model,
+        batch_size=batch_size,
+        on_progress=on_progress,
+        client=client,
+        validate_concurrency=validate_concurrency,
+    )
 
+
+def validate_projects(
+    extraction_obj: dict[str, Any],
+    model: str = "gpt-5.2",
+    batch_size: int | None = 25,
+    on_progress: Callable[[int, int, int, int, str], None] | None = None,
+    client: OpenAI | None = None,
+    validate_concurrency: int | None = None,
+) -> ValidationResult:
+    """Validate an extract artifact held in memory; `extraction_obj` is never mutated."""
     if not isinstance(extraction_obj, dict):
         raise ValueError("Top-level JSON must be an object/dict.")
     projects = extraction_obj.get("projects")
@@ -190,7 +226,8 @@ def validate_projects_json_str(
         raise ValueError("batch_size must be >= 1 when provided.")
 
     total_projects = len(projects)
-    merged_projects = json.loads(json.dumps(projects, ensure_ascii=False))
+    # Copy-on-write: only each project's top-level "errors" key is reassigned below.
+    merged_projects = [dict(project) if isinstance(project, dict) else project for project in projects]
 
     if total_projects > 0:
         validate_context_window_tokens = _read_positive_int_env(
@@ -220,17 +257,16 @@ def validate_projects_json_str(
             - validate_response_buffer_tokens,
         )
         input_budget_tokens = max(1024, usable_context_tokens // 2)
-        initial_chunks = chunk_items_by_token_budget(
-            items=list(range(total_projects)),
+        initial_chunks = chunk_json_list_by_token_budget(
+            items=flattened_projects,
             static_payload=static_payload,
-            add_item_fn=lambda payload, chunk: _build_chunk_payload(
-                payload, chunk, flattened_projects
-            ),
+            list_key="projects",
             budget_tokens=input_budget_tokens,
             max_items_per_chunk=batch_size,
         )
         chunk_queue: deque[list[int]] = deque(initial_chunks)
         total_chunks_planned = len(initial_chunks)
+        started_chunks = 0
         completed_chunks = 0
         done_projects = 0
 
@@ -247,15 +283,10 @@ def validate_projects_json_str(
             )
 
         overall_start = time.perf_counter()
-        chunk_usages: list[dict[str, Any]] = []
-        chunk_times: list[float] = []
-
-        while chunk_queue:
-            chunk_indices = chunk_queue.popleft()
-            chunk_size = len(chunk_indices)
-            if chunk_size == 0:
-                continue
+        # Keyed by (first index, -size) so usage order does not depend on completion order.
+        chunk_usage_records: list[tuple[tuple[int, int], dict[str, Any], float]] = []
 
+        def request_chunk(chunk_indices: list[int]) -> tuple[Any, float]:
             payload_obj = _build_chunk_payload(
                 static_payload, chunk_indices, flattened_projects
             )
@@ -267,157 +298,176 @@ def validate_projects_json_str(
                 - chunk_input_tokens
             )
             max_output_tokens = max(32, remaining_output_budget)
-            current_chunk_no = completed_chunks + 1
+            batch_start = time.perf_counter()
+            response = resolved_client.responses.create(
+                model=model,
+                input=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": json.dumps(payload_obj, ensure_ascii=False)},
+                ],
+                text={"format": {"type": "json_object"}},
+                max_output_tokens=max_output_tokens,
+            )
+            return response, round(time.perf_counter() - batch_start, 4)
+
+        chunk_numbers: dict[tuple[int, int], int] = {}
+
+        def on_dispatch(chunk_indices: list[int]) -> None:
+            nonlocal started_chunks
+            started_chunks += 1
+            chunk_numbers[(chunk_indices[0], -len(chunk_indices))] = started_chunks
             if on_progress:
                 on_progress(
                     min(done_projects, total_projects),
                     total_projects,
-                    current_chunk_no,
+                    started_chunks,
                     total_chunks_planned,
                     (
                         "Validation chunk start: "
-                        f"processing chunk {current_chunk_no}/{total_chunks_planned} "
-                        f"with {chunk_size} project(s)."
+                        f"processing chunk {started_chunks}/{total_chunks_planned} "
+                        f"with {len(chunk_indices)} project(s)."
                     ),
                 )
-            batch_start = time.perf_counter()
-            try:
-                response = resolved_client.responses.create(
-                    model=model,
-                    input=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": json.dumps(payload_obj, ensure_ascii=False)},
-                    ],
-                    text={"format": {"type": "json_object"}},
-                    max_output_tokens=max_output_tokens,
-                )
-            except Exception as error:
-                if not is_context_limit_error(error):
-                    raise
-                if chunk_size <= 1:
-                    index = chunk_indices[0]
-                    ref_code = (
-                        str(merged_projects[index].get("aip_ref_code") or "").strip()
-                        if isinstance(merged_projects[index], dict)
-                        else ""
-                    )
-                    raise RuntimeError(
-                        (
-                            "Validation chunk exceeds model context window for a single project. "
-                            f"index={index} aip_ref_code={ref_code or 'unknown'} "
-                            f"chunk={current_chunk_no}/{total_chunks_planned}"
-                        )
-                    ) from error
-                left_chunk, right_chunk = _split_chunk(chunk_indices, chunk_queue)
-                total_chunks_planned += 1
-                if on_progress:
-                    on_progress(
-                        min(done_projects, total_projects),
-                        total_projects,
-                        current_chunk_no,
-                        total_chunks_planned,
-                        (
-                            "Validation chunk split (context overflow): "
-                            f"chunk {current_chunk_no} exceeded context and was split into "
-                            f"{len(left_chunk)}+{len(right_chunk)} project(s)."
-                        ),
-                    )
-                continue
-
-            batch_elapsed = round(time.perf_counter() - batch_start, 4)
-            usage = safe_usage_dict(response)
-            response_status = str(getattr(response, "status", "") or "").strip().lower()
-            incomplete_details = getattr(response, "incomplete_details", None)
-            response_text = getattr(response, "output_text", None)
-            invalid_reason: str | None = None
-            validated_chunk_projects: list[Any] | None = None
-
-            if response_status == "incomplete":
-                invalid_reason = f"response status=incomplete details={incomplete_details!r}"
-            elif not isinstance(response_text, str) or not response_text.strip():
-                invalid_reason = "empty response.output_text"
-            else:
+
+        executor: ChunkQueueExecutor[tuple[Any, float]] = ChunkQueueExecutor(
+            request_chunk,
+            max_workers=resolve_validate_concurrency(validate_concurrency),
+            thread_name_prefix="validate-chunk",
+        )
+        with executor:
+            for chunk_indices, future in executor.run(chunk_queue, on_dispatch=on_dispatch):
+                chunk_size = len(chunk_indices)
+                chunk_key = (chunk_indices[0], -chunk_size)
+                current_chunk_no = chunk_numbers.get(chunk_key, completed_chunks + 1)
                 try:
-                    validated_chunk_obj = json.loads(response_text)
-                except json.JSONDecodeError as error:
-                    invalid_reason = f"response JSON parse error: {error.msg}"
-                else:
-                    parsed_projects = (
-                        validated_chunk_obj.get("projects")
-                        if isinstance(validated_chunk_obj, dict)
-                        else None
-                    )
-                    if not isinstance(parsed_projects, list):
-                        invalid_reason = (
-                            "missing projects list in model output "
-                            f"(type={type(parsed_projects).__name__})"
+                    response, batch_elapsed = future.result()
+                except Exception as error:
+                    if not is_context_limit_error(error):
+                        raise
+                    if chunk_size <= 1:
+                        index = chunk_indices[0]
+                        ref_code = (
+                            str(merged_projects[index].get("aip_ref_code") or "").strip()
+                            if isinstance(merged_projects[index], dict)
+                            else ""
                         )
-                    elif len(parsed_projects) != chunk_size:
-                        invalid_reason = (
-                            "partial projects list in model output "
-                            f"(expected={chunk_size}, got={len(parsed_projects)})"
+                        raise RuntimeError(
+                            (
+                                "Validation chunk exceeds model context window for a single project. "
+                                f"index={index} aip_ref_code={ref_code or 'unknown'} "
+                                f"chunk={current_chunk_no}/{total_chunks_planned}"
+                            )
+                        ) from error
+                    left_chunk, right_chunk = _split_chunk(chunk_indices, chunk_queue)
+                    total_chunks_planned += 1
+                    if on_progress:
+                        on_progress(
+                            min(done_projects, total_projects),
+                            total_projects,
+                            current_chunk_no,
+                            total_chunks_planned,
+                            (
+                                "Validation chunk split (context overflow): "
+                                f"chunk {current_chunk_no} exceeded context and was split into "
+                                f"{len(left_chunk)}+{len(right_chunk)} project(s)."
+                            ),
                         )
+                    continue
+
+                usage = safe_usage_dict(response)
+                response_status = str(getattr(response, "status", "") or "").strip().lower()
+                incomplete_details = getattr(response, "incomplete_details", None)
+                response_text = getattr(response, "output_text", None)
+                invalid_reason: str | None = None
+                validated_chunk_projects: list[Any] | None = None
+
+                if response_status == "incomplete":
+                    invalid_reason = f"response status=incomplete details={incomplete_details!r}"
+                elif not isinstance(response_text, str) or not response_text.strip():
+                    invalid_reason = "empty response.output_text"
+                else:
+                    try:
+                        validated_chunk_obj = json.loads(response_text)
+                    except json.JSONDecodeError as error:
+                        invalid_reason = f"response JSON parse error: {error.msg}"
                     else:
-                        validated_chunk_projects = parsed_projects
-
-            if invalid_reason:
-                chunk_usages.append(usage)
-                chunk_times.append(batch_elapsed)
-                if chunk_size <= 1:
-                    index = chunk_indices[0]
-                    ref_code = (
-                        str(merged_projects[index].get("aip_ref_code") or "").strip()
-                        if isinstance(merged_projects[index], dict)
-                        else ""
-                    )
-                    raise RuntimeError(
-                        (
-                            "Validation chunk returned invalid model output for a single project. "
-                            f"index={index} aip_ref_code={ref_code or 'unknown'} "
-                            f"chunk={current_chunk_no}/{total_chunks_planned} reason={invalid_reason}"
+                        parsed_projects = (
+                            validated_chunk_obj.get("projects")
+                            if isinstance(validated_chunk_obj, dict)
+                            else None
+                        )
+                        if not isinstance(parsed_projects, list):
+                            invalid_reason = (
+                                "missing projects list in model output "
+                                f"(type={type(parsed_projects).__name__})"
+                            )
+                        elif len(parsed_projects) != chunk_size:
+                            invalid_reason = (
+                                "partial projects list in model output "
+                                f"(expected={chunk_size}, got={len(parsed_projects)})"
+                            )
+                        else:
+                            validated_chunk_projects = parsed_projects
+
+                if invalid_reason:
+                    chunk_usage_records.append((chunk_key, usage, batch_elapsed))
+                    if chunk_size <= 1:
+                        index = chunk_indices[0]
+                        ref_code = (
+                            str(merged_projects[index].get("aip_ref_code") or "").strip()
+                            if isinstance(merged_projects[index], dict)
+                            else ""
+                        )
+                        raise RuntimeError(
+                            (
+                                "Validation chunk returned invalid model output for a single project. "
+                                f"index={index} aip_ref_code={ref_code or 'unknown'} "
+                                f"chunk={current_chunk_no}/{total_chunks_planned} reason={invalid_reason}"
+                            )
+                        )
+                    left_chunk, right_chunk = _split_chunk(chunk_indices, chunk_queue)
+                    total_chunks_planned += 1
+                    if on_progress:
+                        on_progress(
+                            min(done_projects, total_projects),
+                            total_projects,
+                            current_chunk_no,
+                            total_chunks_planned,
+                            (
+                                "Validation chunk split (partial output): "
+                                f"chunk {current_chunk_no} returned invalid output and was split into "
+                                f"{len(left_chunk)}+{len(right_chunk)} project(s). "
+                                f"reason={invalid_reason}"
+                            ),
                         )
+                    continue
+
+                for local_idx, original_idx in enumerate(chunk_indices):
+                    candidate = validated_chunk_projects[local_idx]
+                    merged_projects[original_idx]["errors"] = (
+                        candidate.get("errors", None)
+                        if isinstance(candidate, dict)
+                        else None
                     )
-                left_chunk, right_chunk = _split_chunk(chunk_indices, chunk_queue)
-                total_chunks_planned += 1
+
+                chunk_usage_records.append((chunk_key, usage, batch_elapsed))
+                done_projects += chunk_size
+                completed_chunks += 1
                 if on_progress:
                     on_progress(
                         min(done_projects, total_projects),
                         total_projects,
-                        current_chunk_no,
+                        completed_chunks,
                         total_chunks_planned,
                         (
-                            "Validation chunk split (partial output): "
-                            f"chunk {current_chunk_no} returned invalid output and was split into "
-                            f"{len(left_chunk)}+{len(right_chunk)} project(s). "
-                            f"reason={invalid_reason}"
+                            f"Validating projects {min(done_projects, total_projects)}/{total_projects} "
+                            f"(chunk {completed_chunks}/{total_chunks_planned})..."
                         ),
                     )
-                continue
-
-            for local_idx, original_idx in enumerate(chunk_indices):
-                candidate = validated_chunk_projects[local_idx]
-                merged_projects[original_idx]["errors"] = (
-                    candidate.get("errors", None)
-                    if isinstance(candidate, dict)
-                    else None
-                )
-
-            chunk_usages.append(usage)
-            chunk_times.append(batch_elapsed)
-            done_projects += chunk_size
-            completed_chunks += 1
-            if on_progress:
-                on_progress(
-                    min(done_projects, total_projects),
-                    total_projects,
-                    completed_chunks,
-                    total_chunks_planned,
-                    (
-                        f"Validating projects {min(done_projects, total_projects)}/{total_projects} "
-                        f"(chunk {completed_chunks}/{total_chunks_planned})..."
-                    ),
-                )
 
+        chunk_usage_records.sort(key=lambda record: record[0])
+        chunk_usages = [usage for _, usage, _ in chunk_usage_records]
+        chunk_times = [elapsed for _, _, elapsed in chunk_usage_records]
         usage_total = sum_usage(chunk_usages)
         overall_elapsed = round(time.perf_counter() - overall_start, 4)
     else:
@@ -459,11 +509,12 @@ def validate_projects_json_str(
             },
         ]
 
+    source_document = extraction_obj.get("document")
     validated_obj = make_stage_root(
         stage="validate",
         aip_id=str(extraction_obj.get("aip_id") or "unknown-aip"),
         uploaded_file_id=str(extraction_obj.get("uploaded_file_id")) if extraction_obj.get("uploaded_file_id") else None,
-        document=extraction_obj.get("document") if isinstance(extraction_obj.get("document"), dict) else _fallback_document(),
+        document=source_document if isinstance(source_document, dict) else _fallback_document(),
         projects=merged_projects,
         totals=extraction_obj.get("totals") if isinstance(extraction_obj.get("totals"), list) else [],
         summary=extraction_obj.get("summary") if isinstance(extraction_obj.get("summary"), dict) else None,
@@ -475,7 +526,7 @@ def validate_projects_json_str(
 
     return ValidationResult(
         validated_obj=validated_obj,
-        validated_json_str=json.dumps(validated_obj, ensure_ascii=False, indent=2),
+        validated_json_str=None,
         usage=usage_total,
         elapsed_seconds=overall_elapsed,
         model=model,
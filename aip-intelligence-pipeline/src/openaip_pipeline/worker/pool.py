@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from openaip_pipeline.adapters.supabase.dto import ExtractionRunDTO
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+from openaip_pipeline.adapters.supabase.transport import worst_case_request_seconds
+from openaip_pipeline.core.settings import Settings
+from openaip_pipeline.worker.processor import process_run
+from openaip_pipeline.worker.progress_writer import CoalescingProgressWriter
+
+
+ProcessRunFn = Callable[..., None]
+
+
+def _read_bool_env(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ConcurrentRunWorker:
+    """Drain queued runs through N concurrent slots in one process.
+
+    Every claimed run carries a lease (`lease_owner` plus `lease_expires_at`) that a
+    heartbeat thread renews while the slot is busy. Runs whose lease lapses - a crashed
+    host or a wedged slot - are put back in the queue by whichever worker polls next.
+    Slots share the process-wide OpenAI and Supabase connection pools and one progress
+    writer, which only writes while this worker still holds a run's lease; when the
+    heartbeat finds a lease lost, the slot aborts on its next write instead of racing the
+    worker that re-claimed the run.
+
+    The configured lease is raised to outlast a renewal that blocks for the full Supabase
+    timeout and retry budget; an explicit `lease_seconds` is used as given.
+    """
+
+    def __init__(
+        self,
+        *,
+        repo: PipelineRepository,
+        settings: Settings,
+        slots: int | None = None,
+        lease_seconds: float | None = None,
+        worker_id: str | None = None,
+        process: ProcessRunFn = process_run,
+    ) -> None:
+        self.repo = repo
+        self.settings = settings
+        self.slots = max(1, slots or settings.worker_concurrency)
+        if lease_seconds is None:
+            lease_seconds = settings.worker_lease_seconds
+            # Renewals run every third of the lease, so one stalled renewal must fit in the rest.
+            min_lease_seconds = 1.5 * worst_case_request_seconds()
+            if lease_seconds < min_lease_seconds:
+                print(
+                    f"[WORKER][POOL] lease_seconds raised from {lease_seconds:g} to {min_lease_seconds:g} "
+                    "to outlast the Supabase HTTP timeout and retries",
+                    flush=True,
+                )
+                lease_seconds = min_lease_seconds
+        self.lease_seconds = max(1.0, lease_seconds)
+        self.worker_id = worker_id or default_worker_id()
+        self.process = process
+        self.claim_order = "newest" if os.getenv("PIPELINE_WORKER_CLAIM_ORDER", "").strip().lower() == "newest" else "oldest"
+        self.claim_prefer_retries = _read_bool_env("PIPELINE_WORKER_CLAIM_PREFER_RETRIES", False)
+        self.progress = CoalescingProgressWriter(repo, lease_owner=self.worker_id)
+        self._executor = ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix="run-slot")
+        self._active: dict[str, Future[None]] = {}
+        self._lease_renewed_at: dict[str, float] = {}
+        self._active_lock = threading.Lock()
+        self._slot_freed = threading.Event()
+        self._stopping = threading.Event()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            name="run-lease-heartbeat",
+            daemon=True,
+        )
+
+    @property
+    def active_run_ids(self) -> list[str]:
+        with self._active_lock:
+            return list(self._active)
+
+    def free_slots(self) -> int:
+        with self._active_lock:
+            return self.slots - len(self._active)
+
+    def _claim_runs(self, limit: int) -> list[ExtractionRunDTO]:
+        return self.repo.claim_queued_runs(
+            limit,
+            lease_owner=self.worker_id,
+            lease_seconds=self.lease_seconds,
+            order=self.claim_order,
+            prefer_retries=self.claim_prefer_retries,
+        )
+
+    def _run_slot(self, run: ExtractionRunDTO) -> None:
+        try:
+            self.process(repo=self.repo, settings=self.settings, run=run.__dict__, progress=self.progress)
+        except Exception as error:
+            # process_run records failures itself; anything escaping (e.g. set_run_failed hitting
+            # a Supabase outage) leaves the row running, so hand it back to the queue.
+            print(f"[WORKER][POOL] slot_error run={run.id} error={error}", flush=True)
+            self._requeue_crashed_run(run.id)
+        else:
+            try:
+                self.repo.release_run_lease(run_id=run.id, lease_owner=self.worker_id)
+            except Exception as error:
+                print(f"[WORKER][POOL] lease_release_failed run={run.id} error={error}", flush=True)
+        finally:
+            with self._active_lock:
+                self._active.pop(run.id, None)
+                self._lease_renewed_at.pop(run.id, None)
+            self.progress.clear_lease(run.id)
+            self._slot_freed.set()
+
+    def _requeue_crashed_run(self, run_id: str) -> None:
+        try:
+            requeued = self.repo.requeue_run(run_id=run_id, lease_owner=self.worker_id)
+        except Exception as error:
+            # The lease is left in place: once it expires, requeue_expired_runs picks the run up.
+            print(f"[WORKER][POOL] requeue_failed run={run_id} error={error}", flush=True)
+            return
+        if requeued:
+            print(f"[WORKER][POOL] requeued_crashed_run run={run_id}", flush=True)
+
+    def poll_once(self) -> int:
+        """Requeue expired leases, then claim up to the number of free slots."""
+        try:
+            requeued = self.repo.requeue_expired_runs()
+            if requeued:
+                print(f"[WORKER][POOL] requeued_expired_runs count={len(requeued)}", flush=True)
+        except Exception as error:
+            print(f"[WORKER][POOL] requeue_failed error={error}", flush=True)
+        free = self.free_slots()
+        if free <= 0:
+            return 0
+        runs = self._claim_runs(free)
+        for run in runs:
+            print(f"[WORKER] claimed run {run.id} slot_owner={self.worker_id}", flush=True)
+            with self._active_lock:
+                self._lease_renewed_at[run.id] = time.monotonic()
+                self._active[run.id] = self._executor.submit(self._run_slot, run)
+        return len(runs)
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(1.0, self.lease_seconds / 3)
+        while not self._stopping.wait(interval):
+            run_ids = self.active_run_ids
+            if not run_ids:
+                continue
+            try:
+                renewed = self.repo.renew_run_leases(
+                    run_ids=run_ids,
+                    lease_owner=self.worker_id,
+                    lease_seconds=self.lease_seconds,
+                )
+            except Exception as error:
+                print(f"[WORKER][POOL] lease_renew_failed runs={len(run_ids)} error={error}", flush=True)
+                # Past the last successful renewal plus the lease, another worker may requeue the run.
+                expired_before = time.monotonic() - self.lease_seconds
+                with self._active_lock:
+                    expired = [run_id for run_id in run_ids if self._lease_renewed_at.get(run_id, 0.0) <= expired_before]
+                for run_id in expired:
+                    self._abort_lost_lease(run_id)
+                continue
+            now = time.monotonic()
+            with self._active_lock:
+                for run_id in renewed & self._lease_renewed_at.keys():
+                    self._lease_renewed_at[run_id] = now
+            for run_id in set(run_ids) - renewed:
+                # Finished runs drop out of the renewal filter too; only abort live slots.
+                if run_id in self.active_run_ids:
+                    self._abort_lost_lease(run_id)
+
+    def _abort_lost_lease(self, run_id: str) -> None:
+        print(f"[WORKER][POOL] lease_lost run={run_id}", flush=True)
+        self.progress.mark_lease_lost(run_id)
+
+    def run(self, *, run_once: bool = False) -> None:
+        self._heartbeat_thread.start()
+        print(f"[WORKER][POOL] started slots={self.slots} lease_seconds={self.lease_seconds:g}", flush=True)
+        try:
+            while True:
+                self._slot_freed.clear()
+                claimed = self.poll_once()
+                if run_once and claimed == 0:
+                    if not self.active_run_ids:
+                        print("[WORKER] no queued runs; exiting (run once)")
+                        return
+                    self._slot_freed.wait()
+                    continue
+                if claimed == 0 or self.free_slots() <= 0:
+                    # Wake early when a slot frees up instead of sleeping a full poll interval.
+                    self._slot_freed.wait(timeout=self.settings.worker_poll_seconds)
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._stopping.set()
+        self.progress.close()
+
+
+def run_concurrent_worker(*, repo: PipelineRepository, settings: Settings, **kwargs: Any) -> None:
+    repo.assert_run_leases_ready()
+    ConcurrentRunWorker(repo=repo, settings=settings, **kwargs).run(run_once=settings.worker_run_once)
@@ -1,25 +1,31 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-import json
 import os
-import tempfile
+import threading
 import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+from openaip_pipeline.core.errors import RunLeaseLostError
 from openaip_pipeline.core.settings import Settings
-from openaip_pipeline.services.categorization.categorize import categorize_from_summarized_json_str
+from openaip_pipeline.services.categorization.categorize import (
+    CategorizationResult,
+    attach_summary_to_categorized_obj,
+    categorize_from_summarized,
+)
 from openaip_pipeline.services.extraction.barangay import run_extraction as run_barangay_extraction
 from openaip_pipeline.services.extraction.city import run_extraction as run_city_extraction
-from openaip_pipeline.services.openai_utils import build_openai_client
+from openaip_pipeline.services.openai_utils import get_shared_openai_client
 from openaip_pipeline.services.rag.rag import answer_with_rag
-from openaip_pipeline.services.scaling.scale_amounts import scale_validated_amounts_json_str
-from openaip_pipeline.services.summarization.summarize import summarize_aip_overall_json_str
-from openaip_pipeline.services.validation.barangay import validate_projects_json_str as validate_barangay
-from openaip_pipeline.services.validation.city import validate_projects_json_str as validate_city
+from openaip_pipeline.services.scaling.scale_amounts import scale_validated_amounts
+from openaip_pipeline.services.summarization.summarize import SummarizationResult, summarize_aip_overall
+from openaip_pipeline.services.validation.barangay import validate_projects as validate_barangay
+from openaip_pipeline.services.validation.city import validate_projects as validate_city
 from openaip_pipeline.worker.progress import clamp_pct, read_positive_float_env, run_with_heartbeat
+from openaip_pipeline.worker.progress_writer import CoalescingProgressWriter
 
 VALIDATION_FIXED_BATCH_SIZE = 25
 
@@ -41,6 +47,13 @@ def _read_positive_int_env(name: str, default: int) -> int:
     return parsed if parsed > 0 else default
 
 
+def _read_bool_env(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _normalize_optional_text(value: Any) -> str | None:
     if value is None:
         return None
@@ -120,12 +133,14 @@ def _sanitize_error(message: str, settings: Settings) -> str:
 def _persist_stage_artifact(
     *,
     repo: PipelineRepository,
+    progress: CoalescingProgressWriter,
     run_id: str,
     aip_id: str,
     stage: str,
     payload: dict[str, Any],
     text: str | None,
 ) -> str:
+    progress.ensure_lease(run_id=run_id)
     return repo.insert_artifact(
         run_id=run_id,
         aip_id=aip_id,
@@ -142,7 +157,7 @@ def _embed_line_items(*, settings: Settings, line_items: list[dict[str, Any]]) -
     batch_size = max(1, min(128, int(os.getenv("PIPELINE_LINE_ITEM_EMBED_BATCH_SIZE", "64") or "64")))
     embed_timeout_seconds = read_positive_float_env("PIPELINE_EMBED_TIMEOUT_SECONDS", 300.0)
     embed_started = time.perf_counter()
-    client = build_openai_client(settings.openai_api_key)
+    client = get_shared_openai_client(settings.openai_api_key)
     embedded: list[dict[str, Any]] = []
 
     for start in range(0, len(line_items), batch_size):
@@ -219,30 +234,36 @@ def _extract_summary_text(payload: dict[str, Any]) -> str | None:
     return cleaned or None
 
 
-def _find_artifact_in_run_lineage(
+def process_run(
+    *,
+    repo: PipelineRepository,
+    settings: Settings,
+    run: dict[str, Any],
+    progress: CoalescingProgressWriter | None = None,
+) -> None:
+    owns_progress = progress is None
+    progress_writer = progress or CoalescingProgressWriter(repo)
+    try:
+        _process_run(repo=repo, progress=progress_writer, settings=settings, run=run)
+    finally:
+        if owns_progress:
+            progress_writer.close()
+
+
+def _process_run(
     *,
     repo: PipelineRepository,
-    start_run_id: str,
-    artifact_type: str,
-) -> tuple[dict[str, Any] | None, str | None]:
-    visited: set[str] = set()
-    cursor: str | None = start_run_id
-    while cursor and cursor not in visited:
-        visited.add(cursor)
-        artifact = repo.get_stage_artifact(run_id=cursor, artifact_type=artifact_type)
-        if artifact is not None:
-            return artifact, cursor
-        cursor = repo.get_parent_run_id(run_id=cursor)
-    return None, None
-
-
-def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str, Any]) -> None:
+    progress: CoalescingProgressWriter,
+    settings: Settings,
+    run: dict[str, Any],
+) -> None:
     run_id = str(run["id"])
     aip_id = str(run["aip_id"])
     model_name = str(run.get("model_name") or settings.pipeline_model)
     current_stage = _normalize_resume_start_stage(run.get("resume_from_stage"))
-    tmp_pdf_path: str | None = None
     try:
+        # One pooled client per process, shared by every stage and every concurrent run slot.
+        openai_client = get_shared_openai_client(settings.openai_api_key)
         _enforce_retry_guardrail(
             repo=repo,
             run_id=run_id,
@@ -259,12 +280,11 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
 
         required_artifact_type = _required_input_artifact_type(start_stage)
         if required_artifact_type:
-            prerequisite_payload, source_run_id = _find_artifact_in_run_lineage(
-                repo=repo,
-                start_run_id=run_id,
+            prerequisite_payload, source_run_id = repo.find_lineage_artifact(
+                run_id=run_id,
                 artifact_type=required_artifact_type,
             )
-            if not _is_resumable_stage_payload(prerequisite_payload):
+            if prerequisite_payload is None or not _is_resumable_stage_payload(prerequisite_payload):
                 print(
                     (
                         f"[WORKER][RESUME] run={run_id} stage={start_stage} missing/corrupt "
@@ -296,6 +316,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
         extraction_fn = run_city_extraction if aip_scope == "city" else run_barangay_extraction
         validation_fn = validate_city if aip_scope == "city" else validate_barangay
         if required_artifact_type == "extract" and aip_scope != "city":
+            progress.ensure_lease(run_id=run_id)
             repo.upsert_aip_totals(
                 aip_id=aip_id,
                 totals=extraction_payload.get("totals")
@@ -303,6 +324,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 else [],
             )
         if required_artifact_type == "scale_amounts" and aip_scope == "city":
+            progress.ensure_lease(run_id=run_id)
             repo.upsert_aip_totals(
                 aip_id=aip_id,
                 totals=scaled_payload.get("totals")
@@ -311,19 +333,16 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
         if start_stage == "extract":
             current_stage = "extract"
-            repo.set_run_stage(run_id=run_id, stage=current_stage)
+            progress.set_run_stage(run_id=run_id, stage=current_stage)
             uploaded = repo.get_uploaded_file(run)
             signed_url = repo.client.create_signed_url(uploaded.bucket_id, uploaded.object_name, expires_in=600)
             pdf_bytes = repo.client.download_bytes(signed_url)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(pdf_bytes)
-                tmp_pdf_path = tmp.name
 
             def extraction_progress(done_pages: int, total_pages: int) -> None:
                 if total_pages <= 0:
                     return
                 pct = clamp_pct((done_pages * 100) / total_pages)
-                repo.set_run_progress(
+                progress.set_run_progress(
                     run_id=run_id,
                     stage=current_stage,
                     stage_progress_pct=pct,
@@ -331,15 +350,17 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 )
 
             extraction_res = extraction_fn(
-                tmp_pdf_path,
+                pdf_bytes,
                 model=model_name,
+                client=openai_client,
                 job_id=run_id,
                 aip_id=aip_id,
                 uploaded_file_id=uploaded.id,
                 on_progress=extraction_progress,
+                source_name=uploaded.object_name,
             )
             extraction_payload = extraction_res.payload
-            repo.set_run_progress(
+            progress.set_run_progress(
                 run_id=run_id,
                 stage=current_stage,
                 stage_progress_pct=100,
@@ -347,6 +368,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
             _persist_stage_artifact(
                 repo=repo,
+                progress=progress,
                 run_id=run_id,
                 aip_id=aip_id,
                 stage="extract",
@@ -362,12 +384,12 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 )
 
         if start_stage in {"extract", "validate"}:
-            if not _is_resumable_stage_payload(extraction_payload):
+            if extraction_payload is None or not _is_resumable_stage_payload(extraction_payload):
                 raise RuntimeError("Validation cannot start because extraction payload is unavailable.")
 
             current_stage = "validate"
-            repo.set_run_stage(run_id=run_id, stage=current_stage)
-            repo.set_run_progress(
+            progress.set_run_stage(run_id=run_id, stage=current_stage)
+            progress.set_run_progress(
                 run_id=run_id,
                 stage=current_stage,
                 stage_progress_pct=0,
@@ -385,7 +407,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 message: str,
             ) -> None:
                 pct = 100 if total_projects <= 0 else clamp_pct((done_projects * 100) / total_projects)
-                repo.set_run_progress(
+                progress.set_run_progress(
                     run_id=run_id,
                     stage=current_stage,
                     stage_progress_pct=pct,
@@ -401,13 +423,14 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 )
 
             validation_res = validation_fn(
-                json.dumps(extraction_payload, ensure_ascii=False),
+                extraction_payload,
                 model=model_name,
+                client=openai_client,
                 batch_size=VALIDATION_FIXED_BATCH_SIZE,
                 on_progress=validation_progress,
             )
             validation_payload = validation_res.validated_obj
-            repo.set_run_progress(
+            progress.set_run_progress(
                 run_id=run_id,
                 stage=current_stage,
                 stage_progress_pct=100,
@@ -415,6 +438,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
             _persist_stage_artifact(
                 repo=repo,
+                progress=progress,
                 run_id=run_id,
                 aip_id=aip_id,
                 stage="validate",
@@ -423,23 +447,23 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
 
         if start_stage in {"extract", "validate", "scale_amounts"}:
-            if not _is_resumable_stage_payload(validation_payload):
+            if validation_payload is None or not _is_resumable_stage_payload(validation_payload):
                 raise RuntimeError("Amount scaling cannot start because validation payload is unavailable.")
 
             current_stage = "scale_amounts"
-            repo.set_run_stage(run_id=run_id, stage=current_stage)
-            repo.set_run_progress(
+            progress.set_run_stage(run_id=run_id, stage=current_stage)
+            progress.set_run_progress(
                 run_id=run_id,
                 stage=current_stage,
                 stage_progress_pct=0,
                 progress_message="Scaling city monetary fields by 1000...",
             )
-            scale_res = scale_validated_amounts_json_str(
-                json.dumps(validation_payload, ensure_ascii=False),
+            scale_res = scale_validated_amounts(
+                validation_payload,
                 scope=aip_scope,
             )
             scaled_payload = scale_res.scaled_obj
-            repo.set_run_progress(
+            progress.set_run_progress(
                 run_id=run_id,
                 stage=current_stage,
                 stage_progress_pct=100,
@@ -447,6 +471,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
             _persist_stage_artifact(
                 repo=repo,
+                progress=progress,
                 run_id=run_id,
                 aip_id=aip_id,
                 stage="scale_amounts",
@@ -461,39 +486,9 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                     else [],
                 )
 
-        if start_stage in {"extract", "validate", "scale_amounts", "summarize"}:
-            if not _is_resumable_stage_payload(scaled_payload):
-                raise RuntimeError("Summarization cannot start because scaled payload is unavailable.")
-
-            current_stage = "summarize"
-            repo.set_run_stage(run_id=run_id, stage=current_stage)
-            summary_res = run_with_heartbeat(
-                repo=repo,
-                run_id=run_id,
-                stage=current_stage,
-                expected_seconds=read_positive_float_env("PIPELINE_SUMMARIZE_EXPECTED_SECONDS", 60.0),
-                message_prefix="Generating summary",
-                fn=lambda: summarize_aip_overall_json_str(
-                    json.dumps(scaled_payload, ensure_ascii=False),
-                    model=model_name,
-                ),
-            )
-            summary_payload = summary_res.summary_obj
-            summary_text = summary_res.summary_text
-            _persist_stage_artifact(
-                repo=repo,
-                run_id=run_id,
-                aip_id=aip_id,
-                stage="summarize",
-                payload=summary_payload,
-                text=summary_text,
-            )
-
-        if not _is_resumable_stage_payload(summary_payload):
-            raise RuntimeError("Categorization cannot start because summarize payload is unavailable.")
-
-        current_stage = "categorize"
-        repo.set_run_stage(run_id=run_id, stage=current_stage)
+        categorize_counts: list[int] = []
+        categorize_visible = threading.Event()
+        categorize_cancel = threading.Event()
 
         def categorize_progress(
             categorized_count: int,
@@ -501,10 +496,14 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             batch_no: int,
             total_batches: int,
         ) -> None:
+            categorize_counts[:] = [categorized_count, total_count, batch_no, total_batches]
+            if not categorize_visible.is_set():
+                # Still overlapping summarize; the latest counts are published at the stage switch.
+                return
             pct = 100 if total_count <= 0 else clamp_pct((categorized_count * 100) / total_count)
-            repo.set_run_progress(
+            progress.set_run_progress(
                 run_id=run_id,
-                stage=current_stage,
+                stage="categorize",
                 stage_progress_pct=pct,
                 progress_message=(
                     f"Categorizing projects {categorized_count}/{total_count} "
@@ -512,13 +511,83 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 ),
             )
 
-        categorized_res = categorize_from_summarized_json_str(
-            json.dumps(summary_payload, ensure_ascii=False),
-            model=model_name,
-            batch_size=settings.batch_size,
-            on_progress=categorize_progress,
-        )
-        repo.set_run_progress(
+        def run_categorize(payload: dict[str, Any]) -> CategorizationResult:
+            return categorize_from_summarized(
+                payload,
+                model=model_name,
+                client=openai_client,
+                batch_size=settings.batch_size,
+                on_progress=categorize_progress,
+                cancel_event=categorize_cancel,
+            )
+
+        categorize_job: Future[CategorizationResult] | None = None
+        overlap_executor: ThreadPoolExecutor | None = None
+        try:
+            if start_stage in {"extract", "validate", "scale_amounts", "summarize"}:
+                if scaled_payload is None or not _is_resumable_stage_payload(scaled_payload):
+                    raise RuntimeError("Summarization cannot start because scaled payload is unavailable.")
+
+                current_stage = "summarize"
+                progress.set_run_stage(run_id=run_id, stage=current_stage)
+                if _read_bool_env("PIPELINE_CATEGORIZE_OVERLAP_SUMMARIZE", True):
+                    # Categorization only reads project fields, so it runs on the pre-summary payload
+                    # alongside the summarize map phase and is joined before its artifact is persisted.
+                    overlap_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="categorize-overlap")
+                    categorize_job = overlap_executor.submit(run_categorize, scaled_payload)
+                summary_map_progress = [0, 0]
+
+                def summarize_progress(done_chunks: int, total_chunks: int) -> None:
+                    summary_map_progress[:] = [done_chunks, total_chunks]
+
+                summary_res: SummarizationResult = run_with_heartbeat(
+                    repo=progress,
+                    run_id=run_id,
+                    stage=current_stage,
+                    expected_seconds=read_positive_float_env("PIPELINE_SUMMARIZE_EXPECTED_SECONDS", 60.0),
+                    message_prefix="Generating summary",
+                    fn=lambda: summarize_aip_overall(
+                        scaled_payload,
+                        model=model_name,
+                        client=openai_client,
+                        on_progress=summarize_progress,
+                    ),
+                    completed_units=lambda: (summary_map_progress[0], summary_map_progress[1]),
+                )
+                summary_payload = summary_res.summary_obj
+                summary_text = summary_res.summary_text
+                _persist_stage_artifact(
+                    repo=repo,
+                    progress=progress,
+                    run_id=run_id,
+                    aip_id=aip_id,
+                    stage="summarize",
+                    payload=summary_payload,
+                    text=summary_text,
+                )
+
+            if summary_payload is None or not _is_resumable_stage_payload(summary_payload):
+                raise RuntimeError("Categorization cannot start because summarize payload is unavailable.")
+
+            current_stage = "categorize"
+            progress.set_run_stage(run_id=run_id, stage=current_stage)
+            categorize_visible.set()
+            if categorize_job is None:
+                categorized_obj = run_categorize(summary_payload).categorized_obj
+            else:
+                if categorize_counts:
+                    categorize_progress(*categorize_counts)
+                categorized_obj = attach_summary_to_categorized_obj(
+                    categorize_job.result().categorized_obj,
+                    summary_payload,
+                )
+        finally:
+            if overlap_executor is not None:
+                # On any failure before the join, stop issuing categorize batches and wait out the
+                # in-flight one so no OpenAI calls outlive the run into the slot's next claim.
+                categorize_cancel.set()
+                overlap_executor.shutdown(wait=True)
+        progress.set_run_progress(
             run_id=run_id,
             stage=current_stage,
             stage_progress_pct=100,
@@ -526,23 +595,26 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
         )
         categorize_artifact_id = _persist_stage_artifact(
             repo=repo,
+            progress=progress,
             run_id=run_id,
             aip_id=aip_id,
             stage="categorize",
-            payload=categorized_res.categorized_obj,
+            payload=categorized_obj,
             text=summary_text,
         )
+        progress.ensure_lease(run_id=run_id)
         repo.upsert_projects(
             aip_id=aip_id,
             extraction_artifact_id=categorize_artifact_id,
-            projects=categorized_res.categorized_obj.get("projects", []),
+            projects=categorized_obj.get("projects", []),
         )
         line_items = repo.upsert_aip_line_items(
             aip_id=aip_id,
-            projects=categorized_res.categorized_obj.get("projects", []),
+            projects=categorized_obj.get("projects", []),
         )
         if line_items:
             embedded_rows = _embed_line_items(settings=settings, line_items=line_items)
+            progress.ensure_lease(run_id=run_id)
             repo.upsert_aip_line_item_embeddings(
                 line_items=embedded_rows,
                 model=settings.embedding_model,
@@ -562,6 +634,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                 )
                 _persist_stage_artifact(
                     repo=repo,
+                    progress=progress,
                     run_id=run_id,
                     aip_id=aip_id,
                     stage="embed",
@@ -569,15 +642,19 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
                     text=None,
                 )
 
-        repo.set_run_progress(
+        progress.set_run_progress(
             run_id=run_id,
             stage=current_stage,
             stage_progress_pct=100,
             progress_message="Finalizing processing run. Redirecting shortly...",
         )
-        repo.set_run_succeeded(run_id=run_id)
+        progress.set_run_succeeded(run_id=run_id)
         print(f"[WORKER] run {run_id} succeeded")
     except Exception as error:
+        if isinstance(error, RunLeaseLostError) or progress.lease_lost(run_id):
+            # Another worker has re-claimed the run and owns its progress, artifacts and outcome.
+            print(f"[WORKER] run {run_id} abandoned at stage={current_stage}: lease lost", flush=True)
+            return
         reason_code = _extract_reason_code(error)
         trace_summary = "".join(traceback.format_exception(type(error), error, error.__traceback__))
         sanitized_trace = _sanitize_error(trace_summary, settings)
@@ -585,6 +662,7 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
         try:
             _persist_stage_artifact(
                 repo=repo,
+                progress=progress,
                 run_id=run_id,
                 aip_id=aip_id,
                 stage=current_stage
@@ -599,15 +677,13 @@ def process_run(*, repo: PipelineRepository, settings: Settings, run: dict[str,
             )
         except Exception:
             pass
-        repo.set_run_failed(run_id=run_id, stage=current_stage, error_message=sanitized_message)
+        try:
+            progress.set_run_failed(run_id=run_id, stage=current_stage, error_message=sanitized_message)
+        except RunLeaseLostError:
+            print(f"[WORKER] run {run_id} abandoned at stage={current_stage}: lease lost", flush=True)
+            return
         try:
             _set_run_error_code(repo=repo, run_id=run_id, reason_code=reason_code)
         except Exception:
             pass
         print(f"[WORKER] run {run_id} failed: {reason_code} {sanitized_message}")
-    finally:
-        if tmp_pdf_path and os.path.exists(tmp_pdf_path):
-            try:
-                os.remove(tmp_pdf_path)
-            except OSError:
-                pass
@@ -6,6 +6,7 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+from openaip_pipeline.worker.progress_writer import CoalescingProgressWriter
 
 
 HEARTBEAT_INTERVAL_SECONDS = 5.0
@@ -29,13 +30,19 @@ def clamp_pct(value: float) -> int:
 
 def run_with_heartbeat(
     *,
-    repo: PipelineRepository,
+    repo: PipelineRepository | CoalescingProgressWriter,
     run_id: str,
     stage: str,
     expected_seconds: float,
     message_prefix: str,
     fn: Callable[[], Any],
+    completed_units: Callable[[], tuple[int, int]] | None = None,
 ) -> Any:
+    """Run `fn` on a helper thread and publish stage progress until it returns.
+
+    When `completed_units` reports `(done, total)` with work already finished, the
+    percentage comes from it; otherwise it is estimated from `expected_seconds`.
+    """
     expected_seconds = max(1.0, expected_seconds)
     heartbeat_interval = read_positive_float_env("PIPELINE_PROGRESS_HEARTBEAT_SECONDS", HEARTBEAT_INTERVAL_SECONDS)
     heartbeat_interval = max(1.0, heartbeat_interval)
@@ -46,14 +53,21 @@ def run_with_heartbeat(
         while not future.done():
             now = time.perf_counter()
             elapsed = now - started
-            estimated = (elapsed / expected_seconds) * HEARTBEAT_STAGE_CAP_PCT
-            stage_pct = clamp_pct(max(1, min(HEARTBEAT_STAGE_CAP_PCT, estimated)))
+            done_units, total_units = completed_units() if completed_units else (0, 0)
+            if total_units > 0 and done_units > 0:
+                measured = (min(done_units, total_units) / total_units) * HEARTBEAT_STAGE_CAP_PCT
+                stage_pct = clamp_pct(max(1, min(HEARTBEAT_STAGE_CAP_PCT, measured)))
+                message = f"{message_prefix} ({done_units}/{total_units} chunks, {stage_pct}%)"
+            else:
+                estimated = (elapsed / expected_seconds) * HEARTBEAT_STAGE_CAP_PCT
+                stage_pct = clamp_pct(max(1, min(HEARTBEAT_STAGE_CAP_PCT, estimated)))
+                message = f"{message_prefix} ({stage_pct}%)"
             if now - last_write >= heartbeat_interval:
                 repo.set_run_progress(
                     run_id=run_id,
                     stage=stage,
                     stage_progress_pct=stage_pct,
-                    progress_message=f"{message_prefix} ({stage_pct}%)",
+                    progress_message=message,
                 )
                 last_write = now
             time.sleep(0.5)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+from openaip_pipeline.core.errors import RunLeaseLostError
+
+
+DEFAULT_PROGRESS_MIN_INTERVAL_SECONDS = 1.0
+
+
+def read_non_negative_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+@dataclass
+class _PendingProgress:
+    stage: str
+    stage_progress_pct: int
+    progress_message: str | None
+
+
+class CoalescingProgressWriter:
+    """Background publisher for `extraction_runs` progress updates.
+
+    Percentage updates only record the latest state per run and return immediately; a
+    daemon thread writes each run's newest state at most once per `min_interval_seconds`.
+    Stage transitions and terminal states are written synchronously and discard any
+    pending update for the run, so a stale percentage can never land after them.
+    A zero interval writes every update through on the caller's thread.
+
+    With `lease_owner`, every write only lands while that worker still holds the run's
+    lease. Once a lease is lost (a rejected write, or `mark_lease_lost` from the heartbeat)
+    the next write or `ensure_lease` for the run raises `RunLeaseLostError`, which aborts
+    the slot processing it.
+    """
+
+    def __init__(
+        self,
+        repo: PipelineRepository,
+        *,
+        min_interval_seconds: float | None = None,
+        lease_owner: str | None = None,
+    ) -> None:
+        self.repo = repo
+        self.lease_owner = lease_owner
+        if min_interval_seconds is None:
+            min_interval_seconds = read_non_negative_float_env(
+                "PIPELINE_PROGRESS_MIN_INTERVAL_SECONDS", DEFAULT_PROGRESS_MIN_INTERVAL_SECONDS
+            )
+        self.min_interval_seconds = max(0.0, min_interval_seconds)
+        self._state_lock = threading.Condition()
+        # Held around every REST write so a background flush and a synchronous transition
+        # cannot reorder; hot-path callers never take it.
+        self._write_lock = threading.Lock()
+        self._pending: dict[str, _PendingProgress] = {}
+        self._last_stage: dict[str, str] = {}
+        self._last_flush: dict[str, float] = {}
+        self._finished: set[str] = set()
+        self._lost_leases: set[str] = set()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        if self.min_interval_seconds > 0:
+            self._thread = threading.Thread(target=self._flush_loop, name="progress-writer", daemon=True)
+            self._thread.start()
+
+    def set_run_progress(
+        self,
+        *,
+        run_id: str,
+        stage: str,
+        stage_progress_pct: int,
+        progress_message: str | None = None,
+    ) -> None:
+        with self._state_lock:
+            self._raise_if_lease_lost(run_id)
+            if run_id in self._finished:
+                # Late callbacks from worker threads must not reopen a finished run.
+                return
+            stage_changed = self._last_stage.get(run_id) != stage
+            write_through = self._thread is None or self._closed or stage_changed
+            if not write_through:
+                self._pending[run_id] = _PendingProgress(stage, stage_progress_pct, progress_message)
+                self._state_lock.notify()
+                return
+        self._write_now(
+            run_id,
+            lambda: self.repo.set_run_progress(
+                run_id=run_id,
+                stage=stage,
+                stage_progress_pct=stage_progress_pct,
+                progress_message=progress_message,
+                lease_owner=self.lease_owner,
+            ),
+            stage=stage,
+        )
+
+    def set_run_stage(self, *, run_id: str, stage: str) -> None:
+        self._write_now(
+            run_id,
+            lambda: self.repo.set_run_stage(run_id=run_id, stage=stage, lease_owner=self.lease_owner),
+            stage=stage,
+        )
+
+    def set_run_succeeded(self, *, run_id: str) -> None:
+        self._write_now(
+            run_id,
+            lambda: self.repo.set_run_succeeded(run_id=run_id, lease_owner=self.lease_owner),
+            stage=None,
+        )
+
+    def set_run_failed(self, *, run_id: str, stage: str, error_message: str) -> None:
+        self._write_now(
+            run_id,
+            lambda: self.repo.set_run_failed(
+                run_id=run_id,
+                stage=stage,
+                error_message=error_message,
+                lease_owner=self.lease_owner,
+            ),
+            stage=None,
+        )
+
+    def mark_lease_lost(self, run_id: str) -> None:
+        with self._state_lock:
+            self._lost_leases.add(run_id)
+            self._pending.pop(run_id, None)
+
+    def lease_lost(self, run_id: str) -> bool:
+        with self._state_lock:
+            return run_id in self._lost_leases
+
+    def clear_lease(self, run_id: str) -> None:
+        """Forget a run's lease state once its slot has finished with it."""
+        with self._state_lock:
+            self._lost_leases.discard(run_id)
+
+    def ensure_lease(self, *, run_id: str) -> None:
+        """Raise `RunLeaseLostError` unless this worker still holds the run's lease.
+
+        Guards writes that cannot carry a lease filter themselves (artifact inserts,
+        project and line-item upserts).
+        """
+        with self._state_lock:
+            self._raise_if_lease_lost(run_id)
+        if self.lease_owner is None:
+            return
+        try:
+            self.repo.assert_run_lease_held(run_id=run_id, lease_owner=self.lease_owner)
+        except RunLeaseLostError:
+            self.mark_lease_lost(run_id)
+            raise
+
+    def _raise_if_lease_lost(self, run_id: str) -> None:
+        if run_id in self._lost_leases:
+            raise RunLeaseLostError(f"Run {run_id} is no longer leased by {self.lease_owner}.")
+
+    def _write_now(self, run_id: str, write: Callable[[], None], *, stage: str | None) -> None:
+        with self._write_lock:
+            with self._state_lock:
+                self._raise_if_lease_lost(run_id)
+                self._pending.pop(run_id, None)
+                if stage is None:
+                    self._last_stage.pop(run_id, None)
+                    self._last_flush.pop(run_id, None)
+                    self._finished.add(run_id)
+                else:
+                    self._finished.discard(run_id)
+                    self._last_stage[run_id] = stage
+                    self._last_flush[run_id] = time.monotonic()
+            try:
+                write()
+            except RunLeaseLostError:
+                self.mark_lease_lost(run_id)
+                raise
+
+    def _take_due(self) -> tuple[str, _PendingProgress] | None:
+        now = time.monotonic()
+        for run_id, pending in self._pending.items():
+            if now - self._last_flush.get(run_id, 0.0) >= self.min_interval_seconds:
+                del self._pending[run_id]
+                self._last_flush[run_id] = now
+                return run_id, pending
+        return None
+
+    def _next_due_in(self) -> float | None:
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        return max(
+            0.0,
+            min(self._last_flush.get(run_id, 0.0) + self.min_interval_seconds - now for run_id in self._pending),
+        )
+
+    def _write_pending(self, run_id: str, pending: _PendingProgress) -> None:
+        try:
+            self.repo.set_run_progress(
+                run_id=run_id,
+                stage=pending.stage,
+                stage_progress_pct=pending.stage_progress_pct,
+                progress_message=pending.progress_message,
+                lease_owner=self.lease_owner,
+            )
+        except RunLeaseLostError as error:
+            # The slot sees the lost lease on its next write and aborts.
+            self.mark_lease_lost(run_id)
+            print(f"[WORKER][PROGRESS] lease_lost run={run_id} error={error}", flush=True)
+        except Exception as error:
+            # Progress is advisory; the next update or transition supersedes a lost write.
+            print(f"[WORKER][PROGRESS] write_failed run={run_id} error={error}", flush=True)
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._state_lock:
+                while not self._closed:
+                    wait_for = self._next_due_in()
+                    if wait_for == 0.0:
+                        break
+                    self._state_lock.wait(timeout=wait_for)
+                if self._closed:
+                    return
+            with self._write_lock:
+                with self._state_lock:
+                    # A synchronous transition may have claimed the update in the meantime.
+                    due = self._take_due()
+                if due is not None:
+                    self._write_pending(*due)
+
+    def flush(self, run_id: str | None = None) -> None:
+        """Write pending updates now (for one run, or all runs)."""
+        with self._write_lock:
+            with self._state_lock:
+                if run_id is None:
+                    items = list(self._pending.items())
+                    self._pending.clear()
+                else:
+                    pending = self._pending.pop(run_id, None)
+                    items = [(run_id, pending)] if pending is not None else []
+                now = time.monotonic()
+                for item_run_id, _ in items:
+                    self._last_flush[item_run_id] = now
+            for item_run_id, pending in items:
+                self._write_pending(item_run_id, pending)
+
+    def close(self) -> None:
+        with self._state_lock:
+            self._closed = True
+            self._state_lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self.flush()
@@ -8,14 +8,23 @@ from openaip_pipeline.adapters.supabase.client import SupabaseRestClient
 from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
 from openaip_pipeline.core.logging import configure_logging
 from openaip_pipeline.core.settings import Settings
+from openaip_pipeline.worker.pool import run_concurrent_worker
 from openaip_pipeline.worker.processor import process_run
 
 
 def run_worker() -> None:
     settings = Settings.load(require_supabase=True, require_openai=True)
     client = SupabaseRestClient.from_settings(settings)
-    repo = PipelineRepository(client)
+    repo = PipelineRepository(
+        client,
+        artifact_bucket_id=settings.supabase_storage_artifact_bucket,
+        artifact_inline_max_bytes=settings.artifact_inline_max_bytes,
+        artifact_compression=settings.artifact_compression,
+    )
     repo.assert_progress_tracking_ready()
+    if settings.worker_concurrency > 1:
+        run_concurrent_worker(repo=repo, settings=settings)
+        return
     print("[WORKER] started")
     while True:
         run = repo.claim_next_queued_run()
@@ -86,7 +86,7 @@ class _FakeClient:
 
 def test_upsert_aip_line_items_uses_source_of_truth_context_and_updates_existing() -> None:
     fake_client = _FakeClient()
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     upserted = repo.upsert_aip_line_items(
         aip_id="aip-123",
@@ -129,7 +129,7 @@ def test_upsert_aip_line_items_uses_source_of_truth_context_and_updates_existing
 
 def test_upsert_aip_line_items_null_or_invalid_ref_yields_null_sector() -> None:
     fake_client = _FakeClient()
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_aip_line_items(
         aip_id="aip-123",
@@ -164,7 +164,7 @@ def test_upsert_aip_line_items_null_or_invalid_ref_yields_null_sector() -> None:
 
 def test_upsert_aip_line_item_embeddings_uses_conflict_key() -> None:
     fake_client = _FakeClient()
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_aip_line_item_embeddings(
         line_items=[
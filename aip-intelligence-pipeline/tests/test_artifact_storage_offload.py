@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+import pytest
+
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+
+
+class _FakeArtifactClient:
+    def __init__(self) -> None:
+        self.artifacts: list[dict[str, Any]] = []
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: list[tuple[str, str, str]] = []
+
+    def insert(self, table: str, row: dict[str, Any], *, select: str | None = None) -> list[dict[str, Any]]:
+        assert table == "extraction_artifacts"
+        stored = {**row, "id": f"artifact-{len(self.artifacts) + 1}"}
+        self.artifacts.append(stored)
+        return [{"id": stored["id"]}]
+
+    def select(
+        self,
+        table: str,
+        *,
+        select: str,
+        filters: dict[str, str] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        rows = [
+            row
+            for row in reversed(self.artifacts)
+            if all(str(row.get(column)) == condition[3:] for column, condition in (filters or {}).items())
+        ]
+        return [{"artifact_json": row["artifact_json"]} for row in rows[:limit]]
+
+    def upload_bytes(self, *, bucket_id: str, object_name: str, content: bytes, content_type: str) -> str:
+        self.objects[(bucket_id, object_name)] = content
+        self.uploads.append((bucket_id, object_name, content_type))
+        return object_name
+
+    def download_object(self, *, bucket_id: str, object_name: str) -> bytes:
+        return self.objects[(bucket_id, object_name)]
+
+
+def _payload(project_count: int) -> dict[str, Any]:
+    return {
+        "stage": "validate",
+        "projects": [
+            {"project_key": f"1000-{index:04d}", "program_project_description": "Drainage rehabilitation " * 4}
+            for index in range(project_count)
+        ],
+    }
+
+
+def _repo(client: _FakeArtifactClient, **kwargs: Any) -> PipelineRepository:
+    return PipelineRepository(
+        client,  # type: ignore[arg-type]
+        artifact_bucket_id="aip-artifacts",
+        artifact_inline_max_bytes=2048,
+        **kwargs,
+    )
+
+
+def test_large_artifact_is_compressed_offloaded_and_read_back() -> None:
+    client = _FakeArtifactClient()
+    repo = _repo(client)
+    payload = _payload(200)
+
+    repo.insert_artifact(run_id="run-1", aip_id="aip-1", artifact_type="validate", artifact_json=payload)
+
+    pointer = client.artifacts[0]["artifact_json"]
+    assert "projects" not in pointer
+    assert pointer["storage_bucket"] == "aip-artifacts"
+    assert pointer["storage_path"].startswith("runs/run-1/validate_")
+    assert pointer["storage_encoding"] == "gzip"
+    assert pointer["stored_bytes"] < pointer["content_bytes"]
+    (bucket_id, object_name, content_type) = client.uploads[0]
+    assert content_type == "application/gzip"
+    assert json.loads(gzip.decompress(client.objects[(bucket_id, object_name)])) == payload
+    assert repo.get_stage_artifact(run_id="run-1", artifact_type="validate") == payload
+
+
+def test_small_and_published_artifacts_stay_inline() -> None:
+    client = _FakeArtifactClient()
+    repo = _repo(client)
+
+    repo.insert_artifact(run_id="run-1", aip_id="aip-1", artifact_type="extract", artifact_json=_payload(1))
+    repo.insert_artifact(run_id="run-1", aip_id="aip-1", artifact_type="categorize", artifact_json=_payload(200))
+
+    assert client.uploads == []
+    assert [len(row["artifact_json"]["projects"]) for row in client.artifacts] == [1, 200]
+
+
+def test_offload_is_disabled_without_bucket_settings() -> None:
+    client = _FakeArtifactClient()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    repo.insert_artifact(run_id="run-1", aip_id="aip-1", artifact_type="validate", artifact_json=_payload(200))
+
+    assert client.uploads == []
+    assert len(client.artifacts[0]["artifact_json"]["projects"]) == 200
+
+
+def test_corrupted_offloaded_artifact_fails_the_hash_check() -> None:
+    client = _FakeArtifactClient()
+    repo = _repo(client, artifact_compression="none")
+    repo.insert_artifact(run_id="run-1", aip_id="aip-1", artifact_type="extract", artifact_json=_payload(200))
+    key = next(iter(client.objects))
+    client.objects[key] = json.dumps(_payload(199)).encode("utf-8")
+
+    with pytest.raises(RuntimeError, match="hash mismatch"):
+        repo.get_stage_artifact(run_id="run-1", artifact_type="extract")
+
+
+def test_legacy_path_only_pointer_reads_plain_json_from_default_bucket() -> None:
+    client = _FakeArtifactClient()
+    repo = _repo(client)
+    payload = _payload(3)
+    client.objects[("aip-artifacts", "runs/run-0/extract_1.json")] = json.dumps(payload).encode("utf-8")
+    client.artifacts.append(
+        {"run_id": "run-0", "artifact_type": "extract", "artifact_json": {"storage_path": "runs/run-0/extract_1.json"}}
+    )
+
+    assert repo.get_stage_artifact(run_id="run-0", artifact_type="extract") == payload
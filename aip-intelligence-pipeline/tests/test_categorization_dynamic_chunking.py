@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import json
 import re
+import threading
+import time
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
 from openaip_pipeline.core.artifact_contract import make_stage_root
-from openaip_pipeline.services.categorization.categorize import categorize_from_summarized_json_str
+from openaip_pipeline.services.categorization.categorize import (
+    CategorizationCancelledError,
+    categorize_from_summarized,
+    categorize_from_summarized_json_str,
+)
 
 
 def _document() -> dict[str, Any]:
@@ -163,3 +169,63 @@ def test_single_project_context_overflow_raises_explicit_error() -> None:
             batch_size=None,
             client=client,
         )
+
+
+class _SlowCategorizationResponses(_CategorizationResponses):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def parse(self, **kwargs: Any) -> Any:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.03)
+            return super().parse(**kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_batches_run_concurrently_with_ordered_progress() -> None:
+    payload = _summarized_payload(8, description_length=120)
+    client = SimpleNamespace(responses=_SlowCategorizationResponses())
+    progress_events: list[tuple[int, int, int, int]] = []
+
+    result = categorize_from_summarized_json_str(
+        json.dumps(payload),
+        model="gpt-5.2",
+        batch_size=2,
+        client=client,
+        on_progress=lambda done, total, batch_no, total_batches: progress_events.append(
+            (done, total, batch_no, total_batches)
+        ),
+        categorize_concurrency=3,
+    )
+
+    assert 1 < client.responses.peak <= 3
+    assert [event[0] for event in progress_events] == [2, 4, 6, 8]
+    assert [event[2] for event in progress_events] == [1, 2, 3, 4]
+    assert result.usage["total_tokens"] == 4 * 12
+    for project in result.categorized_obj["projects"]:
+        assert project["classification"]["category"] == _expected_category(project["aip_ref_code"])
+
+
+def test_cancel_event_stops_further_batch_requests(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_CATEGORIZE_CONCURRENCY", "1")
+    client = _CategorizationClient()
+    cancel = threading.Event()
+
+    with pytest.raises(CategorizationCancelledError):
+        categorize_from_summarized(
+            _summarized_payload(6),
+            batch_size=2,
+            client=client,  # type: ignore[arg-type]
+            on_progress=lambda *_args: cancel.set(),
+            cancel_event=cancel,
+        )
+
+    assert client.responses.success_sizes == [2]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import types
+
+from fastapi.testclient import TestClient
+
+import openaip_pipeline.api.routes.chat as chat_route_module
+from openaip_pipeline.api.app import create_app
+from openaip_pipeline.services.rag.engine import RagEngine
+from openaip_pipeline.services.rag.streaming import AnswerFieldDecoder, format_sse_event
+
+
+def _doc(chunk_id: str, text: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        page_content=text,
+        metadata={"chunk_id": chunk_id, "scope_type": "barangay", "similarity": 0.9, "metadata": {}},
+    )
+
+
+def _parse_frames(body: str) -> list[tuple[str, dict]]:
+    frames = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        frames.append((lines["event"], json.loads(lines["data"])))
+    return frames
+
+
+def test_answer_field_decoder_handles_escapes_split_across_deltas() -> None:
+    raw = '{"used_source_ids": ["S1"], "answer": "Road \\"A\\" costs \\u20b1 5M [S1].\\nDone"}'
+    decoder = AnswerFieldDecoder()
+
+    streamed = "".join(decoder.feed(raw[index : index + 3]) for index in range(0, len(raw), 3))
+
+    assert streamed == json.loads(raw)["answer"]
+    assert decoder.done
+
+
+def test_answer_field_decoder_joins_escaped_surrogate_pairs() -> None:
+    raw = '{"answer": "ok \\ud83d\\ude00 done \\ud83d"}'
+    decoder = AnswerFieldDecoder()
+
+    streamed = "".join(decoder.feed(char) for char in raw)
+
+    assert streamed == "ok \U0001f600 done \ufffd"
+    assert decoder.done
+    assert format_sse_event("token", {"delta": streamed}).encode("utf-8")
+
+def test_streamed_pipeline_emits_selection_then_tokens_and_validates_citations(monkeypatch) -> None:
+    docs = [_doc("c1", "Drainage canal rehabilitation in Purok 2."), _doc("c2", "Road concreting in Purok 5.")]
+    generation = '{"answer": "Drainage canal rehabilitation is funded [S1].", "used_source_ids": ["S1"]}'
+
+    class _FakeLLM:
+        def stream(self, _messages):
+            for index in range(0, len(generation), 7):
+                yield types.SimpleNamespace(content=generation[index : index + 7])
+
+        def invoke(self, _messages):
+            return types.SimpleNamespace(content='{"supported": true, "issues": []}')
+
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.rag.run_hybrid_retrieval",
+        lambda **_kwargs: {"dense_docs": docs, "keyword_docs": [], "fused_docs": docs, "strong_docs": docs},
+    )
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.rag.evaluate_evidence_gate",
+        lambda **_kwargs: {"decision": "allow", "reason": "strong_evidence", "metrics": {}},
+    )
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+        supabase=object(),
+    )
+    engine._chat_llms["gpt-5.2"] = _FakeLLM()
+    events: list[tuple[str, object]] = []
+
+    result = engine.answer(
+        question="What drainage projects are funded?",
+        on_selection=lambda payload: events.append(("retrieval", payload)),
+        on_token=lambda delta: events.append(("token", delta)),
+    )
+
+    assert events[0][0] == "retrieval"
+    assert [citation["source_id"] for citation in events[0][1]["citations"]] == ["S1", "S2"]
+    assert "generation_ms" not in events[0][1]["retrieval_meta"]["stage_latency_ms"]
+    assert {name for name, _payload in events[1:]} == {"token"}
+    assert "".join(delta for _name, delta in events[1:]) == result["answer"]
+    assert [citation["source_id"] for citation in result["citations"]] == ["S1"]
+    assert result["retrieval_meta"]["response_mode_source"] == "pipeline_generated"
+
+
+def test_stream_route_sends_retrieval_token_and_final_frames(monkeypatch) -> None:
+    async def fake_answer_with_rag(**kwargs):
+        kwargs["on_selection"]({"question": kwargs["question"], "citations": [{"source_id": "S1"}]})
+        for delta in ["Funded ", "[S1]."]:
+            kwargs["on_token"](delta)
+        return {
+            "question": kwargs["question"],
+            "answer": "Funded [S1].",
+            "refused": False,
+            "citations": [{"source_id": "S1"}],
+            "retrieval_meta": {"reason": "ok"},
+            "context_count": 1,
+        }
+
+    monkeypatch.setenv("INTENT_ROUTER_ENABLED", "false")
+    monkeypatch.setattr(chat_route_module, "_require_internal_token", lambda _request: None)
+    monkeypatch.setattr(chat_route_module, "aanswer_with_rag", fake_answer_with_rag)
+    app = create_app()
+    app.state.rag_engine = types.SimpleNamespace(
+        default_chat_model="gpt-5.2",
+        embeddings_model="text-embedding-3-large",
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+    )
+
+    response = TestClient(app).post("/v1/chat/answer/stream", json={"question": "Drainage?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = _parse_frames(response.text)
+    assert [name for name, _payload in frames] == ["retrieval", "token", "token", "final"]
+    assert frames[1][1] == {"delta": "Funded "}
+    assert frames[-1][1]["answer"] == "Funded [S1]."
+    assert frames[-1][1]["citations"] == [{"source_id": "S1"}]
@@ -37,7 +37,7 @@ def _patch_chat_deps(monkeypatch, *, router: FakeRouter):
     def fake_require_internal_token(_provided_token):
         return None
 
-    def fake_answer_with_rag(**kwargs):
+    async def fake_answer_with_rag(**kwargs):
         rag_calls.append(str(kwargs.get("question") or ""))
         question = str(kwargs.get("question") or "")
         return {
@@ -62,7 +62,7 @@ def _patch_chat_deps(monkeypatch, *, router: FakeRouter):
             openai_api_key="openai-key",
         ),
     )
-    monkeypatch.setattr(chat_route_module, "answer_with_rag", fake_answer_with_rag)
+    monkeypatch.setattr(chat_route_module, "aanswer_with_rag", fake_answer_with_rag)
     return rag_calls
 
 
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+from urllib.error import HTTPError
+
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+
+
+def _row(run_id: str, created_at: str) -> dict[str, Any]:
+    return {
+        "id": run_id,
+        "aip_id": "aip-1",
+        "uploaded_file_id": None,
+        "retry_of_run_id": None,
+        "resume_from_stage": None,
+        "model_name": "gpt-5.2",
+        "status": "running",
+        "stage": "extract",
+        "created_at": created_at,
+    }
+
+
+class _FakeRpcClient:
+    def __init__(self, *, rpc_available: bool = True) -> None:
+        self.rpc_available = rpc_available
+        self.rpc_calls: list[tuple[str, dict[str, Any]]] = []
+        self.queued = [_row("run-a", "2026-01-01T00:00:00+00:00"), _row("run-b", "2026-01-02T00:00:00+00:00")]
+
+    def rpc(self, function_name: str, params: dict[str, Any], *, idempotent: bool = False) -> Any:
+        self.rpc_calls.append((function_name, params))
+        if not self.rpc_available:
+            raise HTTPError(url="http://example.test", code=404, msg="Not Found", hdrs=None, fp=None)
+        claimed, self.queued = self.queued[: params["p_limit"]], self.queued[params["p_limit"] :]
+        return list(reversed(claimed))
+
+    def select(self, table: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return self.queued[:1]
+
+    def update(self, table: str, patch: dict[str, Any], *, filters: dict[str, str], select: str | None = None):
+        run_id = filters["id"][3:]
+        claimed = [row for row in self.queued if row["id"] == run_id]
+        self.queued = [row for row in self.queued if row["id"] != run_id]
+        return [{**row, **patch} for row in claimed]
+
+
+def test_claim_queued_runs_uses_single_rpc_round_trip() -> None:
+    client = _FakeRpcClient()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    runs = repo.claim_queued_runs(5, lease_owner="host:1", lease_seconds=90.0, prefer_retries=True)
+
+    assert [run.id for run in runs] == ["run-a", "run-b"]
+    assert client.rpc_calls == [
+        (
+            "claim_extraction_runs",
+            {
+                "p_limit": 5,
+                "p_lease_owner": "host:1",
+                "p_lease_seconds": 90,
+                "p_order": "oldest",
+                "p_prefer_retries": True,
+            },
+        )
+    ]
+
+
+def test_claim_queued_runs_falls_back_when_rpc_is_missing() -> None:
+    client = _FakeRpcClient(rpc_available=False)
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    first = repo.claim_queued_runs(1)
+    rest = repo.claim_queued_runs(3)
+
+    assert [run.id for run in first] == ["run-a"]
+    assert [run.id for run in rest] == ["run-b"]
+    # The missing RPC is only probed once per repository.
+    assert len(client.rpc_calls) == 1
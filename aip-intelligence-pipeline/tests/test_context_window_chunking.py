@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import random
+
+import pytest
+
+from openaip_pipeline.services.categorization.categorize import (
+    _build_user_text,
+    _chunk_item_texts_by_token_budget,
+)
 from openaip_pipeline.services.chunking.context_window import (
     chunk_items_by_token_budget,
+    chunk_json_list_by_token_budget,
     estimate_tokens_from_json,
     is_context_limit_error,
     sum_usage,
@@ -41,3 +50,61 @@ def test_context_limit_detection_and_usage_sum() -> None:
             {"input_tokens": 4, "output_tokens": 1, "total_tokens": 5},
         ]
     ) == {"input_tokens": 7, "output_tokens": 3, "total_tokens": 10}
+
+
+def _random_text(rng: random.Random) -> str:
+    alphabet = "abc XYZ 0123 \"quoted\" back\\slash\nnew\tline ñ é 漢字 🚧"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 160)))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("max_items_per_chunk", [None, 1, 4])
+def test_measured_list_chunker_matches_reference_boundaries(seed: int, max_items_per_chunk: int | None) -> None:
+    rng = random.Random(seed)
+    items = [
+        {"aip_ref_code": f"1000-{index:03d}", "text": _random_text(rng), "total": rng.random() * 1e6, "errors": None}
+        for index in range(60)
+    ]
+    static_payload = {"aip_id": "aip-1", "document": {"lgu": "Ñoño"}}
+    for budget_tokens in (1, 40, 120, 400, 5000):
+        expected = chunk_items_by_token_budget(
+            items=list(range(len(items))),
+            static_payload=static_payload,
+            add_item_fn=lambda payload, chunk: {**payload, "projects": [items[index] for index in chunk]},
+            budget_tokens=budget_tokens,
+            max_items_per_chunk=max_items_per_chunk,
+        )
+        actual = chunk_json_list_by_token_budget(
+            items=items,
+            static_payload=static_payload,
+            list_key="projects",
+            budget_tokens=budget_tokens,
+            max_items_per_chunk=max_items_per_chunk,
+        )
+        assert actual == expected
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_measured_text_chunker_matches_reference_boundaries(seed: int) -> None:
+    rng = random.Random(seed)
+    # Enough items for two-digit ITEM headers inside a single chunk.
+    item_texts = [_random_text(rng) for _ in range(40)]
+    static_payload = {"stage": "categorization"}
+    for budget_tokens in (1, 60, 300, 3000, 50000):
+        expected = chunk_items_by_token_budget(
+            items=list(range(len(item_texts))),
+            static_payload=static_payload,
+            add_item_fn=lambda payload, chunk: {
+                **payload,
+                "user_text": _build_user_text([item_texts[index] for index in chunk]),
+            },
+            budget_tokens=budget_tokens,
+            max_items_per_chunk=None,
+        )
+        actual = _chunk_item_texts_by_token_budget(
+            item_texts=item_texts,
+            static_payload=static_payload,
+            budget_tokens=budget_tokens,
+            max_items_per_chunk=None,
+        )
+        assert actual == expected
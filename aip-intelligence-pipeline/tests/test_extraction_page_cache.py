@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import io
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pypdf import PdfWriter
+
+from openaip_pipeline.services.extraction import barangay as barangay_module
+from openaip_pipeline.services.extraction import city as city_module
+from openaip_pipeline.services.extraction.page_cache import ExtractionPageCache
+
+
+def _blank_pdf_bytes(page_count: int) -> bytes:
+    writer = PdfWriter()
+    for index in range(page_count):
+        writer.add_blank_page(width=612 + index, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_cache_key_changes_with_model_prompt_and_page_bytes(tmp_path) -> None:
+    def build(model: str, system_prompt: str) -> ExtractionPageCache:
+        return ExtractionPageCache(
+            tmp_path,
+            scope="city",
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt="user",
+            text_format=city_module.CityAIPExtraction,
+        )
+
+    base = build("gpt-5.2", "system")
+    assert base.key_for(b"page-a") == build("gpt-5.2", "system").key_for(b"page-a")
+    assert base.key_for(b"page-a") != base.key_for(b"page-b")
+    assert base.key_for(b"page-a") != build("gpt-5.2-mini", "system").key_for(b"page-a")
+    assert base.key_for(b"page-a") != build("gpt-5.2", "system v2").key_for(b"page-a")
+
+
+def test_corrupt_cache_entry_is_treated_as_miss(tmp_path) -> None:
+    cache = ExtractionPageCache(
+        tmp_path,
+        scope="barangay",
+        model="gpt-5.2",
+        system_prompt="system",
+        user_prompt="user",
+        text_format=barangay_module.BrgyAIPExtraction,
+    )
+    path = cache._entry_path(cache.key_for(b"page"))
+    path.parent.mkdir(parents=True)
+    path.write_text("{not json", encoding="utf-8")
+
+    assert cache.get(b"page") is None
+
+
+@pytest.mark.parametrize("module", [city_module, barangay_module], ids=["city", "barangay"])
+def test_unchanged_pages_are_served_from_cache_without_tokens(
+    module,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    all_pages_fn = (
+        module.extract_city_aip_from_pdf_all_pages
+        if module is city_module
+        else module.extract_brgy_aip_from_pdf_all_pages
+    )
+    page_fn_name = "extract_city_aip_from_pdf_page" if module is city_module else "extract_brgy_aip_from_pdf_page"
+    extraction_cls = city_module.CityAIPExtraction if module is city_module else barangay_module.BrgyAIPExtraction
+
+    monkeypatch.setenv("PIPELINE_EXTRACT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(module, "read_text", lambda resource_path: "prompt")
+    model_calls: list[int] = []
+
+    def fake_extract_page(*args: Any, **kwargs: Any) -> tuple[Any, dict[str, int]]:
+        page_index = int(kwargs["page_index"])
+        model_calls.append(page_index)
+        rows = [{"aip_ref_code": f"1000-00{page_index}", "program_project_description": "Road repair"}]
+        return extraction_cls(projects=rows), {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+    monkeypatch.setattr(module, page_fn_name, fake_extract_page)
+    pdf_bytes = _blank_pdf_bytes(2)
+
+    first_projects, first_usage, _ = all_pages_fn(
+        client=SimpleNamespace(), pdf_source=pdf_bytes, model="gpt-5.2", on_progress=None
+    )
+    second_projects, second_usage, _ = all_pages_fn(
+        client=SimpleNamespace(), pdf_source=pdf_bytes, model="gpt-5.2", on_progress=None
+    )
+
+    assert sorted(model_calls) == [0, 1]
+    assert second_projects == first_projects
+    assert first_usage["total_tokens"] == 30
+    assert (first_usage["extraction_cache_hits"], first_usage["extraction_cache_misses"]) == (0, 2)
+    assert second_usage["total_tokens"] == 0
+    assert (second_usage["extraction_cache_hits"], second_usage["extraction_cache_misses"]) == (2, 0)
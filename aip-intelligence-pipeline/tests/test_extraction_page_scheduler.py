@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from openaip_pipeline.services.extraction import barangay as barangay_module
+from openaip_pipeline.services.extraction import city as city_module
+from openaip_pipeline.services.extraction import page_scheduler
+
+
+def test_run_pages_in_order_reassembles_out_of_order_completion() -> None:
+    delays = [0.05, 0.0, 0.03, 0.01]
+    progress: list[tuple[int, int]] = []
+
+    def extract_page(index: int) -> int:
+        time.sleep(delays[index])
+        return index * 10
+
+    results = page_scheduler.run_pages_in_order(
+        total_pages=len(delays),
+        max_workers=4,
+        extract_page=extract_page,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert results == [0, 10, 20, 30]
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_run_pages_in_order_respects_worker_bound() -> None:
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def extract_page(index: int) -> int:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return index
+
+    results = page_scheduler.run_pages_in_order(total_pages=12, max_workers=3, extract_page=extract_page)
+
+    assert results == list(range(12))
+    assert 1 < state["peak"] <= 3
+
+
+def test_run_pages_in_order_propagates_page_failure() -> None:
+    def extract_page(index: int) -> int:
+        if index == 2:
+            raise RuntimeError("page 3 failed")
+        return index
+
+    with pytest.raises(RuntimeError, match="page 3 failed"):
+        page_scheduler.run_pages_in_order(total_pages=5, max_workers=2, extract_page=extract_page)
+
+
+def test_resolve_extract_concurrency_precedence(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PIPELINE_EXTRACT_CONCURRENCY", raising=False)
+    assert page_scheduler.resolve_extract_concurrency(None) == page_scheduler.DEFAULT_EXTRACT_CONCURRENCY
+
+    monkeypatch.setenv("PIPELINE_EXTRACT_CONCURRENCY", "6")
+    assert page_scheduler.resolve_extract_concurrency(None) == 6
+    assert page_scheduler.resolve_extract_concurrency(2) == 2
+
+    monkeypatch.setenv("PIPELINE_EXTRACT_CONCURRENCY", "0")
+    assert page_scheduler.resolve_extract_concurrency(None) == page_scheduler.DEFAULT_EXTRACT_CONCURRENCY
+
+
+@pytest.mark.parametrize("module", [city_module, barangay_module], ids=["city", "barangay"])
+def test_all_pages_keeps_page_order_and_dedupes_with_concurrency(module, monkeypatch: pytest.MonkeyPatch) -> None:
+    all_pages_fn = (
+        module.extract_city_aip_from_pdf_all_pages
+        if module is city_module
+        else module.extract_brgy_aip_from_pdf_all_pages
+    )
+    page_fn_name = "extract_city_aip_from_pdf_page" if module is city_module else "extract_brgy_aip_from_pdf_page"
+    extraction_cls = city_module.CityAIPExtraction if module is city_module else barangay_module.BrgyAIPExtraction
+
+    monkeypatch.setattr(
+        module,
+        "PdfReader",
+        lambda pdf_path: SimpleNamespace(pages=[object(), object(), object()]),
+    )
+    monkeypatch.setattr(module, "read_text", lambda resource_path: "prompt")
+
+    delays = {0: 0.05, 1: 0.0, 2: 0.02}
+    duplicated_row = {"aip_ref_code": "1000-001", "program_project_description": "Road repair", "total": "100"}
+
+    def fake_extract_page(*args: Any, **kwargs: Any) -> tuple[Any, dict[str, int]]:
+        page_index = int(kwargs["page_index"])
+        time.sleep(delays[page_index])
+        rows = [duplicated_row, {"aip_ref_code": f"2000-00{page_index}", "program_project_description": "Drainage"}]
+        return extraction_cls(projects=rows), {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3}
+
+    monkeypatch.setattr(module, page_fn_name, fake_extract_page)
+    progress: list[tuple[int, int]] = []
+
+    projects, usage, page_count = all_pages_fn(
+        client=SimpleNamespace(),
+        pdf_source="ignored.pdf",
+        model="gpt-5.2",
+        on_progress=lambda done, total: progress.append((done, total)),
+        extract_concurrency=3,
+    )
+
+    assert page_count == 3
+    assert [project["aip_ref_code"] for project in projects] == ["1000-001", "2000-000", "2000-001", "2000-002"]
+    assert [ref["page"] for ref in projects[0]["source_refs"]] == [1, 2, 3]
+    assert usage["input_tokens"] == 3
+    assert usage["total_tokens"] == 9
+    assert progress == [(1, 3), (2, 3), (3, 3)]
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import os
-import tempfile
 from types import SimpleNamespace
 from typing import Any
 
@@ -33,7 +31,8 @@ def test_resolve_extract_page_timeout_precedence(module, monkeypatch: pytest.Mon
 class _TimeoutClient:
     def __init__(self) -> None:
         self.timeouts: list[float] = []
-        self.files = self._Files()
+        self.uploads: list[Any] = []
+        self.files = self._Files(self.uploads)
         self.responses = self._Responses()
 
     def with_options(self, *, timeout: float) -> "_TimeoutClient":
@@ -41,7 +40,11 @@ class _TimeoutClient:
         return self
 
     class _Files:
+        def __init__(self, uploads: list[Any]) -> None:
+            self.uploads = uploads
+
         def create(self, *, file: Any, purpose: str) -> Any:
+            self.uploads.append(file)
             return SimpleNamespace(id="file-timeout")
 
     class _Responses:
@@ -50,25 +53,20 @@ class _TimeoutClient:
 
 
 @pytest.mark.parametrize("module", [city_module, barangay_module], ids=["city", "barangay"])
-def test_page_timeout_raises_extract_timeout_and_cleans_temp_file(module, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_page_timeout_raises_extract_timeout_after_in_memory_upload(module, monkeypatch: pytest.MonkeyPatch) -> None:
     page_fn = (
         module.extract_city_aip_from_pdf_page
         if module is city_module
         else module.extract_brgy_aip_from_pdf_page
     )
-    temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    temp_pdf.write(b"%PDF-1.4 test")
-    temp_pdf.flush()
-    temp_pdf.close()
-    page_pdf_path = temp_pdf.name
-    assert os.path.exists(page_pdf_path)
-
-    monkeypatch.setattr(module, "extract_single_page_pdf", lambda original_pdf_path, page_index: page_pdf_path)
+    page_bytes = b"%PDF-1.4 test"
+
+    monkeypatch.setattr(module, "extract_single_page_pdf", lambda original_pdf, page_index: page_bytes)
     client = _TimeoutClient()
     with pytest.raises(module.ExtractionGuardrailError) as error:
         page_fn(
             client=client,
-            pdf_path="ignored.pdf",
+            pdf_source=b"ignored",
             page_index=0,
             total_pages=3,
             model="gpt-5.2",
@@ -79,7 +77,7 @@ def test_page_timeout_raises_extract_timeout_and_cleans_temp_file(module, monkey
 
     assert error.value.reason_code == "EXTRACT_TIMEOUT"
     assert "page 1/3" in str(error.value)
-    assert not os.path.exists(page_pdf_path)
+    assert client.uploads == [("page-1.pdf", page_bytes, "application/pdf")]
     assert len(client.timeouts) >= 1
 
 
@@ -125,7 +123,7 @@ def test_all_pages_uses_per_page_timeout_without_global_elapsed_limit(
 
     projects, usage, page_count = all_pages_fn(
         client=SimpleNamespace(),
-        pdf_path="ignored.pdf",
+        pdf_source="ignored.pdf",
         model="gpt-5.2",
         on_progress=None,
         parse_timeout_seconds=20.0,
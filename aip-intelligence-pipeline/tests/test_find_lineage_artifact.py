@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+from urllib.error import HTTPError
+
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+
+
+class _FakeLineageClient:
+    def __init__(self, *, rpc_available: bool = True) -> None:
+        self.rpc_available = rpc_available
+        self.parents = {"run-3": "run-2", "run-2": "run-1", "run-1": None}
+        self.artifacts = [{"id": "artifact-1", "run_id": "run-1", "artifact_type": "extract", "artifact_json": {"projects": []}}]
+        self.rpc_calls: list[tuple[str, dict[str, Any]]] = []
+        self.select_calls: list[tuple[str, dict[str, str]]] = []
+
+    def rpc(self, function_name: str, params: dict[str, Any], *, idempotent: bool = False) -> Any:
+        self.rpc_calls.append((function_name, params))
+        if not self.rpc_available:
+            raise HTTPError(url="http://example.test", code=404, msg="Not Found", hdrs=None, fp=None)
+        cursor: str | None = params["p_run_id"]
+        depth = 0
+        while cursor:
+            for row in self.artifacts:
+                if row["run_id"] == cursor and row["artifact_type"] == params["p_artifact_type"]:
+                    return [
+                        {
+                            "source_run_id": cursor,
+                            "artifact_id": row["id"],
+                            "depth": depth,
+                            "artifact_json": row["artifact_json"],
+                        }
+                    ]
+            cursor = self.parents.get(cursor)
+            depth += 1
+        return []
+
+    def select(
+        self,
+        table: str,
+        *,
+        select: str,
+        filters: dict[str, str] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        filters = filters or {}
+        self.select_calls.append((table, filters))
+        if table == "extraction_runs":
+            run_id = filters["id"][3:]
+            return [{"retry_of_run_id": self.parents.get(run_id)}] if run_id in self.parents else []
+        rows = [
+            row
+            for row in self.artifacts
+            if all(str(row.get(column)) == condition[3:] for column, condition in filters.items())
+        ]
+        return [{"artifact_json": row["artifact_json"]} for row in rows[:limit]]
+
+
+def test_find_lineage_artifact_resolves_ancestor_in_one_rpc() -> None:
+    client = _FakeLineageClient()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    payload, source_run_id = repo.find_lineage_artifact(run_id="run-3", artifact_type="extract")
+
+    assert payload == {"projects": []}
+    assert source_run_id == "run-1"
+    assert client.rpc_calls == [("find_lineage_artifact", {"p_run_id": "run-3", "p_artifact_type": "extract"})]
+    assert client.select_calls == []
+
+
+def test_find_lineage_artifact_reuses_cached_lineage() -> None:
+    client = _FakeLineageClient()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    repo.find_lineage_artifact(run_id="run-3", artifact_type="extract")
+    payload, source_run_id = repo.find_lineage_artifact(run_id="run-3", artifact_type="extract")
+
+    assert (payload, source_run_id) == ({"projects": []}, "run-1")
+    assert len(client.rpc_calls) == 1
+    assert client.select_calls == [("extraction_artifacts", {"id": "eq.artifact-1"})]
+
+
+def test_find_lineage_artifact_reports_missing_artifact() -> None:
+    client = _FakeLineageClient()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    assert repo.find_lineage_artifact(run_id="run-3", artifact_type="validate") == (None, None)
+
+
+def test_find_lineage_artifact_walks_hops_when_rpc_is_missing() -> None:
+    client = _FakeLineageClient(rpc_available=False)
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    first = repo.find_lineage_artifact(run_id="run-3", artifact_type="extract")
+    second = repo.find_lineage_artifact(run_id="run-2", artifact_type="extract")
+
+    assert first == ({"projects": []}, "run-1")
+    assert second == ({"projects": []}, "run-1")
+    # The missing RPC is only probed once per repository.
+    assert len(client.rpc_calls) == 1
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import io
+from types import SimpleNamespace
+
+from pypdf import PdfReader, PdfWriter
+
+from openaip_pipeline.services.extraction import signatory_parser
+from openaip_pipeline.services.extraction.document_metadata import extract_document_metadata
+from openaip_pipeline.services.extraction.pdf_document import PdfDocument
+
+
+class _CountingPage:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.extract_calls = 0
+        self.mediabox = SimpleNamespace(width=600, height=800)
+
+    def extract_text(self) -> str:
+        self.extract_calls += 1
+        return self.text
+
+
+def _blank_pdf_bytes(page_count: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(page_count):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_page_text_is_extracted_once_per_page() -> None:
+    pages = [_CountingPage("Annual Investment Program FY 2026"), _CountingPage("Prepared by:")]
+    pdf_document = PdfDocument(SimpleNamespace(pages=pages), source="ignored.pdf")
+
+    assert pdf_document.pages_text() == ["Annual Investment Program FY 2026", "Prepared by:"]
+    assert pdf_document.pages_text() == ["Annual Investment Program FY 2026", "Prepared by:"]
+    assert pdf_document.page_text(1) == "Prepared by:"
+    assert [page.extract_calls for page in pages] == [1, 1]
+    assert pdf_document.page_size(2) == (600.0, 800.0)
+
+
+def test_single_page_pdf_bytes_are_cached_and_valid() -> None:
+    pdf_document = PdfDocument.open(_blank_pdf_bytes(3))
+
+    first = pdf_document.single_page_pdf_bytes(1)
+    assert pdf_document.single_page_pdf_bytes(1) is first
+    assert len(PdfReader(io.BytesIO(first)).pages) == 1
+
+
+def test_open_accepts_bytes_and_buffers_without_a_path() -> None:
+    source_bytes = _blank_pdf_bytes(2)
+
+    from_bytes = PdfDocument.open(source_bytes)
+    from_buffer = PdfDocument.open(io.BytesIO(source_bytes))
+
+    assert from_bytes.page_count == 2
+    assert from_buffer.page_count == 2
+    assert from_buffer.source == source_bytes
+    assert from_bytes.source_name == "<memory>"
+    assert from_bytes.positioned_words(1)[1:] == (612.0, 792.0, False)
+
+
+def test_signatory_parser_and_metadata_reuse_shared_document(monkeypatch) -> None:
+    pages = [_CountingPage("Barangay Mamatid\nAnnual Investment Program FY 2026"), _CountingPage("Prepared by:")]
+    pdf_document = PdfDocument(SimpleNamespace(pages=pages), source="ignored.pdf")
+    word_calls: list[int] = []
+
+    def fake_positioned_words(page_number_1_indexed: int):
+        word_calls.append(page_number_1_indexed)
+        return [], 612.0, 792.0, False
+
+    monkeypatch.setattr(pdf_document, "positioned_words", fake_positioned_words)
+    monkeypatch.setattr(
+        "openaip_pipeline.services.extraction.document_metadata.PdfDocument.open",
+        lambda pdf_path: (_ for _ in ()).throw(AssertionError("PDF must not be reopened")),
+    )
+
+    extract_document_metadata("ignored.pdf", scope="barangay", pdf_document=pdf_document)
+    words, width, height, _ = signatory_parser.extract_positioned_words(
+        "ignored.pdf",
+        2,
+        pdf_document=pdf_document,
+    )
+
+    assert [page.extract_calls for page in pages] == [1, 1]
+    assert word_calls == [1, 2, 2]
+    assert (words, width, height) == ([], 612.0, 792.0)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from openaip_pipeline.worker.progress_writer import CoalescingProgressWriter
+
+
+class _RecordingRepo:
+    def __init__(self, *, write_delay: float = 0.0) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+        self.write_delay = write_delay
+        self._lock = threading.Lock()
+
+    def _record(self, *entry: Any) -> None:
+        time.sleep(self.write_delay)
+        with self._lock:
+            self.calls.append(entry)
+
+    def set_run_progress(
+        self,
+        *,
+        run_id: str,
+        stage: str,
+        stage_progress_pct: int,
+        progress_message: str | None = None,
+        lease_owner: str | None = None,
+    ) -> None:
+        self._record("progress", run_id, stage, stage_progress_pct)
+
+    def set_run_stage(self, *, run_id: str, stage: str, lease_owner: str | None = None) -> None:
+        self._record("stage", run_id, stage)
+
+    def set_run_succeeded(self, *, run_id: str, lease_owner: str | None = None) -> None:
+        self._record("succeeded", run_id)
+
+    def set_run_failed(self, *, run_id: str, stage: str, error_message: str, lease_owner: str | None = None) -> None:
+        self._record("failed", run_id, stage)
+
+
+def test_progress_updates_coalesce_to_latest_state_per_run() -> None:
+    repo = _RecordingRepo(write_delay=0.05)
+    writer = CoalescingProgressWriter(repo, min_interval_seconds=0.2)  # type: ignore[arg-type]
+    try:
+        writer.set_run_stage(run_id="run-1", stage="extract")
+        writer.set_run_stage(run_id="run-2", stage="extract")
+        started = time.perf_counter()
+        for pct in range(1, 101):
+            writer.set_run_progress(run_id="run-1", stage="extract", stage_progress_pct=pct)
+            writer.set_run_progress(run_id="run-2", stage="extract", stage_progress_pct=pct)
+        # Hot-loop callers never wait on a write.
+        assert time.perf_counter() - started < 0.05
+    finally:
+        writer.close()
+
+    run_1 = [call for call in repo.calls if call[1] == "run-1"]
+    assert run_1[0] == ("stage", "run-1", "extract")
+    assert run_1[-1] == ("progress", "run-1", "extract", 100)
+    assert len(run_1) <= 3
+    assert repo.calls.count(("progress", "run-2", "extract", 100)) == 1
+
+
+def test_stage_transition_and_terminal_state_flush_immediately_and_drop_stale_updates() -> None:
+    repo = _RecordingRepo()
+    writer = CoalescingProgressWriter(repo, min_interval_seconds=30.0)  # type: ignore[arg-type]
+    try:
+        writer.set_run_stage(run_id="run-1", stage="validate")
+        writer.set_run_progress(run_id="run-1", stage="validate", stage_progress_pct=40)
+        writer.set_run_stage(run_id="run-1", stage="summarize")
+        writer.set_run_progress(run_id="run-1", stage="summarize", stage_progress_pct=70)
+        writer.set_run_succeeded(run_id="run-1")
+        writer.set_run_progress(run_id="run-1", stage="summarize", stage_progress_pct=90)
+        assert repo.calls == [
+            ("stage", "run-1", "validate"),
+            ("stage", "run-1", "summarize"),
+            ("succeeded", "run-1"),
+        ]
+    finally:
+        writer.close()
+    assert repo.calls[-1] == ("succeeded", "run-1")
+
+
+def test_zero_interval_writes_through(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_PROGRESS_MIN_INTERVAL_SECONDS", "0")
+    repo = _RecordingRepo()
+    writer = CoalescingProgressWriter(repo)  # type: ignore[arg-type]
+
+    for pct in (10, 20, 30):
+        writer.set_run_progress(run_id="run-1", stage="extract", stage_progress_pct=pct)
+    writer.close()
+
+    assert [call[3] for call in repo.calls] == [10, 20, 30]
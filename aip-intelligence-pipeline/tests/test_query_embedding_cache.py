@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from openaip_pipeline.services.rag.embedding_cache import QueryEmbeddingCache
+from openaip_pipeline.services.rag.engine import RagEngine
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeEmbeddingsClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list[str]]] = []
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, *, model: str, input: list[str]) -> Any:
+        self.calls.append((model, list(input)))
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[0.25, 0.5, float(len(input[0]))])])
+
+
+def test_cache_normalizes_text_and_separates_models() -> None:
+    cache = QueryEmbeddingCache(max_entries=4)
+    cache.put("What  drainage projects?", "text-embedding-3-large", [0.1, 0.2])
+
+    assert cache.get("what drainage projects?", "text-embedding-3-large") == [0.1, 0.2]
+    assert cache.get("what drainage projects?", "text-embedding-3-small") is None
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cache_evicts_least_recently_used_and_expires_by_ttl() -> None:
+    clock = _Clock()
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60, clock=clock)
+    cache.put("a", "m", [1.0])
+    cache.put("b", "m", [2.0])
+    assert cache.get("a", "m") == [1.0]
+    cache.put("c", "m", [3.0])
+
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == [1.0]
+    clock.now += 61
+    assert cache.get("c", "m") is None
+
+
+def test_disk_tier_survives_a_new_process(tmp_path) -> None:
+    path = tmp_path / "embeddings.sqlite3"
+    QueryEmbeddingCache(max_entries=8, disk_path=path).put("road works", "m", [0.5, -1.25])
+
+    restarted = QueryEmbeddingCache(max_entries=8, disk_path=path)
+
+    assert restarted.stats()["size"] == 0
+    assert restarted.get("Road Works", "m") == [0.5, -1.25]
+    assert restarted.stats()["size"] == 1
+
+
+def test_async_lookup_keeps_disk_tier_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "embeddings.sqlite3"
+    QueryEmbeddingCache(max_entries=8, disk_path=path).put("road works", "m", [0.5, -1.25])
+    cache = QueryEmbeddingCache(max_entries=8, disk_path=path)
+    disk_threads: list[int] = []
+    read_disk, write_disk = cache._read_disk, cache._write_disk
+
+    def tracked_read(*args: Any) -> Any:
+        disk_threads.append(threading.get_ident())
+        return read_disk(*args)
+
+    def tracked_write(*args: Any) -> None:
+        disk_threads.append(threading.get_ident())
+        write_disk(*args)
+
+    monkeypatch.setattr(cache, "_read_disk", tracked_read)
+    monkeypatch.setattr(cache, "_write_disk", tracked_write)
+
+    async def create(*, model: str, input: list[str]) -> Any:
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, float(len(input[0]))])])
+
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.build_async_openai_client",
+        lambda _key: SimpleNamespace(embeddings=SimpleNamespace(create=create)),
+    )
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="m",
+        chat_model="gpt-5.2",
+        embedding_cache=cache,
+    )
+
+    async def scenario() -> tuple[int, Any, Any]:
+        first = await engine.alookup_embeddings(["Road works", "clinic upgrades"])
+        again = await engine.alookup_embeddings(["road works", "clinic upgrades"])
+        return threading.get_ident(), first, again
+
+    loop_thread, first, again = asyncio.run(scenario())
+
+    assert first == [([0.5, -1.25], True), ([1.0, 15.0], False)]
+    assert again == [([0.5, -1.25], True), ([1.0, 15.0], True)]
+    assert len(disk_threads) == 3
+    assert loop_thread not in disk_threads
+    assert QueryEmbeddingCache(max_entries=8, disk_path=path).get("clinic upgrades", "m") == [1.0, 15.0]
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+def test_engine_embedder_reuses_cache_and_reports_hits(monkeypatch) -> None:
+    client = _FakeEmbeddingsClient()
+    monkeypatch.setattr("openaip_pipeline.services.rag.engine.get_shared_openai_client", lambda _key: client)
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+        embedding_cache=QueryEmbeddingCache(max_entries=8),
+    )
+
+    # The embed-query route and the retriever share one cache.
+    engine.embed_query("health budget 2026")
+    embedder = engine.query_embedder("text-embedding-3-large")
+    first = embedder("Health budget 2026")
+    second = embedder("clinic upgrades")
+
+    assert first == [0.25, 0.5, 18.0]
+    assert second == [0.25, 0.5, 15.0]
+    assert [text for _model, (text,) in client.calls] == ["health budget 2026", "clinic upgrades"]
+    assert embedder.cache_meta() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "process_hit_rate": 0.3333}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import types
+
+from openaip_pipeline.services.rag.answer_cache import AnswerCache, question_anchors
+from openaip_pipeline.services.rag.embedding_cache import QueryEmbeddingCache
+from openaip_pipeline.services.rag.engine import RagEngine
+
+
+class _CorpusSupabase:
+    def __init__(self) -> None:
+        self.version = "v1"
+
+    def rpc(self, function_name: str, _params: dict):
+        assert function_name == "get_rag_corpus_version"
+        return types.SimpleNamespace(execute=lambda: types.SimpleNamespace(data=self.version))
+
+
+def _engine(supabase: _CorpusSupabase, **cache_kwargs) -> RagEngine:
+    return RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+        supabase=supabase,
+        embedding_cache=QueryEmbeddingCache(max_entries=16),
+        answer_cache=AnswerCache(max_entries=16, **cache_kwargs),
+        corpus_version_ttl_seconds=0,
+    )
+
+
+def _count_retrievals(monkeypatch) -> list[str]:
+    calls: list[str] = []
+
+    def fake_run_hybrid_retrieval(**kwargs):
+        calls.append(kwargs["question"])
+        return {"dense_docs": [], "keyword_docs": [], "fused_docs": [], "strong_docs": []}
+
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag.run_hybrid_retrieval", fake_run_hybrid_retrieval)
+    return calls
+
+
+def test_exact_repeat_is_served_from_cache_until_corpus_changes(monkeypatch) -> None:
+    calls = _count_retrievals(monkeypatch)
+    supabase = _CorpusSupabase()
+    engine = _engine(supabase)
+    scope = {"mode": "global", "targets": []}
+
+    first = engine.answer(question="What drainage projects are funded?", retrieval_scope=scope)
+    second = engine.answer(question="  what drainage projects ARE funded? ", retrieval_scope=scope)
+    other_filters = engine.answer(
+        question="What drainage projects are funded?",
+        retrieval_scope=scope,
+        retrieval_filters={"fiscal_year": 2026},
+    )
+    supabase.version = "v2"
+    after_publish = engine.answer(question="What drainage projects are funded?", retrieval_scope=scope)
+
+    assert len(calls) == 3
+    assert first["retrieval_meta"]["stage_latency_ms"]["answer_cache_hit"] is False
+    assert second["retrieval_meta"]["stage_latency_ms"]["answer_cache_hit"] is True
+    assert second["retrieval_meta"]["answer_cache"]["match"] == "exact"
+    assert second["question"] == "  what drainage projects ARE funded? "
+    assert second["answer"] == first["answer"]
+    assert other_filters["retrieval_meta"]["stage_latency_ms"]["answer_cache_hit"] is False
+    assert after_publish["retrieval_meta"]["stage_latency_ms"]["answer_cache_hit"] is False
+
+
+def test_near_duplicate_question_hits_semantic_lookup(monkeypatch) -> None:
+    calls = _count_retrievals(monkeypatch)
+    vectors = {
+        "How much is the health budget?": [1.0, 0.0, 0.1],
+        "How much is the budget for health?": [1.0, 0.0, 0.12],
+        "Any streetlight projects?": [0.0, 1.0, 0.0],
+    }
+
+    def fake_create(*, model, input):  # noqa: ANN001, A002
+        return types.SimpleNamespace(data=[types.SimpleNamespace(index=0, embedding=vectors[input[0]])])
+
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.get_shared_openai_client",
+        lambda _key: types.SimpleNamespace(embeddings=types.SimpleNamespace(create=fake_create)),
+    )
+    engine = _engine(_CorpusSupabase(), semantic_threshold=0.98)
+
+    engine.answer(question="How much is the health budget?")
+    near = engine.answer(question="How much is the budget for health?")
+    unrelated = engine.answer(question="Any streetlight projects?")
+
+    assert calls == ["How much is the health budget?", "Any streetlight projects?"]
+    assert near["retrieval_meta"]["answer_cache"]["match"] == "semantic"
+    assert near["retrieval_meta"]["answer_cache"]["similarity"] >= 0.98
+    assert unrelated["retrieval_meta"]["stage_latency_ms"]["answer_cache_hit"] is False
+
+
+def test_semantic_hit_requires_matching_years_and_figures() -> None:
+    cache = AnswerCache(max_entries=16, semantic_threshold=0.97)
+    cache.put(
+        question="What is the 2024 road budget?",
+        context_key="ctx",
+        corpus_version="v1",
+        result={"answer": "2024 answer"},
+        embedding=[1.0, 0.0, 0.10],
+    )
+
+    other_year = cache.get(
+        question="What is the 2025 road budget?",
+        context_key="ctx",
+        corpus_version="v1",
+        embedding=[1.0, 0.0, 0.11],
+    )
+    same_year = cache.get(
+        question="How much is the road budget for 2024?",
+        context_key="ctx",
+        corpus_version="v1",
+        embedding=[1.0, 0.0, 0.11],
+    )
+
+    assert other_year is None
+    assert same_year is not None and same_year.match == "semantic"
+    assert question_anchors("Top 5 projects in 2024") == frozenset({"year:2024", "number:5"})
+    assert question_anchors("Projects above 1,500,000") != question_anchors("Projects above 2,000,000")
+
+
+def test_semantic_index_follows_replacement_and_eviction() -> None:
+    cache = AnswerCache(max_entries=2, semantic_threshold=0.97)
+    for question, vector in (
+        ("Drainage projects?", [1.0, 0.0, 0.0]),
+        ("Road projects?", [0.0, 1.0, 0.0]),
+    ):
+        cache.put(
+            question=question, context_key="ctx", corpus_version="v1", result={"answer": question}, embedding=vector
+        )
+    cache.put(
+        question="Drainage projects?",
+        context_key="ctx",
+        corpus_version="v1",
+        result={"answer": "replaced"},
+        embedding=[0.0, 0.0, 1.0],
+    )
+    cache.put(question="Clinic projects?", context_key="ctx", corpus_version="v1", result={"answer": "clinic"})
+
+    def lookup(vector: list[float]):
+        return cache.get(question="Something else?", context_key="ctx", corpus_version="v1", embedding=vector)
+
+    evicted = lookup([0.0, 1.0, 0.01])
+    replaced = lookup([0.0, 0.01, 1.0])
+    stale = cache.get(question="Something else?", context_key="ctx", corpus_version="v2", embedding=[0.0, 0.01, 1.0])
+
+    assert evicted is None
+    assert replaced is not None and replaced.result == {"answer": "replaced"}
+    assert stale is None
+    assert lookup([0.0, 0.01, 1.0]) is None
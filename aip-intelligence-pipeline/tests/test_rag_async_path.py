@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import types
+
+from fastapi.testclient import TestClient
+
+from openaip_pipeline.api.app import create_app
+from openaip_pipeline.api.routes import intent as intent_route_module
+from openaip_pipeline.services.intent.types import IntentResult, IntentType
+from openaip_pipeline.services.rag.answer_cache import AnswerCache
+from openaip_pipeline.services.rag.embedding_cache import QueryEmbeddingCache
+from openaip_pipeline.services.rag.engine import RagEngine
+
+_ROWS = {
+    "match_published_aip_project_chunks_v2": [
+        {
+            "chunk_id": "c1",
+            "content": "Drainage canal rehabilitation in Purok 2 worth 1.2M.",
+            "similarity": 0.91,
+            "scope_type": "barangay",
+            "publication_status": "published",
+            "theme_tags": ["infrastructure"],
+        },
+        {
+            "chunk_id": "c2",
+            "content": "Road concreting along Purok 5 access road.",
+            "similarity": 0.74,
+            "scope_type": "barangay",
+            "publication_status": "published",
+            "theme_tags": ["infrastructure"],
+        },
+    ],
+    "match_published_aip_chunks_keyword": [
+        {
+            "chunk_id": "c3",
+            "content": "Declogging of drainage lines before the rainy season.",
+            "keyword_score": 0.4,
+            "scope_type": "barangay",
+            "publication_status": "published",
+            "theme_tags": ["infrastructure"],
+        },
+    ],
+}
+_GENERATION = '{"answer": "Drainage canal rehabilitation is funded [S1].", "used_source_ids": ["S1"]}'
+_VERIFIER = '{"supported": true, "issues": []}'
+
+
+class _SyncSupabase:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def rpc(self, function_name: str, _params: dict):
+        self.calls.append(function_name)
+        return types.SimpleNamespace(execute=lambda: types.SimpleNamespace(data=list(_ROWS.get(function_name, []))))
+
+
+class _AsyncRpc:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.threads: set[str] = set()
+
+    async def rpc(self, function_name: str, _params: dict):
+        self.calls.append(function_name)
+        self.threads.add(threading.current_thread().name)
+        await asyncio.sleep(0)
+        return list(_ROWS.get(function_name, []))
+
+
+class _LLM:
+    def __init__(self, gate: asyncio.Event | None = None) -> None:
+        self.gate = gate
+        self.in_flight = 0
+        self.peak = 0
+
+    def invoke(self, messages):
+        return types.SimpleNamespace(content=_GENERATION if "used_source_ids" in messages[-1]["content"] else _VERIFIER)
+
+    async def ainvoke(self, messages):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        if self.gate is not None:
+            await self.gate.wait()
+        self.in_flight -= 1
+        return self.invoke(messages)
+
+
+def _embeddings_response(input):  # noqa: A002, ANN001
+    return types.SimpleNamespace(
+        data=[types.SimpleNamespace(index=index, embedding=[1.0, 0.0, float(len(text))]) for index, text in enumerate(input)]
+    )
+
+
+def _engine(monkeypatch, *, llm: _LLM) -> tuple[RagEngine, _SyncSupabase, _AsyncRpc]:
+    async def acreate(*, model, input):  # noqa: ANN001, A002
+        return _embeddings_response(input)
+
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.get_shared_openai_client",
+        lambda _key: types.SimpleNamespace(
+            embeddings=types.SimpleNamespace(create=lambda *, model, input: _embeddings_response(input))
+        ),
+    )
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.build_async_openai_client",
+        lambda _key: types.SimpleNamespace(embeddings=types.SimpleNamespace(create=acreate)),
+    )
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.rag.evaluate_evidence_gate",
+        lambda **_kwargs: {"decision": "allow", "reason": "strong_evidence", "metrics": {}},
+    )
+    supabase, rpc = _SyncSupabase(), _AsyncRpc()
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+        supabase=supabase,
+        supabase_rpc=rpc,
+        embedding_cache=QueryEmbeddingCache(max_entries=0),
+        answer_cache=AnswerCache(max_entries=0),
+    )
+    engine._chat_llms["gpt-5.2"] = llm
+    return engine, supabase, rpc
+
+
+def test_async_answer_matches_sync_answer(monkeypatch) -> None:
+    engine, supabase, rpc = _engine(monkeypatch, llm=_LLM())
+    question = "What drainage projects are funded?"
+
+    sync_result = engine.answer(question=question)
+    async_result = asyncio.run(engine.aanswer(question=question))
+
+    assert async_result["answer"] == sync_result["answer"]
+    assert async_result["citations"] == sync_result["citations"]
+    assert async_result["retrieval_meta"]["response_mode_source"] == "pipeline_generated"
+    assert sorted(rpc.calls) == sorted(supabase.calls)
+    assert rpc.threads == {threading.main_thread().name}
+
+
+def test_async_answers_do_not_hold_threads_while_waiting(monkeypatch) -> None:
+    concurrent_requests = 200
+
+    async def scenario() -> tuple[_LLM, list[dict]]:
+        llm = _LLM(gate=asyncio.Event())
+        engine, _supabase, _rpc = _engine(monkeypatch, llm=llm)
+        threads_before = threading.active_count()
+        tasks = [
+            asyncio.create_task(engine.aanswer(question=f"Drainage projects in Purok {index}?"))
+            for index in range(concurrent_requests)
+        ]
+        for _ in range(10_000):
+            if llm.in_flight == concurrent_requests or any(task.done() for task in tasks):
+                break
+            await asyncio.sleep(0)
+        # Every request is parked inside generation at once, with no worker threads spawned.
+        assert llm.in_flight == concurrent_requests
+        assert threading.active_count() == threads_before
+        llm.gate.set()
+        return llm, await asyncio.gather(*tasks)
+
+    llm, results = asyncio.run(scenario())
+
+    assert llm.peak == concurrent_requests
+    assert all(not result["refused"] for result in results)
+
+
+def test_classify_route_scores_on_intent_executor(monkeypatch) -> None:
+    threads: list[str] = []
+
+    class _Router:
+        def route(self, text: str) -> IntentResult:
+            threads.append(threading.current_thread().name)
+            return IntentResult(
+                intent=IntentType.GREETING,
+                confidence=0.99,
+                top2_intent=None,
+                top2_confidence=None,
+                margin=0.99,
+                method="semantic",
+            )
+
+    monkeypatch.setattr(intent_route_module, "_INTENT_ROUTER", _Router())
+
+    response = TestClient(create_app()).post("/intent/classify", json={"text": "hello"})
+
+    assert response.status_code == 200
+    assert threads and threads[0].startswith("intent-scoring")
+
+
+def test_async_rpc_client_retries_unavailable_and_surfaces_postgrest_code() -> None:
+    import httpx
+    import pytest
+
+    from openaip_pipeline.adapters.supabase.async_rpc import AsyncSupabaseRpcClient, SupabaseRpcError
+
+    statuses = {"get_rag_corpus_version": [503, 200], "missing_fn": [404]}
+    seen: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        function_name = request.url.path.rsplit("/", 1)[-1]
+        seen.append((function_name, request.headers["apikey"]))
+        status = statuses[function_name].pop(0)
+        if status == 200:
+            return httpx.Response(200, json="v1")
+        if status == 404:
+            return httpx.Response(404, json={"code": "PGRST202", "message": "Could not find the function"})
+        return httpx.Response(status)
+
+    async def scenario() -> str:
+        client = AsyncSupabaseRpcClient(
+            url="https://example.test/",
+            service_key="service-key",
+            retry_backoff_seconds=0.001,
+            transport=httpx.MockTransport(handler),
+        )
+        try:
+            version = await client.rpc("get_rag_corpus_version", {})
+            with pytest.raises(SupabaseRpcError) as raised:
+                await client.rpc("missing_fn", {})
+            assert raised.value.code == "PGRST202"
+            return version
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == "v1"
+    assert seen == [("get_rag_corpus_version", "service-key")] * 2 + [("missing_fn", "service-key")]
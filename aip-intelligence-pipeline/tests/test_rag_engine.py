@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+
+from fastapi.testclient import TestClient
+
+import openaip_pipeline.api.routes.chat as chat_route_module
+from openaip_pipeline.api.app import create_app
+from openaip_pipeline.services.rag.engine import RagEngine
+
+
+def _empty_retrieval(**_kwargs):
+    return {
+        "hybrid_enabled": True,
+        "keyword_enabled": False,
+        "rrf_enabled": False,
+        "dense_docs": [],
+        "keyword_docs": [],
+        "fused_docs": [],
+        "strong_docs": [],
+    }
+
+
+def test_engine_reuses_clients_and_flag_snapshot_across_answers(monkeypatch) -> None:
+    created: list[tuple[str, str]] = []
+
+    def fake_create_client(url, key):  # noqa: ANN001
+        created.append((url, key))
+        return object()
+
+    monkeypatch.setitem(sys.modules, "supabase.client", types.SimpleNamespace(create_client=fake_create_client))
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag.run_hybrid_retrieval", _empty_retrieval)
+    monkeypatch.setenv("RAG_GATE_MIN_FINAL_DOCS", "3")
+
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+    )
+    # Env changes after construction must not leak into requests served by this engine.
+    monkeypatch.setenv("RAG_GATE_MIN_FINAL_DOCS", "7")
+
+    first = engine.answer(question="What drainage projects are funded?", retrieval_scope={"mode": "global"})
+    second = engine.answer(question="Any road projects?", retrieval_scope={"mode": "global"})
+
+    assert created == [("https://example.test", "service-key")]
+    assert first["refused"] and second["refused"]
+    assert second["retrieval_meta"]["rag_calibration"]["RAG_GATE_MIN_FINAL_DOCS"] == 3
+
+
+def test_engine_caches_chat_model_per_name(monkeypatch) -> None:
+    built: list[str] = []
+
+    class _FakeChatOpenAI:
+        def __init__(self, *, model, **_kwargs):  # noqa: ANN001, ANN003
+            built.append(model)
+
+    monkeypatch.setitem(sys.modules, "langchain_openai", types.SimpleNamespace(ChatOpenAI=_FakeChatOpenAI))
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+    )
+
+    assert engine.chat_llm() is engine.chat_llm("gpt-5.2")
+    engine.chat_llm("gpt-5-mini")
+    assert built == ["gpt-5.2", "gpt-5-mini"]
+
+
+def test_chat_models_share_the_engine_async_client_and_close_with_it(monkeypatch) -> None:
+    built: list[dict] = []
+    closed: list[str] = []
+
+    class _FakeChatOpenAI:
+        def __init__(self, **kwargs):  # noqa: ANN003
+            built.append(kwargs)
+
+    class _FakeAsyncOpenAI:
+        chat = types.SimpleNamespace(completions="completions")
+
+        async def close(self) -> None:
+            closed.append("openai")
+
+    monkeypatch.setitem(sys.modules, "langchain_openai", types.SimpleNamespace(ChatOpenAI=_FakeChatOpenAI))
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.build_async_openai_client", lambda _key: _FakeAsyncOpenAI()
+    )
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+    )
+
+    first = engine.chat_llm()
+    assert built[0]["root_async_client"] is engine.async_openai_client
+    assert built[0]["async_client"] == "completions"
+    assert built[0]["api_key"].get_secret_value() == "openai-key"
+
+    asyncio.run(engine.aclose())
+
+    assert closed == ["openai"]
+    assert engine.chat_llm() is not first
+
+
+def test_embed_query_route_uses_app_engine_without_reloading_settings(monkeypatch) -> None:
+    class _FakeEngine:
+        embeddings_model = "text-embedding-3-large"
+
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, str | None]] = []
+
+        async def aembed_query(self, text: str, *, model: str | None = None) -> list[float]:
+            self.calls.append((text, model))
+            return [0.1, 0.2, 0.3]
+
+    def forbidden_load(**_kwargs):
+        raise AssertionError("Settings should not be reloaded per request")
+
+    monkeypatch.setattr(chat_route_module, "_require_internal_token", lambda _request: None)
+    monkeypatch.setattr(chat_route_module.Settings, "load", forbidden_load)
+    app = create_app()
+    engine = _FakeEngine()
+    app.state.rag_engine = engine
+    client = TestClient(app)
+
+    for _ in range(2):
+        response = client.post("/v1/chat/embed-query", json={"text": "drainage"})
+        assert response.status_code == 200
+        assert response.json() == {"embedding": [0.1, 0.2, 0.3], "model": "text-embedding-3-large", "dimensions": 3}
+
+    assert engine.calls == [("drainage", "text-embedding-3-large")] * 2
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import sys
+import threading
 import types
 
-from openaip_pipeline.services.rag.rag import run_hybrid_retrieval
-from openaip_pipeline.services.rag.retriever import fuse_docs_rrf
+from openaip_pipeline.services.rag.rag import RagFlags, run_hybrid_retrieval
+from openaip_pipeline.services.rag.retriever import fuse_docs_rrf, retrieve_dense_docs
 
 
 class _FakeDocument:
@@ -161,3 +162,79 @@ def test_run_hybrid_retrieval_calls_dense_and_keyword_with_scope(monkeypatch) ->
         channels.update(doc.metadata.get("retrieval_channels") or [])
     assert "dense" in channels
     assert "keyword" in channels
+
+
+def test_run_hybrid_retrieval_dispatches_dense_and_keyword_concurrently(monkeypatch) -> None:
+    monkeypatch.setenv("RAG_HYBRID_RETRIEVAL_ENABLED", "true")
+    monkeypatch.setenv("RAG_KEYWORD_RETRIEVAL_ENABLED", "true")
+    monkeypatch.setenv("RAG_RRF_FUSION_ENABLED", "true")
+    # Each channel blocks until the other has started.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_dense(**_kwargs):
+        barrier.wait()
+        return [_FakeDoc(chunk_id="dense-1", channel="dense", similarity=0.9, content="Drainage canal works.")]
+
+    def fake_keyword(**_kwargs):
+        barrier.wait()
+        return [_FakeDoc(chunk_id="kw-1", channel="keyword", similarity=0.8, content="Drainage rehabilitation.")]
+
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag.retrieve_dense_docs", fake_dense)
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag.retrieve_keyword_docs", fake_keyword)
+
+    bundle = run_hybrid_retrieval(
+        supabase=object(),
+        embeddings_model="text-embedding-3-large",
+        question="drainage",
+        retrieval_scope=None,
+        retrieval_mode="qa",
+        retrieval_filters=None,
+        top_k=5,
+        min_similarity=0.3,
+        flags=RagFlags.from_env(),
+    )
+
+    assert sorted(_chunk_ids(bundle["fused_docs"])) == ["dense-1", "kw-1"]
+
+
+class _FallbackSupabase:
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        self.barrier = barrier
+        self.calls: list[tuple[str, bool | None]] = []
+        self._lock = threading.Lock()
+
+    def rpc(self, function_name: str, params: dict):
+        include_summary = params.get("include_summary_chunks")
+        with self._lock:
+            self.calls.append((function_name, include_summary))
+        if include_summary:
+            rows = [{"chunk_id": "summary-1", "content": "Summary chunk", "similarity": 0.6}]
+        elif function_name == "match_published_aip_chunks":
+            rows = [{"chunk_id": "legacy-1", "content": "Legacy chunk", "similarity": 0.5}]
+        else:
+            rows = []
+        barrier = self.barrier
+
+        def execute():
+            if barrier is not None:
+                barrier.wait()
+            return types.SimpleNamespace(data=rows)
+
+        return types.SimpleNamespace(execute=execute)
+
+
+def test_speculative_dense_fallbacks_run_in_parallel_with_same_result() -> None:
+    kwargs = {
+        "embeddings_model": "text-embedding-3-large",
+        "question": "zoning question",
+        "k": 4,
+        "embed_query": lambda _text: [0.1, 0.2],
+    }
+    sequential_client = _FallbackSupabase()
+    sequential = retrieve_dense_docs(supabase=sequential_client, **kwargs)
+    # v2, summary and legacy RPCs must all be in flight together to pass the barrier.
+    speculative_client = _FallbackSupabase(barrier=threading.Barrier(3, timeout=5))
+    speculative = retrieve_dense_docs(supabase=speculative_client, speculative_fallbacks=True, **kwargs)
+
+    assert _chunk_ids(sequential) == _chunk_ids(speculative) == ["summary-1", "legacy-1"]
+    assert sorted(speculative_client.calls, key=str) == sorted(sequential_client.calls, key=str)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import types
 import sys
 
@@ -8,6 +9,8 @@ from openaip_pipeline.services.rag.multi_query import (
     merge_multi_query_candidates,
     should_retry_multi_query,
 )
+from openaip_pipeline.services.rag.embedding_cache import QueryEmbeddingCache
+from openaip_pipeline.services.rag.engine import RagEngine
 from openaip_pipeline.services.rag.rag import answer_with_rag
 
 
@@ -136,3 +139,58 @@ def test_answer_with_rag_triggers_selective_multi_query(monkeypatch) -> None:
     assert result["retrieval_meta"]["multi_query_reason_code"] == "retry_low_confidence"
     if result["retrieval_meta"]["evidence_gate_decision"] != "allow":
         assert result["retrieval_meta"]["generation_skipped_by_gate"] is True
+
+
+def test_multi_query_variants_share_one_embedding_request_and_run_concurrently(monkeypatch) -> None:
+    monkeypatch.setenv("RAG_HYBRID_RETRIEVAL_ENABLED", "true")
+    monkeypatch.setenv("RAG_EVIDENCE_GATE_ENABLED", "true")
+    monkeypatch.setenv("RAG_SELECTIVE_MULTI_QUERY_ENABLED", "true")
+    monkeypatch.setenv("RAG_GATE_MIN_FINAL_DOCS", "4")
+    monkeypatch.setenv("RAG_SELECTIVE_MULTI_QUERY_MAX_VARIANTS", "2")
+
+    embedding_batches: list[list[str]] = []
+
+    def fake_create(*, model, input):  # noqa: ANN001, A002
+        embedding_batches.append(list(input))
+        return types.SimpleNamespace(
+            data=[types.SimpleNamespace(index=index, embedding=[float(index), 1.0]) for index in range(len(input))]
+        )
+
+    monkeypatch.setattr(
+        "openaip_pipeline.services.rag.engine.get_shared_openai_client",
+        lambda _key: types.SimpleNamespace(embeddings=types.SimpleNamespace(create=fake_create)),
+    )
+    question = "Explain the drainage project with citations."
+    # Both variant retrievals must be in flight at once to pass the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_run_hybrid_retrieval(**kwargs):
+        kwargs["embed_query"](kwargs["question"])
+        if kwargs["question"] == question:
+            docs = [_FakeDoc(chunk_id="base-1", similarity=0.72, content="One weak chunk.")]
+        else:
+            barrier.wait()
+            docs = [_FakeDoc(chunk_id=f"variant-{kwargs['question']}", similarity=0.71, content="Another chunk.")]
+        return {"dense_docs": docs, "keyword_docs": [], "fused_docs": docs, "strong_docs": docs}
+
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag.run_hybrid_retrieval", fake_run_hybrid_retrieval)
+    monkeypatch.setattr("openaip_pipeline.services.rag.rag._select_diverse_docs", lambda docs, **_kwargs: docs[:6])
+    engine = RagEngine(
+        supabase_url="https://example.test",
+        supabase_service_key="service-key",
+        openai_api_key="openai-key",
+        embeddings_model="text-embedding-3-large",
+        chat_model="gpt-5.2",
+        supabase=object(),
+        embedding_cache=QueryEmbeddingCache(max_entries=8),
+    )
+
+    result = engine.answer(question=question, retrieval_scope={"mode": "global", "targets": []})
+
+    variants = build_multi_query_variants(question=question, max_variants=2)
+    assert len(variants) == 2
+    assert embedding_batches == [[question], variants]
+    meta = result["retrieval_meta"]
+    assert meta["multi_query_variant_count"] == 2
+    assert meta["embedding_cache"]["misses"] == 3
+    assert meta["selected_count"] == 3
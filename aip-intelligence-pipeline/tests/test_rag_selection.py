@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from openaip_pipeline.services.rag.selection import CandidateFeatures, tokenize
+
+
+def _pairwise_jaccard(a: str, b: str) -> float:
+    tokens_a, tokens_b = tokenize(a), tokenize(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def test_overlap_matrix_matches_pairwise_jaccard_exactly() -> None:
+    rng = random.Random(3)
+    words = ["road", "drainage", "health", "canal", "solar", "a", "2026", "Barangay", "CLINIC"]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(25)]
+    features = CandidateFeatures(texts=texts, scores=[0.5] * len(texts), section_keys=["s"] * len(texts))
+
+    expected = np.asarray([[_pairwise_jaccard(a, b) for b in texts] for a in texts])
+
+    assert np.array_equal(features.overlap, expected)
+
+
+def test_mmr_penalizes_overlap_and_repeated_sections() -> None:
+    features = CandidateFeatures(
+        texts=[
+            "road concreting purok one",
+            "road concreting purok two",
+            "clinic medicine supply",
+            "streetlight solar install",
+        ],
+        scores=[0.95, 0.94, 0.80, 0.79],
+        section_keys=["infra", "infra", "health", "infra"],
+    )
+
+    assert features.suppress_near_duplicates(max_overlap=0.5) == [0, 2, 3]
+    # Row 1 (0.94) loses to row 3 (0.79) once its 0.6 overlap with row 0 is penalized.
+    assert features.mmr(max_docs=3) == [0, 2, 3]
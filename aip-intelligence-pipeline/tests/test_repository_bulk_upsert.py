@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+from urllib.error import HTTPError
+
+import pytest
+
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository, _encode_vector_literal
+
+
+class _FakeBulkClient:
+    def __init__(self, *, projects: list[dict[str, Any]] | None = None, line_items: list[dict[str, Any]] | None = None):
+        self.rows: dict[str, list[dict[str, Any]]] = {
+            "projects": [dict(row) for row in (projects or [])],
+            "aip_line_items": [dict(row) for row in (line_items or [])],
+        }
+        self.insert_calls: list[dict[str, Any]] = []
+        self.update_calls: list[dict[str, Any]] = []
+        self.fail_bulk_with: int | None = None
+        self._next_id = 0
+
+    def _new_id(self, table: str) -> str:
+        self._next_id += 1
+        return f"{table}-{self._next_id}"
+
+    def select(
+        self,
+        table: str,
+        *,
+        select: str,
+        filters: dict[str, str] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        del select, order
+        if table == "aips":
+            return [{"id": "aip-123", "fiscal_year": 2026, "barangay_id": "brgy-001"}]
+        rows = list(self.rows.get(table, []))
+        for column, condition in (filters or {}).items():
+            expected = condition[3:] if condition.startswith("eq.") else condition
+            rows = [row for row in rows if str(row.get(column)) == expected]
+        return rows[:limit] if limit is not None else rows
+
+    def insert(
+        self,
+        table: str,
+        row: dict[str, Any] | list[dict[str, Any]],
+        *,
+        select: str | None = None,
+        on_conflict: str | None = None,
+        upsert: bool = False,
+    ) -> list[dict[str, Any]]:
+        del select
+        batch = row if isinstance(row, list) else [row]
+        self.insert_calls.append(
+            {"table": table, "rows": [dict(item) for item in batch], "on_conflict": on_conflict, "upsert": upsert}
+        )
+        if isinstance(row, list) and self.fail_bulk_with is not None:
+            raise HTTPError(url="http://example.test", code=self.fail_bulk_with, msg="Conflict", hdrs=None, fp=None)
+        conflict_columns = on_conflict.split(",") if on_conflict else []
+        stored_rows = self.rows.setdefault(table, [])
+        returned: list[dict[str, Any]] = []
+        for item in batch:
+            match = None
+            if upsert and conflict_columns:
+                match = next(
+                    (
+                        stored
+                        for stored in stored_rows
+                        if all(stored.get(column) == item.get(column) for column in conflict_columns)
+                    ),
+                    None,
+                )
+            if match is not None:
+                match.update(item)
+                returned.append(dict(match))
+                continue
+            stored = {"id": self._new_id(table), "is_human_edited": False, **item}
+            stored_rows.append(stored)
+            returned.append(dict(stored))
+        return returned
+
+    def insert_encoded_rows(
+        self,
+        table: str,
+        encoded_rows: list[str],
+        *,
+        on_conflict: str | None = None,
+        upsert: bool = False,
+    ) -> None:
+        self.insert_calls.append(
+            {
+                "table": table,
+                "rows": [json.loads(encoded) for encoded in encoded_rows],
+                "bytes": len(("[" + ",".join(encoded_rows) + "]").encode("utf-8")),
+                "on_conflict": on_conflict,
+                "upsert": upsert,
+            }
+        )
+
+    def update(
+        self,
+        table: str,
+        patch: dict[str, Any],
+        *,
+        filters: dict[str, str],
+        select: str | None = None,
+    ) -> list[dict[str, Any]]:
+        del select
+        self.update_calls.append({"table": table, "patch": dict(patch), "filters": dict(filters)})
+        row_id = filters["id"][3:]
+        for stored in self.rows.get(table, []):
+            if stored["id"] == row_id:
+                stored.update(patch)
+                return [dict(stored)]
+        return []
+
+
+def _project(ref_code: str, description: str, *, page: int = 1, row_index: int = 0) -> dict[str, Any]:
+    return {
+        "aip_ref_code": ref_code,
+        "program_project_description": description,
+        "implementing_agency": "Barangay Council",
+        "start_date": "2026-01-01",
+        "completion_date": "2026-12-31",
+        "source_of_funds": "General Fund",
+        "amounts": {"personal_services": 100.0, "total": 100.0},
+        "source_refs": [{"page": page, "row_index": row_index, "table_index": 0}],
+    }
+
+
+def test_bulk_upsert_projects_chunks_and_skips_human_edited_rows() -> None:
+    fake_client = _FakeBulkClient(
+        projects=[
+            {"id": "proj-old", "aip_id": "aip-123", "project_key": "1000-001", "aip_ref_code": "1000-001"},
+            {
+                "id": "proj-human",
+                "aip_id": "aip-123",
+                "project_key": "1000-002",
+                "aip_ref_code": "1000-002",
+                "is_human_edited": True,
+                "program_project_description": "Edited by staff",
+            },
+        ]
+    )
+    repo = PipelineRepository(fake_client, upsert_batch_size=2)  # type: ignore[arg-type]
+
+    repo.upsert_projects(
+        aip_id="aip-123",
+        extraction_artifact_id="artifact-1",
+        projects=[
+            _project("1000-001", "Refreshed existing"),
+            _project("1000-002", "Must not overwrite"),
+            _project("3000-001", "New A"),
+            _project("3000-002", "New B"),
+            _project("3000-003", "New C first"),
+            _project("3000-003", "New C last"),
+        ],
+    )
+
+    assert fake_client.update_calls == []
+    calls = fake_client.insert_calls
+    assert [(call["on_conflict"], len(call["rows"])) for call in calls] == [
+        ("id", 1),
+        ("aip_id,project_key", 2),
+        ("aip_id,project_key", 1),
+    ]
+    assert all(call["upsert"] for call in calls)
+    assert calls[0]["rows"][0]["id"] == "proj-old"
+
+    by_key = {row["project_key"]: row for row in fake_client.rows["projects"]}
+    assert by_key["1000-001"]["program_project_description"] == "Refreshed existing"
+    assert by_key["1000-002"]["program_project_description"] == "Edited by staff"
+    assert by_key["3000-003"]["program_project_description"] == "New C last"
+    assert len(by_key) == 5
+
+
+def test_bulk_upsert_projects_falls_back_to_row_path_on_conflict() -> None:
+    fake_client = _FakeBulkClient()
+    fake_client.fail_bulk_with = 409
+    repo = PipelineRepository(fake_client, upsert_batch_size=50)  # type: ignore[arg-type]
+
+    repo.upsert_projects(
+        aip_id="aip-123",
+        extraction_artifact_id="artifact-1",
+        projects=[_project("1000-001", "A"), _project("1000-002", "B")],
+    )
+
+    row_calls = [call for call in fake_client.insert_calls if call["on_conflict"] is None]
+    assert len(row_calls) == 2
+    assert {row["project_key"] for row in fake_client.rows["projects"]} == {"1000-001", "1000-002"}
+
+
+def test_bulk_upsert_projects_surfaces_non_conflict_errors() -> None:
+    fake_client = _FakeBulkClient()
+    fake_client.fail_bulk_with = 400
+    repo = PipelineRepository(fake_client, upsert_batch_size=50)  # type: ignore[arg-type]
+
+    with pytest.raises(RuntimeError, match="Failed to bulk upsert project rows. aip_id=aip-123 rows=1"):
+        repo.upsert_projects(aip_id="aip-123", extraction_artifact_id="artifact-1", projects=[_project("1000-001", "A")])
+
+
+def test_bulk_upsert_line_items_returns_embedding_rows_with_ids() -> None:
+    fake_client = _FakeBulkClient(
+        line_items=[
+            {"id": "line-old", "aip_id": "aip-123", "aip_ref_code": "1000-001", "page_no": 1, "row_no": 0, "table_no": 0},
+        ]
+    )
+    repo = PipelineRepository(fake_client, upsert_batch_size=100)  # type: ignore[arg-type]
+
+    upserted = repo.upsert_aip_line_items(
+        aip_id="aip-123",
+        projects=[
+            _project("1000-001", "Existing refreshed"),
+            _project("3000-001", "Brand new"),
+            {**_project("", "No ref code", page=2, row_index=4), "aip_ref_code": None},
+            _project("3000-001", "Brand new (later duplicate)"),
+        ],
+    )
+
+    assert fake_client.update_calls == []
+    assert [(call["on_conflict"], call["upsert"], len(call["rows"])) for call in fake_client.insert_calls] == [
+        ("id", True, 1),
+        (None, False, 2),
+    ]
+    assert [item["program_project_title"] for item in upserted] == [
+        "Existing refreshed",
+        "Brand new (later duplicate)",
+        "No ref code",
+    ]
+    assert upserted[0]["id"] == "line-old"
+    assert all(item["id"] for item in upserted)
+    assert all(item["barangay_name"] is None for item in upserted)
+    assert "Schedule=2026-01-01..2026-12-31" in upserted[1]["embedding_text"]
+    assert len(fake_client.rows["aip_line_items"]) == 3
+
+
+def test_upsert_batch_size_reads_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PIPELINE_SUPABASE_UPSERT_BATCH_SIZE", "7")
+    assert PipelineRepository(_FakeBulkClient()).upsert_batch_size == 7  # type: ignore[arg-type]
+    assert PipelineRepository(_FakeBulkClient(), upsert_batch_size=3).upsert_batch_size == 3  # type: ignore[arg-type]
+
+
+def _embedding_rows(count: int, dims: int = 64) -> list[dict[str, Any]]:
+    return [
+        {"line_item_id": f"line-{index}", "embedding": [0.123456789 * (index + 1) / (dim + 1) for dim in range(dims)]}
+        for index in range(count)
+    ]
+
+
+def test_bulk_embedding_upsert_chunks_by_payload_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PIPELINE_SUPABASE_EMBEDDING_UPSERT_MAX_BYTES", "4000")
+    monkeypatch.delenv("PIPELINE_EMBEDDING_VECTOR_PRECISION", raising=False)
+    fake_client = _FakeBulkClient()
+    repo = PipelineRepository(fake_client, upsert_batch_size=100)  # type: ignore[arg-type]
+
+    rows = _embedding_rows(10)
+    repo.upsert_aip_line_item_embeddings(line_items=rows, model="text-embedding-3-large")
+
+    calls = fake_client.insert_calls
+    assert len(calls) > 1
+    assert all(call["bytes"] <= 4000 for call in calls)
+    assert all(call["on_conflict"] == "line_item_id" and call["upsert"] for call in calls)
+    sent = [row for call in calls for row in call["rows"]]
+    assert [row["line_item_id"] for row in sent] == [row["line_item_id"] for row in rows]
+    assert sent[3]["embedding"] == rows[3]["embedding"]
+    assert sent[3]["model"] == "text-embedding-3-large"
+
+
+def test_bulk_embedding_upsert_compact_vector_literal(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PIPELINE_EMBEDDING_VECTOR_PRECISION", "4")
+    fake_client = _FakeBulkClient()
+    repo = PipelineRepository(fake_client, upsert_batch_size=100)  # type: ignore[arg-type]
+
+    repo.upsert_aip_line_item_embeddings(
+        line_items=[
+            {"line_item_id": "line-1", "embedding": [0.123456789, -0.000012345, 1.0]},
+            {"line_item_id": "line-1", "embedding": [0.5, 0.25, 0.125]},
+            {"line_item_id": "line-2", "embedding": ["bad"]},
+        ],
+        model="m",
+    )
+
+    assert len(fake_client.insert_calls) == 1
+    assert fake_client.insert_calls[0]["rows"] == [{"line_item_id": "line-1", "embedding": "[0.5,0.25,0.125]", "model": "m"}]
+
+
+def test_encode_vector_literal_bounds_precision() -> None:
+    assert _encode_vector_literal([0.123456789, -0.000012345, 1.0], 4) == "[0.1235,-1.234e-05,1]"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import copy
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from openaip_pipeline.core.artifact_contract import make_stage_root
+from openaip_pipeline.services.categorization.categorize import categorize_from_summarized
+from openaip_pipeline.services.scaling.scale_amounts import scale_validated_amounts, scale_validated_amounts_json_str
+from openaip_pipeline.services.validation.city import validate_projects
+
+
+def _payload(stage: str) -> dict[str, Any]:
+    return make_stage_root(
+        stage=stage,
+        aip_id="aip-handoff",
+        uploaded_file_id=None,
+        document={
+            "lgu": {"name": "City Test", "type": "city", "confidence": "high"},
+            "fiscal_year": 2026,
+            "source": {"document_type": "AIP", "page_count": 1},
+        },
+        projects=[
+            {
+                "project_key": f"1000-{index:03d}",
+                "aip_ref_code": f"1000-{index:03d}",
+                "program_project_description": f"Road works {index}",
+                "amounts": {
+                    "personal_services": 1.0,
+                    "maintenance_and_other_operating_expenses": 2.0,
+                    "capital_outlay": 3.0,
+                    "total": 6.0,
+                },
+                "climate": {"climate_change_adaptation": "1.5"},
+                "classification": {"category": "other", "sector_code": "1000"},
+                "errors": ["seed error"],
+                "source_refs": [{"page": 1, "kind": "table_row", "evidence_text": "row"}],
+            }
+            for index in range(3)
+        ],
+        totals=[{"source_label": "total_investment_program", "value": 18.0, "page_no": 1}],
+        summary={"text": "Summary text", "source_refs": [{"page": 1, "kind": "table_row"}]} if stage == "summarize" else None,
+        warnings=[],
+    )
+
+
+def _without_generated_at(payload: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in payload.items() if key != "generated_at"}
+
+
+class _ValidationClient:
+    def __init__(self) -> None:
+        self.responses = SimpleNamespace(create=self._create)
+
+    def _create(self, **kwargs: Any) -> Any:
+        projects = json.loads(kwargs["input"][1]["content"])["projects"]
+        output = {"projects": [{"errors": ["MODEL_ERR"]} for _ in projects]}
+        return SimpleNamespace(output_text=json.dumps(output), usage=None)
+
+
+class _CategorizationClient:
+    def __init__(self) -> None:
+        self.responses = SimpleNamespace(parse=self._parse)
+
+    def _parse(self, **kwargs: Any) -> Any:
+        count = str(kwargs["input"][1]["content"]).count("ITEM ")
+        items = [SimpleNamespace(index=index, category="Infrastructure") for index in range(count)]
+        return SimpleNamespace(output_parsed=SimpleNamespace(items=items), usage=None)
+
+
+def test_scale_object_entry_point_leaves_input_untouched() -> None:
+    validated = _payload("validate")
+    snapshot = copy.deepcopy(validated)
+
+    result = scale_validated_amounts(validated, scope="city")
+
+    assert validated == snapshot
+    assert result.scaled_obj["projects"][0]["amounts"]["total"] == 6000.0
+    assert result.scaled_obj["totals"][0]["value"] == 18000.0
+    wrapped = scale_validated_amounts_json_str(json.dumps(validated), scope="city")
+    assert _without_generated_at(wrapped.scaled_obj) == _without_generated_at(result.scaled_obj)
+    assert json.loads(result.scaled_json_str)["stage"] == "scale_amounts"
+
+
+def test_validate_object_entry_point_leaves_input_untouched() -> None:
+    extracted = _payload("extract")
+    snapshot = copy.deepcopy(extracted)
+
+    result = validate_projects(extracted, batch_size=2, client=_ValidationClient(), validate_concurrency=1)
+
+    assert extracted == snapshot
+    assert all(project["errors"] == ["MODEL_ERR"] for project in result.validated_obj["projects"])
+
+
+def test_categorize_object_entry_point_leaves_input_untouched() -> None:
+    summarized = _payload("summarize")
+    snapshot = copy.deepcopy(summarized)
+
+    result = categorize_from_summarized(summarized, batch_size=2, client=_CategorizationClient())
+
+    assert summarized == snapshot
+    assert [project["classification"]["category"] for project in result.categorized_obj["projects"]] == [
+        "infrastructure"
+    ] * 3
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from types import SimpleNamespace
 from typing import Any
 
@@ -122,6 +124,30 @@ class _SummaryClient:
         )
 
 
+class _SlowSummaryResponses(_SummaryResponses):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def create(self, **kwargs: Any) -> Any:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.03)
+            return super().create(**kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class _SlowSummaryClient:
+    def __init__(self) -> None:
+        self.responses = _SlowSummaryResponses()
+
+
 def test_small_input_uses_single_map_no_reduce() -> None:
     validated = _validated_payload(2)
     client = _SummaryClient()
@@ -227,3 +253,53 @@ def test_final_summary_preserves_grounding_fields(monkeypatch) -> None:
     assert isinstance(summary, dict)
     assert isinstance(summary.get("source_refs"), list) and summary["source_refs"]
     assert isinstance(summary.get("evidence_project_keys"), list) and summary["evidence_project_keys"]
+
+
+def test_map_phase_runs_concurrently_and_reports_chunk_progress(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_SUMMARIZE_CONTEXT_WINDOW_TOKENS", "1400")
+    monkeypatch.setenv("PIPELINE_SUMMARIZE_RESPONSE_BUFFER_TOKENS", "100")
+    validated = _validated_payload(30, description_length=420)
+    client = _SlowSummaryClient()
+    progress_events: list[tuple[int, int]] = []
+
+    result = summarize_aip_overall_json_str(
+        json.dumps(validated),
+        model="gpt-5.2",
+        client=client,
+        on_progress=lambda done, total: progress_events.append((done, total)),
+        summarize_concurrency=4,
+    )
+
+    map_calls = len(client.responses.map_calls)
+    assert 1 < client.responses.peak <= 4
+    assert progress_events[0] == (0, map_calls)
+    assert progress_events[-1] == (map_calls, map_calls)
+    assert [done for done, _ in progress_events] == list(range(map_calls + 1))
+    total_calls = map_calls + len(client.responses.reduce_calls)
+    assert result.usage["total_tokens"] == total_calls * 15
+
+
+def test_tree_reduce_groups_by_fanout_and_keeps_chunk_order(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_SUMMARIZE_CONTEXT_WINDOW_TOKENS", "1400")
+    monkeypatch.setenv("PIPELINE_SUMMARIZE_RESPONSE_BUFFER_TOKENS", "100")
+    monkeypatch.setenv("PIPELINE_SUMMARIZE_REDUCE_FANOUT", "2")
+    validated = _validated_payload(30, description_length=420)
+    client = _SummaryClient()
+
+    result = summarize_aip_overall_json_str(
+        json.dumps(validated),
+        model="gpt-5.2",
+        client=client,
+        summarize_concurrency=3,
+    )
+
+    map_calls = len(client.responses.map_calls)
+    reduce_calls = client.responses.reduce_calls
+    assert map_calls > 2
+    assert all(call["count"] <= 2 for call in reduce_calls)
+    # A binary tree over n leaves always needs n - 1 merges.
+    assert len(reduce_calls) == map_calls - 1
+    assert result.summary_text.startswith("Reduce(2)")
+    first_ref = result.summary_text.index("1000-001")
+    last_ref = result.summary_text.index("1000-030")
+    assert first_ref < last_ref
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-import io
 import json
-import urllib.request
 from urllib.error import HTTPError
 
+import httpx
 import pytest
 
 from openaip_pipeline.adapters.supabase.client import SupabaseConfig, SupabaseRestClient
+from openaip_pipeline.adapters.supabase.transport import SupabaseHttpTransport
 
 
-def test_request_enriches_http_error_with_postgrest_payload(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_request_enriches_http_error_with_postgrest_payload() -> None:
     payload = {
         "code": "23503",
         "message": 'insert or update on table "projects" violates foreign key constraint "fk_projects_sector"',
@@ -19,19 +19,15 @@ def test_request_enriches_http_error_with_postgrest_payload(monkeypatch: pytest.
     }
     body = json.dumps(payload).encode("utf-8")
 
-    def _raise_http_error(*args: object, **kwargs: object) -> object:
-        del args, kwargs
-        raise HTTPError(
-            url="https://example.supabase.co/rest/v1/projects",
-            code=409,
-            msg="Conflict",
-            hdrs=None,
-            fp=io.BytesIO(body),
-        )
+    def _conflict(request: httpx.Request) -> httpx.Response:
+        del request
+        return httpx.Response(409, content=body, headers={"Content-Type": "application/json"})
 
-    monkeypatch.setattr(urllib.request, "urlopen", _raise_http_error)
-
-    client = SupabaseRestClient(SupabaseConfig(url="https://example.supabase.co", service_key="sb-key"))
+    transport = SupabaseHttpTransport(transport=httpx.MockTransport(_conflict), max_retries=0)
+    client = SupabaseRestClient(
+        SupabaseConfig(url="https://example.supabase.co", service_key="sb-key"),
+        transport=transport,
+    )
     with pytest.raises(HTTPError) as error_info:
         client.insert("projects", {"aip_id": "aip-1", "aip_ref_code": "A101-01"})
 
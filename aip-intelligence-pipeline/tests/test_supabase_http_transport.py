@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import gzip
+import json
+from urllib.error import HTTPError
+
+import httpx
+import pytest
+
+from openaip_pipeline.adapters.supabase import transport as transport_module
+from openaip_pipeline.adapters.supabase.client import SupabaseConfig, SupabaseGuardrailError, SupabaseRestClient
+from openaip_pipeline.adapters.supabase.transport import SupabaseHttpTransport
+
+
+def _client_with(handler, **transport_kwargs) -> tuple[SupabaseRestClient, SupabaseHttpTransport]:
+    transport = SupabaseHttpTransport(transport=httpx.MockTransport(handler), **transport_kwargs)
+    client = SupabaseRestClient(
+        SupabaseConfig(url="https://example.supabase.co", service_key="sb-key"),
+        transport=transport,
+    )
+    return client, transport
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    sleeps: list[float] = []
+    monkeypatch.setattr(transport_module.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_select_retries_429_and_5xx_then_succeeds(_no_sleep: list[float]) -> None:
+    statuses = [429, 502]
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if statuses:
+            status = statuses.pop(0)
+            return httpx.Response(status, headers={"Retry-After": "2"} if status == 429 else {})
+        return httpx.Response(200, json=[{"id": "run-1"}])
+
+    client, _ = _client_with(handler, max_retries=3, retry_backoff_seconds=0.1)
+
+    rows = client.select("extraction_runs", select="id", filters={"status": "eq.queued"})
+
+    assert rows == [{"id": "run-1"}]
+    assert len(seen) == 3
+    assert seen[0].headers["apikey"] == "sb-key"
+    assert _no_sleep[0] == 2.0
+    assert 0.2 <= _no_sleep[1] <= 0.3
+
+
+def test_plain_insert_is_not_replayed_after_server_error() -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(500, json={"message": "boom"})
+
+    client, _ = _client_with(handler, max_retries=3)
+
+    with pytest.raises(HTTPError) as error_info:
+        client.insert("artifacts", {"run_id": "run-1"})
+
+    assert error_info.value.code == 500
+    assert "message=boom" in str(error_info.value)
+    assert len(calls) == 1
+
+
+def test_merge_duplicates_upsert_is_replayed_after_server_error() -> None:
+    statuses = [500]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert "merge-duplicates" in request.headers["Prefer"]
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(201, json=[{"id": "row-1"}])
+
+    client, _ = _client_with(handler, max_retries=2)
+
+    assert client.insert("aip_totals", {"aip_id": "a"}, on_conflict="aip_id", upsert=True) == [{"id": "row-1"}]
+
+
+def test_large_json_bodies_are_gzip_compressed() -> None:
+    captured: dict[str, object] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured["encoding"] = request.headers.get("Content-Encoding")
+        captured["body"] = json.loads(gzip.decompress(request.content))
+        return httpx.Response(201, json=[])
+
+    client, _ = _client_with(handler, gzip_min_bytes=64)
+
+    rows = [{"id": index, "text": "x" * 20} for index in range(10)]
+    client.insert("aip_line_items", rows)
+
+    assert captured["encoding"] == "gzip"
+    assert captured["body"] == rows
+
+
+def test_download_bytes_streams_and_enforces_size_guardrail() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"%PDF" + b"0" * 2048)
+
+    client, _ = _client_with(handler)
+    assert client.download_bytes("https://example.supabase.co/storage/v1/object/sign/x").startswith(b"%PDF")
+
+    client.source_pdf_max_bytes = 1024
+    with pytest.raises(SupabaseGuardrailError) as error_info:
+        client.download_bytes("https://example.supabase.co/storage/v1/object/sign/x")
+    assert error_info.value.reason_code == "SOURCE_PDF_TOO_LARGE"
+
+
+def test_clients_share_one_process_wide_transport(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(transport_module, "_shared_transport", None)
+    config = SupabaseConfig(url="https://example.supabase.co", service_key="sb-key")
+
+    first = SupabaseRestClient(config)
+    second = SupabaseRestClient(config)
+
+    assert first.transport is second.transport
+    first.transport.close()
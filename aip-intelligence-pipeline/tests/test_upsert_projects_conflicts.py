@@ -152,7 +152,7 @@ def _sample_project(
 
 def test_upsert_projects_updates_second_duplicate_ref_in_same_payload() -> None:
     fake_client = _FakeProjectsClient()
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_projects(
         aip_id="aip-123",
@@ -172,7 +172,7 @@ def test_upsert_projects_updates_second_duplicate_ref_in_same_payload() -> None:
 
 def test_upsert_projects_recovers_from_insert_conflict_and_updates_row() -> None:
     fake_client = _FakeProjectsClient(conflict_on_insert_keys={"1000-A"})
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_projects(
         aip_id="aip-123",
@@ -190,7 +190,7 @@ def test_upsert_projects_keeps_human_edited_row_on_insert_conflict() -> None:
         conflict_on_insert_keys={"1000-A"},
         conflict_row_human_edited=True,
     )
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_projects(
         aip_id="aip-123",
@@ -204,7 +204,7 @@ def test_upsert_projects_keeps_human_edited_row_on_insert_conflict() -> None:
 
 def test_upsert_projects_uses_project_key_when_ref_is_null() -> None:
     fake_client = _FakeProjectsClient()
-    repo = PipelineRepository(fake_client)  # type: ignore[arg-type]
+    repo = PipelineRepository(fake_client, upsert_batch_size=1)  # type: ignore[arg-type]
 
     repo.upsert_projects(
         aip_id="aip-123",
@@ -250,7 +250,7 @@ def test_upsert_projects_conflict_without_lookup_row_surfaces_context() -> None:
                 )
             return []
 
-    repo = PipelineRepository(_MissingConflictClient())  # type: ignore[arg-type]
+    repo = PipelineRepository(_MissingConflictClient(), upsert_batch_size=1)  # type: ignore[arg-type]
 
     with pytest.raises(RuntimeError) as error_info:
         repo.upsert_projects(
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from types import SimpleNamespace
 from typing import Any
 
@@ -86,6 +88,34 @@ class _ValidationClient:
         self.responses = _ValidationResponses(max_projects_per_call=max_projects_per_call)
 
 
+class _SlowConcurrentResponses(_ValidationResponses):
+    """Answers later chunks faster than earlier ones so completions arrive out of order."""
+
+    def __init__(self, *, max_projects_per_call: int | None = None) -> None:
+        super().__init__(max_projects_per_call=max_projects_per_call)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def create(self, **kwargs: Any) -> Any:
+        payload = json.loads(kwargs["input"][1]["content"])
+        first_ref = str(payload["projects"][0]["aip_ref_code"])
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.08 - 0.01 * min(int(first_ref.split("-")[-1]), 6))
+            return super().create(**kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class _SlowConcurrentClient:
+    def __init__(self, *, max_projects_per_call: int | None = None) -> None:
+        self.responses = _SlowConcurrentResponses(max_projects_per_call=max_projects_per_call)
+
+
 class _PartialOutputResponses:
     def __init__(self) -> None:
         self.attempt_sizes: list[int] = []
@@ -318,3 +348,49 @@ def test_barangay_validation_uses_dynamic_chunking(monkeypatch) -> None:
 
     assert len(client.responses.success_sizes) > 1
     assert result.usage["total_tokens"] == len(client.responses.success_sizes) * 15
+
+
+def test_chunks_run_concurrently_and_merge_by_index() -> None:
+    payload = _extract_payload(6, description_length=120)
+    client = _SlowConcurrentClient()
+    progress_events: list[tuple[int, int, int, int, str]] = []
+
+    result = validate_projects_json_str(
+        json.dumps(payload),
+        model="gpt-5.2",
+        batch_size=1,
+        on_progress=lambda done, total, chunk_no, total_chunks, msg: progress_events.append(
+            (done, total, chunk_no, total_chunks, msg)
+        ),
+        client=client,
+        validate_concurrency=3,
+    )
+
+    assert 1 < client.responses.peak <= 3
+    refs = [row.get("aip_ref_code") for row in result.validated_obj["projects"]]
+    assert refs == [f"2000-{index:03d}" for index in range(1, 7)]
+    assert [row.get("errors") for row in result.validated_obj["projects"]] == [[f"MODEL_ERR:{ref}"] for ref in refs]
+    done_counts = [event[0] for event in progress_events]
+    assert done_counts == sorted(done_counts)
+    assert progress_events[-1][0] == 6
+    assert progress_events[-1][2] == progress_events[-1][3] == 6
+    assert result.usage == {"input_tokens": 60, "output_tokens": 30, "total_tokens": 90}
+
+
+def test_concurrent_chunks_still_split_on_context_overflow_barangay() -> None:
+    payload = _extract_payload(6, description_length=120)
+    client = _SlowConcurrentClient(max_projects_per_call=1)
+
+    result = validate_barangay(
+        json.dumps(payload),
+        model="gpt-5.2",
+        batch_size=2,
+        client=client,
+        validate_concurrency=4,
+    )
+
+    assert sorted(client.responses.success_sizes) == [1, 1, 1, 1, 1, 1]
+    assert [row.get("errors") for row in result.validated_obj["projects"]] == [
+        [f"MODEL_ERR:2000-{index:03d}"] for index in range(1, 7)
+    ]
+    assert result.usage["total_tokens"] == 90
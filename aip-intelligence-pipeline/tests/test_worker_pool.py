@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from openaip_pipeline.adapters.supabase.dto import ExtractionRunDTO
+from openaip_pipeline.adapters.supabase.repositories import PipelineRepository
+from openaip_pipeline.core.errors import RunLeaseLostError
+from openaip_pipeline.core.settings import Settings
+from openaip_pipeline.worker.pool import ConcurrentRunWorker
+
+
+def _settings(*, concurrency: int = 3) -> Settings:
+    return Settings(
+        openai_api_key="sk-test-openai",
+        supabase_url="https://example.supabase.co",
+        supabase_service_key="sb-test-service",
+        supabase_storage_artifact_bucket="aip-artifacts",
+        pipeline_model="gpt-5.2",
+        embedding_model="text-embedding-3-large",
+        batch_size=25,
+        worker_poll_seconds=1.0,
+        worker_run_once=True,
+        artifact_inline_max_bytes=32768,
+        enable_rag=False,
+        dev_routes=False,
+        worker_concurrency=concurrency,
+        worker_lease_seconds=3.0,
+    )
+
+
+def _run(run_id: str) -> ExtractionRunDTO:
+    return ExtractionRunDTO(
+        id=run_id,
+        aip_id=f"aip-{run_id}",
+        uploaded_file_id=None,
+        retry_of_run_id=None,
+        resume_from_stage=None,
+        model_name="gpt-5.2",
+        status="running",
+        stage="extract",
+        created_at=None,
+    )
+
+
+class _FakeLeaseRepo:
+    def __init__(self, run_ids: list[str]) -> None:
+        self.queue = [_run(run_id) for run_id in run_ids]
+        self.lock = threading.Lock()
+        self.claims: list[tuple[str, str | None, float | None]] = []
+        self.claim_batches: list[int] = []
+        self.renewals: list[list[str]] = []
+        self.released: list[str] = []
+        self.requeue_calls = 0
+        self.lost: set[str] = set()
+        self.terminal_writes: list[str] = []
+        self.requeued: list[str] = []
+        self.requeue_returns_to_queue = False
+        self.requeue_error: Exception | None = None
+
+    def claim_queued_runs(
+        self,
+        limit: int,
+        *,
+        lease_owner: str | None = None,
+        lease_seconds: float | None = None,
+        order: str = "oldest",
+        prefer_retries: bool = False,
+    ) -> list[ExtractionRunDTO]:
+        with self.lock:
+            claimed, self.queue = self.queue[:limit], self.queue[limit:]
+            self.claim_batches.append(len(claimed))
+            self.claims.extend((run.id, lease_owner, lease_seconds) for run in claimed)
+            return claimed
+
+    def renew_run_leases(self, *, run_ids: list[str], lease_owner: str, lease_seconds: float) -> set[str]:
+        with self.lock:
+            self.renewals.append(sorted(run_ids))
+        return set(run_ids) - self.lost
+
+    def release_run_lease(self, *, run_id: str, lease_owner: str) -> None:
+        with self.lock:
+            self.released.append(run_id)
+
+    def requeue_run(self, *, run_id: str, lease_owner: str) -> bool:
+        if self.requeue_error is not None:
+            raise self.requeue_error
+        with self.lock:
+            self.requeued.append(run_id)
+            if self.requeue_returns_to_queue:
+                self.queue.append(_run(run_id))
+        return True
+
+    def requeue_expired_runs(self) -> list[str]:
+        self.requeue_calls += 1
+        return []
+
+    def set_run_progress(self, **kwargs: Any) -> None:
+        return None
+
+    def set_run_succeeded(self, *, run_id: str, lease_owner: str | None = None) -> None:
+        self.terminal_writes.append(run_id)
+
+
+def test_concurrent_worker_drains_backlog_within_slot_bound() -> None:
+    repo = _FakeLeaseRepo([f"run-{index}" for index in range(7)])
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    processed: list[str] = []
+
+    def fake_process(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+            processed.append(run["id"])
+
+    worker = ConcurrentRunWorker(
+        repo=repo,  # type: ignore[arg-type]
+        settings=_settings(concurrency=3),
+        lease_seconds=3.0,
+        worker_id="host:1:abc",
+        process=fake_process,
+    )
+    worker.run(run_once=True)
+
+    assert sorted(processed) == sorted(f"run-{index}" for index in range(7))
+    assert 1 < state["peak"] <= 3
+    assert all(owner == "host:1:abc" and seconds == 3.0 for _, owner, seconds in repo.claims)
+    assert sorted(repo.released) == sorted(processed)
+    assert repo.requeue_calls >= 1
+    assert repo.claim_batches[0] == 3
+    assert max(repo.claim_batches) <= 3
+
+
+def test_concurrent_worker_renews_leases_for_active_runs() -> None:
+    repo = _FakeLeaseRepo(["run-slow"])
+
+    def slow_process(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        time.sleep(1.3)
+
+    worker = ConcurrentRunWorker(
+        repo=repo,  # type: ignore[arg-type]
+        settings=_settings(concurrency=2),
+        lease_seconds=3.0,
+        process=slow_process,
+    )
+    worker.run(run_once=True)
+
+    assert ["run-slow"] in repo.renewals
+
+
+def test_slot_errors_do_not_stop_the_pool() -> None:
+    repo = _FakeLeaseRepo(["run-bad", "run-good"])
+    processed: list[str] = []
+
+    def flaky_process(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        if run["id"] == "run-bad":
+            raise RuntimeError("boom")
+        processed.append(run["id"])
+
+    worker = ConcurrentRunWorker(repo=repo, settings=_settings(concurrency=1), process=flaky_process)  # type: ignore[arg-type]
+    worker.run(run_once=True)
+
+    assert processed == ["run-good"]
+    assert repo.released == ["run-good"]
+    assert repo.requeued == ["run-bad"]
+
+
+def test_crashed_slot_requeues_its_run_so_it_is_claimable_again() -> None:
+    repo = _FakeLeaseRepo(["run-crash"])
+    repo.requeue_returns_to_queue = True
+    attempts: list[str] = []
+
+    def crash_once(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        attempts.append(run["id"])
+        if len(attempts) == 1:
+            # e.g. set_run_failed itself failing during a Supabase outage.
+            raise RuntimeError("supabase unavailable")
+
+    worker = ConcurrentRunWorker(repo=repo, settings=_settings(concurrency=1), process=crash_once)  # type: ignore[arg-type]
+    worker.run(run_once=True)
+
+    assert attempts == ["run-crash", "run-crash"]
+    assert repo.requeued == ["run-crash"]
+    assert repo.released == ["run-crash"]
+    assert [run_id for run_id, _, _ in repo.claims] == ["run-crash", "run-crash"]
+
+
+def test_crashed_slot_keeps_its_lease_when_requeue_fails() -> None:
+    repo = _FakeLeaseRepo(["run-crash"])
+    repo.requeue_error = RuntimeError("supabase unavailable")
+
+    def crash(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        raise RuntimeError("supabase unavailable")
+
+    worker = ConcurrentRunWorker(repo=repo, settings=_settings(concurrency=1), process=crash)  # type: ignore[arg-type]
+    worker.run(run_once=True)
+
+    # Releasing would null lease_expires_at and hide the run from requeue_expired_runs.
+    assert repo.released == []
+
+
+def test_configured_lease_outlasts_a_stalled_supabase_renewal(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_SUPABASE_HTTP_TIMEOUT_SECONDS", "20")
+    monkeypatch.setenv("PIPELINE_SUPABASE_HTTP_MAX_RETRIES", "1")
+
+    worker = ConcurrentRunWorker(repo=_FakeLeaseRepo([]), settings=_settings())  # type: ignore[arg-type]
+
+    # Two 20s attempts plus a capped 30s Retry-After wait must fit in two thirds of the lease.
+    assert worker.lease_seconds == 1.5 * (20 * 2 + 30)
+
+
+def test_lost_lease_aborts_slot_before_terminal_write() -> None:
+    repo = _FakeLeaseRepo(["run-lost"])
+    repo.lost.add("run-lost")
+    outcome: list[str] = []
+
+    def stalled_process(*, repo: Any, settings: Settings, run: dict[str, Any], progress: Any) -> None:
+        try:
+            for _ in range(100):
+                progress.set_run_progress(run_id=run["id"], stage="extract", stage_progress_pct=10)
+                time.sleep(0.05)
+            progress.set_run_succeeded(run_id=run["id"])
+        except RunLeaseLostError:
+            outcome.append("aborted")
+            raise
+
+    worker = ConcurrentRunWorker(
+        repo=repo,  # type: ignore[arg-type]
+        settings=_settings(concurrency=1),
+        lease_seconds=3.0,
+        process=stalled_process,
+    )
+    worker.run(run_once=True)
+
+    assert outcome == ["aborted"]
+    assert repo.terminal_writes == []
+    assert not worker.progress.lease_lost("run-lost")
+
+
+def test_run_writes_are_conditional_on_lease_owner() -> None:
+    class _Client:
+        def __init__(self) -> None:
+            self.filters: list[dict[str, str]] = []
+
+        def update(self, table: str, patch: dict[str, Any], *, filters: dict[str, str], select: str | None = None):
+            self.filters.append(filters)
+            return []
+
+    client = _Client()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    with pytest.raises(RunLeaseLostError):
+        repo.set_run_succeeded(run_id="run-1", lease_owner="host:1")
+    repo.set_run_succeeded(run_id="run-1")
+
+    assert client.filters == [{"id": "eq.run-1", "lease_owner": "eq.host:1"}, {"id": "eq.run-1"}]
+
+
+def test_requeue_run_only_touches_a_running_row_the_owner_holds() -> None:
+    class _Client:
+        def __init__(self) -> None:
+            self.calls: list[tuple[dict[str, Any], dict[str, str]]] = []
+
+        def update(self, table: str, patch: dict[str, Any], *, filters: dict[str, str], select: str | None = None):
+            self.calls.append((patch, filters))
+            return [{"id": "run-1"}]
+
+    client = _Client()
+    repo = PipelineRepository(client)  # type: ignore[arg-type]
+
+    assert repo.requeue_run(run_id="run-1", lease_owner="host:1") is True
+    patch, filters = client.calls[0]
+    assert filters == {"id": "eq.run-1", "status": "eq.running", "lease_owner": "eq.host:1"}
+    assert patch["status"] == "queued" and patch["lease_owner"] is None and patch["lease_expires_at"] is None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from types import SimpleNamespace
 from typing import Any
 
@@ -130,7 +131,7 @@ class _FakeRepo:
     def get_uploaded_file(self, run: dict[str, Any]) -> Any:
         return SimpleNamespace(id="file-001", bucket_id="uploads", object_name="sample.pdf")
 
-    def set_run_stage(self, *, run_id: str, stage: str) -> None:
+    def set_run_stage(self, *, run_id: str, stage: str, lease_owner: str | None = None) -> None:
         self.stage_calls.append(stage)
 
     def set_run_progress(
@@ -140,6 +141,7 @@ class _FakeRepo:
         stage: str,
         stage_progress_pct: int,
         progress_message: str | None = None,
+        lease_owner: str | None = None,
     ) -> None:
         self.progress_calls.append((stage, stage_progress_pct, progress_message))
 
@@ -176,10 +178,10 @@ class _FakeRepo:
     def upsert_aip_line_item_embeddings(self, *, line_items: list[dict[str, Any]], model: str) -> None:
         return None
 
-    def set_run_succeeded(self, *, run_id: str) -> None:
+    def set_run_succeeded(self, *, run_id: str, lease_owner: str | None = None) -> None:
         self.succeeded = True
 
-    def set_run_failed(self, *, run_id: str, stage: str, error_message: str) -> None:
+    def set_run_failed(self, *, run_id: str, stage: str, error_message: str, lease_owner: str | None = None) -> None:
         self.failed.append((stage, error_message))
 
     def get_stage_artifact(self, *, run_id: str, artifact_type: str) -> dict[str, Any] | None:
@@ -188,6 +190,17 @@ class _FakeRepo:
     def get_parent_run_id(self, *, run_id: str) -> str | None:
         return self._lineage.get(run_id)
 
+    def find_lineage_artifact(self, *, run_id: str, artifact_type: str) -> tuple[dict[str, Any] | None, str | None]:
+        visited: set[str] = set()
+        cursor: str | None = run_id
+        while cursor and cursor not in visited:
+            visited.add(cursor)
+            artifact = self.get_stage_artifact(run_id=cursor, artifact_type=artifact_type)
+            if artifact is not None:
+                return artifact, cursor
+            cursor = self.get_parent_run_id(run_id=cursor)
+        return None, None
+
 
 def _patch_pipeline_fns(
     monkeypatch,
@@ -216,7 +229,7 @@ def _patch_pipeline_fns(
         payload = extract_payload or _extract_payload()
         return SimpleNamespace(payload=payload, json_str=json.dumps(payload, ensure_ascii=False))
 
-    def fake_validate(extraction_json_str: str, **kwargs: Any) -> Any:
+    def fake_validate(extraction_obj: dict[str, Any], **kwargs: Any) -> Any:
         call_counts["validate"] += 1
         if validation_batch_sizes is not None:
             value = kwargs.get("batch_size")
@@ -258,7 +271,7 @@ def _patch_pipeline_fns(
             )
         return SimpleNamespace(validated_obj=payload, validated_json_str=json.dumps(payload, ensure_ascii=False))
 
-    def fake_summarize(validated_json_str: str, **kwargs: Any) -> Any:
+    def fake_summarize(validated_obj: dict[str, Any], **kwargs: Any) -> Any:
         call_counts["summarize"] += 1
         payload = summarize_payload or _summarize_payload()
         text = str((payload.get("summary") or {}).get("text") or "Generated summary.")
@@ -268,7 +281,7 @@ def _patch_pipeline_fns(
             summary_text=text,
         )
 
-    def fake_categorize(summary_json_str: str, **kwargs: Any) -> Any:
+    def fake_categorize(summary_obj: dict[str, Any], **kwargs: Any) -> Any:
         call_counts["categorize"] += 1
         payload = categorize_payload or _categorize_payload()
         return SimpleNamespace(
@@ -276,7 +289,7 @@ def _patch_pipeline_fns(
             categorized_json_str=json.dumps(payload, ensure_ascii=False),
         )
 
-    def fake_scale(validated_json_str: str, **kwargs: Any) -> Any:
+    def fake_scale(validated_obj: dict[str, Any], **kwargs: Any) -> Any:
         if "scale_amounts" in call_counts:
             call_counts["scale_amounts"] += 1
         payload = scale_payload or validate_payload or _validate_payload()
@@ -289,9 +302,9 @@ def _patch_pipeline_fns(
 
     monkeypatch.setattr(processor_module, "run_city_extraction", fake_extract)
     monkeypatch.setattr(processor_module, "validate_city", fake_validate)
-    monkeypatch.setattr(processor_module, "scale_validated_amounts_json_str", fake_scale)
-    monkeypatch.setattr(processor_module, "summarize_aip_overall_json_str", fake_summarize)
-    monkeypatch.setattr(processor_module, "categorize_from_summarized_json_str", fake_categorize)
+    monkeypatch.setattr(processor_module, "scale_validated_amounts", fake_scale)
+    monkeypatch.setattr(processor_module, "summarize_aip_overall", fake_summarize)
+    monkeypatch.setattr(processor_module, "categorize_from_summarized", fake_categorize)
 
 
 def test_resume_from_validate_skips_extraction(monkeypatch) -> None:
@@ -330,6 +343,8 @@ def test_resume_from_validate_skips_extraction(monkeypatch) -> None:
 
 
 def test_validate_stage_writes_intermediate_progress_and_logs(monkeypatch, capsys) -> None:
+    # Write-through mode: every intermediate message reaches the repository.
+    monkeypatch.setenv("PIPELINE_PROGRESS_MIN_INTERVAL_SECONDS", "0")
     calls = {"extract": 0, "validate": 0, "summarize": 0, "categorize": 0}
     _patch_pipeline_fns(monkeypatch, call_counts=calls)
 
@@ -389,9 +404,9 @@ def test_scale_stage_runs_before_summarize_and_passes_scaled_payload(monkeypatch
 
     captured_payload: dict[str, Any] = {}
 
-    def fake_summarize(validated_json_str: str, **kwargs: Any) -> Any:
+    def fake_summarize(validated_obj: dict[str, Any], **kwargs: Any) -> Any:
         calls["summarize"] += 1
-        captured_payload["input"] = json.loads(validated_json_str)
+        captured_payload["input"] = validated_obj
         payload = _summarize_payload()
         text = str((payload.get("summary") or {}).get("text") or "Generated summary.")
         return SimpleNamespace(
@@ -400,7 +415,7 @@ def test_scale_stage_runs_before_summarize_and_passes_scaled_payload(monkeypatch
             summary_text=text,
         )
 
-    monkeypatch.setattr(processor_module, "summarize_aip_overall_json_str", fake_summarize)
+    monkeypatch.setattr(processor_module, "summarize_aip_overall", fake_summarize)
 
     repo = _FakeRepo(
         lineage={"run-new": "run-old"},
@@ -546,3 +561,138 @@ def test_lineage_traversal_finds_prerequisite_artifact_from_ancestor(monkeypatch
     assert calls["validate"] == 1
     assert repo.stage_calls[0] == "validate"
     assert repo.succeeded is True
+
+
+def test_categorize_overlaps_summarize_and_keeps_summary_block(monkeypatch) -> None:
+    calls = {"extract": 0, "validate": 0, "summarize": 0, "categorize": 0}
+    _patch_pipeline_fns(monkeypatch, call_counts=calls)
+    categorize_started = threading.Event()
+    categorize_inputs: list[dict[str, Any]] = []
+
+    def fake_summarize(validated_obj: dict[str, Any], **kwargs: Any) -> Any:
+        calls["summarize"] += 1
+        # Summarize only finishes once categorization is already running beside it.
+        assert categorize_started.wait(timeout=5)
+        payload = _summarize_payload()
+        return SimpleNamespace(
+            summary_obj=payload,
+            summary_json_str=json.dumps(payload, ensure_ascii=False),
+            summary_text="Summary from prior run.",
+        )
+
+    def fake_categorize(summary_obj: dict[str, Any], **kwargs: Any) -> Any:
+        calls["categorize"] += 1
+        categorize_started.set()
+        categorize_inputs.append(summary_obj)
+        payload = {**_categorize_payload(), "summary": None}
+        return SimpleNamespace(categorized_obj=payload, categorized_json_str=json.dumps(payload))
+
+    monkeypatch.setattr(processor_module, "summarize_aip_overall", fake_summarize)
+    monkeypatch.setattr(processor_module, "categorize_from_summarized", fake_categorize)
+
+    repo = _FakeRepo(
+        lineage={"run-new": "run-old"},
+        artifacts={("run-old", "scale_amounts"): _validate_payload()},
+        scope="city",
+    )
+    run = {
+        "id": "run-new",
+        "aip_id": "aip-001",
+        "uploaded_file_id": "file-001",
+        "resume_from_stage": "summarize",
+        "model_name": "gpt-5.2",
+    }
+
+    processor_module.process_run(repo=repo, settings=_settings(), run=run)
+
+    assert repo.succeeded is True
+    assert calls == {"extract": 0, "validate": 0, "summarize": 1, "categorize": 1}
+    assert "summary" not in categorize_inputs[0]
+    assert [row[0] for row in repo.inserted_artifacts] == ["summarize", "categorize"]
+    categorize_artifact = repo.inserted_artifacts[1][1]
+    assert categorize_artifact["summary"] == {"text": "Summary from prior run."}
+    assert categorize_artifact["projects"][0]["classification"]["category"] == "other"
+
+
+def test_categorize_overlap_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("PIPELINE_CATEGORIZE_OVERLAP_SUMMARIZE", "false")
+    calls = {"extract": 0, "validate": 0, "summarize": 0, "categorize": 0}
+    _patch_pipeline_fns(monkeypatch, call_counts=calls)
+    categorize_inputs: list[dict[str, Any]] = []
+
+    def fake_categorize(summary_obj: dict[str, Any], **kwargs: Any) -> Any:
+        calls["categorize"] += 1
+        categorize_inputs.append(summary_obj)
+        payload = _categorize_payload()
+        return SimpleNamespace(categorized_obj=payload, categorized_json_str=json.dumps(payload))
+
+    monkeypatch.setattr(processor_module, "categorize_from_summarized", fake_categorize)
+
+    repo = _FakeRepo(
+        lineage={"run-new": "run-old"},
+        artifacts={("run-old", "scale_amounts"): _validate_payload()},
+        scope="city",
+    )
+    run = {
+        "id": "run-new",
+        "aip_id": "aip-001",
+        "uploaded_file_id": "file-001",
+        "resume_from_stage": "summarize",
+        "model_name": "gpt-5.2",
+    }
+
+    processor_module.process_run(repo=repo, settings=_settings(), run=run)
+
+    assert repo.succeeded is True
+    assert categorize_inputs[0]["summary"] == {"text": "Summary from prior run."}
+
+
+def test_summarize_failure_cancels_and_joins_overlapped_categorize(monkeypatch) -> None:
+    calls = {"extract": 0, "validate": 0, "summarize": 0, "categorize": 0}
+    _patch_pipeline_fns(monkeypatch, call_counts=calls)
+    categorize_started = threading.Event()
+    events: list[str] = []
+
+    def fake_summarize(validated_obj: dict[str, Any], **kwargs: Any) -> Any:
+        assert categorize_started.wait(timeout=5)
+        raise RuntimeError("summarize exploded")
+
+    def fake_categorize(summary_obj: dict[str, Any], **kwargs: Any) -> Any:
+        cancel_event = kwargs["cancel_event"]
+        categorize_started.set()
+        try:
+            for _ in range(500):
+                if cancel_event.is_set():
+                    events.append("categorize_cancelled")
+                    raise RuntimeError("cancelled")
+                events.append("batch")
+                threading.Event().wait(0.01)
+            return SimpleNamespace(categorized_obj=_categorize_payload(), categorized_json_str="{}")
+        finally:
+            events.append("categorize_exited")
+
+    class _RecordingRepo(_FakeRepo):
+        def set_run_failed(self, **kwargs: Any) -> None:
+            events.append("run_failed")
+            super().set_run_failed(**kwargs)
+
+    monkeypatch.setattr(processor_module, "summarize_aip_overall", fake_summarize)
+    monkeypatch.setattr(processor_module, "categorize_from_summarized", fake_categorize)
+    repo = _RecordingRepo(
+        lineage={"run-new": "run-old"},
+        artifacts={("run-old", "scale_amounts"): _validate_payload()},
+        scope="city",
+    )
+    run = {
+        "id": "run-new",
+        "aip_id": "aip-001",
+        "uploaded_file_id": "file-001",
+        "resume_from_stage": "summarize",
+        "model_name": "gpt-5.2",
+    }
+
+    processor_module.process_run(repo=repo, settings=_settings(), run=run)
+
+    assert repo.failed and repo.failed[0][0] == "summarize"
+    assert events[-3:] == ["categorize_cancelled", "categorize_exited", "run_failed"]
+    assert events.count("batch") < 500
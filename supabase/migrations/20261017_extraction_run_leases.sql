@@ -0,0 +1,15 @@
+begin;
+
+-- Run leases for multi-slot workers: the claiming worker stamps lease_owner and renews
+-- lease_heartbeat_at/lease_expires_at while the run is in flight. Running rows whose
+-- lease expired are returned to the queue so a crashed slot never strands a run.
+alter table public.extraction_runs
+  add column if not exists lease_owner text,
+  add column if not exists lease_heartbeat_at timestamp with time zone,
+  add column if not exists lease_expires_at timestamp with time zone;
+
+create index if not exists idx_extraction_runs_running_lease_expiry
+  on public.extraction_runs (lease_expires_at)
+  where status = 'running' and lease_expires_at is not null;
+
+commit;
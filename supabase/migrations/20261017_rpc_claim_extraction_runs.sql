@@ -0,0 +1,76 @@
+begin;
+
+-- Atomically claim up to p_limit queued runs in one round trip. Rows locked by a
+-- concurrent claimer are skipped rather than waited on, so competing workers split the
+-- queue instead of racing for the same head row.
+create or replace function public.claim_extraction_runs(
+  p_limit int default 1,
+  p_lease_owner text default null,
+  p_lease_seconds int default null,
+  p_order text default 'oldest',
+  p_prefer_retries boolean default false
+)
+returns setof public.extraction_runs
+language sql
+volatile
+security definer
+set search_path = pg_catalog, public
+as $$
+  with candidates as (
+    select r.id
+    from public.extraction_runs r
+    where r.status = 'queued'
+    order by
+      case when p_prefer_retries and r.retry_of_run_id is not null then 0 else 1 end,
+      case when p_order = 'newest' then r.created_at end desc nulls last,
+      r.created_at asc,
+      r.id asc
+    limit greatest(1, least(coalesce(p_limit, 1), 100))
+    for update of r skip locked
+  ),
+  claimed as (
+    select
+      c.id,
+      case
+        when r.resume_from_stage is null then 'extract'::public.pipeline_stage
+        when r.resume_from_stage = 'embed' then 'categorize'::public.pipeline_stage
+        else r.resume_from_stage
+      end as initial_stage
+    from candidates c
+    join public.extraction_runs r on r.id = c.id
+  )
+  update public.extraction_runs r
+  set
+    status = 'running',
+    stage = claimed.initial_stage,
+    started_at = now(),
+    finished_at = null,
+    error_code = null,
+    error_message = null,
+    overall_progress_pct = 0,
+    stage_progress_pct = 0,
+    progress_message = case claimed.initial_stage
+      when 'extract' then 'Starting extraction...'
+      when 'validate' then 'Starting validation...'
+      when 'scale_amounts' then 'Scaling city monetary values...'
+      when 'summarize' then 'Starting summarization...'
+      else 'Starting categorization...'
+    end,
+    progress_updated_at = now(),
+    lease_owner = p_lease_owner,
+    lease_heartbeat_at = case when p_lease_owner is null then null else now() end,
+    lease_expires_at = case
+      when p_lease_owner is null or p_lease_seconds is null then null
+      else now() + make_interval(secs => p_lease_seconds)
+    end
+  from claimed
+  where r.id = claimed.id
+  returning r.*;
+$$;
+
+revoke all on function public.claim_extraction_runs(int, text, int, text, boolean) from public;
+revoke all on function public.claim_extraction_runs(int, text, int, text, boolean) from anon;
+revoke all on function public.claim_extraction_runs(int, text, int, text, boolean) from authenticated;
+grant execute on function public.claim_extraction_runs(int, text, int, text, boolean) to service_role;
+
+commit;
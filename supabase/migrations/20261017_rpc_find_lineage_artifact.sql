@@ -0,0 +1,50 @@
+begin;
+
+-- Resolve the nearest artifact of one type along a run's retry_of_run_id chain in a
+-- single round trip. Depth 0 is the run itself; the walk stops on cycles and after 64
+-- hops. Within a run the newest artifact wins, matching get_stage_artifact.
+create or replace function public.find_lineage_artifact(
+  p_run_id uuid,
+  p_artifact_type public.pipeline_stage
+)
+returns table (
+  source_run_id uuid,
+  artifact_id uuid,
+  depth int,
+  artifact_json jsonb
+)
+language sql
+stable
+security definer
+set search_path = pg_catalog, public
+as $$
+  with recursive lineage as (
+    select r.id, r.retry_of_run_id, 0 as depth, array[r.id] as path
+    from public.extraction_runs r
+    where r.id = p_run_id
+    union all
+    select parent.id, parent.retry_of_run_id, lineage.depth + 1, lineage.path || parent.id
+    from lineage
+    join public.extraction_runs parent on parent.id = lineage.retry_of_run_id
+    where not parent.id = any(lineage.path)
+      and lineage.depth < 64
+  )
+  select a.run_id, a.id, lineage.depth, a.artifact_json
+  from lineage
+  join public.extraction_artifacts a
+    on a.run_id = lineage.id
+   and a.artifact_type = p_artifact_type
+  where jsonb_typeof(a.artifact_json) = 'object'
+  order by lineage.depth asc, a.created_at desc
+  limit 1;
+$$;
+
+create index if not exists idx_extraction_artifacts_run_type_created
+  on public.extraction_artifacts (run_id, artifact_type, created_at desc);
+
+revoke all on function public.find_lineage_artifact(uuid, public.pipeline_stage) from public;
+revoke all on function public.find_lineage_artifact(uuid, public.pipeline_stage) from anon;
+revoke all on function public.find_lineage_artifact(uuid, public.pipeline_stage) from authenticated;
+grant execute on function public.find_lineage_artifact(uuid, public.pipeline_stage) to service_role;
+
+commit;
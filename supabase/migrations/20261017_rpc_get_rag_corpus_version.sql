@@ -0,0 +1,77 @@
+begin;
+
+-- Write counter for the chunk corpus. aip_chunks has no updated_at and the embed function
+-- upserts chunks in place (ignoreDuplicates: false), so row counts and max(created_at)
+-- miss re-ingests; statement-level triggers bump this counter on every insert, update,
+-- delete or truncate of aip_chunks and aip_chunk_embeddings instead.
+create table if not exists public.rag_corpus_version (
+  id boolean primary key default true,
+  version bigint not null default 0,
+  updated_at timestamp with time zone not null default now(),
+  constraint rag_corpus_version_singleton check (id)
+);
+
+insert into public.rag_corpus_version (id) values (true) on conflict (id) do nothing;
+
+alter table public.rag_corpus_version enable row level security;
+
+create or replace function public.bump_rag_corpus_version()
+returns trigger
+language plpgsql
+security definer
+set search_path = pg_catalog, public
+as $$
+begin
+  update public.rag_corpus_version
+     set version = version + 1,
+         updated_at = now()
+   where id;
+  return null;
+end;
+$$;
+
+create or replace trigger trg_aip_chunks_bump_rag_corpus_version
+  after insert or update or delete or truncate on public.aip_chunks
+  for each statement execute function public.bump_rag_corpus_version();
+
+create or replace trigger trg_aip_chunk_embeddings_bump_rag_corpus_version
+  after insert or update or delete or truncate on public.aip_chunk_embeddings
+  for each statement execute function public.bump_rag_corpus_version();
+
+-- Fingerprint of everything chat retrieval can read: the published AIP set with each
+-- AIP's updated_at (bumped by trg_aips_set_timestamps on any edit, status or metadata),
+-- plus the chunk corpus write counter. Any publish, unpublish, metadata edit, re-ingest
+-- or re-embed changes the hash, so the pipeline's answer cache can drop entries computed
+-- against an older corpus.
+create or replace function public.get_rag_corpus_version()
+returns text
+language sql
+stable
+security definer
+set search_path = pg_catalog, public
+as $$
+  select md5(
+    concat_ws(
+      '|',
+      (
+        select coalesce(string_agg(a.id::text || ':' || a.updated_at::text, ',' order by a.id), '')
+        from public.aips a
+        where a.status = 'published'
+      ),
+      (
+        select coalesce(max(v.version), 0)::text
+        from public.rag_corpus_version v
+      )
+    )
+  );
+$$;
+
+revoke all on table public.rag_corpus_version from anon;
+revoke all on table public.rag_corpus_version from authenticated;
+revoke all on function public.bump_rag_corpus_version() from public;
+revoke all on function public.get_rag_corpus_version() from public;
+revoke all on function public.get_rag_corpus_version() from anon;
+revoke all on function public.get_rag_corpus_version() from authenticated;
+grant execute on function public.get_rag_corpus_version() to service_role;
+
+commit;